@@ -0,0 +1,779 @@
+## ==================== almacen_columnar.py ====================
+from collections.abc import Mapping
+
+import numpy as np
+
+
+class AlmacenColumnar:
+    """
+    Almacén de matrículas en columnas NumPy con identificadores internos densos.
+
+    Cada documento y cada código de curso se internan una sola vez y se
+    representan con un entero. Una matrícula ocupa una fila de arreglos de
+    tamaño fijo (estudiante, curso, nota y los enlaces a la fila anterior y
+    siguiente del mismo estudiante y del mismo curso), unos 32 bytes en total,
+    sin objetos Python por matrícula.
+
+    Las filas activas siempre son [0, len): al borrar, la última fila ocupa el
+    hueco, de modo que las columnas se pueden exponer como vistas sin copia.
+
+    La fila de cada (estudiante, curso) se ubica con una tabla hash de
+    direccionamiento abierto, también en arreglos NumPy (unos 24 bytes por
+    matrícula). Los rankings por curso se calculan de las columnas recorriendo
+    la lista del curso (ver RankingsColumnar). Para los conteos por rango de
+    nota (NotasColumnar) se lleva la cantidad de matrículas de cada décima y,
+    en cada una, la de cada nota distinta.
+
+    Se comporta como un diccionario (documento, codigo_curso) -> nota para que
+    ModeloSIGA lo use igual que su índice en memoria.
+    """
+
+    CAPACIDAD_INICIAL = 1024
+    LIBRE = -1  # Ranura vacía de la tabla hash
+    CUBETAS_NOTA = 51  # Décimas de 0.0 a 5.0 (ver _cubeta_nota)
+
+    def __init__(self):
+        self.documentos = []       # id -> documento
+        self.codigos = []          # id -> código de curso
+        self._id_estudiante = {}   # documento -> id
+        self._id_curso = {}        # código -> id
+
+        # Columnas por matrícula
+        capacidad = self.CAPACIDAD_INICIAL
+        self._estudiante = np.empty(capacidad, dtype=np.int32)
+        self._curso = np.empty(capacidad, dtype=np.int32)
+        self._nota = np.empty(capacidad, dtype=np.float64)
+        self._ant_est = np.empty(capacidad, dtype=np.int32)
+        self._sig_est = np.empty(capacidad, dtype=np.int32)
+        self._ant_cur = np.empty(capacidad, dtype=np.int32)
+        self._sig_cur = np.empty(capacidad, dtype=np.int32)
+        self._filas = 0
+
+        # Tabla hash (estudiante, curso) -> fila, con sondeo lineal y carga <= 1/2
+        self._claves = np.full(2 * capacidad, self.LIBRE, dtype=np.int64)  # ie << 32 | ic
+        self._posiciones = np.empty(2 * capacidad, dtype=np.int32)
+        self._bits = (2 * capacidad).bit_length() - 1
+
+        # Rankings ya calculados: ic -> (notas negadas, ids de estudiante) en orden
+        self._ordenados = {}
+
+        # Conteos por nota: décima -> {nota: cantidad}, y la cantidad de cada décima
+        self._notas_cubeta = [{} for _ in range(self.CUBETAS_NOTA)]
+        self._total_cubeta = [0] * self.CUBETAS_NOTA
+
+        # Columnas por entidad: primera y última fila de cada lista, y conteo
+        self._cabeza_est = np.empty(0, dtype=np.int32)
+        self._cola_est = np.empty(0, dtype=np.int32)
+        self._conteo_est = np.empty(0, dtype=np.int32)
+        self._cabeza_cur = np.empty(0, dtype=np.int32)
+        self._cola_cur = np.empty(0, dtype=np.int32)
+        self._conteo_cur = np.empty(0, dtype=np.int32)
+
+    # ==================== INTERNADO ====================
+
+    def internar_estudiante(self, documento):
+        ie = self._id_estudiante.get(documento)
+        if ie is None:
+            ie = len(self.documentos)
+            self._id_estudiante[documento] = ie
+            self.documentos.append(documento)
+            if ie >= len(self._cabeza_est):
+                nueva = max(16, 2 * len(self._cabeza_est))
+                self._cabeza_est = _crecer(self._cabeza_est, nueva, -1)
+                self._cola_est = _crecer(self._cola_est, nueva, -1)
+                self._conteo_est = _crecer(self._conteo_est, nueva, 0)
+        return ie
+
+    def internar_curso(self, codigo):
+        ic = self._id_curso.get(codigo)
+        if ic is None:
+            ic = len(self.codigos)
+            self._id_curso[codigo] = ic
+            self.codigos.append(codigo)
+            if ic >= len(self._cabeza_cur):
+                nueva = max(16, 2 * len(self._cabeza_cur))
+                self._cabeza_cur = _crecer(self._cabeza_cur, nueva, -1)
+                self._cola_cur = _crecer(self._cola_cur, nueva, -1)
+                self._conteo_cur = _crecer(self._conteo_cur, nueva, 0)
+        return ic
+
+    # ==================== INTERFAZ DE DICCIONARIO ====================
+
+    def __len__(self):
+        return self._filas
+
+    def __contains__(self, clave):
+        return self._buscar_fila(*clave) >= 0
+
+    def __getitem__(self, clave):
+        fila = self._buscar_fila(*clave)
+        if fila < 0:
+            raise KeyError(clave)
+        return float(self._nota[fila])
+
+    def get(self, clave, defecto=None):
+        fila = self._buscar_fila(*clave)
+        return float(self._nota[fila]) if fila >= 0 else defecto
+
+    def __setitem__(self, clave, nota):
+        documento, codigo_curso = clave
+        ie = self.internar_estudiante(documento)
+        ic = self.internar_curso(codigo_curso)
+        ranura = self._ranura(ie, ic)
+        if ranura >= 0:
+            fila = int(self._posiciones[ranura])
+            self._contar_nota(float(self._nota[fila]), -1)
+        else:
+            if 2 * (self._filas + 1) > len(self._claves):
+                self._rehacer_tabla(2 * len(self._claves))
+                ranura = self._ranura(ie, ic)
+            fila = self._nueva_fila()
+            self._estudiante[fila] = ie
+            self._curso[fila] = ic
+            self._claves[~ranura] = _clave(ie, ic)
+            self._posiciones[~ranura] = fila
+            self._enlazar(fila)
+        self._nota[fila] = nota
+        self._contar_nota(float(nota), 1)
+        self._ordenados.pop(ic, None)
+
+    def agregar_lote(self, documentos, codigos, notas):
+        """
+        Agrega matrículas nuevas en una pasada: columnas, enlaces y tabla hash
+        se escriben con NumPy y no fila a fila. Ninguna (documento, codigo)
+        puede estar ya en el almacén ni repetirse en el lote.
+        """
+        k = len(notas)
+        if not k:
+            return
+        ids_est = np.fromiter(map(self.internar_estudiante, documentos), dtype=np.int32, count=k)
+        ids_cur = np.fromiter(map(self.internar_curso, codigos), dtype=np.int32, count=k)
+        inicio, fin = self._filas, self._filas + k
+        self._reservar(fin)
+        self._estudiante[inicio:fin] = ids_est
+        self._curso[inicio:fin] = ids_cur
+        self._nota[inicio:fin] = notas
+        self._filas = fin
+
+        filas = np.arange(inicio, fin, dtype=np.int32)
+        _enlazar_lote(filas, ids_est, self._ant_est, self._sig_est,
+                      self._cabeza_est, self._cola_est, self._conteo_est)
+        _enlazar_lote(filas, ids_cur, self._ant_cur, self._sig_cur,
+                      self._cabeza_cur, self._cola_cur, self._conteo_cur)
+
+        capacidad = len(self._claves)
+        if 2 * fin > capacidad:
+            while 2 * fin > capacidad:
+                capacidad *= 2
+            self._rehacer_tabla(capacidad)
+        else:
+            self._insertar_en_tabla(filas)
+        for ic in np.unique(ids_cur).tolist():
+            self._ordenados.pop(ic, None)
+        valores, cantidades = np.unique(self._nota[inicio:fin], return_counts=True)
+        for nota, cantidad in zip(valores.tolist(), cantidades.tolist()):
+            self._contar_nota(nota, cantidad)
+
+    def pop(self, clave):
+        ie = self._id_estudiante.get(clave[0])
+        ic = self._id_curso.get(clave[1])
+        ranura = self._ranura(ie, ic) if ie is not None and ic is not None else -1
+        if ranura < 0:
+            raise KeyError(clave)
+        fila = int(self._posiciones[ranura])
+        nota = float(self._nota[fila])
+        self._contar_nota(nota, -1)
+        self._liberar_ranura(ranura)
+        self._desenlazar(fila)
+        self._ordenados.pop(ic, None)
+        ultima = self._filas - 1
+        if fila != ultima:
+            self._mover(ultima, fila)
+        self._filas = ultima
+        return nota
+
+    def __iter__(self):
+        for clave, _ in self.items():
+            yield clave
+
+    def items(self):
+        documentos, codigos = self.documentos, self.codigos
+        estudiantes = self._estudiante[:self._filas].tolist()
+        cursos = self._curso[:self._filas].tolist()
+        notas = self._nota[:self._filas].tolist()
+        for ie, ic, nota in zip(estudiantes, cursos, notas):
+            yield (documentos[ie], codigos[ic]), nota
+
+    # ==================== CONSULTAS POR ENTIDAD ====================
+
+    def cursos_de(self, documento):
+        ie = self._id_estudiante.get(documento)
+        if ie is None:
+            return []
+        return [self.codigos[self._curso[fila]] for fila in self._filas_estudiante(ie)]
+
+    def notas_de(self, documento):
+        ie = self._id_estudiante.get(documento)
+        if ie is None:
+            return {}
+        return {self.codigos[self._curso[fila]]: float(self._nota[fila])
+                for fila in self._filas_estudiante(ie)}
+
+    def estudiantes_de(self, codigo_curso):
+        ic = self._id_curso.get(codigo_curso)
+        if ic is None:
+            return []
+        documentos = self.documentos
+        filas = []
+        fila = int(self._cabeza_cur[ic])
+        while fila >= 0:
+            filas.append(documentos[self._estudiante[fila]])
+            fila = int(self._sig_cur[fila])
+        return filas
+
+    def conteo_estudiante(self, documento):
+        ie = self._id_estudiante.get(documento)
+        return int(self._conteo_est[ie]) if ie is not None else 0
+
+    def conteo_curso(self, codigo_curso):
+        ic = self._id_curso.get(codigo_curso)
+        return int(self._conteo_cur[ic]) if ic is not None else 0
+
+    def columnas(self):
+        """
+        Retorna las columnas activas como vistas sin copia.
+
+        Returns:
+            tuple: (ids_estudiante, ids_curso, notas, documentos, codigos); los
+            ids indexan las listas documentos y codigos.
+        """
+        n = self._filas
+        return self._estudiante[:n], self._curso[:n], self._nota[:n], self.documentos, self.codigos
+
+    def memoria_bytes(self):
+        """Bytes ocupados por los arreglos NumPy (sin contar las cadenas internadas)."""
+        arreglos = (self._estudiante, self._curso, self._nota, self._ant_est, self._sig_est,
+                    self._ant_cur, self._sig_cur, self._cabeza_est, self._cola_est,
+                    self._conteo_est, self._cabeza_cur, self._cola_cur, self._conteo_cur,
+                    self._claves, self._posiciones)
+        return sum(arreglo.nbytes for arreglo in arreglos)
+
+    # ==================== RANKINGS Y NOTAS ====================
+
+    def ordenado(self, codigo_curso):
+        """
+        Retorna (notas negadas, ids de estudiante) del curso, ordenados por
+        (-nota, documento) como un ranking. Se calcula de las columnas la primera
+        vez y se guarda hasta que cambia una matrícula del curso.
+        """
+        ic = self._id_curso.get(codigo_curso)
+        if ic is None:
+            return np.empty(0, dtype=np.float64), np.empty(0, dtype=np.int32)
+        ordenado = self._ordenados.get(ic)
+        if ordenado is None:
+            # Las filas del curso, por su lista enlazada: no se recorre todo el almacén
+            filas = np.array(self._filas_curso(ic), dtype=np.int64)
+            ids = self._estudiante[filas]
+            negadas = -self._nota[filas]
+            # A igual nota, por documento (la cadena, no el id)
+            documentos = np.array([self.documentos[ie] for ie in ids.tolist()], dtype=str)
+            orden = np.lexsort((documentos, negadas))
+            ordenado = self._ordenados[ic] = (negadas[orden], ids[orden])
+        return ordenado
+
+    def contar_notas(self, desde, hasta):
+        """
+        Cantidad de matrículas con desde <= nota < hasta. Suma las décimas que
+        el rango cubre enteras y revisa por nota solo las de los dos extremos:
+        O(décimas + notas distintas en los extremos), sin recorrer las filas.
+        """
+        if not desde < hasta:
+            return 0
+        inicial, final = _cubeta_nota(desde), _cubeta_nota(hasta)
+        cantidad = sum(self._total_cubeta[inicial + 1:final])
+        for cubeta in {inicial, final}:
+            cantidad += sum(veces for nota, veces in self._notas_cubeta[cubeta].items()
+                            if desde <= nota < hasta)
+        return cantidad
+
+    def _contar_nota(self, nota, delta):
+        cubeta = _cubeta_nota(nota)
+        notas = self._notas_cubeta[cubeta]
+        veces = notas.get(nota, 0) + delta
+        if veces:
+            notas[nota] = veces
+        else:
+            del notas[nota]
+        self._total_cubeta[cubeta] += delta
+
+    # ==================== FILAS Y ENLACES ====================
+
+    def _buscar_fila(self, documento, codigo_curso):
+        ie = self._id_estudiante.get(documento)
+        ic = self._id_curso.get(codigo_curso)
+        if ie is None or ic is None:
+            return -1
+        ranura = self._ranura(ie, ic)
+        return int(self._posiciones[ranura]) if ranura >= 0 else -1
+
+    # ==================== TABLA HASH ====================
+
+    def _ranura(self, ie, ic):
+        # Ranura de (ie, ic) si está; si no, ~ranura libre donde iría
+        clave = _clave(ie, ic)
+        claves = self._claves
+        mascara = len(claves) - 1
+        ranura = _dispersar(clave, self._bits)
+        while True:
+            actual = int(claves[ranura])
+            if actual == clave:
+                return ranura
+            if actual == self.LIBRE:
+                return ~ranura
+            ranura = (ranura + 1) & mascara
+
+    def _liberar_ranura(self, ranura):
+        # Borrado con desplazamiento hacia atrás: no deja lápidas en el sondeo
+        claves, posiciones = self._claves, self._posiciones
+        mascara = len(claves) - 1
+        siguiente = ranura
+        while True:
+            siguiente = (siguiente + 1) & mascara
+            clave = int(claves[siguiente])
+            if clave == self.LIBRE:
+                break
+            inicial = _dispersar(clave, self._bits)
+            # Se mueve si su ranura inicial no está entre el hueco (excluido) y ella
+            if (ranura - inicial) & mascara < (siguiente - inicial) & mascara:
+                claves[ranura] = clave
+                posiciones[ranura] = posiciones[siguiente]
+                ranura = siguiente
+        claves[ranura] = self.LIBRE
+
+    def _rehacer_tabla(self, capacidad):
+        self._claves = np.full(capacidad, self.LIBRE, dtype=np.int64)
+        self._posiciones = np.empty(capacidad, dtype=np.int32)
+        self._bits = capacidad.bit_length() - 1
+        self._insertar_en_tabla(np.arange(self._filas, dtype=np.int32))
+
+    def _insertar_en_tabla(self, filas):
+        # Inserta las filas a la vez: en cada ronda ocupa, de las filas pendientes
+        # cuya ranura está libre, una por ranura; las demás avanzan
+        claves, posiciones = self._claves, self._posiciones
+        mascara = len(claves) - 1
+        pendientes = _clave(self._estudiante[filas].astype(np.int64), self._curso[filas].astype(np.int64))
+        ranuras = _dispersar(pendientes, self._bits)
+        while len(filas):
+            libres = np.flatnonzero(claves[ranuras] == self.LIBRE)
+            _, primeras = np.unique(ranuras[libres], return_index=True)
+            elegidas = libres[primeras]
+            claves[ranuras[elegidas]] = pendientes[elegidas]
+            posiciones[ranuras[elegidas]] = filas[elegidas]
+            quedan = np.ones(len(filas), dtype=bool)
+            quedan[elegidas] = False
+            filas, pendientes = filas[quedan], pendientes[quedan]
+            ranuras = (ranuras[quedan] + 1) & mascara
+
+    def _filas_curso(self, ic):
+        siguientes = self._sig_cur
+        filas = []
+        fila = self._cabeza_cur[ic].item()
+        while fila >= 0:
+            filas.append(fila)
+            fila = siguientes[fila].item()
+        return filas
+
+    def _filas_estudiante(self, ie):
+        fila = int(self._cabeza_est[ie])
+        while fila >= 0:
+            yield fila
+            fila = int(self._sig_est[fila])
+
+    def _nueva_fila(self):
+        self._reservar(self._filas + 1)
+        fila = self._filas
+        self._filas += 1
+        return fila
+
+    def _reservar(self, filas):
+        # Capacidad para `filas` filas; las columnas crecen al menos al doble
+        if filas > len(self._estudiante):
+            nueva = max(filas, 2 * len(self._estudiante))
+            self._estudiante = _crecer(self._estudiante, nueva)
+            self._curso = _crecer(self._curso, nueva)
+            self._nota = _crecer(self._nota, nueva)
+            self._ant_est = _crecer(self._ant_est, nueva)
+            self._sig_est = _crecer(self._sig_est, nueva)
+            self._ant_cur = _crecer(self._ant_cur, nueva)
+            self._sig_cur = _crecer(self._sig_cur, nueva)
+
+    def _enlazar(self, fila):
+        # Agrega la fila al final de la lista del estudiante y de la del curso
+        ie = self._estudiante[fila]
+        cola = self._cola_est[ie]
+        self._ant_est[fila] = cola
+        self._sig_est[fila] = -1
+        if cola >= 0:
+            self._sig_est[cola] = fila
+        else:
+            self._cabeza_est[ie] = fila
+        self._cola_est[ie] = fila
+        self._conteo_est[ie] += 1
+
+        ic = self._curso[fila]
+        cola = self._cola_cur[ic]
+        self._ant_cur[fila] = cola
+        self._sig_cur[fila] = -1
+        if cola >= 0:
+            self._sig_cur[cola] = fila
+        else:
+            self._cabeza_cur[ic] = fila
+        self._cola_cur[ic] = fila
+        self._conteo_cur[ic] += 1
+
+    def _desenlazar(self, fila):
+        ie = self._estudiante[fila]
+        anterior, siguiente = self._ant_est[fila], self._sig_est[fila]
+        if anterior >= 0:
+            self._sig_est[anterior] = siguiente
+        else:
+            self._cabeza_est[ie] = siguiente
+        if siguiente >= 0:
+            self._ant_est[siguiente] = anterior
+        else:
+            self._cola_est[ie] = anterior
+        self._conteo_est[ie] -= 1
+
+        ic = self._curso[fila]
+        anterior, siguiente = self._ant_cur[fila], self._sig_cur[fila]
+        if anterior >= 0:
+            self._sig_cur[anterior] = siguiente
+        else:
+            self._cabeza_cur[ic] = siguiente
+        if siguiente >= 0:
+            self._ant_cur[siguiente] = anterior
+        else:
+            self._cola_cur[ic] = anterior
+        self._conteo_cur[ic] -= 1
+
+    def _mover(self, origen, destino):
+        # Copia la fila origen en destino y redirige los enlaces que apuntaban a ella
+        for columna in (self._estudiante, self._curso, self._nota, self._ant_est,
+                        self._sig_est, self._ant_cur, self._sig_cur):
+            columna[destino] = columna[origen]
+
+        ie = self._estudiante[destino]
+        self._posiciones[self._ranura(int(ie), int(self._curso[destino]))] = destino
+        anterior, siguiente = self._ant_est[destino], self._sig_est[destino]
+        if anterior >= 0:
+            self._sig_est[anterior] = destino
+        else:
+            self._cabeza_est[ie] = destino
+        if siguiente >= 0:
+            self._ant_est[siguiente] = destino
+        else:
+            self._cola_est[ie] = destino
+
+        ic = self._curso[destino]
+        anterior, siguiente = self._ant_cur[destino], self._sig_cur[destino]
+        if anterior >= 0:
+            self._sig_cur[anterior] = destino
+        else:
+            self._cabeza_cur[ic] = destino
+        if siguiente >= 0:
+            self._ant_cur[siguiente] = destino
+        else:
+            self._cola_cur[ic] = destino
+
+
+class AlmacenFijado:
+    """
+    Un AlmacenColumnar que sigue cambiando, tal como estaba al crear una lectura
+    (ver lectura.py): a lo que da el almacén se le aplican las notas anteriores
+    que el modelo guardó de cada matrícula que modificó después. Cada consulta
+    lee el almacén con el cerrojo de lectura del modelo, así que debe ser corta.
+    """
+
+    def __init__(self, almacen, anteriores, cerrojo):
+        """
+        Args:
+            almacen: AlmacenColumnar del modelo
+            anteriores: Valores anteriores de la lectura (ver modelo._Anteriores)
+            cerrojo: Cerrojo de lectura del modelo (ver ModeloSIGA.leyendo)
+        """
+        self._almacen = almacen
+        self._anteriores = anteriores['_matriculas']  # (documento, codigo_curso) -> nota, o None
+        self._por_documento = anteriores.por_documento
+        self._por_curso = anteriores.por_curso
+        self._cerrojo = cerrojo
+        self._ordenados = {}  # codigo -> ranking fijado, que ya no cambia
+
+    @property
+    def documentos(self):
+        # Solo crece: los ids que dan columnas() y ordenado() siguen valiendo
+        return self._almacen.documentos
+
+    def __len__(self):
+        with self._cerrojo:
+            almacen = self._almacen
+            return len(almacen) + sum((nota is not None) - (clave in almacen)
+                                      for clave, nota in self._anteriores.items())
+
+    def __contains__(self, clave):
+        return self.get(clave) is not None
+
+    def __getitem__(self, clave):
+        nota = self.get(clave)
+        if nota is None:
+            raise KeyError(clave)
+        return nota
+
+    def get(self, clave, defecto=None):
+        with self._cerrojo:
+            if clave in self._anteriores:
+                nota = self._anteriores[clave]
+            else:
+                nota = self._almacen.get(clave)
+        return defecto if nota is None else nota
+
+    def __iter__(self):
+        for clave, _ in self.items():
+            yield clave
+
+    def items(self):
+        estudiantes, cursos, notas, documentos, codigos = self.columnas()
+        for ie, ic, nota in zip(estudiantes.tolist(), cursos.tolist(), notas.tolist()):
+            yield (documentos[ie], codigos[ic]), nota
+
+    def cursos_de(self, documento):
+        return list(self.notas_de(documento))
+
+    def notas_de(self, documento):
+        with self._cerrojo:
+            notas = self._almacen.notas_de(documento)
+            for codigo in self._por_documento.get(documento, ()):
+                nota = self._anteriores[(documento, codigo)]
+                if nota is None:
+                    notas.pop(codigo, None)
+                else:
+                    notas[codigo] = nota
+        return notas
+
+    def estudiantes_de(self, codigo_curso):
+        with self._cerrojo:
+            documentos = self._almacen.estudiantes_de(codigo_curso)
+            cambiados = self._por_curso.get(codigo_curso)
+            if cambiados:
+                anteriores = self._anteriores
+                vivos = set(documentos)
+                # Sin los matriculados después, y al final los que se retiraron después
+                documentos = [d for d in documentos if anteriores.get((d, codigo_curso), 0) is not None]
+                documentos.extend(d for d in cambiados
+                                  if d not in vivos and anteriores[(d, codigo_curso)] is not None)
+        return documentos
+
+    def columnas(self):
+        """Como AlmacenColumnar.columnas, pero copias: el almacén sigue cambiando."""
+        with self._cerrojo:
+            almacen = self._almacen
+            estudiantes, cursos, notas, documentos, codigos = almacen.columnas()
+            anteriores = [((almacen._id_estudiante.get(d), almacen._id_curso.get(c)), nota)
+                          for (d, c), nota in self._anteriores.items()]
+            anteriores = [((ie, ic), nota) for (ie, ic), nota in anteriores if ie is not None and ic is not None]
+            if anteriores:
+                # Las filas de las matrículas modificadas se reemplazan por sus notas anteriores
+                cambiadas = np.array([_clave(ie, ic) for (ie, ic), _ in anteriores], dtype=np.int64)
+                mantener = ~np.isin((estudiantes.astype(np.int64) << 32) | cursos, cambiadas)
+                viejas = [(ie, ic, nota) for (ie, ic), nota in anteriores if nota is not None]
+                estudiantes = np.concatenate((estudiantes[mantener], np.array([f[0] for f in viejas], dtype=np.int32)))
+                cursos = np.concatenate((cursos[mantener], np.array([f[1] for f in viejas], dtype=np.int32)))
+                notas = np.concatenate((notas[mantener], np.array([f[2] for f in viejas], dtype=np.float64)))
+            else:
+                estudiantes, cursos, notas = estudiantes.copy(), cursos.copy(), notas.copy()
+            return estudiantes, cursos, notas, documentos[:], codigos[:]
+
+    def ordenado(self, codigo_curso):
+        """Como AlmacenColumnar.ordenado; el de cada curso se calcula una sola vez."""
+        ordenado = self._ordenados.get(codigo_curso)
+        if ordenado is None:
+            with self._cerrojo:
+                almacen = self._almacen
+                negadas, ids = almacen.ordenado(codigo_curso)
+                cambiados = [(almacen._id_estudiante.get(d), self._anteriores[(d, codigo_curso)])
+                             for d in self._por_curso.get(codigo_curso, ())]
+                cambiados = [(ie, nota) for ie, nota in cambiados if ie is not None]
+                if cambiados:
+                    mantener = ~np.isin(ids, np.array([ie for ie, _ in cambiados], dtype=np.int32))
+                    viejas = [(ie, nota) for ie, nota in cambiados if nota is not None]
+                    ids = np.concatenate((ids[mantener], np.array([ie for ie, _ in viejas], dtype=np.int32)))
+                    negadas = np.concatenate((negadas[mantener],
+                                              -np.array([nota for _, nota in viejas], dtype=np.float64)))
+                    documentos = np.array([almacen.documentos[ie] for ie in ids.tolist()], dtype=str)
+                    orden = np.lexsort((documentos, negadas))
+                    negadas, ids = negadas[orden], ids[orden]
+            ordenado = self._ordenados[codigo_curso] = (negadas, ids)
+        return ordenado
+
+    def contar_notas(self, desde, hasta):
+        with self._cerrojo:
+            cantidad = self._almacen.contar_notas(desde, hasta)
+            for clave, anterior in self._anteriores.items():
+                actual = self._almacen.get(clave)
+                cantidad += ((anterior is not None and desde <= anterior < hasta)
+                             - (actual is not None and desde <= actual < hasta))
+        return cantidad
+
+
+class RankingsColumnar(Mapping):
+    """
+    codigo -> RankingColumnar de cada curso, calculados sobre un almacén. Hace
+    en modo columnar lo que los ListaOrdenada por curso en modo normal, sin
+    una tupla por matrícula.
+    """
+
+    def __init__(self, almacen, cursos):
+        self._almacen = almacen
+        self._cursos = cursos  # Tabla de cursos del modelo: define las claves
+
+    def __getitem__(self, codigo_curso):
+        if codigo_curso not in self._cursos:
+            raise KeyError(codigo_curso)
+        return RankingColumnar(self._almacen, codigo_curso)
+
+    def __contains__(self, codigo_curso):
+        return codigo_curso in self._cursos
+
+    def __iter__(self):
+        return iter(self._cursos)
+
+    def __len__(self):
+        return len(self._cursos)
+
+
+class RankingColumnar:
+    """
+    Ranking de un curso con la interfaz de lectura de ListaOrdenada sobre
+    valores (-nota, documento). Las posiciones se buscan con searchsorted en
+    las columnas ordenadas (ver AlmacenColumnar.ordenado).
+    """
+
+    BLOQUE = 512  # Filas que desde() convierte a tuplas de una vez
+
+    def __init__(self, almacen, codigo_curso):
+        self._almacen = almacen
+        self._negadas, self._ids = almacen.ordenado(codigo_curso)
+
+    def __len__(self):
+        return len(self._ids)
+
+    def posicion(self, valor):
+        """Cantidad de valores (-nota, documento) menores que valor (una tupla de 0 a 2 elementos)."""
+        if not valor:
+            return 0
+        inicio = int(np.searchsorted(self._negadas, valor[0], side='left'))
+        if len(valor) == 1:
+            return inicio
+        # Entre las de igual nota, búsqueda binaria por documento
+        fin = int(np.searchsorted(self._negadas, valor[0], side='right'))
+        documentos, ids = self._almacen.documentos, self._ids
+        while inicio < fin:
+            medio = (inicio + fin) // 2
+            if documentos[ids[medio]] < valor[1]:
+                inicio = medio + 1
+            else:
+                fin = medio
+        return inicio
+
+    def contar(self, desde, hasta):
+        if not desde < hasta:
+            return 0
+        return self.posicion(hasta) - self.posicion(desde)
+
+    def desde(self, valor):
+        for inicio in range(self.posicion(valor), len(self._ids), self.BLOQUE):
+            yield from self._tuplas(inicio, inicio + self.BLOQUE)
+
+    def primeros(self, n=None):
+        return self._tuplas(0, n)
+
+    def ultimos(self, n=None):
+        inicio = 0 if n is None else max(len(self._ids) - n, 0)
+        return self._tuplas(inicio, None)[::-1]
+
+    def _tuplas(self, inicio, fin):
+        documentos = self._almacen.documentos
+        return [(negada, documentos[ie]) for negada, ie in
+                zip(self._negadas[inicio:fin].tolist(), self._ids[inicio:fin].tolist())]
+
+
+class NotasColumnar:
+    """Conteo de notas por rango de todas las matrículas de un almacén (como ListaOrdenada.contar)."""
+
+    def __init__(self, almacen):
+        self._almacen = almacen
+
+    def __len__(self):
+        return len(self._almacen)
+
+    def contar(self, desde, hasta):
+        if not desde < hasta:
+            return 0
+        return self._almacen.contar_notas(desde, hasta)
+
+
+_DORADO = 0x9E3779B97F4A7C15  # Constante de dispersión multiplicativa (Fibonacci)
+
+
+def _clave(ie, ic):
+    return (ie << 32) | ic
+
+
+def _dispersar(clave, bits):
+    # Los bits altos del producto de 64 bits; acepta un entero o un arreglo int64
+    if isinstance(clave, np.ndarray):
+        return ((clave.astype(np.uint64) * np.uint64(_DORADO)) >> np.uint64(64 - bits)).astype(np.int64)
+    return ((clave * _DORADO) & 0xFFFFFFFFFFFFFFFF) >> (64 - bits)
+
+
+def _cubeta_nota(nota):
+    # Décima de la nota, de 0 (0.0) a 50 (5.0). Es monótona, que es lo que
+    # necesita contar_notas: una nota fuera de 0 a 5 queda en un extremo
+    return int(min(max(nota, 0.0), 5.0) * 10)
+
+
+def _enlazar_lote(filas, ids, anterior, siguiente, cabeza, cola, conteo):
+    # Agrega las filas, en su orden, al final de la lista de su estudiante o de
+    # su curso (ids): dentro de cada grupo quedan enlazadas entre sí y la
+    # primera se enlaza con la cola que ya tenía la lista
+    orden = np.argsort(ids, kind='stable')
+    filas, ids = filas[orden], ids[orden]
+    primera = np.ones(len(ids), dtype=bool)
+    primera[1:] = ids[1:] != ids[:-1]
+    ultima = np.ones(len(ids), dtype=bool)
+    ultima[:-1] = primera[1:]
+
+    grupos, primeras = ids[primera], filas[primera]
+    colas = cola[grupos]
+    previas = np.empty_like(filas)
+    previas[1:] = filas[:-1]
+    previas[primera] = colas
+    anterior[filas] = previas
+    siguientes = np.empty_like(filas)
+    siguientes[:-1] = filas[1:]
+    siguientes[ultima] = -1
+    siguiente[filas] = siguientes
+
+    enlazadas = colas >= 0
+    siguiente[colas[enlazadas]] = primeras[enlazadas]
+    cabeza[grupos[~enlazadas]] = primeras[~enlazadas]
+    cola[ids[ultima]] = filas[ultima]
+    conteo[grupos] += np.diff(np.append(np.flatnonzero(primera), len(ids))).astype(conteo.dtype)
+
+
+def _crecer(arreglo, capacidad, relleno=None):
+    # Las vistas entregadas antes siguen apuntando al arreglo anterior
+    nuevo = np.empty(capacidad, dtype=arreglo.dtype)
+    nuevo[:len(arreglo)] = arreglo
+    if relleno is not None:
+        nuevo[len(arreglo):] = relleno
+    return nuevo
@@ -0,0 +1,367 @@
+## ==================== benchmark.py ====================
+"""
+Benchmarks de las rutas críticas del modelo, el predictor y los reportes.
+
+Cada benchmark se mide sobre instituciones sintéticas (ver generador.py) de
+varios tamaños. De cada operación se reporta la mediana, el p95 y el mínimo
+de sus repeticiones. Los resultados se guardan en JSON, y un archivo de
+resultados anterior sirve de línea base: --comparar marca como regresión
+toda mediana que empeore más que el umbral.
+
+Los benchmarks del predictor y del reporte PDF necesitan TensorFlow (el
+controlador lo importa); si no está instalado quedan como omitidos.
+
+Uso:
+    python benchmark.py
+    python benchmark.py --tamanos 1000 100000 --salida base.json
+    python benchmark.py --comparar base.json --umbral 0.25
+    python benchmark.py --solo matricular_estudiante buscar_estudiantes --salida -
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from datetime import datetime
+
+import numpy as np
+
+from generador import APELLIDOS, NOMBRES, InstitucionSintetica
+from modelo import ModeloSIGA
+
+
+VERSION_FORMATO = 1
+TAMANOS = [1_000, 10_000, 100_000]
+UMBRAL_REGRESION = 0.20
+RUIDO_S = 5e-6          # Diferencias menores que esto no cuentan como regresión
+EPOCAS = 3              # Épocas de entrenamiento: se mide el costo, no la precisión
+
+BENCHMARKS = {}  # nombre -> (preparar, repeticiones, máximo de estudiantes)
+
+
+class Omitido(Exception):
+    """El benchmark no puede correr en este entorno o con este tamaño."""
+
+
+def benchmark(nombre, repeticiones=200, max_estudiantes=None):
+    """
+    Registra un benchmark. La función decorada recibe el Contexto y retorna
+    la operación a medir, que se llama una vez por repetición.
+    """
+    def registrar(preparar):
+        BENCHMARKS[nombre] = (preparar, repeticiones, max_estudiantes)
+        return preparar
+    return registrar
+
+
+class Contexto:
+    """Institución cargada en un modelo, compartida por los benchmarks de un tamaño."""
+
+    def __init__(self, num_estudiantes, num_cursos, columnar, semilla, directorio):
+        self.num_estudiantes = num_estudiantes
+        self.columnar = columnar
+        self.directorio = directorio
+        self.azar = random.Random(semilla)
+        self.institucion = InstitucionSintetica(num_estudiantes, num_cursos, semilla=semilla)
+        self.archivo_instantanea = os.path.join(directorio, f"institucion_{num_estudiantes}.siga")
+        self.institucion.escribir_instantanea(self.archivo_instantanea)
+        self.modelo = self.nuevo_modelo()
+        self._predictor = None
+
+    def nuevo_modelo(self):
+        """Modelo nuevo con la institución cargada."""
+        modelo = ModeloSIGA(columnar=self.columnar)
+        modelo.cargar_instantanea(self.archivo_instantanea)
+        return modelo
+
+    def matriculas_al_azar(self, cantidad):
+        claves = list(self.modelo._matriculas.keys())
+        return [claves[self.azar.randrange(len(claves))] for _ in range(cantidad)]
+
+    def predictor(self):
+        """Predictor entrenado sobre el modelo (se entrena una vez por tamaño)."""
+        if self._predictor is None:
+            predictor_cls = _importar('predictor').PredictorAcademico
+            predictor = predictor_cls()
+            predictor.entrenar(self.modelo, epochs=EPOCAS)
+            self._predictor = predictor
+        return self._predictor
+
+    def ruta(self, nombre):
+        return os.path.join(self.directorio, nombre)
+
+
+def _importar(modulo):
+    try:
+        return __import__(modulo)
+    except ImportError as e:
+        raise Omitido(f"Falta una dependencia: {e.name}")
+
+
+# ==================== BENCHMARKS ====================
+
+@benchmark('matricular_estudiante', repeticiones=1000)
+def _matricular_estudiante(contexto):
+    modelo = contexto.modelo
+    documentos = list(modelo.estudiantes)
+    codigos = list(modelo.cursos)
+    if len(documentos) * len(codigos) < 2 * (len(modelo.matriculas) + 1000):
+        raise Omitido("La institución no tiene suficientes cupos libres")
+    pares = set()
+    while len(pares) < 1000:
+        par = (contexto.azar.choice(documentos), contexto.azar.choice(codigos))
+        if not modelo.esta_matriculado(*par):
+            pares.add(par)
+    argumentos = iter(sorted(pares))
+    return lambda: modelo.matricular_estudiante(*next(argumentos), round(contexto.azar.uniform(0, 5), 1))
+
+
+@benchmark('actualizar_nota', repeticiones=1000)
+def _actualizar_nota(contexto):
+    modelo = contexto.modelo
+    argumentos = iter(contexto.matriculas_al_azar(1000))
+    return lambda: modelo.actualizar_nota(*next(argumentos), round(contexto.azar.uniform(0, 5), 1))
+
+
+@benchmark('buscar_estudiantes', repeticiones=100)
+def _buscar_estudiantes(contexto):
+    modelo = contexto.modelo
+    # Términos de distinta selectividad: nombres y apellidos completos, fragmentos, documentos
+    terminos = [contexto.azar.choice(APELLIDOS) for _ in range(40)] + \
+               [contexto.azar.choice(NOMBRES)[:4].lower() for _ in range(30)] + \
+               [str(10_000_000 + contexto.azar.randrange(contexto.num_estudiantes)) for _ in range(30)]
+    argumentos = iter(terminos)
+    return lambda: modelo.buscar_estudiantes(next(argumentos))
+
+
+@benchmark('obtener_top_estudiantes', repeticiones=1000)
+def _obtener_top_estudiantes(contexto):
+    modelo = contexto.modelo
+    codigos = list(modelo.cursos)
+    return lambda: modelo.obtener_top_estudiantes(contexto.azar.choice(codigos), 10)
+
+
+@benchmark('guardar_datos_json', repeticiones=3)
+def _guardar_datos_json(contexto):
+    archivo = contexto.ruta('guardar.json')
+    return lambda: contexto.modelo.guardar_datos_json(archivo)
+
+
+@benchmark('cargar_datos_json', repeticiones=3)
+def _cargar_datos_json(contexto):
+    archivo = contexto.ruta('cargar.json')
+    contexto.modelo.guardar_datos_json(archivo, compacto=True)
+    modelo = ModeloSIGA(columnar=contexto.columnar)
+    return lambda: modelo.cargar_datos_json(archivo)
+
+
+@benchmark('preparar_datos', repeticiones=10)
+def _preparar_datos(contexto):
+    predictor = _importar('predictor').PredictorAcademico()
+    return lambda: predictor.preparar_datos(contexto.modelo)
+
+
+@benchmark('entrenar', repeticiones=1, max_estudiantes=20_000)
+def _entrenar(contexto):
+    predictor = _importar('predictor').PredictorAcademico()
+    return lambda: predictor.entrenar(contexto.modelo, epochs=EPOCAS)
+
+
+@benchmark('predecir', repeticiones=100, max_estudiantes=20_000)
+def _predecir(contexto):
+    predictor = contexto.predictor()
+    argumentos = iter(contexto.matriculas_al_azar(100))
+    return lambda: predictor.predecir(contexto.modelo, *next(argumentos))
+
+
+@benchmark('identificar_estudiantes_riesgo', repeticiones=1, max_estudiantes=1_000)
+def _identificar_estudiantes_riesgo(contexto):
+    analizador = _importar('predictor').AnalizadorRendimiento
+    predictor = contexto.predictor()
+    return lambda: analizador.identificar_estudiantes_riesgo(contexto.modelo, predictor)
+
+
+@benchmark('exportar_pdf_completo', repeticiones=1, max_estudiantes=10_000)
+def _exportar_pdf_completo(contexto):
+    controlador = _importar('controlador').ControladorSIGA(contexto.modelo, None)
+    exportar = _importar('utils').exportar_pdf_completo
+    archivo = contexto.ruta('reporte.pdf')
+    return lambda: exportar(archivo, controlador)
+
+
+# ==================== EJECUCIÓN ====================
+
+def medir(operacion, repeticiones):
+    """Tiempo de cada llamada a operacion, en segundos."""
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        operacion()
+        tiempos.append(time.perf_counter() - inicio)
+    return tiempos
+
+
+def ejecutar(tamanos=TAMANOS, nombres=None, num_cursos=100, columnar=False, semilla=42,
+             progreso=None):
+    """
+    Corre los benchmarks pedidos (todos por defecto) en cada tamaño.
+
+    Args:
+        progreso: Función que recibe cada resultado apenas se obtiene
+
+    Returns:
+        dict: Resultados en el formato de los archivos de benchmark
+    """
+    nombres = list(BENCHMARKS) if nombres is None else nombres
+    desconocidos = [nombre for nombre in nombres if nombre not in BENCHMARKS]
+    if desconocidos:
+        raise ValueError(f"Benchmarks desconocidos: {', '.join(desconocidos)}")
+
+    resultados = []
+    for tamano in tamanos:
+        with tempfile.TemporaryDirectory(prefix='minisiga_bench_') as directorio:
+            contexto = Contexto(tamano, num_cursos, columnar, semilla, directorio)
+            for nombre in nombres:
+                preparar, repeticiones, max_estudiantes = BENCHMARKS[nombre]
+                resultado = {'benchmark': nombre, 'estudiantes': tamano,
+                             'matriculas': len(contexto.modelo.matriculas)}
+                try:
+                    if max_estudiantes is not None and tamano > max_estudiantes:
+                        raise Omitido(f"Solo hasta {max_estudiantes} estudiantes")
+                    tiempos = medir(preparar(contexto), repeticiones)
+                except Omitido as e:
+                    resultado['omitido'] = str(e)
+                else:
+                    resultado.update({
+                        'repeticiones': repeticiones,
+                        'mediana_s': float(np.median(tiempos)),
+                        'p95_s': float(np.percentile(tiempos, 95)),
+                        'min_s': min(tiempos),
+                        'total_s': sum(tiempos),
+                    })
+                resultados.append(resultado)
+                if progreso:
+                    progreso(resultado)
+
+    return {
+        'version': VERSION_FORMATO,
+        'fecha': datetime.now().isoformat(timespec='seconds'),
+        'entorno': {
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'plataforma': platform.platform(),
+            'procesador': platform.processor() or platform.machine(),
+        },
+        'parametros': {'cursos': num_cursos, 'columnar': columnar, 'semilla': semilla},
+        'resultados': resultados,
+    }
+
+
+def comparar(base, actual, umbral=UMBRAL_REGRESION):
+    """
+    Compara dos ejecuciones benchmark por benchmark y tamaño por tamaño.
+
+    Returns:
+        list: (benchmark, estudiantes, mediana base, mediana actual, cambio relativo,
+               es_regresion) de cada medición presente en ambas
+    """
+    medidas_base = {(r['benchmark'], r['estudiantes']): r['mediana_s']
+                    for r in base['resultados'] if 'mediana_s' in r}
+    filas = []
+    for r in actual['resultados']:
+        clave = (r['benchmark'], r['estudiantes'])
+        if 'mediana_s' not in r or clave not in medidas_base:
+            continue
+        anterior, ahora = medidas_base[clave], r['mediana_s']
+        cambio = (ahora - anterior) / anterior if anterior > 0 else 0.0
+        regresion = cambio > umbral and ahora - anterior > RUIDO_S
+        filas.append((*clave, anterior, ahora, cambio, regresion))
+    return filas
+
+
+def _formatear_tiempo(segundos):
+    if segundos < 1e-3:
+        return f"{segundos * 1e6:.1f} µs"
+    if segundos < 1:
+        return f"{segundos * 1e3:.2f} ms"
+    return f"{segundos:.2f} s"
+
+
+def imprimir_resultado(resultado, salida=sys.stdout):
+    nombre = f"{resultado['benchmark']:<32} {resultado['estudiantes']:>10,}"
+    if 'omitido' in resultado:
+        print(f"{nombre}   omitido: {resultado['omitido']}", file=salida)
+    else:
+        print(f"{nombre} {_formatear_tiempo(resultado['mediana_s']):>12} "
+              f"{_formatear_tiempo(resultado['p95_s']):>12} {resultado['repeticiones']:>6}", file=salida)
+
+
+def imprimir_comparacion(filas, umbral, salida=sys.stdout):
+    print("=" * 94, file=salida)
+    print(f"COMPARACIÓN CON LA LÍNEA BASE (regresión: más de {umbral:.0%} más lento)", file=salida)
+    print("=" * 94, file=salida)
+    print(f"{'Benchmark':<32} {'Estudiantes':>10} {'Base':>12} {'Actual':>12} {'Cambio':>9}", file=salida)
+    print("-" * 94, file=salida)
+    for nombre, estudiantes, anterior, ahora, cambio, regresion in filas:
+        marca = "❌ REGRESIÓN" if regresion else "✅"
+        print(f"{nombre:<32} {estudiantes:>10,} {_formatear_tiempo(anterior):>12} "
+              f"{_formatear_tiempo(ahora):>12} {cambio:>+9.1%}  {marca}", file=salida)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks de MiniSIGA")
+    parser.add_argument('--tamanos', type=int, nargs='+', default=TAMANOS,
+                        help="Números de estudiantes de cada institución")
+    parser.add_argument('--solo', nargs='+', choices=list(BENCHMARKS), metavar='BENCHMARK',
+                        help=f"Benchmarks a correr: {', '.join(BENCHMARKS)}")
+    parser.add_argument('--cursos', type=int, default=100)
+    parser.add_argument('--columnar', action='store_true', help="Usar el almacén columnar")
+    parser.add_argument('--semilla', type=int, default=42)
+    parser.add_argument('--salida', help="Archivo JSON de resultados ('-' para la salida estándar)")
+    parser.add_argument('--comparar', metavar='BASE', help="JSON de resultados de una corrida anterior")
+    parser.add_argument('--actual', metavar='RESULTADOS',
+                        help="Con --comparar, comparar este JSON en vez de correr los benchmarks")
+    parser.add_argument('--umbral', type=float, default=UMBRAL_REGRESION,
+                        help="Aumento relativo de la mediana que cuenta como regresión")
+    args = parser.parse_args()
+
+    # Con el JSON en la salida estándar, el progreso va a la de errores
+    consola = sys.stderr if args.salida == '-' else sys.stdout
+
+    if args.actual:
+        if not args.comparar:
+            parser.error("--actual requiere --comparar")
+        with open(args.actual, encoding='utf-8') as f:
+            resultados = json.load(f)
+    else:
+        print(f"{'Benchmark':<32} {'Estudiantes':>10} {'Mediana':>12} {'p95':>12} {'Rep.':>6}", file=consola)
+        print("-" * 76, file=consola)
+        # Lo que impriman las operaciones medidas (p. ej. el reporte PDF) tampoco va al JSON
+        with redirect_stdout(consola):
+            resultados = ejecutar(args.tamanos, args.solo, args.cursos, args.columnar, args.semilla,
+                                  progreso=lambda r: imprimir_resultado(r, consola))
+
+    if args.salida == '-':
+        json.dump(resultados, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+    elif args.salida:
+        with open(args.salida, 'w', encoding='utf-8') as f:
+            json.dump(resultados, f, ensure_ascii=False, indent=2)
+
+    if args.comparar:
+        with open(args.comparar, encoding='utf-8') as f:
+            base = json.load(f)
+        filas = comparar(base, resultados, args.umbral)
+        imprimir_comparacion(filas, args.umbral, consola)
+        if any(fila[-1] for fila in filas):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
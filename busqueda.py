@@ -0,0 +1,146 @@
+## ==================== busqueda.py ====================
+import unicodedata
+from array import array
+from collections import defaultdict
+from functools import lru_cache
+
+
+def normalizar_texto(texto):
+    """Pasa a minúsculas y elimina tildes para comparar ("González" -> "gonzalez")."""
+    if texto.isascii():
+        return texto.lower()
+    return _normalizar_no_ascii(texto)
+
+
+@lru_cache(maxsize=65536)
+def _normalizar_no_ascii(texto):
+    # Los nombres y apellidos se repiten mucho: se cachea su forma normalizada
+    descompuesto = unicodedata.normalize('NFKD', texto)
+    return ''.join(c for c in descompuesto if not unicodedata.combining(c)).casefold()
+
+
+class IndiceBusqueda:
+    """
+    Índice invertido de trigramas sobre los campos de texto de los estudiantes.
+
+    Cada campo se normaliza una sola vez al indexar. Los documentos se internan
+    como ids enteros crecientes y cada trigrama guarda sus ids en un array('I')
+    ordenado: un id nuevo siempre es el mayor, así que agregar es un append.
+    Quitar solo marca el id como libre; los ids libres se descartan de las listas
+    todos juntos cuando llegan a ser la mitad (ver _compactar), de modo que ni
+    agregar ni quitar cuestan en proporción a la tabla.
+
+    Con un término de 3 o más caracteres, los candidatos son los de su trigrama
+    menos frecuente y solo en ellos se verifica la subcadena. Uno de 1 o 2
+    caracteres (que aparece en casi todos) se busca recorriendo los textos.
+    """
+
+    SEPARADOR = '\x00'  # Impide coincidencias que crucen dos campos
+    N = 3                # Longitud de los n-gramas indexados
+    MINIMO_COMPACTAR = 1024  # Ids libres por debajo de los cuales no se compacta
+
+    def __init__(self):
+        self._ids = {}         # documento -> id interno
+        self._documentos = []  # id -> documento (None si se quitó)
+        self._textos = []      # id -> campos normalizados unidos por SEPARADOR (None si se quitó)
+        self._libres = 0       # ids quitados que siguen en las listas
+        self._gramas = {}      # trigrama -> array('I') ordenado de ids
+
+    def __len__(self):
+        return len(self._ids)
+
+    def agregar(self, documento, *campos):
+        self.agregar_lote([(documento, *campos)])
+
+    def agregar_lote(self, filas):
+        """
+        Indexa (documento, *campos) de cada fila. Las listas de trigramas se
+        arman para todo el lote en una pasada y se extienden una vez cada una.
+        """
+        desde = len(self._documentos)
+        for documento, *campos in filas:
+            self._olvidar(documento)
+            self._ids[documento] = len(self._documentos)
+            self._documentos.append(documento)
+            self._textos.append(self.SEPARADOR.join([normalizar_texto(campo) for campo in campos]))
+        self._indexar(desde)
+        self._compactar_si_conviene()
+
+    def quitar(self, documento):
+        self.quitar_lote((documento,))
+
+    def quitar_lote(self, documentos):
+        """Quita varios documentos; las listas se compactan a lo sumo una vez al final."""
+        for documento in documentos:
+            self._olvidar(documento)
+        self._compactar_si_conviene()
+
+    def buscar(self, termino):
+        """Retorna los documentos cuyo algún campo contiene el término (sin distinguir tildes)."""
+        termino = normalizar_texto(termino)
+        if not termino:
+            return list(self._ids)
+        if self.SEPARADOR in termino:
+            return []
+        textos, documentos = self._textos, self._documentos
+
+        if len(termino) < self.N:
+            # Casi todos lo contienen: recorrer los textos es más barato que una lista
+            return [documento for documento, texto in zip(documentos, textos)
+                    if texto is not None and termino in texto]
+
+        # Candidatos: los de su trigrama menos frecuente, verificados por subcadena
+        # (verificar es más barato que intersectar las demás listas)
+        menor = None
+        for trigrama in self._gramas_de([termino]):
+            ids = self._gramas.get(trigrama)
+            if ids is None:
+                return []
+            if menor is None or len(ids) < len(menor):
+                menor = ids
+        return [documentos[id_doc] for id_doc in menor
+                if textos[id_doc] is not None and termino in textos[id_doc]]
+
+    def _olvidar(self, documento):
+        # El id queda libre en las listas hasta la próxima compactación
+        id_doc = self._ids.pop(documento, None)
+        if id_doc is not None:
+            self._documentos[id_doc] = None
+            self._textos[id_doc] = None
+            self._libres += 1
+
+    def _compactar_si_conviene(self):
+        if self._libres >= max(len(self._ids), self.MINIMO_COMPACTAR):
+            self._compactar()
+
+    def _indexar(self, desde):
+        # Agrega a las listas los trigramas de los ids desde `desde`, que son los mayores
+        nuevos = defaultdict(list)
+        separador = self.SEPARADOR
+        for id_doc, texto in enumerate(self._textos[desde:], desde):
+            if texto is not None:
+                for grama in self._gramas_de(texto.split(separador)):
+                    nuevos[grama].append(id_doc)
+        gramas = self._gramas
+        for grama, ids in nuevos.items():
+            actuales = gramas.get(grama)
+            if actuales is None:
+                gramas[grama] = array('I', ids)
+            else:
+                actuales.extend(ids)
+
+    def _compactar(self):
+        # Renumera los documentos vivos y rehace las listas en una pasada
+        vivos = [(documento, texto) for documento, texto in zip(self._documentos, self._textos)
+                 if texto is not None]
+        self._documentos = [documento for documento, _ in vivos]
+        self._textos = [texto for _, texto in vivos]
+        self._ids = {documento: id_doc for id_doc, documento in enumerate(self._documentos)}
+        self._libres = 0
+        self._gramas = {}
+        self._indexar(0)
+
+    @classmethod
+    def _gramas_de(cls, campos):
+        n = cls.N
+        return {campo[i:i + n] for campo in campos for i in range(len(campo) - n + 1)}
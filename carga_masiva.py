@@ -0,0 +1,209 @@
+## ==================== carga_masiva.py ====================
+"""
+Carga masiva de estudiantes, cursos y matrículas desde CSV.
+
+Los archivos se leen por bloques de tamaño fijo, de modo que la memoria
+no crece con el tamaño del archivo. Cada bloque se valida de forma
+vectorizada con pandas y sus filas válidas se dan de alta en el modelo
+juntas: índices, rankings y agregados se actualizan una vez por bloque y
+no fila a fila. Las filas rechazadas se escriben en un archivo CSV con el
+motivo del rechazo.
+
+Cada fila se identifica por su número de registro: 1 es el primer registro
+después del encabezado. No siempre coincide con el número de línea: las
+líneas en blanco se omiten y un campo entre comillas puede ocupar varias.
+
+Formato esperado (con encabezado):
+    estudiantes: documento,nombre,apellidos,correo,fecha_nac
+    cursos:      codigo,nombre
+    matriculas:  documento,codigo_curso,nota
+"""
+
+import csv
+import io
+
+import pandas as pd
+
+from modelo import PATRON_EMAIL
+
+
+COLUMNAS_ESTUDIANTES = ['documento', 'nombre', 'apellidos', 'correo', 'fecha_nac']
+COLUMNAS_CURSOS = ['codigo', 'nombre']
+COLUMNAS_MATRICULAS = ['documento', 'codigo_curso', 'nota']
+
+TAMANO_BLOQUE = 100_000
+
+
+# ==================== VALIDACIÓN POR BLOQUES ====================
+
+def validar_bloque_estudiantes(bloque):
+    """
+    Valida un bloque de estudiantes con operaciones vectorizadas.
+
+    Returns:
+        tuple: (DataFrame con las filas válidas, Series con el motivo de cada fila rechazada)
+    """
+    documento = bloque['documento'].str.strip()
+    motivos = pd.Series('', index=bloque.index, dtype=object)
+
+    fecha_valida = pd.to_datetime(bloque['fecha_nac'], format='%Y-%m-%d', errors='coerce').notna()
+    motivos[~fecha_valida] = "Fecha inválida"
+    motivos[~bloque['correo'].str.match(PATRON_EMAIL)] = "Email inválido"
+    motivos[~((documento.str.len() > 0) & bloque['documento'].str.isdigit())] = "Documento inválido"
+
+    return _separar(bloque, motivos)
+
+
+def validar_bloque_cursos(bloque):
+    motivos = pd.Series('', index=bloque.index, dtype=object)
+    motivos[bloque['nombre'].str.strip().str.len() == 0] = "Nombre de curso vacío"
+    motivos[bloque['codigo'].str.strip().str.len() == 0] = "Código de curso vacío"
+    return _separar(bloque, motivos)
+
+
+def validar_bloque_matriculas(bloque):
+    motivos = pd.Series('', index=bloque.index, dtype=object)
+    nota = pd.to_numeric(bloque['nota'], errors='coerce')
+    motivos[~nota.between(0, 5)] = "La nota debe estar entre 0 y 5"
+    motivos[nota.isna()] = "Nota inválida"
+
+    validas, rechazos = _separar(bloque, motivos)
+    validas = validas.assign(nota=nota[validas.index])
+    return validas, rechazos
+
+
+def _separar(bloque, motivos):
+    rechazadas = motivos != ''
+    return bloque[~rechazadas], motivos[rechazadas]
+
+
+# ==================== INSERCIÓN EN EL MODELO ====================
+
+def _columnas(validas, columnas):
+    # Listas de Python: iterar una Series elemento a elemento es mucho más lento
+    return [validas[columna].tolist() for columna in columnas]
+
+
+# Cada bloque se revisa fila a fila contra el modelo (solo consultas a diccionarios)
+# y las filas aceptadas se dan de alta juntas, con los índices armados una vez
+
+def _insertar_estudiantes(modelo, validas, rechazos):
+    # Los duplicados se resuelven en orden de archivo: gana la primera aparición
+    estudiantes = modelo.estudiantes
+    nuevos = {}
+    for fila, documento, *datos in zip(validas.index.tolist(), *_columnas(validas, COLUMNAS_ESTUDIANTES)):
+        if documento in estudiantes or documento in nuevos:
+            rechazos.append((fila, "El estudiante ya existe"))
+        else:
+            nuevos[documento] = (documento, *datos)
+    modelo._agregar_estudiantes(nuevos.values())
+
+
+def _insertar_cursos(modelo, validas, rechazos):
+    for fila, codigo, nombre in zip(validas.index.tolist(), *_columnas(validas, COLUMNAS_CURSOS)):
+        if codigo in modelo.cursos:
+            rechazos.append((fila, "El curso ya existe"))
+        else:
+            modelo._agregar_curso(codigo, nombre)
+
+
+def _insertar_matriculas(modelo, validas, rechazos):
+    estudiantes, cursos, matriculas = modelo.estudiantes, modelo.cursos, modelo._matriculas
+    nuevas = {}  # (documento, codigo_curso) -> nota
+    for fila, documento, codigo_curso, nota in zip(
+            validas.index.tolist(), *_columnas(validas, COLUMNAS_MATRICULAS)):
+        clave = (documento, codigo_curso)
+        if documento not in estudiantes:
+            rechazos.append((fila, "Estudiante no encontrado"))
+        elif codigo_curso not in cursos:
+            rechazos.append((fila, "Curso no encontrado"))
+        elif clave in nuevas or clave in matriculas:
+            rechazos.append((fila, "El estudiante ya está matriculado en este curso"))
+        else:
+            nuevas[clave] = nota
+    modelo._vincular_lote(nuevas)
+
+
+TIPOS = {
+    'cursos': (COLUMNAS_CURSOS, validar_bloque_cursos, _insertar_cursos),
+    'estudiantes': (COLUMNAS_ESTUDIANTES, validar_bloque_estudiantes, _insertar_estudiantes),
+    'matriculas': (COLUMNAS_MATRICULAS, validar_bloque_matriculas, _insertar_matriculas),
+}
+
+
+# ==================== CARGA ====================
+
+def registro_csv(valores):
+    """
+    Codifica los campos de una fila como un registro CSV de una sola cadena
+    (con comas, comillas y saltos de línea escapados), para la columna datos
+    del reporte de rechazos; csv.reader(io.StringIO(texto)) devuelve los campos.
+    """
+    salida = io.StringIO()
+    csv.writer(salida).writerow(valores)  # Cita los campos con '\r' o '\n'
+    return salida.getvalue().removesuffix('\r\n')
+
+
+def leer_bloques(archivo, columnas, tamano_bloque=TAMANO_BLOQUE):
+    """
+    Lee un CSV por bloques como texto. El índice de cada bloque es el número
+    de registro en el archivo (1 es el primero después del encabezado).
+    """
+    lector = pd.read_csv(archivo, dtype=str, keep_default_na=False, encoding='utf-8-sig',
+                         chunksize=tamano_bloque)
+    registro = 1
+    for bloque in lector:
+        faltantes = [c for c in columnas if c not in bloque.columns]
+        if faltantes:
+            raise ValueError(f"Faltan columnas en {archivo}: {', '.join(faltantes)}")
+        bloque.index = pd.RangeIndex(registro, registro + len(bloque))
+        registro += len(bloque)
+        yield bloque[columnas]
+
+
+def cargar_masivo(modelo, archivo_estudiantes=None, archivo_cursos=None,
+                  archivo_matriculas=None, archivo_rechazos=None,
+                  tamano_bloque=TAMANO_BLOQUE):
+    """
+    Carga cursos, estudiantes y matrículas en el modelo, en ese orden.
+
+    Args:
+        archivo_rechazos: CSV donde se escriben las filas rechazadas con su motivo:
+            archivo, registro, motivo y datos, que es la fila original como
+            registro CSV (ver registro_csv). Si es None no se escribe.
+        tamano_bloque: Filas leídas y validadas por bloque
+
+    Returns:
+        dict: Filas cargadas por tipo y total de rechazadas
+    """
+    resumen = {'estudiantes': 0, 'cursos': 0, 'matriculas': 0, 'rechazadas': 0}
+    archivos = [('cursos', archivo_cursos), ('estudiantes', archivo_estudiantes),
+                ('matriculas', archivo_matriculas)]
+
+    salida = open(archivo_rechazos, 'w', newline='', encoding='utf-8') if archivo_rechazos else None
+    try:
+        escritor = csv.writer(salida) if salida else None
+        if escritor:
+            escritor.writerow(['archivo', 'registro', 'motivo', 'datos'])
+
+        for tipo, archivo in archivos:
+            if not archivo:
+                continue
+            columnas, validar, insertar = TIPOS[tipo]
+            for bloque in leer_bloques(archivo, columnas, tamano_bloque):
+                validas, motivos = validar(bloque)
+                rechazos = list(motivos.items())
+                insertar(modelo, validas, rechazos)
+
+                resumen[tipo] += len(validas) - (len(rechazos) - len(motivos))
+                resumen['rechazadas'] += len(rechazos)
+                if escritor and rechazos:
+                    rechazos.sort()
+                    filas = bloque.loc[[registro for registro, _ in rechazos]].values.tolist()
+                    escritor.writerows([archivo, registro, motivo, registro_csv(fila)]
+                                       for (registro, motivo), fila in zip(rechazos, filas))
+    finally:
+        if salida:
+            salida.close()
+
+    return resumen
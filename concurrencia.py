@@ -0,0 +1,130 @@
+## ==================== concurrencia.py ====================
+"""
+Cerrojo de lectores y escritor para compartir ModeloSIGA entre hilos.
+
+Varios hilos pueden leer a la vez; quien escribe tiene el modelo para sí
+solo, de modo que un cambio compuesto (índice de matrículas, notas del
+estudiante, estudiantes del curso, estadísticas) nunca se ve a medias.
+
+El cerrojo es reentrante: un método público puede llamar a otro, y quien
+escribe puede también leer. Un lector no puede pasar a escritor sin soltar
+antes la lectura (dos lectores que lo intentaran se esperarían para
+siempre). Los escritores tienen preferencia: con uno esperando, los
+lectores nuevos aguardan, para que un flujo continuo de lecturas no lo
+deje esperando indefinidamente.
+
+Uso:
+    with modelo.leyendo():
+        for estudiante in modelo.estudiantes.values():
+            ...
+"""
+
+import threading
+from functools import wraps
+
+
+class CerrojoLecturaEscritura:
+    def __init__(self):
+        self._condicion = threading.Condition(threading.Lock())
+        self._lectores = 0              # Hilos con lectura (cada uno cuenta una vez)
+        self._escritor = None           # Hilo con la escritura
+        self._escrituras = 0            # Reentradas del escritor
+        self._escritores_esperando = 0
+        self._local = threading.local()  # Lecturas de cada hilo
+
+        self.lectura = _Bloque(self.adquirir_lectura, self.liberar_lectura)
+        self.escritura = _Bloque(self.adquirir_escritura, self.liberar_escritura)
+
+    def adquirir_lectura(self):
+        local = self._local
+        lecturas = getattr(local, 'lecturas', 0)
+        if lecturas or self._escritor == threading.get_ident():
+            # Reentrada, o el escritor leyendo: ya excluye a los demás escritores
+            local.lecturas = lecturas + 1
+            return
+        with self._condicion:
+            while self._escritor is not None or self._escritores_esperando:
+                self._condicion.wait()
+            self._lectores += 1
+        local.lecturas = 1
+        local.contada = True
+
+    def liberar_lectura(self):
+        local = self._local
+        local.lecturas -= 1
+        if not local.lecturas and getattr(local, 'contada', False):
+            local.contada = False
+            with self._condicion:
+                self._lectores -= 1
+                if not self._lectores:
+                    self._condicion.notify_all()
+
+    def adquirir_escritura(self):
+        yo = threading.get_ident()
+        if self._escritor == yo:
+            self._escrituras += 1
+            return
+        if getattr(self._local, 'lecturas', 0):
+            raise RuntimeError("No se puede escribir mientras el mismo hilo tiene una lectura abierta")
+        with self._condicion:
+            self._escritores_esperando += 1
+            try:
+                while self._escritor is not None or self._lectores:
+                    self._condicion.wait()
+            finally:
+                self._escritores_esperando -= 1
+            self._escritor = yo
+            self._escrituras = 1
+
+    def liberar_escritura(self):
+        self._escrituras -= 1
+        if not self._escrituras:
+            with self._condicion:
+                self._escritor = None
+                self._condicion.notify_all()
+
+
+class _Bloque:
+    """Context manager reutilizable sobre un par adquirir/liberar."""
+
+    __slots__ = ('_adquirir', '_liberar')
+
+    def __init__(self, adquirir, liberar):
+        self._adquirir = adquirir
+        self._liberar = liberar
+
+    def __enter__(self):
+        self._adquirir()
+
+    def __exit__(self, *exc):
+        self._liberar()
+
+
+def con_lectura(metodo):
+    """Decora un método de ModeloSIGA para ejecutarlo con el cerrojo de lectura."""
+    @wraps(metodo)
+    def envoltura(self, *args, **kwargs):
+        with self._cerrojo.lectura:
+            return metodo(self, *args, **kwargs)
+    return envoltura
+
+
+def con_escritura(metodo):
+    """Decora un método de ModeloSIGA para ejecutarlo con el cerrojo de escritura."""
+    @wraps(metodo)
+    def envoltura(self, *args, **kwargs):
+        with self._cerrojo.escritura:
+            return metodo(self, *args, **kwargs)
+    return envoltura
+
+
+def con_operacion(metodo):
+    """
+    Como con_escritura, y además ejecuta el método como una operación de
+    ModeloSIGA (ver _operacion): con motor, una transacción que termina confirmada.
+    """
+    @wraps(metodo)
+    def envoltura(self, *args, **kwargs):
+        with self._cerrojo.escritura, self._operacion():
+            return metodo(self, *args, **kwargs)
+    return envoltura
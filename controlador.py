@@ -1,27 +1,89 @@
 # controlador.py
+import os
+
+import numpy as np
 import pandas as pd
 from predictor import PredictorAcademico, AnalizadorRendimiento
+from periodos import ArchivoPeriodos
+from modelo import ModeloSIGA
+
+
+ALMACENAMIENTOS = ('memoria', 'columnar', 'sqlite')
+
+
+def crear_modelo(almacenamiento='memoria', base=None):
+    """
+    Crea el ModeloSIGA con el almacenamiento elegido.
+
+    Args:
+        almacenamiento: 'memoria' (diccionarios), 'columnar' (NumPy) o 'sqlite'
+            (los registros viven en la base y cada operación se confirma en ella)
+        base: Archivo de la base SQLite; solo con almacenamiento='sqlite'
+    """
+    if almacenamiento == 'memoria':
+        return ModeloSIGA()
+    if almacenamiento == 'columnar':
+        return ModeloSIGA(columnar=True)
+    if almacenamiento == 'sqlite':
+        if not base:
+            raise ValueError("El almacenamiento sqlite necesita el archivo de la base")
+        from motor_sqlite import MotorSQLite
+        return ModeloSIGA(motor=MotorSQLite(base))
+    raise ValueError(f"Almacenamiento desconocido: {almacenamiento!r} (opciones: {', '.join(ALMACENAMIENTOS)})")
+
+
+def directorio_periodos(archivo_datos=None):
+    """
+    Directorio de los períodos archivados: "periodos" junto al archivo de datos
+    (la base SQLite, el diario o la instantánea) o, sin archivo, junto al
+    programa; nunca relativo al directorio de trabajo.
+    """
+    origen = archivo_datos if archivo_datos else __file__
+    return os.path.join(os.path.dirname(os.path.abspath(origen)), "periodos")
 
 
 class ControladorSIGA:
-    def __init__(self, modelo, vista):
+    def __init__(self, modelo, vista, periodos=None):
+        """
+        Args:
+            periodos: Directorio de los períodos archivados (por defecto, ver directorio_periodos)
+        """
         self.modelo = modelo
         self.vista = vista
         self.predictor = PredictorAcademico()
         self.analizador = AnalizadorRendimiento()
+        self.periodos = ArchivoPeriodos(periodos or directorio_periodos())
+
+    def cerrar(self):
+        """Libera los períodos abiertos y, con motor, confirma y cierra la base."""
+        self.periodos.cerrar()
+        if self.modelo.motor is not None:
+            self.modelo.motor.cerrar()
     
-    def generar_reporte_estudiantes(self):
-        data = []
-        for est in self.modelo.estudiantes.values():
-            for curso_cod in est.cursos:
-                data.append({
-                    "Documento": est.documento,
-                    "Nombre": f"{est.nombre} {est.apellidos}",
-                    "Correo": est.correo,
-                    "Curso": curso_cod,
-                    "Nota": est.notas.get(curso_cod, 0.0)
-                })
-        df = pd.DataFrame(data)
+    def generar_reporte_estudiantes(self, modelo=None):
+        # modelo puede ser una lectura (ver ModeloSIGA.lectura); por defecto, el modelo actual
+        if modelo is None:
+            modelo = self.modelo
+        ids_estudiante, ids_curso, notas, documentos, codigos = modelo.columnas_matriculas()
+        
+        # Datos por estudiante alineados con sus ids internos
+        nombres = np.empty(len(documentos), dtype=object)
+        correos = np.empty(len(documentos), dtype=object)
+        for i, documento in enumerate(documentos):
+            est = modelo.estudiantes.get(documento)
+            nombres[i] = f"{est.nombre} {est.apellidos}" if est else ""
+            correos[i] = est.correo if est else ""
+        
+        # Agrupar por estudiante conservando el orden de sus matrículas
+        orden = np.argsort(ids_estudiante, kind='stable')
+        filas_est = ids_estudiante[orden]
+        df = pd.DataFrame({
+            "Documento": np.asarray(documentos, dtype=object)[filas_est],
+            "Nombre": nombres[filas_est],
+            "Correo": correos[filas_est],
+            "Curso": np.asarray(codigos, dtype=object)[ids_curso[orden]],
+            "Nota": notas[orden]
+        })
         return df
     
     # ==================== MÉTODOS DE PREDICCIÓN ====================
@@ -29,16 +91,19 @@ class ControladorSIGA:
     def entrenar_modelo_prediccion(self):
         """Entrena el modelo de predicción con los datos actuales."""
         try:
-            if len(self.modelo.matriculas) < 10:
+            # Se entrena con el período en curso y los archivados
+            total_matriculas = len(self.modelo.matriculas) + self.periodos.total_matriculas()
+            if total_matriculas < 10:
                 self.vista.mostrar_error(
                     "Error de Entrenamiento",
                     "Se necesitan al menos 10 matrículas para entrenar el modelo.\n"
-                    f"Actualmente hay {len(self.modelo.matriculas)} matrículas."
+                    f"Actualmente hay {total_matriculas} matrículas."
                 )
                 return False
             
             # Entrenar modelo
-            metricas = self.predictor.entrenar(self.modelo, epochs=150, verbose=1)
+            metricas = self.predictor.entrenar(self.modelo, epochs=150, verbose=1,
+                                               historial=self.periodos)
             
             # Guardar modelo
             self.predictor.guardar_modelo()
@@ -121,9 +186,11 @@ class ControladorSIGA:
             if not self.predictor.modelo_entrenado:
                 return []
             
-            estudiantes_riesgo = self.analizador.identificar_estudiantes_riesgo(
-                self.modelo, self.predictor, umbral
-            )
+            # El recorrido es largo: se hace sobre una lectura que no cambia mientras dura
+            with self.modelo.lectura() as lectura:
+                estudiantes_riesgo = self.analizador.identificar_estudiantes_riesgo(
+                    lectura, self.predictor, umbral
+                )
             return estudiantes_riesgo
             
         except Exception as e:
@@ -150,12 +217,12 @@ class ControladorSIGA:
             return None
     
     # ==================== MÉTODOS EXISTENTES ====================
+    # La vista se actualiza sola con los eventos del modelo (ver VistaSIGA.aplicar_eventos)
         
     def crear_estudiante(self, documento, nombre, apellidos, correo, fecha_nac):
         try:
             estudiante = self.modelo.crear_estudiante(documento, nombre, apellidos, correo, fecha_nac)
             self.vista.mostrar_mensaje("Éxito", f"Estudiante {nombre} {apellidos} creado correctamente")
-            self.vista.refrescar_tabla_estudiantes()
             return True
         except ValueError as e:
             self.vista.mostrar_error("Error", str(e))
@@ -165,7 +232,6 @@ class ControladorSIGA:
         try:
             curso = self.modelo.crear_curso(codigo, nombre)
             self.vista.mostrar_mensaje("Éxito", f"Curso {nombre} creado correctamente")
-            self.vista.refrescar_tabla_cursos()
             return True
         except ValueError as e:
             self.vista.mostrar_error("Error", str(e))
@@ -175,8 +241,6 @@ class ControladorSIGA:
         try:
             self.modelo.matricular_estudiante(documento, codigo_curso, float(nota))
             self.vista.mostrar_mensaje("Éxito", "Estudiante matriculado correctamente")
-            self.vista.refrescar_tabla_cursos()
-            self.vista.refrescar_tabla_matriculas()
             return True
         except ValueError as e:
             self.vista.mostrar_error("Error", str(e))
@@ -186,8 +250,6 @@ class ControladorSIGA:
         try:
             self.modelo.actualizar_nota(documento, codigo_curso, float(nueva_nota))
             self.vista.mostrar_mensaje("Éxito", "Nota actualizada correctamente")
-            self.vista.refrescar_tabla_matriculas()
-            self.vista.refrescar_tabla_cursos()
             return True
         except ValueError as e:
             self.vista.mostrar_error("Error", str(e))
@@ -199,39 +261,114 @@ class ControladorSIGA:
     def eliminar_estudiante(self, documento):
         if self.modelo.eliminar_estudiante(documento):
             self.vista.mostrar_mensaje("Éxito", "Estudiante eliminado correctamente")
-            self.vista.refrescar_tabla_estudiantes()
-            self.vista.refrescar_tabla_cursos()
-            self.vista.refrescar_tabla_matriculas()
         else:
             self.vista.mostrar_error("Error", "Estudiante no encontrado")
     
     def eliminar_curso(self, codigo_curso):
         if self.modelo.eliminar_curso(codigo_curso):
             self.vista.mostrar_mensaje("Éxito", "Curso eliminado correctamente")
-            self.vista.refrescar_tabla_cursos()
-            self.vista.refrescar_tabla_matriculas()
         else:
             self.vista.mostrar_error("Error", "Curso no encontrado")
     
+    # ==================== OPERACIONES EN LOTE ====================
+    # Un solo mensaje por lote; la vista recibe todos sus eventos en una sola entrega
+    
+    def matricular_estudiantes(self, matriculas):
+        """matriculas: iterable de (documento, codigo_curso, nota)"""
+        try:
+            matriculas = [(documento, codigo_curso, float(nota)) for documento, codigo_curso, nota in matriculas]
+            self.modelo.matricular_estudiantes(matriculas)
+            self.vista.mostrar_mensaje("Éxito", f"{len(matriculas)} matrículas registradas correctamente")
+            return True
+        except ValueError as e:
+            self.vista.mostrar_error("Error", str(e))
+            return False
+    
+    def actualizar_notas(self, cambios):
+        """cambios: iterable de (documento, codigo_curso, nueva_nota)"""
+        try:
+            cambios = [(documento, codigo_curso, float(nota)) for documento, codigo_curso, nota in cambios]
+            self.modelo.actualizar_notas(cambios)
+            self.vista.mostrar_mensaje("Éxito", f"{len(cambios)} notas actualizadas correctamente")
+            return True
+        except ValueError as e:
+            self.vista.mostrar_error("Error", str(e))
+            return False
+    
+    def eliminar_estudiantes(self, documentos):
+        try:
+            documentos = list(documentos)
+            self.modelo.eliminar_estudiantes(documentos)
+            self.vista.mostrar_mensaje("Éxito", f"{len(documentos)} estudiantes eliminados correctamente")
+            return True
+        except ValueError as e:
+            self.vista.mostrar_error("Error", str(e))
+            return False
+    
+    def eliminar_cursos(self, codigos):
+        try:
+            codigos = list(codigos)
+            self.modelo.eliminar_cursos(codigos)
+            self.vista.mostrar_mensaje("Éxito", f"{len(codigos)} cursos eliminados correctamente")
+            return True
+        except ValueError as e:
+            self.vista.mostrar_error("Error", str(e))
+            return False
+    
     def cargar_csv(self, archivo):
         try:
-            self.modelo.cargar_datos_csv(archivo)
-            self.vista.mostrar_mensaje("Éxito", "Datos cargados desde CSV")
-            self.vista.refrescar_tabla_estudiantes()
+            resumen = self.modelo.cargar_datos_csv(archivo)
+            self.vista.mostrar_mensaje(
+                "Éxito",
+                f"Datos cargados desde CSV\n"
+                f"Estudiantes cargados: {resumen['estudiantes']}\n"
+                f"Filas rechazadas: {resumen['rechazadas']}"
+            )
         except Exception as e:
             self.vista.mostrar_error("Error", f"Error al cargar CSV: {str(e)}")
     
     def guardar_json(self, archivo):
         try:
-            self.modelo.guardar_datos_json(archivo)
-            self.vista.mostrar_mensaje("Éxito", "Datos guardados en JSON")
+            # Si es el mismo archivo cargado o guardado antes, solo se guardan los cambios
+            if self.modelo.guardar_datos_json(archivo, incremental=True):
+                self.vista.mostrar_mensaje("Éxito", "Cambios guardados en JSON")
+            else:
+                self.vista.mostrar_mensaje("Éxito", "Datos guardados en JSON")
         except Exception as e:
             self.vista.mostrar_error("Error", f"Error al guardar JSON: {str(e)}")
     
+    def compactar_json(self):
+        try:
+            self.modelo.compactar_datos_json()
+            self.vista.mostrar_mensaje("Éxito", "Archivo JSON compactado")
+        except Exception as e:
+            self.vista.mostrar_error("Error", f"Error al compactar JSON: {str(e)}")
+    
     def cargar_json(self, archivo):
         try:
             self.modelo.cargar_datos_json(archivo)
             self.vista.mostrar_mensaje("Éxito", "Datos cargados desde JSON")
-            self.vista.refrescar_todas_las_tablas()
         except Exception as e:
-            self.vista.mostrar_error("Error", f"Error al cargar JSON: {str(e)}")
\ No newline at end of file
+            self.vista.mostrar_error("Error", f"Error al cargar JSON: {str(e)}")
+    
+    def cerrar_periodo(self, periodo):
+        """Archiva el período en curso; el modelo queda sin matrículas para el siguiente."""
+        try:
+            self.modelo.cerrar_periodo(self.periodos, periodo)
+            self.vista.mostrar_mensaje(
+                "Éxito",
+                f"Período {periodo} cerrado y archivado.\n"
+                f"Períodos archivados: {len(self.periodos.periodos())}"
+            )
+            return True
+        except Exception as e:
+            self.vista.mostrar_error("Error", f"Error al cerrar el período: {str(e)}")
+            return False
+    
+    def historial_estudiante(self, documento):
+        """Notas del estudiante en los períodos archivados: [(periodo, codigo_curso, nota)]."""
+        try:
+            return self.periodos.historial_estudiante(documento)
+        except Exception as e:
+            self.vista.mostrar_error("Error", f"Error al leer el historial: {str(e)}")
+            return []
@@ -0,0 +1,215 @@
+## ==================== diario.py ====================
+"""
+Diario de cambios de ModeloSIGA: cada cambio se agrega al final de un archivo.
+
+Persistir una nota cuesta una línea de unas decenas de bytes. Los fsync se
+agrupan: un hilo sincroniza cada INTERVALO_SINCRONIZACION segundos todo lo
+escrito desde el último, de modo que una ráfaga de cambios paga un solo fsync.
+
+Cada REGISTROS_POR_PUNTO_CONTROL cambios (y después de cada carga en bloque)
+el modelo completo se guarda como instantánea (ver instantanea.py) y el diario
+se vacía. Al abrir, se carga la instantánea y se reproducen los cambios del
+diario con los mismos métodos del modelo que los produjeron.
+
+Cada punto de control tiene un número de generación que se guarda en la
+instantánea y en la primera línea del diario. Si el proceso muere entre
+guardar la instantánea y vaciar el diario, las generaciones no coinciden y
+el diario, ya incluido en la instantánea, se descarta.
+
+Formato de cada línea: crc32 en hexadecimal, un espacio y el cambio como
+lista JSON [operacion, argumentos...]; la primera es ["generacion", n]. Una
+última línea incompleta o con crc inválido (escritura interrumpida) se
+descarta al recuperar.
+
+Uso:
+    modelo = ModeloSIGA()
+    diario = Diario(modelo, "datos/siga")   # datos/siga.siga + datos/siga.diario
+    ...
+    diario.cerrar()
+"""
+
+import json
+import os
+import threading
+import time
+import zlib
+
+
+INTERVALO_SINCRONIZACION = 0.05
+REGISTROS_POR_PUNTO_CONTROL = 10_000
+
+# Métodos de ModeloSIGA que se registran y se reproducen
+OPERACIONES = {'crear_estudiante', 'crear_curso', 'matricular_estudiante',
+               'actualizar_nota', 'eliminar_estudiante', 'eliminar_curso',
+               'matricular_estudiantes', 'actualizar_notas', 'eliminar_estudiantes',
+               'eliminar_cursos'}
+
+
+class Diario:
+    def __init__(self, modelo, ruta_base, intervalo=INTERVALO_SINCRONIZACION,
+                 registros_por_punto_control=REGISTROS_POR_PUNTO_CONTROL):
+        """
+        Recupera el estado guardado en ruta_base y empieza a registrar los cambios del modelo.
+
+        Args:
+            intervalo: Segundos máximos entre un cambio y su fsync; 0 sincroniza cada cambio
+            registros_por_punto_control: Cambios tras los cuales se guarda una instantánea
+        """
+        self.modelo = modelo
+        self.archivo_instantanea = f"{ruta_base}.siga"
+        self.archivo_diario = f"{ruta_base}.diario"
+        self.intervalo = intervalo
+        self.registros_por_punto_control = registros_por_punto_control
+
+        self._condicion = threading.Condition()
+        self._pendientes = 0   # Líneas escritas aún sin fsync
+        self._registros = 0    # Líneas desde el último punto de control
+        self._cerrado = False
+        self._generacion = 0
+
+        habia_instantanea = os.path.exists(self.archivo_instantanea)
+        self.recuperados = self.recuperar()
+        # Sin buffer de Python: cada cambio llega al sistema operativo con una sola escritura
+        self._f = open(self.archivo_diario, 'ab', buffering=0)
+        if not habia_instantanea:
+            self.punto_de_control()  # Incluye lo que el modelo ya tuviera
+        elif not os.path.getsize(self.archivo_diario):
+            self._escribir_cabecera()
+        modelo.suscribir(self._registrar)
+
+        self._hilo = None
+        if intervalo > 0:
+            self._hilo = threading.Thread(target=self._sincronizar_periodicamente, daemon=True)
+            self._hilo.start()
+
+    # ==================== RECUPERACIÓN ====================
+
+    def recuperar(self):
+        """Carga la última instantánea y reproduce el diario. Retorna los cambios reproducidos."""
+        if os.path.exists(self.archivo_instantanea):
+            self._generacion = self.modelo.cargar_instantanea(self.archivo_instantanea)
+        if not os.path.exists(self.archivo_diario):
+            return 0
+
+        reproducidos = 0
+        validos = 0
+        with open(self.archivo_diario, 'rb') as f:
+            cabecera = _decodificar(f.readline())
+            if cabecera == ['generacion', self._generacion]:
+                validos = f.tell()
+                for linea in f:
+                    cambio = _decodificar(linea)
+                    if cambio is None or cambio[0] not in OPERACIONES:
+                        break  # Escritura interrumpida: lo que sigue no es confiable
+                    operacion, *argumentos = cambio
+                    getattr(self.modelo, operacion)(*argumentos)
+                    validos += len(linea)
+                    reproducidos += 1
+            # Con otra generación el diario ya está incluido en la instantánea: se descarta
+
+        if validos < os.path.getsize(self.archivo_diario):
+            with open(self.archivo_diario, 'r+b') as f:
+                f.truncate(validos)
+        return reproducidos
+
+    # ==================== REGISTRO ====================
+
+    def _registrar(self, operacion, *argumentos):
+        if operacion == 'cargar':
+            # Una carga en bloque no se registra cambio a cambio
+            self.punto_de_control()
+            return
+
+        with self._condicion:
+            self._f.write(_codificar([operacion, *argumentos]))
+            self._pendientes += 1
+            self._registros += 1
+            self._condicion.notify()
+        if not self.intervalo:
+            self.sincronizar()
+        if self._registros >= self.registros_por_punto_control:
+            self.punto_de_control()
+
+    def sincronizar(self):
+        """Fuerza a disco todo lo escrito en el diario."""
+        with self._condicion:
+            if not self._pendientes:
+                return
+            self._pendientes = 0
+            os.fsync(self._f.fileno())
+
+    def _sincronizar_periodicamente(self):
+        while True:
+            with self._condicion:
+                while not self._pendientes and not self._cerrado:
+                    self._condicion.wait()
+                if self._cerrado:
+                    return
+            # Los cambios que lleguen durante la espera entran en el mismo fsync
+            time.sleep(self.intervalo)
+            self.sincronizar()
+
+    def punto_de_control(self):
+        """Guarda el modelo completo como instantánea y vacía el diario."""
+        # La instantánea se escribe aparte y se renombra (ver instantanea.escribir_tablas);
+        # falta sincronizar el directorio para que el renombre sea durable
+        self.modelo.guardar_instantanea(self.archivo_instantanea, self._generacion + 1)
+        _fsync(os.path.dirname(os.path.abspath(self.archivo_instantanea)))
+        self._generacion += 1
+        self._escribir_cabecera()
+
+    def _escribir_cabecera(self):
+        # Vacía el diario y lo asocia a la instantánea actual
+        with self._condicion:
+            self._f.truncate(0)
+            self._f.write(_codificar(['generacion', self._generacion]))
+            os.fsync(self._f.fileno())
+            self._pendientes = 0
+            self._registros = 0
+
+    def cerrar(self):
+        self.modelo.desuscribir(self._registrar)
+        with self._condicion:
+            self._cerrado = True
+            self._condicion.notify()
+        if self._hilo is not None:
+            self._hilo.join()
+        self.sincronizar()
+        self._f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+
+def _codificar(cambio):
+    cuerpo = json.dumps(cambio, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    return b'%08x %s\n' % (zlib.crc32(cuerpo), cuerpo)
+
+
+def _decodificar(linea):
+    # Retorna el cambio de una línea, o None si está incompleta o dañada
+    if not linea.endswith(b'\n'):
+        return None
+    crc, _, cuerpo = linea[:-1].partition(b' ')
+    try:
+        if int(crc, 16) != zlib.crc32(cuerpo):
+            return None
+        return json.loads(cuerpo)
+    except ValueError:
+        return None
+
+
+def _fsync(ruta):
+    # En Windows no se pueden abrir directorios: ahí os.replace ya es durable
+    try:
+        descriptor = os.open(ruta, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(descriptor)
+    finally:
+        os.close(descriptor)
+
@@ -0,0 +1,209 @@
+## ==================== estructuras.py ====================
+from bisect import bisect_left, insort
+from itertools import chain, islice
+
+
+class ListaOrdenada:
+    """
+    Lista ordenada por bloques para índices que cambian con frecuencia.
+
+    Los valores se reparten en bloques ordenados de tamaño acotado, de modo
+    que insertar o borrar cuesta O(log n) para ubicar el bloque más el
+    desplazamiento dentro de un bloque pequeño, en lugar de mover toda la lista.
+
+    Un árbol de Fenwick sobre el largo de los bloques da la posición de un
+    valor (y el conteo de un rango) en O(log n). Se reconstruye solo cuando
+    cambian los bloques, al dividirse o vaciarse uno.
+
+    copia() comparte los bloques con la lista original: cada una copia un
+    bloque la primera vez que lo modifica, así que copiar y volver a escribir
+    cuesta O(n / CARGA) y no O(n).
+    """
+
+    CARGA = 512  # Tamaño de bloque objetivo
+    LOTE_MINIMO = 16  # agregar_lote rehace la lista si agrega más de 1/LOTE_MINIMO de su largo
+
+    def __init__(self, valores=()):
+        self._bloques = []
+        self._maximos = []  # Último valor de cada bloque
+        self._longitud = 0
+        self._arbol = None  # Fenwick: _arbol[i] suma el largo de algunos bloques hasta el i-1
+        self._propios = None  # ids de los bloques no compartidos desde la última copia (None: todos)
+        self._rellenar(sorted(valores))
+
+    def __len__(self):
+        return self._longitud
+
+    def __iter__(self):
+        return chain.from_iterable(self._bloques)
+
+    def __reversed__(self):
+        return chain.from_iterable(reversed(bloque) for bloque in reversed(self._bloques))
+
+    def __contains__(self, valor):
+        i = bisect_left(self._maximos, valor)
+        if i == len(self._maximos):
+            return False
+        bloque = self._bloques[i]
+        j = bisect_left(bloque, valor)
+        return j < len(bloque) and bloque[j] == valor
+
+    def agregar(self, valor):
+        if not self._bloques:
+            self._bloques.append(self._bloque_nuevo([valor]))
+            self._maximos.append(valor)
+            self._longitud = 1
+            self._arbol = None
+            return
+
+        i = bisect_left(self._maximos, valor)
+        if i == len(self._maximos):
+            # Mayor que todos: va al final del último bloque
+            i -= 1
+            self._bloque_propio(i).append(valor)
+            self._maximos[i] = valor
+        else:
+            insort(self._bloque_propio(i), valor)
+        self._longitud += 1
+
+        if len(self._bloques[i]) > 2 * self.CARGA:
+            self._dividir(i)
+        elif self._arbol is not None:
+            self._sumar(i, 1)
+
+    def agregar_lote(self, valores):
+        """
+        Agrega varios valores. Si son pocos frente a la lista se insertan uno a
+        uno; si no, la lista se rehace en una pasada, O(n + k log k).
+        """
+        valores = list(valores)
+        if len(valores) * self.LOTE_MINIMO < self._longitud:
+            for valor in valores:
+                self.agregar(valor)
+            return
+        # Con los valores al final, sort() solo mezcla las dos corridas ordenadas
+        todos = list(self)
+        todos.extend(sorted(valores))
+        todos.sort()
+        self._rellenar(todos)
+
+    def quitar(self, valor):
+        i = bisect_left(self._maximos, valor)
+        if i == len(self._maximos):
+            raise ValueError(f"{valor!r} no está en la lista")
+        bloque = self._bloques[i]
+        j = bisect_left(bloque, valor)
+        if j == len(bloque) or bloque[j] != valor:
+            raise ValueError(f"{valor!r} no está en la lista")
+
+        bloque = self._bloque_propio(i)
+        del bloque[j]
+        self._longitud -= 1
+        if bloque:
+            self._maximos[i] = bloque[-1]
+            if self._arbol is not None:
+                self._sumar(i, -1)
+        else:
+            del self._bloques[i]
+            del self._maximos[i]
+            self._arbol = None
+
+    def copia(self):
+        """
+        Copia independiente en O(n / CARGA): las dos listas comparten los bloques
+        y cada una copia un bloque antes de modificarlo.
+        """
+        copia = ListaOrdenada()
+        copia._bloques = self._bloques[:]
+        copia._maximos = self._maximos[:]
+        copia._longitud = self._longitud
+        copia._propios = set()
+        self._propios = set()
+        return copia
+
+    def posicion(self, valor):
+        """Cantidad de valores menores que valor, en O(log n)."""
+        i = bisect_left(self._maximos, valor)
+        if i == len(self._bloques):
+            return self._longitud
+        if self._arbol is None:
+            self._construir_arbol()
+        return self._prefijo(i) + bisect_left(self._bloques[i], valor)
+
+    def contar(self, desde, hasta):
+        """Cantidad de valores v con desde <= v < hasta, en O(log n)."""
+        if not desde < hasta:
+            return 0
+        return self.posicion(hasta) - self.posicion(desde)
+
+    def desde(self, valor):
+        """Genera en orden ascendente los valores mayores o iguales que valor."""
+        i = bisect_left(self._maximos, valor)
+        if i == len(self._bloques):
+            return
+        bloque = self._bloques[i]
+        yield from islice(bloque, bisect_left(bloque, valor), None)
+        for bloque in islice(self._bloques, i + 1, None):
+            yield from bloque
+
+    def primeros(self, n=None):
+        """Retorna los n menores valores en orden ascendente (todos si n es None)."""
+        return list(islice(iter(self), n))
+
+    def ultimos(self, n=None):
+        """Retorna los n mayores valores en orden descendente (todos si n es None)."""
+        return list(islice(reversed(self), n))
+
+    def _dividir(self, i):
+        bloque = self._bloques[i]
+        mitad = len(bloque) // 2
+        self._bloques[i:i + 1] = [self._bloque_nuevo(bloque[:mitad]), self._bloque_nuevo(bloque[mitad:])]
+        self._maximos[i:i + 1] = [bloque[mitad - 1], bloque[-1]]
+        self._arbol = None
+
+    def _rellenar(self, valores):
+        # Reemplaza el contenido por valores ya ordenados, en bloques nuevos (propios)
+        self._bloques = [valores[inicio:inicio + self.CARGA]
+                         for inicio in range(0, len(valores), self.CARGA)]
+        self._maximos = [bloque[-1] for bloque in self._bloques]
+        self._longitud = len(valores)
+        self._arbol = None
+        self._propios = None
+
+    def _bloque_propio(self, i):
+        # El bloque i, copiado antes si lo comparte con otra lista (ver copia)
+        bloque = self._bloques[i]
+        if self._propios is not None and id(bloque) not in self._propios:
+            bloque = self._bloques[i] = self._bloque_nuevo(bloque[:])
+        return bloque
+
+    def _bloque_nuevo(self, bloque):
+        if self._propios is not None:
+            self._propios.add(id(bloque))
+        return bloque
+
+    def _construir_arbol(self):
+        arbol = [0] * (len(self._bloques) + 1)
+        for i, bloque in enumerate(self._bloques, 1):
+            arbol[i] += len(bloque)
+            padre = i + (i & -i)
+            if padre < len(arbol):
+                arbol[padre] += arbol[i]
+        self._arbol = arbol
+
+    def _prefijo(self, i):
+        # Suma del largo de los bloques [0, i)
+        arbol = self._arbol
+        total = 0
+        while i:
+            total += arbol[i]
+            i &= i - 1
+        return total
+
+    def _sumar(self, i, delta):
+        # El bloque i cambió de largo en delta
+        arbol = self._arbol
+        i += 1
+        while i < len(arbol):
+            arbol[i] += delta
+            i += i & -i
@@ -0,0 +1,104 @@
+## ==================== eventos.py ====================
+"""
+Eventos de cambio de ModeloSIGA.
+
+Cada alta, baja o cambio de nota del modelo emite un evento tipado que dice
+exactamente qué cambió, para que vistas, cachés e índices se actualicen en
+forma incremental en vez de releer todo el estado.
+
+Los eventos se entregan en lotes: una operación pública del modelo (eliminar
+un estudiante con todas sus matrículas, matricular un lote, ...) produce una
+sola entrega con todos sus eventos, en el orden en que ocurrieron. Una carga
+en bloque no emite sus cambios uno a uno sino un único DatosRecargados, tras
+el cual el suscriptor debe releer lo que necesite.
+
+Uso:
+    def al_cambiar(eventos):
+        for evento in eventos:
+            ...
+    modelo.eventos.suscribir(al_cambiar, (MatriculaAgregada, NotaCambiada))
+"""
+
+from collections import namedtuple
+from contextlib import contextmanager
+
+
+EstudianteAgregado = namedtuple('EstudianteAgregado', 'documento')
+EstudianteEliminado = namedtuple('EstudianteEliminado', 'documento')
+CursoAgregado = namedtuple('CursoAgregado', 'codigo')
+CursoEliminado = namedtuple('CursoEliminado', 'codigo')
+MatriculaAgregada = namedtuple('MatriculaAgregada', 'documento codigo_curso nota')
+MatriculaEliminada = namedtuple('MatriculaEliminada', 'documento codigo_curso nota')
+NotaCambiada = namedtuple('NotaCambiada', 'documento codigo_curso nota_anterior nota_nueva')
+DatosRecargados = namedtuple('DatosRecargados', '')
+
+
+class BusEventos:
+    def __init__(self):
+        self._suscriptores = []  # (funcion, tipos o None)
+        self._pendientes = []    # Eventos del lote en curso
+        self._profundidad = 0    # Lotes anidados abiertos
+        self._recargas = 0       # Cargas en bloque en curso
+        self.activo = False      # Hay a quién entregar y no se está recargando
+
+    def suscribir(self, funcion, tipos=None):
+        """
+        Registra funcion(eventos), que recibe una lista de eventos por cada entrega.
+
+        Args:
+            tipos: Clases de evento que interesan (None recibe todas). DatosRecargados
+                   se entrega siempre, porque invalida cualquier estado derivado
+        """
+        if tipos is not None:
+            tipos = frozenset(tipos) | {DatosRecargados}
+        self._suscriptores.append((funcion, tipos))
+        self._actualizar_activo()
+
+    def desuscribir(self, funcion):
+        self._suscriptores = [(f, t) for f, t in self._suscriptores if f != funcion]
+        self._actualizar_activo()
+
+    def emitir(self, evento):
+        # Quien emite debe consultar antes self.activo, para no construir eventos sin destino
+        self._pendientes.append(evento)
+        if not self._profundidad:
+            self._entregar()
+
+    @contextmanager
+    def lote(self):
+        """Agrupa los eventos del bloque en una sola entrega al salir del lote más externo."""
+        self._profundidad += 1
+        try:
+            yield
+        finally:
+            self._profundidad -= 1
+            if not self._profundidad and self._pendientes:
+                self._entregar()
+
+    def iniciar_recarga(self):
+        # Durante una carga en bloque no se emite nada; al terminar se emite DatosRecargados
+        self._profundidad += 1
+        self._recargas += 1
+        self._actualizar_activo()
+
+    def terminar_recarga(self):
+        self._recargas -= 1
+        self._actualizar_activo()
+        if self._suscriptores:
+            self._pendientes.append(DatosRecargados())
+        self._profundidad -= 1
+        if not self._profundidad and self._pendientes:
+            self._entregar()
+
+    def _entregar(self):
+        eventos, self._pendientes = self._pendientes, []
+        for funcion, tipos in list(self._suscriptores):
+            if tipos is None:
+                funcion(eventos)
+            else:
+                seleccion = [evento for evento in eventos if type(evento) in tipos]
+                if seleccion:
+                    funcion(seleccion)
+
+    def _actualizar_activo(self):
+        self.activo = bool(self._suscriptores) and not self._recargas
@@ -0,0 +1,195 @@
+## ==================== flujo_json.py ====================
+"""
+Lectura y escritura incremental de archivos JSON de MiniSIGA.
+
+El archivo es un objeto cuyas claves son secciones con listas de elementos
+({"estudiantes": [...], "cursos": [...], "matriculas": [...]}). Tanto la
+escritura como la lectura procesan un elemento a la vez, así que la memoria
+usada no depende del tamaño del archivo.
+"""
+
+import json
+import os
+
+
+TAMANO_LECTURA = 1 << 16
+
+# Un error de decodificación a más de MARGEN caracteres del final del buffer no
+# se debe a un elemento cortado por el trozo: el elemento es inválido
+MARGEN = 16
+
+
+def escribir_json(archivo, secciones, compacto=False):
+    """
+    Escribe las secciones elemento por elemento.
+
+    El archivo se escribe primero en un temporal y se reemplaza al final,
+    para no dejar un JSON a medias si el proceso se interrumpe.
+
+    Args:
+        secciones: Iterable de (nombre, iterable de elementos)
+        compacto: Sin sangría ni espacios (archivos más pequeños y rápidos)
+    """
+    temporal = f"{archivo}.tmp"
+    with open(temporal, 'w', encoding='utf-8') as f:
+        if compacto:
+            _escribir_compacto(f, secciones)
+        else:
+            _escribir_con_sangria(f, secciones)
+    os.replace(temporal, archivo)
+
+
+def escribir_json_codificado(archivo, secciones):
+    """
+    Como escribir_json(compacto=True), con los elementos ya codificados: cada
+    sección da trozos de texto, cada uno con elementos JSON separados por
+    comas. Sirve para escribir millones de elementos armados por bloques sin
+    codificarlos uno a uno.
+
+    Args:
+        secciones: Iterable de (nombre, iterable de trozos de texto)
+    """
+    temporal = f"{archivo}.tmp"
+    with open(temporal, 'w', encoding='utf-8') as f:
+        f.write('{')
+        for i, (nombre, trozos) in enumerate(secciones):
+            f.write(f"{',' if i else ''}{json.dumps(nombre)}:[")
+            separador = ''
+            for trozo in trozos:
+                if trozo:
+                    f.write(separador + trozo)
+                    separador = ','
+            f.write(']')
+        f.write('}')
+    os.replace(temporal, archivo)
+
+
+def _escribir_compacto(f, secciones):
+    codificador = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+    f.write('{')
+    for i, (nombre, elementos) in enumerate(secciones):
+        f.write(f"{',' if i else ''}{json.dumps(nombre)}:[")
+        for j, elemento in enumerate(elementos):
+            if j:
+                f.write(',')
+            f.write(codificador.encode(elemento))
+        f.write(']')
+    f.write('}')
+
+
+def _escribir_con_sangria(f, secciones):
+    # Mismo formato que json.dump(..., indent=2)
+    codificador = json.JSONEncoder(ensure_ascii=False, indent=2)
+    f.write('{')
+    for i, (nombre, elementos) in enumerate(secciones):
+        f.write(f"{',' if i else ''}\n  {json.dumps(nombre)}: [")
+        vacia = True
+        for j, elemento in enumerate(elementos):
+            texto = codificador.encode(elemento).replace('\n', '\n    ')
+            f.write(f"{',' if j else ''}\n    {texto}")
+            vacia = False
+        f.write(']' if vacia else '\n  ]')
+    f.write('\n}')
+
+
+class LectorJSON:
+    """
+    Recorre un objeto JSON de secciones y entrega sus elementos uno a uno.
+
+    Lee el archivo por trozos y decodifica cada elemento con
+    JSONDecoder.raw_decode; solo el elemento actual vive en memoria.
+    """
+
+    def __init__(self, archivo):
+        self._archivo = archivo
+        self._decodificador = json.JSONDecoder()
+
+    def __iter__(self):
+        """Genera (seccion, elemento) para cada elemento de cada sección."""
+        with open(self._archivo, 'r', encoding='utf-8') as self._f:
+            self._buffer = ''
+            self._pos = 0
+            self._fin = False
+
+            self._esperar('{')
+            if self._siguiente() == '}':
+                self._pos += 1
+                return
+            while True:
+                clave = self._decodificar()
+                self._esperar(':')
+                if self._siguiente() == '[':
+                    self._pos += 1
+                    yield from self._elementos(clave)
+                else:
+                    self._decodificar()  # Valores sueltos: se ignoran
+                separador = self._siguiente()
+                self._pos += 1
+                if separador == '}':
+                    return
+                if separador != ',':
+                    raise ValueError(f"JSON inválido: se esperaba ',' o '}}' y se encontró {separador!r}")
+
+    def _elementos(self, clave):
+        if self._siguiente() == ']':
+            self._pos += 1
+            return
+        while True:
+            yield clave, self._decodificar()
+            separador = self._siguiente()
+            self._pos += 1
+            if separador == ']':
+                return
+            if separador != ',':
+                raise ValueError(f"JSON inválido: se esperaba ',' o ']' y se encontró {separador!r}")
+
+    def _decodificar(self):
+        self._siguiente()
+        while True:
+            try:
+                valor, fin = self._decodificador.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError as e:
+                # Solo se lee más si el error puede deberse al corte del trozo: una
+                # cadena sin cerrar o un error junto al final del buffer
+                cortado = e.msg.startswith('Unterminated string') or len(self._buffer) - e.pos <= MARGEN
+                if self._fin or not cortado:
+                    raise
+                self._leer(len(self._buffer) - self._pos)
+                continue
+            # Un número al final del buffer podría continuar en el siguiente trozo
+            if fin == len(self._buffer) and not self._fin:
+                self._leer()
+                continue
+            self._pos = fin
+            return valor
+
+    def _siguiente(self):
+        # Salta espacios y retorna el próximo carácter sin consumirlo
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in ' \t\r\n':
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if self._fin:
+                raise ValueError("JSON inválido: fin de archivo inesperado")
+            self._leer()
+
+    def _esperar(self, caracter):
+        encontrado = self._siguiente()
+        if encontrado != caracter:
+            raise ValueError(f"JSON inválido: se esperaba {caracter!r} y se encontró {encontrado!r}")
+        self._pos += 1
+
+    def _leer(self, pendiente=0):
+        # Con un elemento más largo que un trozo se lee al menos lo que ya hay
+        # pendiente: cada reintento duplica el buffer y decodificarlo es lineal
+        trozo = self._f.read(max(TAMANO_LECTURA, pendiente))
+        if not trozo:
+            self._fin = True
+        self._buffer = self._buffer[self._pos:] + trozo
+        self._pos = 0
+
+
+def leer_json(archivo):
+    """Atajo para iterar (seccion, elemento) de un archivo."""
+    return iter(LectorJSON(archivo))
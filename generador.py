@@ -0,0 +1,373 @@
+## ==================== generador.py ====================
+"""
+Generador de instituciones sintéticas para pruebas de carga.
+
+Produce instituciones de cualquier tamaño (de mil a millones de estudiantes)
+de forma determinista: la misma semilla genera siempre los mismos datos.
+
+- Cada estudiante toma en promedio cursos_por_estudiante cursos (Poisson).
+- Los cursos no son igual de populares: la demanda sigue una ley de Zipf
+  (sesgo 0 reparte las matrículas por igual).
+- La nota depende de la habilidad del estudiante y de la dificultad del
+  curso, más ruido: un buen estudiante saca buenas notas en todos sus cursos
+  y los cursos difíciles tienen menos aprobados. El corte se ajusta para que
+  la fracción de aprobados sea la pedida.
+
+Todo se genera en columnas NumPy; las cadenas se arman al escribir. Se
+escribe en los formatos que lee ModeloSIGA: JSON (cargar_datos_json), los
+tres CSV de la carga masiva (cargar_datos_csv) y la instantánea binaria
+(cargar_instantanea / abrir_instantanea). La instantánea es la más rápida de
+escribir y de abrir; el JSON y los CSV se arman por bloques como texto.
+
+Uso:
+    python generador.py 100000 datos.siga
+    python generador.py 1000000 carpeta_csv --formato csv --semilla 7 --aprobacion 0.8
+"""
+
+import argparse
+import csv
+import json
+import os
+import time
+from datetime import date, timedelta
+from itertools import islice
+
+import numpy as np
+
+from busqueda import normalizar_texto
+from flujo_json import escribir_json, escribir_json_codificado
+from instantanea import REGISTRO_MATRICULA, escribir_tablas
+from modelo import EstadisticasCurso
+
+
+NOMBRES = ["Juan", "María", "Carlos", "Ana", "Luis", "Sofía", "Diego", "Valentina",
+           "Andrés", "Camila", "José", "Isabella", "Miguel", "Daniela", "Jorge", "Laura",
+           "Santiago", "Mariana", "Sebastián", "Gabriela", "Nicolás", "Paula", "Julián",
+           "Natalia", "Felipe", "Catalina", "Tomás", "Lucía", "Mateo", "Juliana"]
+APELLIDOS = ["Pérez", "González", "Martínez", "Rodríguez", "López", "García", "Gómez",
+             "Hernández", "Díaz", "Torres", "Ramírez", "Castro", "Vargas", "Rojas",
+             "Moreno", "Jiménez", "Muñoz", "Álvarez", "Romero", "Suárez", "Ortiz",
+             "Restrepo", "Cárdenas", "Osorio", "Quintero", "Valencia", "Mejía", "Ríos"]
+AREAS = [("MAT", "Matemáticas"), ("FIS", "Física"), ("QUI", "Química"), ("BIO", "Biología"),
+         ("PROG", "Programación"), ("EST", "Estadística"), ("ECO", "Economía"),
+         ("HIS", "Historia"), ("LIT", "Literatura"), ("ING", "Inglés"), ("FIL", "Filosofía"),
+         ("ADM", "Administración")]
+DOMINIOS = ["email.com", "correo.edu.co", "universidad.edu.co"]
+
+DOCUMENTO_INICIAL = 10_000_000
+NACIMIENTO_DESDE = date(1995, 1, 1)
+DIAS_NACIMIENTO = 12 * 365
+REINTENTOS = 4          # Rondas para reemplazar cursos repetidos de un mismo estudiante
+FILAS_POR_BLOQUE = 1_000_000
+FORMATOS = ('instantanea', 'csv', 'json')
+
+
+class InstitucionSintetica:
+    """
+    Una institución generada, guardada en columnas.
+
+    Estudiantes: índices de nombre, de los dos apellidos, de dominio de correo
+    y día de nacimiento. Cursos: área y nivel. Matrículas: posiciones de
+    estudiante y curso y la nota en décimas (la escala del modelo).
+    """
+
+    def __init__(self, num_estudiantes, num_cursos=300, cursos_por_estudiante=5,
+                 aprobacion=0.75, sesgo=1.0, semilla=42):
+        """
+        Args:
+            num_cursos: Cantidad de cursos de la institución
+            cursos_por_estudiante: Media de cursos por estudiante
+            aprobacion: Fracción de matrículas con nota aprobatoria, entre 0 y 1
+            sesgo: Exponente de Zipf de la popularidad de los cursos
+            semilla: Misma semilla, mismos datos
+        """
+        if num_estudiantes < 1 or num_cursos < 1:
+            raise ValueError("Se necesita al menos un estudiante y un curso")
+        if not 0 < aprobacion < 1:
+            raise ValueError("La aprobación debe estar entre 0 y 1")
+        if cursos_por_estudiante <= 0:
+            raise ValueError("Los cursos por estudiante deben ser positivos")
+
+        self.num_estudiantes = num_estudiantes
+        self.num_cursos = num_cursos
+        self.semilla = semilla
+        azar = np.random.default_rng(semilla)
+
+        # Estudiantes
+        self.nombre = azar.integers(len(NOMBRES), size=num_estudiantes, dtype=np.uint8)
+        self.apellido1 = azar.integers(len(APELLIDOS), size=num_estudiantes, dtype=np.uint8)
+        self.apellido2 = azar.integers(len(APELLIDOS), size=num_estudiantes, dtype=np.uint8)
+        self.dominio = azar.integers(len(DOMINIOS), size=num_estudiantes, dtype=np.uint8)
+        self.nacimiento = azar.integers(DIAS_NACIMIENTO, size=num_estudiantes, dtype=np.uint16)
+
+        # Cursos: áreas repartidas por turnos, niveles 101, 102, ... dentro de cada área
+        posiciones = np.arange(num_cursos)
+        self.area = posiciones % len(AREAS)
+        self.nivel = 101 + posiciones // len(AREAS)
+
+        self.estudiante, self.curso = self._matricular(azar, cursos_por_estudiante, sesgo)
+        self.decimas = self._calificar(azar, aprobacion)
+
+    def _matricular(self, azar, cursos_por_estudiante, sesgo):
+        por_estudiante = np.clip(azar.poisson(cursos_por_estudiante, size=self.num_estudiantes),
+                                 1, self.num_cursos)
+        estudiante = np.repeat(np.arange(self.num_estudiantes, dtype=np.uint32), por_estudiante)
+
+        # Demanda de Zipf sobre un orden de popularidad al azar
+        popularidad = 1.0 / np.arange(1, self.num_cursos + 1) ** sesgo
+        probabilidad = np.empty(self.num_cursos)
+        probabilidad[azar.permutation(self.num_cursos)] = popularidad / popularidad.sum()
+        curso = azar.choice(self.num_cursos, size=len(estudiante), p=probabilidad).astype(np.uint32)
+
+        # Un estudiante no puede tomar dos veces el mismo curso: las repeticiones se
+        # vuelven a sortear y las que sobrevivan se descartan
+        for ronda in range(REINTENTOS + 1):
+            clave = estudiante.astype(np.int64) * self.num_cursos + curso
+            orden = np.argsort(clave, kind='stable')
+            repetida = np.zeros(len(clave), dtype=bool)
+            repetida[orden[1:]] = clave[orden[1:]] == clave[orden[:-1]]
+            if not repetida.any():
+                break
+            if ronda == REINTENTOS:
+                return estudiante[~repetida], curso[~repetida]
+            curso[repetida] = azar.choice(self.num_cursos, size=int(repetida.sum()), p=probabilidad)
+        return estudiante, curso
+
+    def _calificar(self, azar, aprobacion):
+        habilidad = azar.normal(0.0, 0.8, size=self.num_estudiantes)
+        dificultad = azar.normal(0.0, 0.6, size=self.num_cursos)
+        puntaje = habilidad[self.estudiante] - dificultad[self.curso] + azar.normal(0.0, 0.6, size=len(self.curso))
+
+        # El corte de aprobación cae en el cuantil que deja la fracción pedida por encima
+        corte = np.quantile(puntaje, 1 - aprobacion)
+        nota = EstadisticasCurso.NOTA_APROBATORIA + 0.9 * (puntaje - corte)
+        return np.clip(np.floor(nota * 10 + 1e-9), 0, 50).astype(np.uint8)
+
+    @property
+    def num_matriculas(self):
+        return len(self.curso)
+
+    # ==================== REGISTROS ====================
+
+    def codigos(self):
+        return [f"{AREAS[a][0]}{n}" for a, n in zip(self.area.tolist(), self.nivel.tolist())]
+
+    def nombres_cursos(self):
+        return [f"{AREAS[a][1]} {n - 100}" for a, n in zip(self.area.tolist(), self.nivel.tolist())]
+
+    def estudiantes(self):
+        """Genera (documento, nombre, apellidos, correo, fecha_nac) de cada estudiante."""
+        fechas, apellidos = self._fechas(), self._apellidos()
+        columnas = zip(self.nombre.tolist(), self.apellido1.tolist(), self.apellido2.tolist(),
+                       self.nacimiento.tolist(), self._correos())
+        for i, (n, a1, a2, f, correo) in enumerate(columnas):
+            yield (str(DOCUMENTO_INICIAL + i), NOMBRES[n], apellidos[a1 * len(APELLIDOS) + a2],
+                   correo, fechas[f])
+
+    def _correos(self):
+        # Sin tildes, para que pasen la validación de la carga
+        nombres = [normalizar_texto(n) for n in NOMBRES]
+        apellidos = [normalizar_texto(a) for a in APELLIDOS]
+        columnas = zip(self.nombre.tolist(), self.apellido1.tolist(), self.dominio.tolist())
+        for i, (n, a, d) in enumerate(columnas):
+            yield f"{nombres[n]}.{apellidos[a]}{i}@{DOMINIOS[d]}"
+
+    @staticmethod
+    def _fechas():
+        return [(NACIMIENTO_DESDE + timedelta(days=d)).isoformat() for d in range(DIAS_NACIMIENTO)]
+
+    @staticmethod
+    def _apellidos():
+        # Todos los pares de apellidos; el estudiante i tiene el par apellido1 * len + apellido2
+        return [f"{a} {b}" for a in APELLIDOS for b in APELLIDOS]
+
+    def cursos(self):
+        """Genera (codigo, nombre) de cada curso."""
+        return zip(self.codigos(), self.nombres_cursos())
+
+    def matriculas(self, tamano_bloque=FILAS_POR_BLOQUE):
+        """Genera (documento, codigo_curso, nota) de cada matrícula."""
+        codigos = self.codigos()
+        notas = [d / 10 for d in range(51)]
+        for inicio in range(0, self.num_matriculas, tamano_bloque):
+            fin = inicio + tamano_bloque
+            for e, c, d in zip(self.estudiante[inicio:fin].tolist(), self.curso[inicio:fin].tolist(),
+                               self.decimas[inicio:fin].tolist()):
+                yield str(DOCUMENTO_INICIAL + e), codigos[c], notas[d]
+
+    # ==================== ESCRITURA ====================
+
+    def escribir(self, destino, formato='instantanea'):
+        """Escribe la institución en el formato dado (ver FORMATOS)."""
+        if formato == 'instantanea':
+            self.escribir_instantanea(destino)
+        elif formato == 'csv':
+            self.escribir_csv(destino)
+        elif formato == 'json':
+            self.escribir_json(destino)
+        else:
+            raise ValueError(f"Formato desconocido: {formato}")
+
+    def escribir_json(self, archivo, compacto=True):
+        """
+        JSON de guardar_datos_json. Compacto se arma por bloques como texto, con
+        las cadenas de cada vocabulario (nombres, apellidos, fechas, códigos)
+        codificadas una sola vez; con sangría, elemento por elemento.
+        """
+        claves_estudiante = ('documento', 'nombre', 'apellidos', 'correo', 'fecha_nac')
+        cursos = [{'codigo': codigo, 'nombre': nombre} for codigo, nombre in self.cursos()]
+        if not compacto:
+            escribir_json(archivo, [
+                ('estudiantes', (dict(zip(claves_estudiante, fila)) for fila in self.estudiantes())),
+                ('cursos', cursos),
+                ('matriculas', self.matriculas())
+            ])
+            return
+        escribir_json_codificado(archivo, [
+            ('estudiantes', self._estudiantes_json()),
+            ('cursos', [','.join(map(_json, cursos))]),
+            ('matriculas', self._matriculas_json())
+        ])
+
+    def _estudiantes_json(self):
+        # Un trozo de texto por bloque; los correos son ASCII sin comillas
+        nombres = [_json(nombre) for nombre in NOMBRES]
+        apellidos = [_json(apellido) for apellido in self._apellidos()]
+        fechas = [_json(fecha) for fecha in self._fechas()]
+        correos = self._correos()
+        pares = len(APELLIDOS)
+        for inicio in range(0, self.num_estudiantes, FILAS_POR_BLOQUE):
+            fin = inicio + FILAS_POR_BLOQUE
+            columnas = zip(range(DOCUMENTO_INICIAL + inicio, DOCUMENTO_INICIAL + self.num_estudiantes),
+                           self.nombre[inicio:fin].tolist(), self.apellido1[inicio:fin].tolist(),
+                           self.apellido2[inicio:fin].tolist(), self.nacimiento[inicio:fin].tolist(),
+                           islice(correos, FILAS_POR_BLOQUE))
+            yield ','.join(
+                f'{{"documento":"{documento}","nombre":{nombres[n]},"apellidos":{apellidos[a1 * pares + a2]},'
+                f'"correo":"{correo}","fecha_nac":{fechas[f]}}}'
+                for documento, n, a1, a2, f, correo in columnas)
+
+    def _matriculas_json(self):
+        codigos = [_json(codigo) for codigo in self.codigos()]
+        notas = [_json(d / 10) for d in range(51)]
+        for inicio in range(0, self.num_matriculas, FILAS_POR_BLOQUE):
+            fin = inicio + FILAS_POR_BLOQUE
+            yield ','.join(
+                f'["{DOCUMENTO_INICIAL + e}",{codigos[c]},{notas[d]}]'
+                for e, c, d in zip(self.estudiante[inicio:fin].tolist(), self.curso[inicio:fin].tolist(),
+                                   self.decimas[inicio:fin].tolist()))
+
+    def escribir_csv(self, directorio):
+        """
+        Escribe estudiantes.csv, cursos.csv y matriculas.csv en el directorio,
+        con las columnas de la carga masiva.
+
+        Returns:
+            dict: Ruta de cada archivo, con los nombres de argumento de cargar_datos_csv
+        """
+        from carga_masiva import COLUMNAS_CURSOS, COLUMNAS_ESTUDIANTES, COLUMNAS_MATRICULAS
+        os.makedirs(directorio, exist_ok=True)
+        archivos = {
+            'archivo_estudiantes': os.path.join(directorio, 'estudiantes.csv'),
+            'archivo_cursos': os.path.join(directorio, 'cursos.csv'),
+            'archivo_matriculas': os.path.join(directorio, 'matriculas.csv'),
+        }
+        for archivo, columnas, filas in (
+                (archivos['archivo_estudiantes'], COLUMNAS_ESTUDIANTES, self.estudiantes()),
+                (archivos['archivo_cursos'], COLUMNAS_CURSOS, self.cursos())):
+            with open(archivo, 'w', newline='', encoding='utf-8') as f:
+                escritor = csv.writer(f)
+                escritor.writerow(columnas)
+                escritor.writerows(filas)
+
+        # Las matrículas son la mayor parte: se arman por bloques como texto
+        # (ningún campo lleva comas ni comillas)
+        codigos = self.codigos()
+        notas = [f"{d / 10:.1f}" for d in range(51)]
+        with open(archivos['archivo_matriculas'], 'w', encoding='utf-8') as f:
+            f.write(','.join(COLUMNAS_MATRICULAS) + '\n')
+            for inicio in range(0, self.num_matriculas, FILAS_POR_BLOQUE):
+                fin = inicio + FILAS_POR_BLOQUE
+                f.write(''.join(
+                    f"{DOCUMENTO_INICIAL + e},{codigos[c]},{notas[d]}\n"
+                    for e, c, d in zip(self.estudiante[inicio:fin].tolist(), self.curso[inicio:fin].tolist(),
+                                       self.decimas[inicio:fin].tolist())))
+        return archivos
+
+    def escribir_instantanea(self, archivo):
+        """Instantánea binaria (ver instantanea.py), armada desde las columnas sin pasar por un modelo."""
+        # Cada tabla de cadenas va en un tramo propio, así que los ids salen de
+        # los índices de las columnas sin buscar cadenas repetidas
+        codigos = self.codigos()
+        tramos = [NOMBRES, self._apellidos(), self._fechas(), codigos, self.nombres_cursos()]
+        inicios = np.cumsum([0] + [len(tramo) for tramo in tramos])
+        inicio_nombres, inicio_apellidos, inicio_fechas, inicio_codigos, inicio_nombres_cursos, \
+            inicio_documentos = inicios
+        inicio_correos = inicio_documentos + self.num_estudiantes
+        cadenas = [cadena for tramo in tramos for cadena in tramo]
+        cadenas.extend(str(DOCUMENTO_INICIAL + i) for i in range(self.num_estudiantes))
+        cadenas.extend(self._correos())
+
+        posiciones = np.arange(self.num_estudiantes, dtype=np.int64)
+        estudiantes = np.column_stack([
+            inicio_documentos + posiciones,
+            inicio_nombres + self.nombre,
+            inicio_apellidos + self.apellido1.astype(np.int64) * len(APELLIDOS) + self.apellido2,
+            inicio_correos + posiciones,
+            inicio_fechas + self.nacimiento,
+        ]).astype('<u4')
+        posiciones = np.arange(self.num_cursos, dtype=np.int64)
+        cursos = np.column_stack([inicio_codigos + posiciones,
+                                  inicio_nombres_cursos + posiciones]).astype('<u4')
+
+        # Documentos consecutivos del mismo largo (8 dígitos): ya están en orden
+        orden_estudiantes = np.arange(self.num_estudiantes, dtype='<u4')
+        orden_cursos = np.array(sorted(range(self.num_cursos), key=codigos.__getitem__), dtype='<u4')
+
+        matriculas = np.empty(self.num_matriculas, dtype=REGISTRO_MATRICULA)
+        matriculas['estudiante'] = self.estudiante
+        matriculas['curso'] = self.curso
+        matriculas['nota'] = self.decimas / 10
+        escribir_tablas(archivo, cadenas, estudiantes, cursos,
+                        orden_estudiantes, orden_cursos, matriculas)
+
+    def __repr__(self):
+        return (f"InstitucionSintetica({self.num_estudiantes} estudiantes, {self.num_cursos} cursos, "
+                f"{self.num_matriculas} matrículas, semilla={self.semilla})")
+
+
+def _json(valor):
+    # Igual que escribir_json compacto
+    return json.dumps(valor, ensure_ascii=False, separators=(',', ':'))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Genera instituciones sintéticas de MiniSIGA")
+    parser.add_argument('estudiantes', type=int, help="Cantidad de estudiantes")
+    parser.add_argument('destino', help="Archivo (.siga o .json) o directorio para los CSV")
+    parser.add_argument('--formato', choices=FORMATOS,
+                        help="Por defecto según la extensión del destino (csv si no tiene)")
+    parser.add_argument('--cursos', type=int, default=300)
+    parser.add_argument('--cursos-por-estudiante', type=float, default=5)
+    parser.add_argument('--aprobacion', type=float, default=0.75, help="Fracción de aprobados")
+    parser.add_argument('--sesgo', type=float, default=1.0, help="Exponente de Zipf de la demanda")
+    parser.add_argument('--semilla', type=int, default=42)
+    args = parser.parse_args()
+
+    formato = args.formato
+    if formato is None:
+        extension = os.path.splitext(args.destino)[1].lower()
+        formato = {'.siga': 'instantanea', '.json': 'json'}.get(extension, 'csv')
+
+    inicio = time.perf_counter()
+    institucion = InstitucionSintetica(args.estudiantes, args.cursos, args.cursos_por_estudiante,
+                                       args.aprobacion, args.sesgo, args.semilla)
+    generada = time.perf_counter()
+    institucion.escribir(args.destino, formato)
+    fin = time.perf_counter()
+    print(institucion)
+    print(f"Generada en {generada - inicio:.1f} s, escrita ({formato}) en {fin - generada:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,482 @@
+## ==================== instantanea.py ====================
+"""
+Instantáneas binarias de MiniSIGA para abrir instituciones grandes al instante.
+
+Una instantánea es un archivo de solo lectura que se abre con mmap: abrirla
+solo lee la cabecera, y las páginas del archivo se cargan cuando una consulta
+las toca. No hay que decodificar ni reconstruir nada al iniciar.
+
+Formato (little-endian, secciones alineadas a 8 bytes):
+
+    cabecera     magia "SIGAINS1", versión, generación (la usa diario.py),
+                 conteos y desplazamiento de cada sección
+    cadenas      desplazamientos u64[n_cadenas + 1] y los bytes UTF-8 de todas las
+                 cadenas, sin repetir (nombres y apellidos se comparten)
+    estudiantes  u32[n_estudiantes, 5]: ids de cadena de documento, nombre,
+                 apellidos, correo y fecha_nac, en el orden del modelo
+    cursos       u32[n_cursos, 2]: ids de cadena de código y nombre
+    orden_*      u32: posiciones de estudiantes y cursos ordenadas por documento
+                 o código, para búsqueda binaria
+    matriculas   registros de 16 bytes (estudiante u32, curso u32, nota f64)
+                 en el orden del modelo
+    por_curso    inicio u64[n_cursos + 1] y posiciones u32 de las matrículas de
+                 cada curso, de mayor a menor nota (el ranking ya resuelto)
+    por_estudiante  inicio u64[n_estudiantes + 1] y posiciones u32 de las
+                 matrículas de cada estudiante
+
+Uso:
+    python instantanea.py datos.json datos.siga   # JSON -> instantánea
+    python instantanea.py datos.siga datos.json   # instantánea -> JSON
+"""
+
+import argparse
+import mmap
+import os
+import struct
+from collections.abc import Mapping
+
+import numpy as np
+
+from busqueda import normalizar_texto
+from flujo_json import escribir_json
+from modelo import Curso, Estudiante, EstadisticasCurso
+
+
+MAGIA = b'SIGAINS1'
+VERSION = 1
+
+SECCIONES = (
+    'desplazamientos_cadenas', 'cadenas', 'estudiantes', 'orden_estudiantes',
+    'cursos', 'orden_cursos', 'matriculas', 'inicio_por_curso', 'por_curso',
+    'inicio_por_estudiante', 'por_estudiante',
+)
+
+# magia, versión, generación, n_cadenas, n_estudiantes, n_cursos, n_matriculas,
+# y el desplazamiento de cada sección
+CABECERA = struct.Struct(f'<8sII4Q{len(SECCIONES)}Q')
+
+REGISTRO_MATRICULA = np.dtype([('estudiante', '<u4'), ('curso', '<u4'), ('nota', '<f8')])
+
+
+# ==================== ESCRITURA ====================
+
+def escribir_instantanea(modelo, archivo, generacion=0):
+    """
+    Escribe el contenido de un ModeloSIGA (o de otra instantánea) en formato binario.
+
+    Args:
+        generacion: Número de punto de control que identifica la instantánea
+    """
+    cadenas = {}
+
+    def id_cadena(texto):
+        return cadenas.setdefault(texto, len(cadenas))
+
+    documentos = list(modelo.estudiantes)
+    codigos = list(modelo.cursos)
+    posicion_estudiante = {documento: i for i, documento in enumerate(documentos)}
+    posicion_curso = {codigo: i for i, codigo in enumerate(codigos)}
+
+    estudiantes = np.array(
+        [[id_cadena(est.documento), id_cadena(est.nombre), id_cadena(est.apellidos),
+          id_cadena(est.correo), id_cadena(est.fecha_nac)]
+         for est in modelo.estudiantes.values()],
+        dtype='<u4').reshape(-1, 5)
+    cursos = np.array(
+        [[id_cadena(curso.codigo), id_cadena(curso.nombre)] for curso in modelo.cursos.values()],
+        dtype='<u4').reshape(-1, 2)
+    orden_estudiantes = np.array(sorted(range(len(documentos)), key=documentos.__getitem__), dtype='<u4')
+    orden_cursos = np.array(sorted(range(len(codigos)), key=codigos.__getitem__), dtype='<u4')
+
+    # Las columnas del modelo usan sus propios ids: se traducen a posiciones en las tablas
+    # (el almacén columnar conserva ids de registros ya eliminados, que ninguna fila usa)
+    ids_estudiante, ids_curso, notas, documentos_ids, codigos_ids = modelo.columnas_matriculas()
+    a_estudiante = np.array([posicion_estudiante.get(d, 0) for d in documentos_ids], dtype='<u4')
+    a_curso = np.array([posicion_curso.get(c, 0) for c in codigos_ids], dtype='<u4')
+    matriculas = np.empty(len(notas), dtype=REGISTRO_MATRICULA)
+    matriculas['estudiante'] = a_estudiante[ids_estudiante]
+    matriculas['curso'] = a_curso[ids_curso]
+    matriculas['nota'] = notas
+
+    escribir_tablas(archivo, list(cadenas), estudiantes, cursos, orden_estudiantes, orden_cursos,
+                    matriculas, generacion)
+
+
+def escribir_tablas(archivo, cadenas, estudiantes, cursos, orden_estudiantes, orden_cursos,
+                    matriculas, generacion=0):
+    """
+    Escribe una instantánea a partir de sus tablas ya armadas (ver el formato arriba).
+
+    Se escribe en archivo.tmp, se sincroniza con el disco y se renombra: quien
+    tenga abierta la instantánea anterior o se detenga a mitad de la escritura
+    nunca ve un archivo a medias.
+
+    Args:
+        cadenas: Lista de cadenas; las tablas guardan su posición en ella
+        estudiantes, cursos: Arreglos u32[n, 5] y u32[n, 2] de ids de cadena
+        orden_estudiantes, orden_cursos: Posiciones ordenadas por documento y por código
+        matriculas: Arreglo REGISTRO_MATRICULA con posiciones de estudiante y curso
+    """
+    n_estudiantes = len(estudiantes)
+    n_cursos = len(cursos)
+
+    # Por curso: de mayor a menor nota y, a igual nota, por documento (como el ranking del modelo)
+    rango_documento = np.empty(n_estudiantes, dtype=np.int64)
+    rango_documento[orden_estudiantes] = np.arange(n_estudiantes)
+    por_curso = np.lexsort((rango_documento[matriculas['estudiante']],
+                            -matriculas['nota'], matriculas['curso'])).astype('<u4')
+    por_estudiante = np.argsort(matriculas['estudiante'], kind='stable').astype('<u4')
+
+    codificadas = [texto.encode('utf-8') for texto in cadenas]
+    desplazamientos = np.zeros(len(codificadas) + 1, dtype='<u8')
+    np.cumsum([len(c) for c in codificadas], out=desplazamientos[1:])
+
+    datos = {
+        'desplazamientos_cadenas': desplazamientos.tobytes(),
+        'cadenas': b''.join(codificadas),
+        'estudiantes': np.asarray(estudiantes, dtype='<u4').tobytes(),
+        'orden_estudiantes': np.asarray(orden_estudiantes, dtype='<u4').tobytes(),
+        'cursos': np.asarray(cursos, dtype='<u4').tobytes(),
+        'orden_cursos': np.asarray(orden_cursos, dtype='<u4').tobytes(),
+        'matriculas': matriculas.tobytes(),
+        'inicio_por_curso': _inicios(matriculas['curso'], n_cursos).tobytes(),
+        'por_curso': por_curso.tobytes(),
+        'inicio_por_estudiante': _inicios(matriculas['estudiante'], n_estudiantes).tobytes(),
+        'por_estudiante': por_estudiante.tobytes(),
+    }
+
+    desplazamientos_secciones = []
+    posicion = _alinear(CABECERA.size)
+    for nombre in SECCIONES:
+        desplazamientos_secciones.append(posicion)
+        posicion = _alinear(posicion + len(datos[nombre]))
+
+    temporal = f"{archivo}.tmp"
+    with open(temporal, 'wb') as f:
+        f.write(CABECERA.pack(MAGIA, VERSION, generacion, len(cadenas), n_estudiantes,
+                              n_cursos, len(matriculas), *desplazamientos_secciones))
+        for nombre, inicio in zip(SECCIONES, desplazamientos_secciones):
+            f.write(b'\x00' * (inicio - f.tell()))
+            f.write(datos[nombre])
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporal, archivo)
+
+
+def _inicios(grupos, cantidad):
+    # Desplazamiento de cada grupo dentro de una lista agrupada (formato CSR)
+    inicios = np.zeros(cantidad + 1, dtype='<u8')
+    np.cumsum(np.bincount(grupos, minlength=cantidad), out=inicios[1:])
+    return inicios
+
+
+def _alinear(posicion):
+    return (posicion + 7) & ~7
+
+
+# ==================== LECTURA ====================
+
+class InstantaneaSIGA:
+    """
+    Vista de solo lectura sobre una instantánea abierta con mmap.
+
+    Ofrece las consultas de ModeloSIGA (estudiantes, cursos, matrículas,
+    notas, rankings y estadísticas) leyendo directamente del archivo. Los
+    registros Estudiante y Curso se construyen al pedirlos y no se guardan.
+    """
+
+    def __init__(self, archivo):
+        self.archivo = archivo
+        with open(archivo, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._abrir()
+        except Exception:
+            self._mmap.close()
+            raise
+
+    def _abrir(self):
+        if len(self._mmap) < CABECERA.size:
+            raise ValueError(f"{self.archivo} no es una instantánea de MiniSIGA")
+        magia, version, self.generacion, n_cadenas, n_estudiantes, n_cursos, n_matriculas, *desplazamientos = \
+            CABECERA.unpack_from(self._mmap, 0)
+        if magia != MAGIA:
+            raise ValueError(f"{self.archivo} no es una instantánea de MiniSIGA")
+        if version != VERSION:
+            raise ValueError(f"Versión de instantánea no soportada: {version}")
+
+        secciones = dict(zip(SECCIONES, desplazamientos))
+
+        def vista(nombre, dtype, cantidad):
+            # np.frombuffer no copia: las páginas se leen cuando se accede a ellas
+            return np.frombuffer(self._mmap, dtype=dtype, count=cantidad, offset=secciones[nombre])
+
+        self._desplazamientos_cadenas = vista('desplazamientos_cadenas', '<u8', n_cadenas + 1)
+        self._inicio_cadenas = secciones['cadenas']
+        self._estudiantes = vista('estudiantes', '<u4', 5 * n_estudiantes).reshape(-1, 5)
+        self._orden_estudiantes = vista('orden_estudiantes', '<u4', n_estudiantes)
+        self._cursos = vista('cursos', '<u4', 2 * n_cursos).reshape(-1, 2)
+        self._orden_cursos = vista('orden_cursos', '<u4', n_cursos)
+        self._matriculas = vista('matriculas', REGISTRO_MATRICULA, n_matriculas)
+        self._inicio_por_curso = vista('inicio_por_curso', '<u8', n_cursos + 1)
+        self._por_curso = vista('por_curso', '<u4', n_matriculas)
+        self._inicio_por_estudiante = vista('inicio_por_estudiante', '<u8', n_estudiantes + 1)
+        self._por_estudiante = vista('por_estudiante', '<u4', n_matriculas)
+
+        self.estudiantes = _VistaRegistros(self, self._estudiantes, self._orden_estudiantes,
+                                           self._crear_estudiante)
+        self.cursos = _VistaRegistros(self, self._cursos, self._orden_cursos, self._crear_curso)
+        self.matriculas = _VistaMatriculas(self)
+
+    def cerrar(self):
+        # Las vistas NumPy retienen el mmap: se sueltan antes de cerrarlo
+        for nombre in ('_desplazamientos_cadenas', '_estudiantes', '_orden_estudiantes',
+                       '_cursos', '_orden_cursos', '_matriculas', '_inicio_por_curso',
+                       '_por_curso', '_inicio_por_estudiante', '_por_estudiante'):
+            setattr(self, nombre, None)
+        self.estudiantes = self.cursos = self.matriculas = None
+        try:
+            self._mmap.close()
+        except BufferError:
+            pass  # Aún hay arreglos del llamador apuntando al archivo; se libera con ellos
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+    # ==================== CONSULTAS ====================
+
+    def obtener_nota(self, documento, codigo_curso):
+        """Retorna la nota de una matrícula o None si no existe."""
+        fila = self._fila_matricula(documento, codigo_curso)
+        return None if fila is None else float(self._matriculas['nota'][fila])
+
+    def esta_matriculado(self, documento, codigo_curso):
+        return self._fila_matricula(documento, codigo_curso) is not None
+
+    def buscar_estudiantes(self, termino=""):
+        """Igual que ModeloSIGA.buscar_estudiantes, pero recorriendo el archivo (sin índice)."""
+        if not termino:
+            return list(self.estudiantes.values())
+        termino = normalizar_texto(termino)
+        resultados = []
+        for i in range(len(self._estudiantes)):
+            documento, nombre, apellidos, correo, _ = (self._cadena(c) for c in self._estudiantes[i])
+            if any(termino in normalizar_texto(campo) for campo in (nombre, apellidos, documento, correo)):
+                resultados.append(self._crear_estudiante(i))
+        return sorted(resultados, key=lambda x: x.apellidos)
+
+    def obtener_top_estudiantes(self, codigo_curso, n=3):
+        """Retorna [(Estudiante, nota)] con las n mejores notas del curso (todas si n es None)."""
+        filas = self._filas_curso(codigo_curso)
+        return self._con_estudiante(filas if n is None else filas[:n])
+
+    def obtener_bottom_estudiantes(self, codigo_curso, n=3):
+        """Retorna [(Estudiante, nota)] con las n notas más bajas del curso, de menor a mayor."""
+        filas = self._filas_curso(codigo_curso)[::-1]
+        return self._con_estudiante(filas if n is None else filas[:n])
+
+    def obtener_estadisticas_curso(self, codigo_curso):
+        return self._estadisticas(self._matriculas['nota'][self._filas_curso(codigo_curso)])
+
+    def obtener_estadisticas_generales(self):
+        return self._estadisticas(self._matriculas['nota'])
+
+    def obtener_promedio_curso(self, codigo_curso):
+        return self.obtener_estadisticas_curso(codigo_curso).promedio
+
+    def obtener_estadisticas_aprobados(self, codigo_curso):
+        estadisticas = self.obtener_estadisticas_curso(codigo_curso)
+        return estadisticas.aprobados, estadisticas.reprobados
+
+    def obtener_matriculas_por_curso(self, codigo_curso=""):
+        """Matrículas de un curso, de mayor a menor nota (todas si no se indica curso)."""
+        if not codigo_curso:
+            return self.matriculas
+        filas = self._filas_curso(codigo_curso)
+        notas = self._matriculas['nota'][filas].tolist()
+        return [(self._cadena(self._estudiantes[ie, 0]), codigo_curso, nota)
+                for ie, nota in zip(self._matriculas['estudiante'][filas].tolist(), notas)]
+
+    def columnas_matriculas(self):
+        """Mismas columnas que ModeloSIGA.columnas_matriculas, leídas del archivo."""
+        return (self._matriculas['estudiante'].astype(np.int32),
+                self._matriculas['curso'].astype(np.int32),
+                self._matriculas['nota'].copy(),
+                list(self.estudiantes), list(self.cursos))
+
+    # ==================== AUXILIARES ====================
+
+    def _cadena(self, id_cadena):
+        inicio = self._inicio_cadenas + int(self._desplazamientos_cadenas[id_cadena])
+        fin = self._inicio_cadenas + int(self._desplazamientos_cadenas[id_cadena + 1])
+        return self._mmap[inicio:fin].decode('utf-8')
+
+    def _buscar(self, tabla, orden, clave):
+        # Búsqueda binaria sobre la primera columna (documento o código) de la tabla
+        bajo, alto = 0, len(orden)
+        while bajo < alto:
+            medio = (bajo + alto) // 2
+            posicion = int(orden[medio])
+            valor = self._cadena(tabla[posicion, 0])
+            if valor == clave:
+                return posicion
+            if valor < clave:
+                bajo = medio + 1
+            else:
+                alto = medio
+        return None
+
+    def _fila_matricula(self, documento, codigo_curso):
+        ie = self._buscar(self._estudiantes, self._orden_estudiantes, documento)
+        ic = self._buscar(self._cursos, self._orden_cursos, codigo_curso)
+        if ie is None or ic is None:
+            return None
+        filas = self._filas_estudiante(ie)
+        coincidencias = filas[self._matriculas['curso'][filas] == ic]
+        return int(coincidencias[0]) if len(coincidencias) else None
+
+    def _filas_estudiante(self, ie):
+        return self._por_estudiante[self._inicio_por_estudiante[ie]:self._inicio_por_estudiante[ie + 1]]
+
+    def _filas_curso(self, codigo_curso):
+        ic = self._buscar(self._cursos, self._orden_cursos, codigo_curso)
+        if ic is None:
+            return self._por_curso[:0]
+        return self._por_curso[self._inicio_por_curso[ic]:self._inicio_por_curso[ic + 1]]
+
+    def _con_estudiante(self, filas):
+        return [(self._crear_estudiante(ie), nota)
+                for ie, nota in zip(self._matriculas['estudiante'][filas].tolist(),
+                                    self._matriculas['nota'][filas].tolist())]
+
+    def _estadisticas(self, notas):
+        estadisticas = EstadisticasCurso()
+        estadisticas.total = len(notas)
+        estadisticas.suma = float(notas.sum())
+        estadisticas.aprobados = int((notas >= EstadisticasCurso.NOTA_APROBATORIA).sum())
+        # Mismas cubetas que EstadisticasCurso.cubeta: la décima que contiene la nota
+        cubetas = np.clip(np.floor(notas * EstadisticasCurso.DIVISIONES + EstadisticasCurso.TOLERANCIA),
+                          0, EstadisticasCurso.CUBETAS - 1)
+        estadisticas.histograma = np.bincount(cubetas.astype(np.int64),
+                                              minlength=EstadisticasCurso.CUBETAS).tolist()
+        return estadisticas
+
+    def _crear_estudiante(self, ie):
+        estudiante = Estudiante(*(self._cadena(c) for c in self._estudiantes[ie]))
+        filas = self._filas_estudiante(ie)
+        for ic, nota in zip(self._matriculas['curso'][filas].tolist(),
+                            self._matriculas['nota'][filas].tolist()):
+            estudiante._registrar_matricula(self._cadena(self._cursos[ic, 0]), nota)
+        return estudiante
+
+    def _crear_curso(self, ic):
+        curso = Curso(*(self._cadena(c) for c in self._cursos[ic]))
+        filas = self._matriculas['estudiante'][self._por_curso_en_orden(ic)]
+        for ie in filas.tolist():
+            curso._registrar_estudiante(self._cadena(self._estudiantes[ie, 0]))
+        return curso
+
+    def _por_curso_en_orden(self, ic):
+        # Matrículas del curso en el orden en que se registraron
+        return np.sort(self._por_curso[self._inicio_por_curso[ic]:self._inicio_por_curso[ic + 1]])
+
+
+class _VistaRegistros(Mapping):
+    """documento/código -> Estudiante/Curso, construido desde el archivo en cada acceso."""
+
+    def __init__(self, instantanea, tabla, orden, crear):
+        self._instantanea = instantanea
+        self._tabla = tabla
+        self._orden = orden
+        self._crear = crear
+
+    def __getitem__(self, clave):
+        posicion = self._instantanea._buscar(self._tabla, self._orden, clave)
+        if posicion is None:
+            raise KeyError(clave)
+        return self._crear(posicion)
+
+    def __contains__(self, clave):
+        return self._instantanea._buscar(self._tabla, self._orden, clave) is not None
+
+    def __iter__(self):
+        cadena = self._instantanea._cadena
+        for id_cadena in self._tabla[:, 0].tolist():
+            yield cadena(id_cadena)
+
+    def __len__(self):
+        return len(self._tabla)
+
+    def values(self):
+        return (self._crear(i) for i in range(len(self._tabla)))
+
+
+class _VistaMatriculas:
+    """Matrículas como tuplas (documento, codigo_curso, nota), con acceso posicional directo."""
+
+    def __init__(self, instantanea):
+        self._instantanea = instantanea
+
+    def __len__(self):
+        return len(self._instantanea._matriculas)
+
+    def __iter__(self):
+        for posicion in range(len(self)):
+            yield self[posicion]
+
+    def __getitem__(self, posicion):
+        if isinstance(posicion, slice):
+            return [self[i] for i in range(*posicion.indices(len(self)))]
+        if posicion < 0:
+            posicion += len(self)
+        if not 0 <= posicion < len(self):
+            raise IndexError("Índice de matrícula fuera de rango")
+        instantanea = self._instantanea
+        ie, ic, nota = instantanea._matriculas[posicion].tolist()
+        return (instantanea._cadena(instantanea._estudiantes[ie, 0]),
+                instantanea._cadena(instantanea._cursos[ic, 0]), nota)
+
+    def __repr__(self):
+        return f"Matrículas de instantánea ({len(self)} matrículas)"
+
+
+# ==================== CONVERSIÓN ====================
+
+def json_a_instantanea(archivo_json, archivo_instantanea):
+    """Convierte un JSON de MiniSIGA (el de guardar_datos_json) a instantánea."""
+    from modelo import ModeloSIGA
+    modelo = ModeloSIGA()
+    modelo.cargar_datos_json(archivo_json)
+    escribir_instantanea(modelo, archivo_instantanea)
+
+
+def instantanea_a_json(archivo_instantanea, archivo_json, compacto=False):
+    """Convierte una instantánea al JSON de guardar_datos_json, elemento por elemento."""
+    with InstantaneaSIGA(archivo_instantanea) as instantanea:
+        escribir_json(archivo_json, [
+            ('estudiantes', (est.to_dict() for est in instantanea.estudiantes.values())),
+            ('cursos', (curso.to_dict() for curso in instantanea.cursos.values())),
+            ('matriculas', instantanea.matriculas)
+        ], compacto=compacto)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convierte entre JSON de MiniSIGA e instantáneas binarias")
+    parser.add_argument('origen', help="Archivo .json o instantánea")
+    parser.add_argument('destino')
+    parser.add_argument('--compacto', action='store_true', help="JSON sin sangría")
+    args = parser.parse_args()
+
+    with open(args.origen, 'rb') as f:
+        es_instantanea = f.read(len(MAGIA)) == MAGIA
+    if es_instantanea:
+        instantanea_a_json(args.origen, args.destino, compacto=args.compacto)
+    else:
+        json_a_instantanea(args.origen, args.destino)
+
+
+if __name__ == "__main__":
+    main()
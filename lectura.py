@@ -0,0 +1,169 @@
+## ==================== lectura.py ====================
+"""
+Lecturas consistentes de ModeloSIGA.
+
+modelo.lectura() retorna una LecturaSIGA: las consultas del modelo sobre el
+estado que tenía al pedirla, aunque después siga cambiando. Los procesos
+largos (reportes, análisis de riesgo) la recorren, incluso desde otro hilo,
+mientras la interfaz sigue modificando el modelo.
+
+Crearla no copia el modelo: la lectura lee las tablas del modelo a través
+de los valores anteriores que el modelo guarda de cada clave que modifica
+mientras ella vive (ver ModeloSIGA.lectura). cerrar() la libera.
+
+Uso:
+    with modelo.lectura() as lectura:
+        for documento, estudiante in lectura.estudiantes.items():
+            ...
+"""
+
+from collections.abc import Mapping
+
+from busqueda import normalizar_texto
+from modelo import ModeloSIGA, EstudianteColumnar, CursoColumnar
+
+
+class LecturaSIGA:
+    def __init__(self, modelo, anteriores):
+        """
+        Se crea con ModeloSIGA.lectura(), con el cerrojo de escritura del modelo tomado.
+
+        Args:
+            modelo: ModeloSIGA que se lee
+            anteriores: Donde el modelo guarda lo que modifica después (ver
+                        ModeloSIGA._registrar_anterior)
+        """
+        self.version = modelo.version
+        self.columnar = modelo.columnar
+        self.motor = None
+        self._modelo = modelo
+        self._estadisticas = _TablaFijada(modelo._estadisticas, anteriores['_estadisticas'])
+        self._estadisticas_globales = modelo._estadisticas_globales
+        self._rankings = self._notas = None
+        if modelo.motor is not None:
+            self.motor = modelo.motor.abrir_lectura()
+            self.estudiantes, self.cursos, self._matriculas = \
+                self.motor.estudiantes, self.motor.cursos, self.motor.matriculas
+        elif modelo.columnar:
+            # Los registros, rankings y conteos por nota se recalculan sobre el almacén fijado
+            from almacen_columnar import AlmacenFijado, NotasColumnar, RankingsColumnar
+            almacen = AlmacenFijado(modelo._matriculas, anteriores, modelo.leyendo())
+            cursos = _TablaFijada(modelo.cursos, anteriores['cursos'])
+            self.estudiantes = _Revinculados(
+                _TablaFijada(modelo.estudiantes, anteriores['estudiantes']),
+                lambda e: EstudianteColumnar(e.documento, e.nombre, e.apellidos, e.correo, e.fecha_nac, almacen))
+            self.cursos = _Revinculados(cursos, lambda c: CursoColumnar(c.codigo, c.nombre, almacen))
+            self._matriculas = almacen
+            self._rankings = RankingsColumnar(almacen, cursos)
+            self._notas = NotasColumnar(almacen)
+        else:
+            self.estudiantes = _TablaFijada(modelo.estudiantes, anteriores['estudiantes'])
+            self.cursos = _TablaFijada(modelo.cursos, anteriores['cursos'])
+            self._matriculas = _TablaFijada(modelo._matriculas, anteriores['_matriculas'])
+            self._rankings = _TablaFijada(modelo._rankings, anteriores['_rankings'])
+            self._notas = modelo._notas
+
+    # Consultas que solo leen atributos que la lectura comparte con el modelo, sin su
+    # cerrojo (__wrapped__): una lectura no cambia
+    matriculas = ModeloSIGA.matriculas
+    obtener_nota = ModeloSIGA.obtener_nota.__wrapped__
+    esta_matriculado = ModeloSIGA.esta_matriculado.__wrapped__
+    obtener_top_estudiantes = ModeloSIGA.obtener_top_estudiantes.__wrapped__
+    obtener_bottom_estudiantes = ModeloSIGA.obtener_bottom_estudiantes.__wrapped__
+    obtener_estadisticas_curso = ModeloSIGA.obtener_estadisticas_curso.__wrapped__
+    obtener_estadisticas_generales = ModeloSIGA.obtener_estadisticas_generales.__wrapped__
+    obtener_promedio_curso = ModeloSIGA.obtener_promedio_curso.__wrapped__
+    obtener_estadisticas_aprobados = ModeloSIGA.obtener_estadisticas_aprobados.__wrapped__
+    obtener_matriculas_por_curso = ModeloSIGA.obtener_matriculas_por_curso.__wrapped__
+    columnas_matriculas = ModeloSIGA.columnas_matriculas.__wrapped__
+    consultar_matriculas = ModeloSIGA.consultar_matriculas.__wrapped__
+    contar_matriculas_por_nota = ModeloSIGA.contar_matriculas_por_nota.__wrapped__
+    _recorrer_matriculas = ModeloSIGA._recorrer_matriculas
+    _ranking_desde = ModeloSIGA._ranking_desde
+
+    def buscar_estudiantes(self, termino=""):
+        """Igual que ModeloSIGA.buscar_estudiantes; sin motor recorre los estudiantes (sin índice)."""
+        if self.motor is not None or not termino:
+            return ModeloSIGA.buscar_estudiantes.__wrapped__(self, termino)
+        termino = normalizar_texto(termino)
+        resultados = [estudiante for estudiante in self.estudiantes.values()
+                      if any(termino in normalizar_texto(campo) for campo in
+                             (estudiante.nombre, estudiante.apellidos, estudiante.documento, estudiante.correo))]
+        return sorted(resultados, key=lambda x: x.apellidos)
+
+    def cerrar(self):
+        """
+        Deja de registrarse en el modelo (que ya no guarda valores anteriores
+        para ella) y libera la transacción de lectura del motor, si la hay.
+        """
+        self._modelo._olvidar_lectura(self)
+        if self.motor is not None:
+            self.motor.cerrar()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+    def __repr__(self):
+        return f"LecturaSIGA(version={self.version})"
+
+
+class _TablaFijada(Mapping):
+    """
+    Tabla del modelo (un dict que sigue cambiando) tal como estaba al crear la
+    lectura: lo que el modelo modificó después se lee de los valores anteriores
+    que guardó. Las claves se enumeran una vez y se recuerdan.
+    """
+
+    def __init__(self, tabla, anteriores):
+        self._tabla = tabla
+        self._anteriores = anteriores
+        self._claves = None
+
+    def __getitem__(self, clave):
+        # Primero la tabla: el modelo guarda el valor anterior antes de cambiarla
+        valor = self._tabla.get(clave)
+        valor = self._anteriores.get(clave, valor)
+        if valor is None:
+            raise KeyError(clave)
+        return valor
+
+    def __iter__(self):
+        if self._claves is None:
+            claves = list(self._tabla)
+            anteriores = self._anteriores.copy()
+            # Las de la tabla que ya existían, y al final las que el modelo eliminó después
+            claves = [clave for clave in claves if anteriores.pop(clave, True) is not None]
+            claves.extend(clave for clave, valor in anteriores.items() if valor is not None)
+            self._claves = claves
+        return iter(self._claves)
+
+    def __len__(self):
+        if self._claves is None:
+            iter(self)
+        return len(self._claves)
+
+
+class _Revinculados(Mapping):
+    """Registros de una tabla del modelo, recreados sobre otro almacén al leerlos."""
+
+    def __init__(self, registros, crear):
+        self._registros = registros
+        self._crear = crear
+
+    def __getitem__(self, clave):
+        return self._crear(self._registros[clave])
+
+    def __contains__(self, clave):
+        return clave in self._registros
+
+    def __iter__(self):
+        return iter(self._registros)
+
+    def __len__(self):
+        return len(self._registros)
+
+    def values(self):
+        return (self._crear(registro) for registro in self._registros.values())
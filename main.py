@@ -1,19 +1,83 @@
 # ==================== main.py ====================
+"""
+MiniSIGA - Sistema de Gestión Académica.
+
+Uso:
+    python main.py                          # Con datos de ejemplo
+    python main.py --instantanea datos.siga # Abre una instantánea (ver instantanea.py)
+    python main.py --almacenamiento sqlite --base siga.db   # Registros en SQLite (ver motor_sqlite.py)
+    python main.py --diario datos/siga      # Recupera y registra los cambios (ver diario.py)
+"""
+
+import argparse
+import os
+import queue
+import threading
 import tkinter as tk
-from modelo import ModeloSIGA
-from controlador import ControladorSIGA
+from controlador import ControladorSIGA, crear_modelo, directorio_periodos, ALMACENAMIENTOS
+from diario import Diario
 from vista import VistaSIGA
 from utils import verificar_dependencias
 
 
+INTERVALO_CARGA_MS = 100  # Cada cuánto la interfaz revisa si terminó la carga en segundo plano
+
+
 class MiniSIGA:
-    def __init__(self):
+    def __init__(self, instantanea=None, almacenamiento='memoria', base=None, diario=None):
+        if diario and (instantanea or almacenamiento == 'sqlite'):
+            # El diario tiene su propia instantánea, y con SQLite cada operación ya es durable
+            raise ValueError("El diario no se combina con --instantanea ni con almacenamiento sqlite")
         self.root = tk.Tk()
-        self.modelo = ModeloSIGA()
+        self.modelo = crear_modelo(almacenamiento, base)
         self.vista = VistaSIGA(self.root)
-        self.controlador = ControladorSIGA(self.modelo, self.vista)
+        # Los períodos se archivan junto a los datos con que se abre el programa
+        datos = base if almacenamiento == 'sqlite' else diario or instantanea
+        self.controlador = ControladorSIGA(self.modelo, self.vista, directorio_periodos(datos))
         self.vista.establecer_controlador(self.controlador)
-        self.cargar_datos_ejemplo()
+        self.diario = None
+        if diario:
+            # Primero recupera lo guardado y reproduce el diario; después registra cada cambio
+            os.makedirs(os.path.dirname(os.path.abspath(diario)), exist_ok=True)
+            self.diario = Diario(self.modelo, diario)
+            self.vista.refrescar_todas_las_tablas()
+        if instantanea:
+            self.cargar_en_segundo_plano(instantanea)
+        elif not self.modelo.estudiantes:
+            # Una base SQLite o un diario con datos se abren tal cual
+            self.cargar_datos_ejemplo()
+
+    def cargar_en_segundo_plano(self, archivo):
+        """
+        Carga una instantánea en otro hilo: la ventana aparece y responde de
+        inmediato, y los datos se muestran cuando la carga termina.
+        """
+        resultado = queue.Queue(maxsize=1)
+
+        def cargar():
+            # En un modelo aparte: el de la interfaz no se bloquea mientras tanto
+            try:
+                nuevo = self.modelo.modelo_de_carga()
+                nuevo.cargar_instantanea(archivo)
+                resultado.put(nuevo)
+            except Exception as e:
+                resultado.put(e)
+
+        threading.Thread(target=cargar, daemon=True).start()
+        self._esperar_carga(resultado, archivo)
+
+    def _esperar_carga(self, resultado, archivo):
+        # Tk no se debe usar desde otro hilo: el reemplazo se hace aquí, en el de la interfaz
+        try:
+            nuevo = resultado.get_nowait()
+        except queue.Empty:
+            self.root.after(INTERVALO_CARGA_MS, self._esperar_carga, resultado, archivo)
+            return
+        if isinstance(nuevo, Exception):
+            self.vista.mostrar_error("Error", f"No se pudo abrir {archivo}: {nuevo}")
+            return
+        self.modelo.reemplazar(nuevo)
+        self.vista.refrescar_todas_las_tablas()
 
     def cargar_datos_ejemplo(self):
         """Carga algunos datos de ejemplo para demostrar funcionalidad"""
@@ -71,11 +135,25 @@ class MiniSIGA:
             print(f"Error cargando datos de ejemplo: {e}")
 
     def ejecutar(self):
-        self.root.mainloop()
+        try:
+            self.root.mainloop()
+        finally:
+            if self.diario is not None:
+                self.diario.cerrar()
+            self.controlador.cerrar()
 
 
 # ==================== PUNTO DE ENTRADA ====================
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="MiniSIGA - Sistema de Gestión Académica")
+    parser.add_argument('--instantanea', help="Instantánea (.siga) que se abre al iniciar, en segundo plano")
+    parser.add_argument('--almacenamiento', choices=ALMACENAMIENTOS, default='memoria',
+                        help="Dónde viven los registros (por defecto, en memoria)")
+    parser.add_argument('--base', default="siga.db", help="Archivo de la base con --almacenamiento sqlite")
+    parser.add_argument('--diario', metavar='RUTA_BASE',
+                        help="Guarda los cambios en RUTA_BASE.siga y RUTA_BASE.diario y los recupera al iniciar")
+    args = parser.parse_args()
+
     print("MiniSIGA - Sistema de Gestión Académica")
     print("=" * 40)
 
@@ -84,7 +162,8 @@ if __name__ == "__main__":
         exit(1)
 
     try:
-        app = MiniSIGA()
+        app = MiniSIGA(instantanea=args.instantanea, almacenamiento=args.almacenamiento, base=args.base,
+                       diario=args.diario)
         app.ejecutar()
     except Exception as e:
         print(f"Error fatal: {str(e)}")
@@ -1,19 +1,63 @@
 ## ==================== modelo.py ====================
-import csv
 import json
+import os
 import re
+from bisect import bisect_left
+from collections import namedtuple
+from contextlib import contextmanager, nullcontext
+from copy import copy
 from datetime import datetime
+from heapq import merge
+from itertools import islice
+from math import inf, nextafter
+from types import MappingProxyType
+from weakref import ref
+
+from busqueda import IndiceBusqueda
+from concurrencia import CerrojoLecturaEscritura, con_lectura, con_escritura, con_operacion
+from estructuras import ListaOrdenada
+from eventos import (BusEventos, EstudianteAgregado, EstudianteEliminado, CursoAgregado,
+                     CursoEliminado, MatriculaAgregada, MatriculaEliminada, NotaCambiada)
+from flujo_json import escribir_json, leer_json
+
+
+PATRON_EMAIL = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+
+# Contenedores vacíos compartidos por los registros que aún no tienen matrículas
+_SIN_CURSOS = ()
+_SIN_NOTAS = MappingProxyType({})
+
+# Órdenes de consultar_matriculas: clave de cada fila (documento, codigo_curso, nota).
+# La clave de la última fila de una página es el cursor de la siguiente
+CLAVES_MATRICULAS = {
+    'curso': lambda fila: (fila[1], -fila[2], fila[0]),  # Por curso, y en cada uno de mayor a menor nota
+    'nota': lambda fila: (-fila[2], fila[0], fila[1]),   # De mayor a menor nota en toda la institución
+}
+
+PaginaMatriculas = namedtuple('PaginaMatriculas', 'filas siguiente')
 
 
 class Estudiante:
+    # Registro compacto: sin __dict__ y con las notas creadas en la primera matrícula.
+    # Las notas (codigo -> nota, en orden de matrícula) son también la lista de cursos,
+    # así que retirar un curso es O(1)
+    __slots__ = ('documento', 'nombre', 'apellidos', 'correo', 'fecha_nac', '_notas')
+
     def __init__(self, documento, nombre, apellidos, correo, fecha_nac):
         self.documento = documento
         self.nombre = nombre
         self.apellidos = apellidos
         self.correo = correo
         self.fecha_nac = fecha_nac
-        self.cursos = []
-        self.notas = {}
+        self._notas = None
+
+    @property
+    def cursos(self):
+        return self._notas.keys() if self._notas is not None else _SIN_CURSOS
+
+    @property
+    def notas(self):
+        return self._notas if self._notas is not None else _SIN_NOTAS
 
 
     def to_dict(self):
@@ -23,32 +67,544 @@ class Estudiante:
         'apellidos': self.apellidos,
         'correo': self.correo,
         'fecha_nac': self.fecha_nac,
-        'cursos': self.cursos,
-        'notas': self.notas
+        'cursos': list(self.cursos),
+        'notas': dict(self.notas)
         }
 
+    # Mantenimiento de matrículas, invocado solo por ModeloSIGA
+    def _registrar_matricula(self, codigo_curso, nota):
+        if self._notas is None:
+            self._notas = {}
+        self._notas[codigo_curso] = nota
+
+    def _registrar_nota(self, codigo_curso, nota):
+        self._notas[codigo_curso] = nota
+
+    def _retirar_matricula(self, codigo_curso):
+        del self._notas[codigo_curso]
+        if not self._notas:
+            self._notas = None
+
+    def _copia(self):
+        # Copia que el modelo modifica cuando el original lo comparte una lectura
+        estudiante = Estudiante(self.documento, self.nombre, self.apellidos, self.correo, self.fecha_nac)
+        if self._notas is not None:
+            estudiante._notas = dict(self._notas)
+        return estudiante
+
 
 class Curso:
+    # _estudiantes es un conjunto ordenado (documento -> None): retirar a uno es O(1)
+    __slots__ = ('codigo', 'nombre', '_estudiantes')
+
     def __init__(self, codigo, nombre):
         self.codigo = codigo
         self.nombre = nombre
-        self.estudiantes = []
+        self._estudiantes = None
+
+    @property
+    def estudiantes(self):
+        return self._estudiantes.keys() if self._estudiantes is not None else _SIN_CURSOS
 
 
     def to_dict(self):
         return {
         'codigo': self.codigo,
         'nombre': self.nombre,
-        'estudiantes': self.estudiantes
+        'estudiantes': list(self.estudiantes)
         }
 
+    # Mantenimiento de matrículas, invocado solo por ModeloSIGA
+    def _registrar_estudiante(self, documento):
+        if self._estudiantes is None:
+            self._estudiantes = {}
+        self._estudiantes[documento] = None
+
+    def _retirar_estudiante(self, documento):
+        del self._estudiantes[documento]
+        if not self._estudiantes:
+            self._estudiantes = None
+
+    def _copia(self):
+        curso = Curso(self.codigo, self.nombre)
+        if self._estudiantes is not None:
+            curso._estudiantes = dict(self._estudiantes)
+        return curso
+
+
+class EstudianteColumnar(Estudiante):
+    """
+    Estudiante cuyas matrículas se leen del almacén (columnar o de un motor)
+    en lugar de guardarse en el objeto.
+    """
+
+    __slots__ = ('_almacen',)
+
+    def __init__(self, documento, nombre, apellidos, correo, fecha_nac, almacen):
+        self.documento = documento
+        self.nombre = nombre
+        self.apellidos = apellidos
+        self.correo = correo
+        self.fecha_nac = fecha_nac
+        self._almacen = almacen
+
+    @property
+    def cursos(self):
+        return self._almacen.cursos_de(self.documento)
+
+    @property
+    def notas(self):
+        return self._almacen.notas_de(self.documento)
+
+    def _registrar_matricula(self, codigo_curso, nota):
+        pass
+
+    def _registrar_nota(self, codigo_curso, nota):
+        pass
+
+    def _retirar_matricula(self, codigo_curso):
+        pass
+
+
+class CursoColumnar(Curso):
+    """Curso cuya lista de estudiantes se lee del almacén (columnar o de un motor)."""
+
+    __slots__ = ('_almacen',)
+
+    def __init__(self, codigo, nombre, almacen):
+        self.codigo = codigo
+        self.nombre = nombre
+        self._almacen = almacen
+
+    @property
+    def estudiantes(self):
+        return self._almacen.estudiantes_de(self.codigo)
+
+    def _registrar_estudiante(self, documento):
+        pass
+
+    def _retirar_estudiante(self, documento):
+        pass
+
+
+class EstadisticasCurso:
+    """
+    Agregados de notas mantenidos incrementalmente: conteo, suma, aprobados y
+    reprobados, y un histograma de la distribución de notas.
+
+    El histograma cuenta las notas por décima, de 0.0 a 5.0 (cada nota en la
+    décima que la contiene: 2.96 cuenta en 2.9, nunca en la cubeta aprobatoria
+    3.0), así que percentiles y gráficas de distribución cuestan O(cubetas)
+    sin ordenar las matrículas, y son exactos con notas de un decimal. Los
+    agregados de varios cursos se suman con combinar().
+    """
+
+    NOTA_APROBATORIA = 3.0
+    DIVISIONES = 10              # Cubetas del histograma por punto de nota
+    CUBETAS = 5 * DIVISIONES + 1  # 0.0, 0.1, ..., 5.0 (la de 5.0 solo recibe 5.0)
+    # Absorbe el error de representación: 2.3 * 10 da 22.999999999999996
+    TOLERANCIA = 1e-9
 
-class ModeloSIGA:
     def __init__(self):
+        self.total = 0
+        self.suma = 0.0
+        self.aprobados = 0
+        self.histograma = [0] * self.CUBETAS  # cubeta -> cantidad de notas
+
+    def __copy__(self):
+        # El histograma no se comparte con la copia
+        copia = EstadisticasCurso.__new__(EstadisticasCurso)
+        copia.__dict__.update(self.__dict__)
+        copia.histograma = self.histograma[:]
+        return copia
+
+    @classmethod
+    def cubeta(cls, nota):
+        return min(max(int(nota * cls.DIVISIONES + cls.TOLERANCIA), 0), cls.CUBETAS - 1)
+
+    @classmethod
+    def nota_cubeta(cls, cubeta):
+        return cubeta / cls.DIVISIONES
+
+    @property
+    def reprobados(self):
+        return self.total - self.aprobados
+
+    @property
+    def promedio(self):
+        return self.suma / self.total if self.total else 0.0
+
+    @property
+    def tasa_aprobacion(self):
+        return self.aprobados / self.total if self.total else 0.0
+
+    @property
+    def mediana(self):
+        return self.percentil(50)
+
+    def percentil(self, p):
+        """Nota en el percentil p (0 a 100), interpolada como numpy.percentile; 0.0 sin notas."""
+        if not self.total:
+            return 0.0
+        posicion = (self.total - 1) * p / 100
+        inferior = int(posicion)
+        nota = self._nota_en(inferior)
+        if inferior == posicion:
+            return nota
+        return nota + (self._nota_en(inferior + 1) - nota) * (posicion - inferior)
+
+    def _nota_en(self, k):
+        # k-ésima nota (desde 0) en orden ascendente, a la resolución del histograma
+        acumulado = 0
+        for cubeta, cantidad in enumerate(self.histograma):
+            acumulado += cantidad
+            if acumulado > k:
+                return self.nota_cubeta(cubeta)
+        return self.nota_cubeta(self.CUBETAS - 1)
+
+    def agregar(self, nota):
+        self.total += 1
+        self.suma += nota
+        if nota >= self.NOTA_APROBATORIA:
+            self.aprobados += 1
+        self.histograma[self.cubeta(nota)] += 1
+
+    def agregar_lote(self, notas):
+        """Como agregar() con cada nota de la lista, en una sola pasada."""
+        notas = list(notas)
+        self.total += len(notas)
+        self.suma = sum(notas, self.suma)
+        aprobatoria = self.NOTA_APROBATORIA
+        self.aprobados += sum(1 for nota in notas if nota >= aprobatoria)
+        histograma, cubeta = self.histograma, self.cubeta
+        for nota in notas:
+            histograma[cubeta(nota)] += 1
+
+    def quitar(self, nota):
+        self.total -= 1
+        if nota >= self.NOTA_APROBATORIA:
+            self.aprobados -= 1
+        self.histograma[self.cubeta(nota)] -= 1
+        # Evitar que se acumule error de redondeo al vaciarse
+        self.suma = self.suma - nota if self.total else 0.0
+
+    def reemplazar(self, nota_anterior, nota_nueva):
+        self.quitar(nota_anterior)
+        self.agregar(nota_nueva)
+
+    def combinar(self, otras):
+        """Suma a estos agregados los de otras EstadisticasCurso (p. ej. de varios cursos)."""
+        for otra in otras:
+            self.total += otra.total
+            self.suma += otra.suma
+            self.aprobados += otra.aprobados
+            self.histograma = [a + b for a, b in zip(self.histograma, otra.histograma)]
+        return self
+
+
+class ColeccionMatriculas:
+    """
+    Vista de solo lectura del índice de matrículas como tuplas (documento, codigo_curso, nota).
+
+    No se indexa por posición: el índice es un dict y llegar a la i-ésima
+    matrícula costaría recorrerlo. Para eso, list(modelo.matriculas).
+    """
+
+    def __init__(self, indice):
+        self._indice = indice
+
+    def __len__(self):
+        return len(self._indice)
+
+    def __iter__(self):
+        for (documento, codigo_curso), nota in self._indice.items():
+            yield (documento, codigo_curso, nota)
+
+    def __contains__(self, matricula):
+        try:
+            documento, codigo_curso, nota = matricula
+        except (TypeError, ValueError):
+            return False
+        clave = (documento, codigo_curso)
+        return clave in self._indice and self._indice[clave] == nota
+
+    def __repr__(self):
+        return f"ColeccionMatriculas({len(self._indice)} matrículas)"
+
+
+class _Anteriores(dict):
+    """
+    Lo que veía una lectura de cada clave que el modelo modificó después de
+    crearla: tabla -> {clave: valor anterior, o None si la clave no existía}.
+    Solo se agregan claves. Las matrículas guardadas se indexan además por
+    documento y por curso, para las consultas del almacén columnar.
+    """
+
+    TABLAS = ('estudiantes', 'cursos', '_matriculas', '_rankings', '_estadisticas')
+
+    def __init__(self, version):
+        super().__init__((tabla, {}) for tabla in self.TABLAS)
+        self.version = version
+        self.por_documento = {}  # documento -> [codigo_curso] de sus claves en '_matriculas'
+        self.por_curso = {}      # codigo_curso -> [documento]
+
+    def guardar(self, tabla, clave, valor):
+        self[tabla][clave] = valor
+        if tabla == '_matriculas':
+            documento, codigo_curso = clave
+            self.por_documento.setdefault(documento, []).append(codigo_curso)
+            self.por_curso.setdefault(codigo_curso, []).append(documento)
+
+
+class ModeloSIGA:
+    def __init__(self, columnar=False, motor=None):
+        # Con columnar=True las matrículas se guardan en un AlmacenColumnar (requiere NumPy)
+        # y Estudiante/Curso pasan a ser vistas sobre él
+        self.columnar = columnar
+        # Con un motor (ver motor.py) los registros viven en él y el modelo abre su contenido
+        self.motor = motor
+        self._cerrojo = CerrojoLecturaEscritura()  # Ver leyendo() y escribiendo()
+        self._suscriptores = []
+        self.eventos = BusEventos()  # Eventos de cambio tipados (ver eventos.py)
+        self.version = 0             # Cambios aplicados; identifica lo que ve cada lectura
+        self._lecturas = {}          # id -> (weakref, _Anteriores) de cada lectura viva (ver lectura())
+        self._compartidos = set()    # Atributos que la última lectura ve sin copiar (ver _propio)
+        self._base_json = None  # JSON al que se refieren los cambios pendientes
+        self._cambios = None    # Claves modificadas desde el último guardado, mientras haya base
+        self._en_operacion = False  # Dentro de una operación pública (ver _operacion)
+        if motor is not None:
+            self._conectar_motor()
+        else:
+            self._reiniciar()
+    
+    def _reiniciar(self):
+        self._base_json = None
+        self._cambios = None
+        self.version += 1
+        self._soltar_lecturas()
+        if self.motor is not None:
+            self.motor.vaciar()
+            self._conectar_motor()
+            return
         self.estudiantes = {}  # documento -> Estudiante
         self.cursos = {}       # codigo -> Curso
-        self.matriculas = []   # [(documento, codigo_curso, nota)]
+        self._estadisticas = {}  # codigo -> EstadisticasCurso
+        self._estadisticas_globales = EstadisticasCurso()
+        if self.columnar:
+            # Rankings y conteos por nota se calculan de las columnas del almacén
+            from almacen_columnar import AlmacenColumnar, NotasColumnar, RankingsColumnar
+            self._matriculas = AlmacenColumnar()
+            self._rankings = RankingsColumnar(self._matriculas, self.cursos)
+            self._notas = NotasColumnar(self._matriculas)
+        else:
+            self._matriculas = {}  # (documento, codigo_curso) -> nota
+            self._rankings = {}  # codigo -> ListaOrdenada de (-nota, documento)
+            self._notas = ListaOrdenada()  # Notas de todas las matrículas, para conteos por rango
+        self._indice_busqueda = IndiceBusqueda()
+
+    def _conectar_motor(self):
+        # En memoria solo quedan los agregados por curso; rankings y búsqueda los resuelve el motor
+        self._soltar_lecturas()
+        self.estudiantes = self.motor.estudiantes
+        self.cursos = self.motor.cursos
+        self._matriculas = self.motor.matriculas
+        self._estadisticas = {}
+        self._estadisticas_globales = EstadisticasCurso()
+        for codigo, total, suma, aprobados in self.motor.agregados_por_curso(EstadisticasCurso.NOTA_APROBATORIA):
+            estadisticas = self._estadisticas[codigo] = EstadisticasCurso()
+            estadisticas.total, estadisticas.suma, estadisticas.aprobados = total, suma, int(aprobados)
+        for codigo, nota, cantidad in self.motor.conteos_por_nota():
+            self._estadisticas[codigo].histograma[EstadisticasCurso.cubeta(nota)] += cantidad
+        self._estadisticas_globales.combinar(self._estadisticas.values())
+        self._rankings = None
+        self._notas = None
+        self._indice_busqueda = None
+
+    @contextmanager
+    def _operacion(self):
+        # Con motor, cada operación pública es una transacción: termina confirmada,
+        # y si falla el motor la deshace y los agregados se vuelven a leer de él
+        if self.motor is None or self._en_operacion:
+            yield
+            return
+        escrituras = self.motor.escrituras
+        self._en_operacion = True
+        try:
+            with self.motor.transaccion():
+                yield
+        except BaseException:
+            if self.motor.escrituras != escrituras:
+                self.eventos.iniciar_recarga()
+                try:
+                    self._conectar_motor()
+                finally:
+                    self.eventos.terminar_recarga()
+            raise
+        finally:
+            self._en_operacion = False
+
+    def leyendo(self):
+        """
+        Context manager para una consulta compuesta desde varios hilos: dentro del
+        bloque nadie modifica el modelo (otros hilos pueden leer a la vez). Cada
+        método público ya toma el cerrojo que necesita; para recorrer sin bloquear
+        a los escritores, usar lectura().
+        """
+        return self._cerrojo.lectura
+    
+    def escribiendo(self):
+        """Context manager para una modificación compuesta: el bloque excluye a todos los demás hilos."""
+        return self._cerrojo.escritura
+    
+    @con_escritura
+    def suscribir(self, funcion):
+        """
+        Registra funcion(operacion, *argumentos), que se llama después de cada
+        cambio hecho por los métodos públicos. operacion es el nombre del método
+        ('crear_estudiante', 'matricular_estudiante', ...) con sus argumentos, o
+        'cargar' cuando una carga reemplazó o agregó datos en bloque. Una
+        operación que falla no se notifica (salvo una carga CSV sin motor que
+        ya agregó filas, que se notifica como 'cargar').
+        
+        Sirve para registrar y reproducir operaciones (ver diario.py); para
+        saber qué registros cambiaron, usar self.eventos.
+        """
+        self._suscriptores.append(funcion)
+
+    @con_escritura
+    def desuscribir(self, funcion):
+        self._suscriptores.remove(funcion)
+
+    def _notificar(self, operacion, *argumentos):
+        for funcion in self._suscriptores:
+            funcion(operacion, *argumentos)
+
+    def _marcar(self, tipo, clave, quitada=False):
+        # Registra la clave como modificada y si se quitó en algún momento. Cada alta
+        # o baja la pasa al final, para que el delta reproduzca el orden de los registros
+        if self._cambios is not None:
+            cambios = self._cambios[tipo]
+            cambios[clave] = cambios.pop(clave, False) or quitada
+    
+    def _marcar_nota(self, clave):
+        # Un cambio de nota no mueve la matrícula en el orden
+        if self._cambios is not None:
+            self._cambios['matriculas'].setdefault(clave, False)
+
+    def _rastrear_cambios(self, archivo):
+        self._base_json = os.path.abspath(archivo)
+        self._cambios = {'estudiantes': {}, 'cursos': {}, 'matriculas': {}}
+
+    @con_lectura
+    def hay_cambios(self):
+        """True si hay cambios sin guardar en el JSON base (o si no hay base)."""
+        return self._cambios is None or any(self._cambios.values())
+
+    @con_escritura
+    def confirmar_cambios(self):
+        """
+        Hace durables las escrituras del motor hechas fuera de las operaciones
+        públicas (que ya terminan confirmadas); sin motor no hace nada.
+        """
+        if self.motor is not None:
+            self.motor.confirmar()
+
+    @con_escritura
+    def lectura(self):
+        """
+        Retorna una LecturaSIGA (ver lectura.py): las mismas consultas del modelo
+        sobre su estado actual, que no cambia aunque el modelo siga modificándose.
+        Se pide desde el hilo que modifica el modelo y se puede recorrer desde otro.
         
+        Crearla no copia nada. Mientras viva, el modelo guarda el valor anterior
+        de cada clave que modifica (ver _registrar_anterior) y copia cada registro
+        (estudiante, curso, su ranking y sus estadísticas) la primera vez que lo
+        modifica. Con motor, los registros se leen en una transacción propia del
+        motor. cerrar() la libera; si no se cierra, se libera al recolectarla.
+        """
+        from lectura import LecturaSIGA
+        # Sin cambios desde la última lectura, las dos ven lo mismo: comparten los anteriores
+        anteriores = next((a for a in self._registros_vivos() if a.version == self.version), None)
+        if anteriores is None:
+            anteriores = _Anteriores(self.version)
+        lectura = LecturaSIGA(self, anteriores)
+        clave, lecturas = id(lectura), self._lecturas
+        lecturas[clave] = (ref(lectura, lambda _: lecturas.pop(clave, None)), anteriores)
+        self._compartidos = {'_estadisticas_globales', '_notas'}
+        return lectura
+
+    def _olvidar_lectura(self, lectura):
+        # La lectura se cerró: el modelo deja de guardarle valores anteriores
+        self._lecturas.pop(id(lectura), None)
+
+    def _soltar_lecturas(self):
+        # Las tablas se reemplazan y las anteriores ya no cambian: las lecturas
+        # vivas se quedan con ellas y no necesitan más valores anteriores
+        self._lecturas = {}
+        self._compartidos = set()
+
+    def _registros_vivos(self):
+        # Los _Anteriores de las lecturas vivas, una vez cada uno
+        return {id(anteriores): anteriores for _, anteriores in list(self._lecturas.values())}.values()
+
+    def _antes_de_escribir(self):
+        self.version += 1
+
+    def _registrar_anterior(self, tabla, clave):
+        # Antes de modificar getattr(self, tabla)[clave]: cada lectura viva que aún
+        # no la tiene guarda lo que veía. Retorna True si alguna la guardó, es decir,
+        # si el valor actual lo ve una lectura y no se debe modificar en su lugar
+        if not self._lecturas:
+            return False
+        valor = getattr(self, tabla).get(clave)
+        guardado = False
+        for anteriores in self._registros_vivos():
+            if clave not in anteriores[tabla]:
+                anteriores.guardar(tabla, clave, valor)
+                guardado = True
+        return guardado
+
+    def _propio(self, nombre, copiar):
+        # Copy-on-write de un objeto que la última lectura ve sin copiar (los
+        # agregados globales y las notas de todas las matrículas)
+        valor = getattr(self, nombre)
+        if nombre in self._compartidos:
+            self._compartidos.discard(nombre)
+            if self._lecturas:
+                valor = copiar(valor)
+                setattr(self, nombre, valor)
+        return valor
+    
+    def _estudiante_propio(self, documento):
+        # El estudiante, copiado antes si lo ve una lectura
+        estudiante = self.estudiantes[documento]
+        if self._registrar_anterior('estudiantes', documento):
+            estudiante = self.estudiantes[documento] = estudiante._copia()
+        return estudiante
+    
+    def _curso_propio(self, codigo_curso):
+        curso = self.cursos[codigo_curso]
+        if self._registrar_anterior('cursos', codigo_curso):
+            curso = self.cursos[codigo_curso] = curso._copia()
+        return curso
+
+    def _ranking_propio(self, codigo_curso):
+        ranking = self._rankings[codigo_curso]
+        if self._registrar_anterior('_rankings', codigo_curso):
+            ranking = self._rankings[codigo_curso] = ranking.copia()
+        return ranking
+
+    def _estadisticas_propias(self, codigo_curso):
+        estadisticas = self._estadisticas[codigo_curso]
+        if self._registrar_anterior('_estadisticas', codigo_curso):
+            estadisticas = self._estadisticas[codigo_curso] = copy(estadisticas)
+        return estadisticas
+    
+    @property
+    def matriculas(self):
+        return ColeccionMatriculas(self._matriculas)
+        
+    @con_operacion
     def crear_estudiante(self, documento, nombre, apellidos, correo, fecha_nac):
         if documento in self.estudiantes:
             raise ValueError("El estudiante ya existe")
@@ -61,180 +617,933 @@ class ModeloSIGA:
         if not self._validar_fecha(fecha_nac):
             raise ValueError("Fecha inválida")
             
-        estudiante = Estudiante(documento, nombre, apellidos, correo, fecha_nac)
-        self.estudiantes[documento] = estudiante
+        estudiante = self._agregar_estudiante(documento, nombre, apellidos, correo, fecha_nac)
+        self._notificar('crear_estudiante', documento, nombre, apellidos, correo, fecha_nac)
         return estudiante
     
+    @con_operacion
     def crear_curso(self, codigo, nombre):
         if codigo in self.cursos:
             raise ValueError("El curso ya existe")
         
-        curso = Curso(codigo, nombre)
-        self.cursos[codigo] = curso
+        curso = self._agregar_curso(codigo, nombre)
+        self._notificar('crear_curso', codigo, nombre)
         return curso
     
+    @con_operacion
     def matricular_estudiante(self, documento, codigo_curso, nota=0.0):
+        error = self._validar_matricula(documento, codigo_curso, nota)
+        if error:
+            raise ValueError(error)
+            
+        self._vincular(documento, codigo_curso, nota)
+        self._notificar('matricular_estudiante', documento, codigo_curso, nota)
+    
+    @con_operacion
+    def actualizar_nota(self, documento, codigo_curso, nueva_nota):
+        error = self._validar_cambio_nota(documento, codigo_curso, nueva_nota)
+        if error:
+            raise ValueError(error)
+        
+        self._cambiar_nota(documento, codigo_curso, nueva_nota)
+        self._notificar('actualizar_nota', documento, codigo_curso, nueva_nota)
+        return True
+    
+    def _validar_matricula(self, documento, codigo_curso, nota):
+        # Retorna el error que impide la matrícula, o None si es válida
         if documento not in self.estudiantes:
-            raise ValueError("Estudiante no encontrado")
+            return "Estudiante no encontrado"
         if codigo_curso not in self.cursos:
-            raise ValueError("Curso no encontrado")
+            return "Curso no encontrado"
         
         # Verificar si ya está matriculado
-        for matricula in self.matriculas:
-            if matricula[0] == documento and matricula[1] == codigo_curso:
-                raise ValueError("El estudiante ya está matriculado en este curso")
+        if (documento, codigo_curso) in self._matriculas:
+            return "El estudiante ya está matriculado en este curso"
         
         if not (0 <= nota <= 5):
-            raise ValueError("La nota debe estar entre 0 y 5")
-            
-        self.matriculas.append((documento, codigo_curso, nota))
-        self.estudiantes[documento].cursos.append(codigo_curso)
-        self.estudiantes[documento].notas[codigo_curso] = nota
-        self.cursos[codigo_curso].estudiantes.append(documento)
+            return "La nota debe estar entre 0 y 5"
+        return None
     
-    def actualizar_nota(self, documento, codigo_curso, nueva_nota):
+    def _validar_cambio_nota(self, documento, codigo_curso, nueva_nota):
         if not (0 <= nueva_nota <= 5):
-            raise ValueError("La nota debe estar entre 0 y 5")
-            
-        # Actualizar en la lista de matrículas
-        for i, (doc, curso, nota) in enumerate(self.matriculas):
-            if doc == documento and curso == codigo_curso:
-                self.matriculas[i] = (documento, codigo_curso, nueva_nota)
-                self.estudiantes[documento].notas[codigo_curso] = nueva_nota
-                return True
-        
-        raise ValueError("Matrícula no encontrada")
+            return "La nota debe estar entre 0 y 5"
+        if (documento, codigo_curso) not in self._matriculas:
+            return "Matrícula no encontrada"
+        return None
+    
+    @con_lectura
+    def obtener_nota(self, documento, codigo_curso):
+        """Retorna la nota de una matrícula o None si no existe."""
+        return self._matriculas.get((documento, codigo_curso))
     
+    @con_lectura
+    def esta_matriculado(self, documento, codigo_curso):
+        return (documento, codigo_curso) in self._matriculas
+    
+    @con_lectura
     def buscar_estudiantes(self, termino=""):
         if not termino:
             return list(self.estudiantes.values())
             
-        resultados = []
-        for estudiante in self.estudiantes.values():
-            if (termino.lower() in estudiante.nombre.lower() or 
-                termino.lower() in estudiante.apellidos.lower() or
-                termino in estudiante.documento or
-                termino.lower() in estudiante.correo.lower()):
-                resultados.append(estudiante)
+        # Coincidencia por subcadena en nombre, apellidos, documento o correo, sin distinguir tildes
+        if self.motor is not None:
+            resultados = self.motor.buscar_estudiantes(termino)
+        else:
+            resultados = [self.estudiantes[doc] for doc in self._indice_busqueda.buscar(termino)]
         return sorted(resultados, key=lambda x: x.apellidos)
     
+    @con_lectura
     def obtener_top_estudiantes(self, codigo_curso, n=3):
-        estudiantes_curso = []
-        for documento, curso, nota in self.matriculas:
-            if curso == codigo_curso:
-                estudiante = self.estudiantes[documento]
-                estudiantes_curso.append((estudiante, nota))
-        
-        return sorted(estudiantes_curso, key=lambda x: x[1], reverse=True)[:n]
+        """Retorna [(Estudiante, nota)] con las n mejores notas del curso (todas si n es None)."""
+        if self.motor is not None:
+            return self.motor.ranking(codigo_curso, n)
+        ranking = self._rankings.get(codigo_curso)
+        if ranking is None:
+            return []
+        return [(self.estudiantes[documento], -nota_negativa)
+                for nota_negativa, documento in ranking.primeros(n)]
+    
+    @con_lectura
+    def obtener_bottom_estudiantes(self, codigo_curso, n=3):
+        """Retorna [(Estudiante, nota)] con las n notas más bajas del curso, de menor a mayor."""
+        if self.motor is not None:
+            return self.motor.ranking(codigo_curso, n, ascendente=True)
+        ranking = self._rankings.get(codigo_curso)
+        if ranking is None:
+            return []
+        return [(self.estudiantes[documento], -nota_negativa)
+                for nota_negativa, documento in ranking.ultimos(n)]
+    
+    @con_lectura
+    def obtener_estadisticas_curso(self, codigo_curso):
+        """Retorna los agregados del curso (vacíos si el curso no existe)."""
+        return self._estadisticas.get(codigo_curso) or EstadisticasCurso()
+    
+    @con_lectura
+    def obtener_estadisticas_generales(self):
+        """Retorna los agregados de todas las matrículas de la institución."""
+        return self._estadisticas_globales
     
+    @con_lectura
+    def obtener_promedio_curso(self, codigo_curso):
+        return self.obtener_estadisticas_curso(codigo_curso).promedio
+    
+    @con_lectura
     def obtener_estadisticas_aprobados(self, codigo_curso):
-        aprobados = 0
-        reprobados = 0
-        
-        for documento, curso, nota in self.matriculas:
-            if curso == codigo_curso:
-                if nota >= 3.0:
-                    aprobados += 1
-                else:
-                    reprobados += 1
-        
-        return aprobados, reprobados
+        estadisticas = self.obtener_estadisticas_curso(codigo_curso)
+        return estadisticas.aprobados, estadisticas.reprobados
     
+    @con_lectura
     def obtener_matriculas_por_curso(self, codigo_curso=""):
         if codigo_curso:
-            return [(doc, curso, nota) for doc, curso, nota in self.matriculas if curso == codigo_curso]
-        return self.matriculas
+            if codigo_curso not in self.cursos:
+                return []
+            if self.motor is not None:
+                return self.motor.matriculas_por_curso(codigo_curso)
+            return [(doc, codigo_curso, self._matriculas[(doc, codigo_curso)])
+                    for doc in self.cursos[codigo_curso].estudiantes]
+        # Una lista, como antes: quien la reciba puede indexarla
+        return list(self.matriculas)
+    
+    @con_lectura
+    def consultar_matriculas(self, codigo_curso=None, documento=None, nota_minima=None,
+                             nota_maxima=None, aprobado=None, orden='curso', despues_de=None,
+                             limite=100):
+        """
+        Consulta paginada de matrículas, resuelta sobre los rankings de cada curso
+        (o los índices del motor) sin recorrer las que no pasan el filtro.
+        
+        Args:
+            codigo_curso, documento: Restringen a un curso o a un estudiante
+            nota_minima, nota_maxima: Rango de notas, ambos extremos incluidos
+            aprobado: True solo aprobadas, False solo reprobadas, None ambas
+            orden: Clave de CLAVES_MATRICULAS ('curso' o 'nota'); a igual nota, por documento
+            despues_de: Cursor de la página anterior (PaginaMatriculas.siguiente)
+            limite: Filas por página
+        
+        Returns:
+            PaginaMatriculas: filas [(documento, codigo_curso, nota)] y el cursor de la
+            siguiente página, o None si no hay más. El cursor es la clave de la última
+            fila, así que la paginación no salta ni repite filas aunque el modelo
+            cambie entre una página y otra.
+        """
+        if orden not in CLAVES_MATRICULAS:
+            raise ValueError(f"Orden no soportado: {orden}")
+        filtro = (codigo_curso, documento, nota_minima, nota_maxima, aprobado)
+        if self.motor is not None:
+            filas = self.motor.consultar_matriculas(*filtro, EstadisticasCurso.NOTA_APROBATORIA,
+                                                    orden, despues_de, limite + 1)
+        else:
+            filas = list(islice(self._recorrer_matriculas(*filtro, orden, despues_de), limite + 1))
+        if len(filas) <= limite:
+            return PaginaMatriculas(filas, None)
+        del filas[limite:]
+        return PaginaMatriculas(filas, CLAVES_MATRICULAS[orden](filas[-1]))
+    
+    @con_lectura
+    def contar_matriculas_por_nota(self, nota_minima=None, nota_maxima=None, codigo_curso=None):
+        """
+        Cuenta las matrículas con nota en [nota_minima, nota_maxima] (un extremo en
+        None no acota), del curso o de toda la institución. Para recorrerlas,
+        consultar_matriculas con el mismo rango.
+        
+        Costo sin motor: en modo normal O(log n), con ListaOrdenada. En modo
+        columnar, el de toda la institución suma las décimas de nota del rango
+        (ver AlmacenColumnar.contar_notas) y el de un curso busca en su ranking,
+        O(log k), que se ordena de nuevo, O(k log k), tras cambiar el curso. Con
+        motor es un COUNT del motor.
+        """
+        if self.motor is not None:
+            return self.motor.contar_matriculas(codigo_curso, None, nota_minima, nota_maxima)
+        if codigo_curso is None:
+            return self._notas.contar(-inf if nota_minima is None else nota_minima,
+                                      inf if nota_maxima is None else nextafter(nota_maxima, inf))
+        ranking = self._rankings.get(codigo_curso)
+        if ranking is None:
+            return 0
+        # El ranking guarda (-nota, documento): el rango de notas se invierte
+        return ranking.contar(() if nota_maxima is None else (-nota_maxima,),
+                              (inf,) if nota_minima is None else (nextafter(-nota_minima, inf),))
+    
+    def _recorrer_matriculas(self, codigo_curso, documento, nota_minima, nota_maxima, aprobado,
+                             orden, despues_de):
+        # Genera las matrículas del filtro en el orden pedido, a partir de despues_de
+        clave = CLAVES_MATRICULAS[orden]
+        # aprobado se traduce en un rango de notas, para acotar también el recorrido
+        if aprobado:
+            piso = EstadisticasCurso.NOTA_APROBATORIA
+            nota_minima = piso if nota_minima is None else max(nota_minima, piso)
+        elif aprobado is not None:
+            tope = nextafter(EstadisticasCurso.NOTA_APROBATORIA, -inf)  # La mayor nota reprobada
+            nota_maxima = tope if nota_maxima is None else min(nota_maxima, tope)
+        
+        def admitida(fila):
+            nota = fila[2]
+            return ((nota_minima is None or nota >= nota_minima)
+                    and (nota_maxima is None or nota <= nota_maxima)
+                    and (despues_de is None or clave(fila) > despues_de))
+        
+        if documento is not None:
+            # Pocas matrículas por estudiante: se ordenan al vuelo
+            estudiante = self.estudiantes.get(documento)
+            if estudiante is None:
+                return
+            filas = [(documento, codigo, nota) for codigo, nota in estudiante.notas.items()
+                     if codigo_curso is None or codigo == codigo_curso]
+            yield from filter(admitida, sorted(filas, key=clave))
+            return
+        
+        if codigo_curso is not None:
+            codigos = [codigo_curso] if codigo_curso in self._rankings else []
+        else:
+            codigos = sorted(self._rankings)
+        # Primera entrada de cada ranking, (-nota, documento), que puede pasar el filtro
+        inicio = (-nota_maxima,) if nota_maxima is not None else ()
+        
+        if orden == 'curso':
+            if despues_de is not None:
+                codigos = codigos[bisect_left(codigos, despues_de[0]):]
+            for codigo in codigos:
+                desde = inicio
+                if despues_de is not None and codigo == despues_de[0]:
+                    desde = max(desde, despues_de[1:])
+                yield from filter(admitida, self._ranking_desde(codigo, desde, nota_minima))
+        else:
+            if despues_de is not None:
+                inicio = max(inicio, despues_de[:2])
+            yield from filter(admitida, merge(
+                *(self._ranking_desde(codigo, inicio, nota_minima) for codigo in codigos), key=clave))
     
+    def _ranking_desde(self, codigo_curso, inicio, nota_minima):
+        # Matrículas del curso de mayor a menor nota desde inicio, hasta bajar de nota_minima
+        for nota_negativa, documento in self._rankings[codigo_curso].desde(inicio):
+            if nota_minima is not None and -nota_negativa < nota_minima:
+                return
+            yield (documento, codigo_curso, -nota_negativa)
+    
+    @con_operacion
     def eliminar_estudiante(self, documento):
         if documento in self.estudiantes:
-            # Eliminar de cursos
-            for codigo_curso in self.estudiantes[documento].cursos:
-                if codigo_curso in self.cursos:
-                    self.cursos[codigo_curso].estudiantes.remove(documento)
-            
-            # Eliminar matrículas
-            self.matriculas = [m for m in self.matriculas if m[0] != documento]
-            
-            # Eliminar estudiante
-            del self.estudiantes[documento]
+            with self.eventos.lote():
+                self._quitar_estudiante(documento)
+            self._notificar('eliminar_estudiante', documento)
             return True
         return False
     
+    @con_operacion
     def eliminar_curso(self, codigo_curso):
         if codigo_curso in self.cursos:
-            # Eliminar de estudiantes
-            for documento in self.cursos[codigo_curso].estudiantes:
-                if documento in self.estudiantes:
-                    self.estudiantes[documento].cursos.remove(codigo_curso)
-                    if codigo_curso in self.estudiantes[documento].notas:
-                        del self.estudiantes[documento].notas[codigo_curso]
-            
-            # Eliminar matrículas
-            self.matriculas = [m for m in self.matriculas if m[1] != codigo_curso]
-            
-            # Eliminar curso
-            del self.cursos[codigo_curso]
+            with self.eventos.lote():
+                self._quitar_curso(codigo_curso)
+            self._notificar('eliminar_curso', codigo_curso)
             return True
         return False
     
-    def cargar_datos_csv(self, archivo_estudiantes, archivo_cursos=None):
+    # ==================== OPERACIONES EN LOTE ====================
+    # Validan todo el lote antes de tocar nada, lo aplican completo o no aplican
+    # nada y notifican una sola vez (un solo refresco de la vista, una línea del diario)
+    
+    @con_operacion
+    def matricular_estudiantes(self, matriculas):
+        """
+        Matricula varios estudiantes de una vez.
+        
+        Args:
+            matriculas: Iterable de (documento, codigo_curso, nota)
+            
+        Raises:
+            ValueError: Con todos los errores del lote; en ese caso no se aplica ninguna
+        """
+        matriculas = [tuple(matricula) for matricula in matriculas]
+        errores = []
+        vistas = set()
+        for numero, (documento, codigo_curso, nota) in enumerate(matriculas, 1):
+            error = self._validar_matricula(documento, codigo_curso, nota)
+            if error is None and (documento, codigo_curso) in vistas:
+                error = "Matrícula repetida en el lote"
+            if error:
+                errores.append(f"{numero}. {documento} en {codigo_curso}: {error}")
+            vistas.add((documento, codigo_curso))
+        self._verificar_lote(errores)
+        
+        with self._aplicar_lote() as deshacer:
+            for documento, codigo_curso, nota in matriculas:
+                self._vincular(documento, codigo_curso, nota)
+                deshacer.append(lambda d=documento, c=codigo_curso: self._desvincular(d, c))
+        self._notificar('matricular_estudiantes', matriculas)
+    
+    @con_operacion
+    def actualizar_notas(self, cambios):
+        """
+        Cambia varias notas de una vez. Si una matrícula se repite, queda la última nota.
+        
+        Args:
+            cambios: Iterable de (documento, codigo_curso, nueva_nota)
+            
+        Raises:
+            ValueError: Con todos los errores del lote; en ese caso no se aplica ninguno
+        """
+        cambios = [tuple(cambio) for cambio in cambios]
+        errores = []
+        for numero, (documento, codigo_curso, nueva_nota) in enumerate(cambios, 1):
+            error = self._validar_cambio_nota(documento, codigo_curso, nueva_nota)
+            if error:
+                errores.append(f"{numero}. {documento} en {codigo_curso}: {error}")
+        self._verificar_lote(errores)
+        
+        with self._aplicar_lote() as deshacer:
+            for documento, codigo_curso, nueva_nota in cambios:
+                nota_anterior = self._matriculas[(documento, codigo_curso)]
+                self._cambiar_nota(documento, codigo_curso, nueva_nota)
+                deshacer.append(lambda d=documento, c=codigo_curso, n=nota_anterior: self._cambiar_nota(d, c, n))
+        self._notificar('actualizar_notas', cambios)
+        return True
+    
+    @con_operacion
+    def eliminar_estudiantes(self, documentos):
+        """
+        Elimina varios estudiantes con sus matrículas. Los repetidos se eliminan una vez.
+        
+        Raises:
+            ValueError: Si alguno no existe; en ese caso no se elimina ninguno
+        """
+        documentos = list(dict.fromkeys(documentos))
+        self._verificar_lote([f"{documento}: Estudiante no encontrado"
+                         for documento in documentos if documento not in self.estudiantes])
+        
+        with self._aplicar_lote() as deshacer:
+            for documento in documentos:
+                estudiante = self.estudiantes[documento]
+                datos = (documento, estudiante.nombre, estudiante.apellidos,
+                         estudiante.correo, estudiante.fecha_nac)
+                notas = list(estudiante.notas.items())
+                self._quitar_estudiante(documento, indexar=False)
+                deshacer.append(lambda datos=datos, notas=notas: self._restaurar_estudiante(datos, notas))
+            # La cohorte sale del índice de búsqueda de una vez
+            if self.motor is None:
+                self._indice_busqueda.quitar_lote(documentos)
+        self._notificar('eliminar_estudiantes', documentos)
+        return True
+    
+    @con_operacion
+    def eliminar_cursos(self, codigos):
+        """
+        Elimina varios cursos con sus matrículas. Los repetidos se eliminan una vez.
+        
+        Raises:
+            ValueError: Si alguno no existe; en ese caso no se elimina ninguno
+        """
+        codigos = list(dict.fromkeys(codigos))
+        self._verificar_lote([f"{codigo}: Curso no encontrado"
+                         for codigo in codigos if codigo not in self.cursos])
+        
+        with self._aplicar_lote() as deshacer:
+            for codigo in codigos:
+                curso = self.cursos[codigo]
+                notas = [(documento, self._matriculas[(documento, codigo)]) for documento in curso.estudiantes]
+                nombre = curso.nombre
+                self._quitar_curso(codigo)
+                deshacer.append(lambda c=codigo, nombre=nombre, notas=notas: self._restaurar_curso(c, nombre, notas))
+        self._notificar('eliminar_cursos', codigos)
+        return True
+    
+    @contextmanager
+    def _aplicar_lote(self):
+        # Si algo falla a mitad del lote, los pasos ya aplicados se deshacen en orden
+        # inverso; con motor, además, sus escrituras se revierten en una transacción.
+        # Los eventos del lote (y de lo deshecho) se entregan juntos al final
+        deshacer = []
+        transaccion = self.motor.transaccion() if self.motor is not None else nullcontext()
+        with self.eventos.lote(), transaccion:
+            try:
+                yield deshacer
+            except BaseException:
+                for paso in reversed(deshacer):
+                    paso()
+                raise
+    
+    def _verificar_lote(self, errores):
+        if errores:
+            detalle = "\n".join(errores[:10])
+            if len(errores) > 10:
+                detalle += f"\n... y {len(errores) - 10} errores más"
+            raise ValueError(f"Lote rechazado, no se aplicó ningún cambio:\n{detalle}")
+    
+    def _restaurar_estudiante(self, datos, notas):
+        self._agregar_estudiante(*datos)
+        for codigo_curso, nota in notas:
+            self._vincular(datos[0], codigo_curso, nota)
+    
+    def _restaurar_curso(self, codigo, nombre, notas):
+        self._agregar_curso(codigo, nombre)
+        for documento, nota in notas:
+            self._vincular(documento, codigo, nota)
+    
+    @con_lectura
+    def columnas_matriculas(self):
+        """
+        Retorna las matrículas en columnas NumPy para consumidores vectorizados.
+        
+        En modo columnar son vistas sin copia del almacén; en modo normal se
+        construyen en una sola pasada.
+        
+        Returns:
+            tuple: (ids_estudiante, ids_curso, notas, documentos, codigos)
+        """
+        if self.columnar or self.motor is not None:
+            return self._matriculas.columnas()
+        
+        import numpy as np
+        ids_estudiante = {}
+        ids_curso = {}
+        total = len(self._matriculas)
+        estudiantes = np.fromiter(
+            (ids_estudiante.setdefault(doc, len(ids_estudiante)) for doc, _ in self._matriculas),
+            dtype=np.int32, count=total
+        )
+        cursos = np.fromiter(
+            (ids_curso.setdefault(cod, len(ids_curso)) for _, cod in self._matriculas),
+            dtype=np.int32, count=total
+        )
+        notas = np.fromiter(self._matriculas.values(), dtype=np.float64, count=total)
+        return estudiantes, cursos, notas, list(ids_estudiante), list(ids_curso)
+    
+    def _agregar_estudiante(self, documento, nombre, apellidos, correo, fecha_nac, indexar=True):
+        # Alta sin validaciones, para datos ya validados (indexar: ver _quitar_estudiante)
+        self._antes_de_escribir()
+        if self.columnar or self.motor is not None:
+            estudiante = EstudianteColumnar(documento, nombre, apellidos, correo, fecha_nac, self._matriculas)
+        else:
+            estudiante = Estudiante(documento, nombre, apellidos, correo, fecha_nac)
+        if self.motor is None:
+            self._registrar_anterior('estudiantes', documento)
+        self.estudiantes[documento] = estudiante
+        if self.motor is None and indexar:
+            self._indice_busqueda.agregar(documento, nombre, apellidos, documento, correo)
+        self._marcar('estudiantes', documento)
+        if self.eventos.activo:
+            self.eventos.emitir(EstudianteAgregado(documento))
+        return estudiante
+    
+    def _agregar_estudiantes(self, filas):
+        # Alta en lote de (documento, nombre, apellidos, correo, fecha_nac) ya
+        # validados; el índice de búsqueda se arma una vez para todo el lote
+        filas = list(filas)
+        for fila in filas:
+            self._agregar_estudiante(*fila, indexar=False)
+        if self.motor is None:
+            self._indice_busqueda.agregar_lote(
+                (documento, nombre, apellidos, documento, correo)
+                for documento, nombre, apellidos, correo, _ in filas)
+    
+    def _agregar_curso(self, codigo, nombre):
+        self._antes_de_escribir()
+        if self.columnar or self.motor is not None:
+            curso = CursoColumnar(codigo, nombre, self._matriculas)
+        else:
+            curso = Curso(codigo, nombre)
+        if self.motor is None:
+            self._registrar_anterior('cursos', codigo)
+        self.cursos[codigo] = curso
+        self._registrar_anterior('_estadisticas', codigo)
+        self._estadisticas[codigo] = EstadisticasCurso()
+        if self.motor is None and not self.columnar:
+            self._registrar_anterior('_rankings', codigo)
+            self._rankings[codigo] = ListaOrdenada()
+        self._marcar('cursos', codigo)
+        if self.eventos.activo:
+            self.eventos.emitir(CursoAgregado(codigo))
+        return curso
+    
+    def _quitar_estudiante(self, documento, indexar=True):
+        # indexar=False deja el documento en el índice de búsqueda: quien
+        # elimina un lote lo quita del índice después, todo junto
+        self._antes_de_escribir()
+        # Eliminar matrículas y referencias en cursos
+        for codigo_curso in list(self.estudiantes[documento].cursos):
+            self._desvincular(documento, codigo_curso)
+        
+        # Eliminar estudiante
+        if self.motor is None:
+            self._registrar_anterior('estudiantes', documento)
+        del self.estudiantes[documento]
+        if self.motor is None and indexar:
+            self._indice_busqueda.quitar(documento)
+        self._marcar('estudiantes', documento)
+        if self.eventos.activo:
+            self.eventos.emitir(EstudianteEliminado(documento))
+    
+    def _quitar_curso(self, codigo_curso):
+        self._antes_de_escribir()
+        # Eliminar matrículas y referencias en estudiantes
+        for documento in list(self.cursos[codigo_curso].estudiantes):
+            self._desvincular(documento, codigo_curso)
+        
+        # Eliminar curso
+        if self.motor is None:
+            self._registrar_anterior('cursos', codigo_curso)
+        del self.cursos[codigo_curso]
+        self._registrar_anterior('_estadisticas', codigo_curso)
+        del self._estadisticas[codigo_curso]
+        if self.motor is None and not self.columnar:
+            self._registrar_anterior('_rankings', codigo_curso)
+            del self._rankings[codigo_curso]
+        self._marcar('cursos', codigo_curso)
+        if self.eventos.activo:
+            self.eventos.emitir(CursoEliminado(codigo_curso))
+    
+    def _vincular(self, documento, codigo_curso, nota):
+        # Único punto de alta de una matrícula: índice, estudiante y curso
+        self._antes_de_escribir()
+        if self.motor is None:
+            self._registrar_anterior('_matriculas', (documento, codigo_curso))
+        self._matriculas[(documento, codigo_curso)] = nota
+        self._estadisticas_propias(codigo_curso).agregar(nota)
+        self._propio('_estadisticas_globales', copy).agregar(nota)
+        self._marcar('matriculas', (documento, codigo_curso))
+        if self.motor is None and not self.columnar:
+            # Con motor o en modo columnar, el almacén ya refleja la matrícula
+            self._estudiante_propio(documento)._registrar_matricula(codigo_curso, nota)
+            self._curso_propio(codigo_curso)._registrar_estudiante(documento)
+            self._ranking_propio(codigo_curso).agregar((-nota, documento))
+            self._propio('_notas', ListaOrdenada.copia).agregar(nota)
+        if self.eventos.activo:
+            self.eventos.emitir(MatriculaAgregada(documento, codigo_curso, nota))
+    
+    def _vincular_lote(self, notas):
+        # Alta en lote de matrículas {(documento, codigo_curso): nota} nuevas, de
+        # estudiantes y cursos existentes. Índice, rankings y agregados se
+        # actualizan una vez por curso y no matrícula a matrícula; con motor o
+        # con lecturas vivas (que guardan valores anteriores) se vincula una a una
+        if self.motor is not None or self._lecturas:
+            for (documento, codigo_curso), nota in notas.items():
+                self._vincular(documento, codigo_curso, nota)
+            return
+        if not notas:
+            return
+        self._antes_de_escribir()
+        por_curso = {}  # codigo -> [(documento, nota)]
+        for (documento, codigo_curso), nota in notas.items():
+            filas = por_curso.get(codigo_curso)
+            if filas is None:
+                filas = por_curso[codigo_curso] = []
+            filas.append((documento, nota))
+
+        if self.columnar:
+            claves = notas.keys()
+            self._matriculas.agregar_lote([d for d, _ in claves], [c for _, c in claves],
+                                          list(notas.values()))
+        else:
+            self._matriculas.update(notas)
+            estudiantes, cursos = self.estudiantes, self.cursos
+            for (documento, codigo_curso), nota in notas.items():
+                estudiantes[documento]._registrar_matricula(codigo_curso, nota)
+            for codigo_curso, filas in por_curso.items():
+                curso = cursos[codigo_curso]
+                for documento, _ in filas:
+                    curso._registrar_estudiante(documento)
+                self._ranking_propio(codigo_curso).agregar_lote(
+                    [(-nota, documento) for documento, nota in filas])
+            self._propio('_notas', ListaOrdenada.copia).agregar_lote(notas.values())
+
+        # Los agregados globales suman los del lote de cada curso
+        lotes = []
+        for codigo_curso, filas in por_curso.items():
+            lote = EstadisticasCurso()
+            lote.agregar_lote([nota for _, nota in filas])
+            self._estadisticas_propias(codigo_curso).combinar([lote])
+            lotes.append(lote)
+        self._propio('_estadisticas_globales', copy).combinar(lotes)
+        if self._cambios is not None:
+            for clave in notas:
+                self._marcar('matriculas', clave)
+        if self.eventos.activo:
+            for (documento, codigo_curso), nota in notas.items():
+                self.eventos.emitir(MatriculaAgregada(documento, codigo_curso, nota))
+    
+    def _desvincular(self, documento, codigo_curso):
+        # Único punto de baja de una matrícula; retorna la nota eliminada
+        self._antes_de_escribir()
+        if self.motor is None:
+            self._registrar_anterior('_matriculas', (documento, codigo_curso))
+        nota = self._matriculas.pop((documento, codigo_curso))
+        self._estadisticas_propias(codigo_curso).quitar(nota)
+        self._propio('_estadisticas_globales', copy).quitar(nota)
+        self._marcar('matriculas', (documento, codigo_curso), quitada=True)
+        if self.motor is None and not self.columnar:
+            self._estudiante_propio(documento)._retirar_matricula(codigo_curso)
+            self._curso_propio(codigo_curso)._retirar_estudiante(documento)
+            self._ranking_propio(codigo_curso).quitar((-nota, documento))
+            self._propio('_notas', ListaOrdenada.copia).quitar(nota)
+        if self.eventos.activo:
+            self.eventos.emitir(MatriculaEliminada(documento, codigo_curso, nota))
+        return nota
+    
+    def _cambiar_nota(self, documento, codigo_curso, nueva_nota):
+        self._antes_de_escribir()
+        clave = (documento, codigo_curso)
+        nota_anterior = self._matriculas[clave]
+        if self.motor is None:
+            self._registrar_anterior('_matriculas', clave)
+        self._matriculas[clave] = nueva_nota
+        self._estadisticas_propias(codigo_curso).reemplazar(nota_anterior, nueva_nota)
+        self._propio('_estadisticas_globales', copy).reemplazar(nota_anterior, nueva_nota)
+        self._marcar_nota(clave)
+        if self.motor is None and not self.columnar:
+            self._estudiante_propio(documento)._registrar_nota(codigo_curso, nueva_nota)
+            ranking = self._ranking_propio(codigo_curso)
+            ranking.quitar((-nota_anterior, documento))
+            ranking.agregar((-nueva_nota, documento))
+            notas = self._propio('_notas', ListaOrdenada.copia)
+            notas.quitar(nota_anterior)
+            notas.agregar(nueva_nota)
+        if self.eventos.activo:
+            self.eventos.emitir(NotaCambiada(documento, codigo_curso, nota_anterior, nueva_nota))
+    
+    @con_operacion
+    def cargar_datos_csv(self, archivo_estudiantes, archivo_cursos=None,
+                         archivo_matriculas=None, archivo_rechazos=None,
+                         tamano_bloque=None):
+        """
+        Carga masiva por bloques desde CSV (ver carga_masiva.cargar_masivo).
+        
+        Args:
+            tamano_bloque: Filas por bloque de lectura y validación
+        
+        Returns:
+            dict: Filas cargadas por tipo y total de rechazadas
+        """
+        from carga_masiva import cargar_masivo, TAMANO_BLOQUE
+        version = self.version
+        self.eventos.iniciar_recarga()
         try:
-            with open(archivo_estudiantes, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    try:
-                        self.crear_estudiante(
-                            row['documento'], row['nombre'], 
-                            row['apellidos'], row['correo'], row['fecha_nac']
-                        )
-                    except (ValueError, KeyError):
-                        pass  # Ignorar duplicados o datos inválidos
+            resumen = cargar_masivo(
+                self, archivo_estudiantes, archivo_cursos,
+                archivo_matriculas, archivo_rechazos,
+                tamano_bloque=tamano_bloque or TAMANO_BLOQUE
+            )
         except Exception as e:
+            if self.motor is None and self.version != version:
+                # Sin motor no se deshace: las filas cargadas antes del error quedan
+                self._notificar('cargar')
             raise ValueError(f"Error al cargar CSV: {str(e)}")
+        finally:
+            self.eventos.terminar_recarga()
+        self._notificar('cargar')
+        return resumen
     
-    def guardar_datos_json(self, archivo):
-        datos = {
-            'estudiantes': [est.to_dict() for est in self.estudiantes.values()],
-            'cursos': [curso.to_dict() for curso in self.cursos.values()],
-            'matriculas': self.matriculas
-        }
-        with open(archivo, 'w', encoding='utf-8') as f:
-            json.dump(datos, f, indent=2, ensure_ascii=False)
+    @con_escritura
+    def guardar_datos_json(self, archivo, compacto=False, incremental=False):
+        """
+        Guarda el modelo escribiendo estudiantes, cursos y matrículas uno a uno.
+        
+        Args:
+            compacto: Sin sangría ni espacios; por defecto usa indent=2
+            incremental: Si archivo es el JSON del que se cargó o en el que se
+                guardó por última vez, solo agrega los cambios a archivo.delta
+        
+        Returns:
+            bool: True si se guardó solo el delta
+        """
+        if incremental and self._base_json == os.path.abspath(archivo) and os.path.exists(archivo):
+            self._guardar_delta()
+            return True
+        
+        escribir_json(archivo, [
+            ('estudiantes', (est.to_dict() for est in self.estudiantes.values())),
+            ('cursos', (curso.to_dict() for curso in self.cursos.values())),
+            ('matriculas', self.matriculas)
+        ], compacto=compacto)
+        # El archivo completo ya incluye los deltas anteriores
+        if os.path.exists(f"{archivo}.delta"):
+            os.remove(f"{archivo}.delta")
+        self._rastrear_cambios(archivo)
+        return False
+    
+    @con_escritura
+    def compactar_datos_json(self, compacto=False):
+        """Reescribe el JSON base completo incorporando sus deltas."""
+        if self._base_json is None:
+            raise ValueError("No hay un archivo JSON cargado o guardado para compactar")
+        self.guardar_datos_json(self._base_json, compacto=compacto)
+    
+    def _guardar_delta(self):
+        # Una línea JSON por guardado con el estado actual de cada clave modificada;
+        # None indica que el registro se eliminó. Las matrículas indican además si
+        # se quitaron antes de su estado actual (y por tanto pasan al final del orden)
+        if not self.hay_cambios():
+            return
+        estudiantes = [[doc, self.estudiantes[doc].to_dict() if doc in self.estudiantes else None]
+                       for doc in self._cambios['estudiantes']]
+        cursos = [[codigo, self.cursos[codigo].nombre if codigo in self.cursos else None]
+                  for codigo in self._cambios['cursos']]
+        matriculas = [[doc, codigo, self._matriculas.get((doc, codigo)), quitada]
+                      for (doc, codigo), quitada in self._cambios['matriculas'].items()]
+        linea = json.dumps({'estudiantes': estudiantes, 'cursos': cursos, 'matriculas': matriculas},
+                           ensure_ascii=False, separators=(',', ':'))
+        with open(f"{self._base_json}.delta", 'a', encoding='utf-8') as f:
+            f.write(linea + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        self._rastrear_cambios(self._base_json)
     
+    @con_operacion
     def cargar_datos_json(self, archivo):
-        with open(archivo, 'r', encoding='utf-8') as f:
-            datos = json.load(f)
+        """
+        Reemplaza el contenido del modelo por el del JSON y sus deltas.
+
+        El archivo se carga primero en un modelo aparte y sus tablas pasan a
+        este solo si la carga termina: con un archivo dañado, el modelo (y su
+        motor, si lo tiene) queda como estaba.
+        """
+        nuevo = self.modelo_de_carga()
+        nuevo._leer_json(archivo)
+        self.reemplazar(nuevo)
+        self._rastrear_cambios(archivo)
+
+    def _leer_json(self, archivo):
+        # Se lee elemento a elemento; las matrículas son la fuente de verdad
+        # para cursos, notas y estudiantes
+        pendientes = []
+        for seccion, datos in leer_json(archivo):
+            if seccion == 'estudiantes':
+                self._agregar_estudiante(
+                    datos['documento'], datos['nombre'],
+                    datos['apellidos'], datos['correo'], datos['fecha_nac']
+                )
+            elif seccion == 'cursos':
+                self._agregar_curso(datos['codigo'], datos['nombre'])
+            elif seccion == 'matriculas':
+                if not self._cargar_matricula(*datos):
+                    pendientes.append(datos)
+
+        # Matrículas que aparecieron antes que su estudiante o su curso
+        for datos in pendientes:
+            self._cargar_matricula(*datos)
+
+        if os.path.exists(f"{archivo}.delta"):
+            self._aplicar_deltas(f"{archivo}.delta")
+
+    def modelo_de_carga(self):
+        """
+        Retorna un ModeloSIGA vacío donde preparar una carga para reemplazar();
+        con motor, en columnas (lo más compacto).
+        """
+        return ModeloSIGA(columnar=self.columnar or self.motor is not None)
+
+    @con_operacion
+    def reemplazar(self, otro):
+        """
+        Reemplaza el contenido del modelo por el de otro ModeloSIGA sin motor,
+        que no se debe seguir usando.
+
+        Permite cargar en otro hilo sin bloquear este modelo: la carga se hace
+        en un modelo aparte y el reemplazo solo toma sus tablas (con motor, es
+        una transacción que copia los registros).
+        """
+        if otro.motor is not None:
+            raise ValueError("El modelo de reemplazo no puede tener motor")
+        if self.motor is None and otro.columnar != self.columnar:
+            raise ValueError("Los modelos deben usar el mismo almacenamiento (columnar o no)")
+        self.eventos.iniciar_recarga()
+        try:
+            self._adoptar(otro)
+        finally:
+            self.eventos.terminar_recarga()
+        self._notificar('cargar')
+
+    # Tablas que _adoptar toma de otro modelo
+    _TABLAS = ('estudiantes', 'cursos', '_matriculas', '_estadisticas', '_estadisticas_globales',
+               '_rankings', '_notas', '_indice_busqueda')
+
+    def _adoptar(self, otro):
+        # Reemplaza el contenido por el de otro modelo ya cargado (sin motor). Las
+        # tablas anteriores no se modifican más: las lecturas vivas las conservan
+        if self.motor is None:
+            self._reiniciar()
+            for nombre in self._TABLAS:
+                setattr(self, nombre, getattr(otro, nombre))
+            return
+
+        # Con motor, vaciar y dar de alta es la transacción de la operación
+        base = self._base_json, self._cambios
+        try:
+            self._reiniciar()
+            for est in otro.estudiantes.values():
+                self._agregar_estudiante(est.documento, est.nombre, est.apellidos,
+                                         est.correo, est.fecha_nac)
+            for curso in otro.cursos.values():
+                self._agregar_curso(curso.codigo, curso.nombre)
+            for (documento, codigo_curso), nota in otro._matriculas.items():
+                self._vincular(documento, codigo_curso, nota)
+        except BaseException:
+            # El motor deshace la transacción y _operacion relee los agregados
+            self._base_json, self._cambios = base
+            raise
+    
+    @con_lectura
+    def guardar_instantanea(self, archivo, generacion=0):
+        """Guarda el modelo como instantánea binaria (ver instantanea.py)."""
+        from instantanea import escribir_instantanea
+        escribir_instantanea(self, archivo, generacion)
+
+    @staticmethod
+    def abrir_instantanea(archivo):
+        """
+        Abre una instantánea con mmap para consultarla sin cargarla.
+
+        Returns:
+            InstantaneaSIGA: Vista de solo lectura con las consultas del modelo
+        """
+        from instantanea import InstantaneaSIGA
+        return InstantaneaSIGA(archivo)
+
+    @con_operacion
+    def cargar_instantanea(self, archivo):
+        """
+        Reemplaza el contenido del modelo por el de una instantánea, para editarlo.
+
+        Como cargar_datos_json, se carga en un modelo aparte y solo reemplaza
+        al actual si la carga termina. Para cargar sin bloquear el modelo (la
+        interfaz al iniciar), cargar la instantánea en modelo_de_carga()
+        desde otro hilo y pasarlo después a reemplazar().
+
+        Returns:
+            int: Generación de la instantánea
+        """
+        nuevo = self.modelo_de_carga()
+        with self.abrir_instantanea(archivo) as instantanea:
+            generacion = instantanea.generacion
+            for est in instantanea.estudiantes.values():
+                nuevo._agregar_estudiante(est.documento, est.nombre, est.apellidos,
+                                          est.correo, est.fecha_nac)
+            for curso in instantanea.cursos.values():
+                nuevo._agregar_curso(curso.codigo, curso.nombre)
+            for documento, codigo_curso, nota in instantanea.matriculas:
+                nuevo._vincular(documento, codigo_curso, nota)
+        self.reemplazar(nuevo)
+        return generacion
+
+    @con_operacion
+    def cerrar_periodo(self, archivo, periodo):
+        """
+        Archiva el período en curso y empieza uno nuevo (ver periodos.py).
+
+        Las matrículas pasan al archivo del período; los estudiantes y cursos
+        siguen en el modelo para el período siguiente.
+
+        Args:
+            archivo: ArchivoPeriodos donde se guarda el período
+            periodo: Nombre del período que se cierra (ej. "2025-1")
+        """
+        # El período siguiente se prepara aparte: si archivar falla, el modelo no cambió
+        siguiente = self.modelo_de_carga()
+        for est in self.estudiantes.values():
+            siguiente._agregar_estudiante(est.documento, est.nombre, est.apellidos, est.correo, est.fecha_nac)
+        for curso in self.cursos.values():
+            siguiente._agregar_curso(curso.codigo, curso.nombre)
+
+        archivo.archivar(self, periodo)
+        self.eventos.iniciar_recarga()
+        try:
+            # Con motor, vaciar y volver a dar de alta es la transacción de la operación
+            self._adoptar(siguiente)
+        except BaseException:
+            # El modelo sigue con el período en curso: no debe quedar también archivado
+            archivo.descartar(periodo)
+            raise
+        finally:
+            self.eventos.terminar_recarga()
+        self._notificar('cargar')
+
+    def _aplicar_deltas(self, archivo_delta):
+        with open(archivo_delta, 'r', encoding='utf-8') as f:
+            lineas = f.readlines()
+        for i, linea in enumerate(lineas):
+            try:
+                delta = json.loads(linea)
+            except ValueError:
+                if i == len(lineas) - 1:
+                    break  # Guardado interrumpido: el último delta no llegó completo
+                raise
             
-        # Limpiar datos actuales
-        self.estudiantes = {}
-        self.cursos = {}
-        self.matriculas = []
-        
-        # Cargar estudiantes
-        for est_data in datos.get('estudiantes', []):
-            estudiante = Estudiante(
-                est_data['documento'], est_data['nombre'],
-                est_data['apellidos'], est_data['correo'], est_data['fecha_nac']
-            )
-            estudiante.cursos = est_data.get('cursos', [])
-            estudiante.notas = est_data.get('notas', {})
-            self.estudiantes[estudiante.documento] = estudiante
-        
-        # Cargar cursos
-        for curso_data in datos.get('cursos', []):
-            curso = Curso(curso_data['codigo'], curso_data['nombre'])
-            curso.estudiantes = curso_data.get('estudiantes', [])
-            self.cursos[curso.codigo] = curso
-        
-        # Cargar matrículas
-        self.matriculas = datos.get('matriculas', [])
+            # Un registro presente en el delta se eliminó o se volvió a crear:
+            # se quita el anterior con sus matrículas y estas se reponen desde el delta
+            for documento, datos in delta['estudiantes']:
+                if documento in self.estudiantes:
+                    self._quitar_estudiante(documento)
+                if datos is not None:
+                    self._agregar_estudiante(datos['documento'], datos['nombre'], datos['apellidos'],
+                                             datos['correo'], datos['fecha_nac'])
+            for codigo, nombre in delta['cursos']:
+                if codigo in self.cursos:
+                    self._quitar_curso(codigo)
+                if nombre is not None:
+                    self._agregar_curso(codigo, nombre)
+            for documento, codigo_curso, nota, quitada in delta['matriculas']:
+                matriculado = (documento, codigo_curso) in self._matriculas
+                if matriculado and (nota is None or quitada):
+                    self._desvincular(documento, codigo_curso)
+                    matriculado = False
+                if nota is None:
+                    continue
+                if matriculado:
+                    self._cambiar_nota(documento, codigo_curso, nota)
+                else:
+                    self._vincular(documento, codigo_curso, nota)
+    
+    def _cargar_matricula(self, documento, codigo_curso, nota):
+        if documento not in self.estudiantes or codigo_curso not in self.cursos:
+            return False
+        if (documento, codigo_curso) not in self._matriculas:
+            self._vincular(documento, codigo_curso, nota)
+        return True
     
     def _validar_documento(self, documento):
         return len(documento.strip()) > 0 and documento.isdigit()
     
     def _validar_email(self, email):
-        patron = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        return re.match(patron, email) is not None
+        return PATRON_EMAIL.match(email) is not None
     
     def _validar_fecha(self, fecha):
         try:
@@ -0,0 +1,100 @@
+## ==================== motor.py ====================
+"""
+Interfaz de los motores de almacenamiento de ModeloSIGA.
+
+Con ModeloSIGA(motor=...) los estudiantes, cursos y matrículas viven en el
+motor y no en diccionarios del proceso; en memoria solo quedan los agregados
+por curso. Un motor expone tres tablas con interfaz de diccionario y las
+consultas que sabe resolver por sí mismo.
+
+Cada operación pública del modelo es una transacción del motor (ver
+ModeloSIGA._operacion): se confirma al terminar o se deshace si falla.
+"""
+
+from abc import ABC, abstractmethod
+
+
+class MotorAlmacenamiento(ABC):
+    """
+    Clase base de los motores. Las subclases deben definir, además de los
+    métodos abstractos:
+
+        estudiantes   documento -> Estudiante (MutableMapping)
+        cursos        codigo -> Curso (MutableMapping)
+        matriculas    (documento, codigo_curso) -> nota, con la misma interfaz que
+                      AlmacenColumnar (cursos_de, notas_de, estudiantes_de, columnas)
+        escrituras    Sentencias de escritura ejecutadas desde que se abrió; si no
+                      cambia, una operación fallida no modificó nada
+    """
+
+    estudiantes = None
+    cursos = None
+    matriculas = None
+    escrituras = 0
+
+    @abstractmethod
+    def ranking(self, codigo_curso, n=None, ascendente=False):
+        """
+        Retorna [(Estudiante, nota)] del curso ordenado por nota (y documento a
+        igual nota), limitado a n filas si n no es None.
+        """
+
+    @abstractmethod
+    def matriculas_por_curso(self, codigo_curso):
+        """Retorna [(documento, codigo_curso, nota)] en orden de matrícula."""
+
+    @abstractmethod
+    def consultar_matriculas(self, codigo_curso, documento, nota_minima, nota_maxima, aprobado,
+                             nota_aprobatoria, orden, despues_de, limite):
+        """
+        Retorna hasta limite filas (documento, codigo_curso, nota) para
+        ModeloSIGA.consultar_matriculas: las del filtro posteriores a despues_de,
+        en el orden de modelo.CLAVES_MATRICULAS[orden].
+        """
+
+    @abstractmethod
+    def contar_matriculas(self, codigo_curso, documento, nota_minima, nota_maxima):
+        """Cuenta las matrículas del filtro (None no filtra); el rango de notas incluye ambos extremos."""
+
+    @abstractmethod
+    def agregados_por_curso(self, nota_aprobatoria):
+        """Genera (codigo, total, suma, aprobados) por cada curso, incluidos los vacíos."""
+
+    @abstractmethod
+    def conteos_por_nota(self):
+        """Genera (codigo_curso, nota, cantidad) por cada nota distinta de cada curso."""
+
+    @abstractmethod
+    def buscar_estudiantes(self, termino):
+        """
+        Retorna los Estudiante con algún campo que contiene el término, sin
+        distinguir tildes (como IndiceBusqueda.buscar), leídos en la misma consulta.
+        """
+
+    @abstractmethod
+    def transaccion(self):
+        """Context manager: las escrituras del bloque se confirman juntas o ninguna."""
+
+    @abstractmethod
+    def confirmar(self):
+        """Hace durables las escrituras hechas fuera de transaccion()."""
+
+    @abstractmethod
+    def abrir_lectura(self):
+        """
+        Retorna un motor de solo lectura fijado en el estado confirmado actual, que
+        no ve escrituras posteriores y se puede usar desde otro hilo. Se cierra con cerrar().
+        """
+
+    @abstractmethod
+    def vaciar(self):
+        """Elimina todos los registros."""
+
+    def cerrar(self):
+        self.confirmar()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
@@ -0,0 +1,427 @@
+## ==================== motor_sqlite.py ====================
+"""
+Motor de almacenamiento SQLite para ModeloSIGA.
+
+Los registros se guardan en tablas indexadas y se leen bajo demanda, de modo
+que la institución puede ser más grande que la memoria disponible. Las
+consultas de ranking, búsqueda y matrículas por curso se resuelven en SQL.
+
+Cada operación pública del modelo es una transacción que se confirma al
+terminar (ver ModeloSIGA._operacion), y las cargas en bloque son una sola
+transacción; cada cambio se persiste una sola vez, sin reescribir el archivo
+completo.
+
+Uso:
+    modelo = ModeloSIGA(motor=MotorSQLite("siga.db"))
+    ...
+    modelo.motor.cerrar()
+"""
+
+import sqlite3
+from collections.abc import MutableMapping
+from contextlib import contextmanager
+
+from busqueda import normalizar_texto
+from modelo import EstudianteColumnar, CursoColumnar
+from motor import MotorAlmacenamiento
+
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS estudiantes (
+    id INTEGER PRIMARY KEY,
+    documento TEXT NOT NULL UNIQUE,
+    nombre TEXT NOT NULL,
+    apellidos TEXT NOT NULL,
+    correo TEXT NOT NULL,
+    fecha_nac TEXT NOT NULL,
+    texto TEXT NOT NULL  -- campos normalizados para la búsqueda
+);
+CREATE TABLE IF NOT EXISTS cursos (
+    id INTEGER PRIMARY KEY,
+    codigo TEXT NOT NULL UNIQUE,
+    nombre TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS matriculas (
+    id INTEGER PRIMARY KEY,
+    documento TEXT NOT NULL,
+    codigo_curso TEXT NOT NULL,
+    nota REAL NOT NULL,
+    UNIQUE (documento, codigo_curso)
+);
+CREATE INDEX IF NOT EXISTS matriculas_ranking ON matriculas (codigo_curso, nota DESC, documento);
+CREATE INDEX IF NOT EXISTS matriculas_nota ON matriculas (nota DESC, documento, codigo_curso);
+"""
+
+# Índice de trigramas mantenido por SQLite (requiere FTS5, presente en las versiones actuales)
+ESQUEMA_BUSQUEDA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS busqueda USING fts5(
+    texto, content='estudiantes', content_rowid='id', tokenize='trigram'
+);
+CREATE TRIGGER IF NOT EXISTS estudiantes_alta AFTER INSERT ON estudiantes BEGIN
+    INSERT INTO busqueda (rowid, texto) VALUES (new.id, new.texto);
+END;
+CREATE TRIGGER IF NOT EXISTS estudiantes_baja AFTER DELETE ON estudiantes BEGIN
+    INSERT INTO busqueda (busqueda, rowid, texto) VALUES ('delete', old.id, old.texto);
+END;
+CREATE TRIGGER IF NOT EXISTS estudiantes_cambio AFTER UPDATE ON estudiantes BEGIN
+    INSERT INTO busqueda (busqueda, rowid, texto) VALUES ('delete', old.id, old.texto);
+    INSERT INTO busqueda (rowid, texto) VALUES (new.id, new.texto);
+END;
+"""
+
+COLUMNAS_ESTUDIANTE = "documento, nombre, apellidos, correo, fecha_nac"
+
+# Separa los campos de la columna texto; a diferencia de IndiceBusqueda.SEPARADOR ('\x00'),
+# SQLite no trunca las cadenas en él
+SEPARADOR = '\x1f'
+
+
+class MotorSQLite(MotorAlmacenamiento):
+    def __init__(self, archivo):
+        self.archivo = archivo
+        # Sin transacciones implícitas: el motor decide cuándo abrir y confirmar. El
+        # cerrojo de ModeloSIGA ordena el uso desde varios hilos
+        self._conexion = sqlite3.connect(archivo, isolation_level=None, check_same_thread=False)
+        self._conexion.execute("PRAGMA journal_mode=WAL")
+        self._conexion.execute("PRAGMA synchronous=NORMAL")
+        self._conexion.executescript(ESQUEMA)
+        try:
+            self._conexion.executescript(ESQUEMA_BUSQUEDA)
+            self._fts = True
+        except sqlite3.OperationalError:
+            self._fts = False  # Sin FTS5: la búsqueda recorre la tabla
+
+        self.escrituras = 0
+        self._profundidad = 0     # Bloques transaccion() anidados
+
+        self.matriculas = _TablaMatriculas(self)
+        self.estudiantes = _TablaEstudiantes(self)
+        self.cursos = _TablaCursos(self)
+
+    # ==================== TRANSACCIONES ====================
+
+    def _escribir(self, sql, parametros=()):
+        # Fuera de transaccion(), SQLite confirma cada sentencia por sí mismo
+        cursor = self._conexion.execute(sql, parametros)
+        self.escrituras += 1
+        return cursor
+
+    def _leer(self, sql, parametros=()):
+        return self._conexion.execute(sql, parametros)
+
+    def confirmar(self):
+        if self._profundidad:
+            return  # Se confirma al salir del bloque transaccion() más externo
+        if self._conexion.in_transaction:
+            self._conexion.execute("COMMIT")
+
+    @contextmanager
+    def transaccion(self):
+        if not self._profundidad:
+            self.confirmar()
+            self._conexion.execute("BEGIN")
+        self._profundidad += 1
+        try:
+            yield self
+        except BaseException:
+            self._profundidad -= 1
+            if not self._profundidad:
+                self._conexion.execute("ROLLBACK")
+            raise
+        self._profundidad -= 1
+        if not self._profundidad:
+            self.confirmar()
+
+    def vaciar(self):
+        with self.transaccion():
+            for tabla in ('matriculas', 'estudiantes', 'cursos'):
+                self._escribir(f"DELETE FROM {tabla}")
+
+    def cerrar(self):
+        self.confirmar()
+        self._conexion.close()
+
+    def abrir_lectura(self):
+        # Con WAL, una transacción de lectura en otra conexión ve el último estado
+        # confirmado y no bloquea ni es bloqueada por las escrituras
+        if self.archivo == ':memory:':
+            raise ValueError("Una base de datos en memoria no admite lecturas concurrentes")
+        self.confirmar()
+        return _LecturaSQLite(self.archivo, self._fts)
+
+    # ==================== CONSULTAS ====================
+
+    def ranking(self, codigo_curso, n=None, ascendente=False):
+        orden = "m.nota ASC, m.documento DESC" if ascendente else "m.nota DESC, m.documento ASC"
+        filas = self._leer(
+            f"SELECT {_prefijar(COLUMNAS_ESTUDIANTE, 'e')}, m.nota FROM matriculas m "
+            f"JOIN estudiantes e ON e.documento = m.documento "
+            f"WHERE m.codigo_curso = ? ORDER BY {orden} LIMIT ?",
+            (codigo_curso, -1 if n is None else n))
+        return [(self.estudiantes._registro(fila[:5]), fila[5]) for fila in filas]
+
+    def matriculas_por_curso(self, codigo_curso):
+        return self._leer(
+            "SELECT documento, codigo_curso, nota FROM matriculas WHERE codigo_curso = ? ORDER BY id",
+            (codigo_curso,)).fetchall()
+
+    def consultar_matriculas(self, codigo_curso, documento, nota_minima, nota_maxima, aprobado,
+                             nota_aprobatoria, orden, despues_de, limite):
+        condiciones, parametros = _filtro_matriculas(codigo_curso, documento, nota_minima, nota_maxima)
+        if aprobado is not None:
+            condiciones.append("nota >= ?" if aprobado else "nota < ?")
+            parametros.append(nota_aprobatoria)
+        # Keyset: filas estrictamente posteriores al cursor, en términos del índice usado
+        if orden == 'curso':
+            if despues_de is not None:
+                codigo, nota_negativa, doc = despues_de
+                condiciones.append("(codigo_curso > ? OR codigo_curso = ? AND "
+                                   "(nota < ? OR nota = ? AND documento > ?))")
+                parametros += [codigo, codigo, -nota_negativa, -nota_negativa, doc]
+            orden_sql = "codigo_curso, nota DESC, documento"
+        else:
+            if despues_de is not None:
+                nota_negativa, doc, codigo = despues_de
+                condiciones.append("(nota < ? OR nota = ? AND "
+                                   "(documento > ? OR documento = ? AND codigo_curso > ?))")
+                parametros += [-nota_negativa, -nota_negativa, doc, doc, codigo]
+            orden_sql = "nota DESC, documento, codigo_curso"
+        donde = f"WHERE {' AND '.join(condiciones)} " if condiciones else ""
+        return self._leer(
+            f"SELECT documento, codigo_curso, nota FROM matriculas {donde}ORDER BY {orden_sql} LIMIT ?",
+            (*parametros, limite)).fetchall()
+
+    def contar_matriculas(self, codigo_curso, documento, nota_minima, nota_maxima):
+        condiciones, parametros = _filtro_matriculas(codigo_curso, documento, nota_minima, nota_maxima)
+        donde = f" WHERE {' AND '.join(condiciones)}" if condiciones else ""
+        return self._leer(f"SELECT count(*) FROM matriculas{donde}", parametros).fetchone()[0]
+
+    def agregados_por_curso(self, nota_aprobatoria):
+        return self._leer(
+            "SELECT c.codigo, count(m.id), total(m.nota), total(m.nota >= ?) FROM cursos c "
+            "LEFT JOIN matriculas m ON m.codigo_curso = c.codigo GROUP BY c.id ORDER BY c.id",
+            (nota_aprobatoria,))
+
+    def conteos_por_nota(self):
+        return self._leer("SELECT codigo_curso, nota, count(*) FROM matriculas GROUP BY codigo_curso, nota")
+
+    def buscar_estudiantes(self, termino):
+        termino = normalizar_texto(termino)
+        if SEPARADOR in termino:
+            return []
+        columnas = _prefijar(COLUMNAS_ESTUDIANTE, 'e')
+        if self._fts and len(termino) >= 3:
+            filas = self._leer(
+                f"SELECT {columnas} FROM busqueda JOIN estudiantes e ON e.id = busqueda.rowid "
+                "WHERE busqueda MATCH ?", ('"' + termino.replace('"', '""') + '"',))
+        else:
+            filas = self._leer(f"SELECT {columnas} FROM estudiantes e WHERE instr(e.texto, ?) > 0",
+                               (termino,))
+        return [self.estudiantes._registro(fila) for fila in filas]
+
+
+class _LecturaSQLite(MotorSQLite):
+    """Motor de solo lectura con conexión propia, fijado en una transacción de lectura."""
+
+    def __init__(self, archivo, fts):
+        self.archivo = archivo
+        # La conexión se crea en el hilo del modelo y se usa desde el del lector
+        self._conexion = sqlite3.connect(archivo, isolation_level=None, check_same_thread=False)
+        self._fts = fts
+        self.escrituras = 0
+        self._profundidad = 0
+
+        self.matriculas = _TablaMatriculas(self)
+        self.estudiantes = _TablaEstudiantes(self)
+        self.cursos = _TablaCursos(self)
+
+        # La instantánea de WAL se fija en la primera lectura de la transacción
+        self._conexion.execute("BEGIN")
+        self._conexion.execute("SELECT count(*) FROM cursos").fetchone()
+
+    def _escribir(self, sql, parametros=()):
+        raise TypeError("Un motor de lectura no admite escrituras")
+
+    def confirmar(self):
+        pass
+
+    def cerrar(self):
+        self._conexion.close()  # Descarta la transacción de lectura
+
+
+class _TablaEstudiantes(MutableMapping):
+    """documento -> Estudiante; los registros se construyen al leerlos."""
+
+    def __init__(self, motor):
+        self._motor = motor
+
+    def _registro(self, fila):
+        return EstudianteColumnar(*fila, self._motor.matriculas)
+
+    def __getitem__(self, documento):
+        fila = self._motor._leer(
+            f"SELECT {COLUMNAS_ESTUDIANTE} FROM estudiantes WHERE documento = ?", (documento,)).fetchone()
+        if fila is None:
+            raise KeyError(documento)
+        return self._registro(fila)
+
+    def __setitem__(self, documento, estudiante):
+        campos = (estudiante.nombre, estudiante.apellidos, documento, estudiante.correo)
+        texto = SEPARADOR.join(normalizar_texto(campo) for campo in campos)
+        self._motor._escribir(
+            f"INSERT INTO estudiantes ({COLUMNAS_ESTUDIANTE}, texto) VALUES (?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (documento) DO UPDATE SET nombre = excluded.nombre, "
+            "apellidos = excluded.apellidos, correo = excluded.correo, "
+            "fecha_nac = excluded.fecha_nac, texto = excluded.texto",
+            (documento, estudiante.nombre, estudiante.apellidos, estudiante.correo,
+             estudiante.fecha_nac, texto))
+
+    def __delitem__(self, documento):
+        if not self._motor._escribir("DELETE FROM estudiantes WHERE documento = ?", (documento,)).rowcount:
+            raise KeyError(documento)
+
+    def __contains__(self, documento):
+        return self._motor._leer(
+            "SELECT 1 FROM estudiantes WHERE documento = ?", (documento,)).fetchone() is not None
+
+    def __iter__(self):
+        for documento, in self._motor._leer("SELECT documento FROM estudiantes ORDER BY id"):
+            yield documento
+
+    def __len__(self):
+        return self._motor._leer("SELECT count(*) FROM estudiantes").fetchone()[0]
+
+    def values(self):
+        # Una sola consulta en lugar de una por documento
+        for fila in self._motor._leer(f"SELECT {COLUMNAS_ESTUDIANTE} FROM estudiantes ORDER BY id"):
+            yield self._registro(fila)
+
+
+class _TablaCursos(MutableMapping):
+    """codigo -> Curso; los registros se construyen al leerlos."""
+
+    def __init__(self, motor):
+        self._motor = motor
+
+    def _registro(self, fila):
+        return CursoColumnar(*fila, self._motor.matriculas)
+
+    def __getitem__(self, codigo):
+        fila = self._motor._leer("SELECT codigo, nombre FROM cursos WHERE codigo = ?", (codigo,)).fetchone()
+        if fila is None:
+            raise KeyError(codigo)
+        return self._registro(fila)
+
+    def __setitem__(self, codigo, curso):
+        self._motor._escribir(
+            "INSERT INTO cursos (codigo, nombre) VALUES (?, ?) "
+            "ON CONFLICT (codigo) DO UPDATE SET nombre = excluded.nombre", (codigo, curso.nombre))
+
+    def __delitem__(self, codigo):
+        if not self._motor._escribir("DELETE FROM cursos WHERE codigo = ?", (codigo,)).rowcount:
+            raise KeyError(codigo)
+
+    def __contains__(self, codigo):
+        return self._motor._leer("SELECT 1 FROM cursos WHERE codigo = ?", (codigo,)).fetchone() is not None
+
+    def __iter__(self):
+        for codigo, in self._motor._leer("SELECT codigo FROM cursos ORDER BY id"):
+            yield codigo
+
+    def __len__(self):
+        return self._motor._leer("SELECT count(*) FROM cursos").fetchone()[0]
+
+    def values(self):
+        for fila in self._motor._leer("SELECT codigo, nombre FROM cursos ORDER BY id"):
+            yield self._registro(fila)
+
+
+class _TablaMatriculas:
+    """(documento, codigo_curso) -> nota, con la interfaz de AlmacenColumnar."""
+
+    def __init__(self, motor):
+        self._motor = motor
+
+    def __len__(self):
+        return self._motor._leer("SELECT count(*) FROM matriculas").fetchone()[0]
+
+    def __contains__(self, clave):
+        return self.get(clave) is not None
+
+    def __getitem__(self, clave):
+        nota = self.get(clave)
+        if nota is None:
+            raise KeyError(clave)
+        return nota
+
+    def get(self, clave, defecto=None):
+        fila = self._motor._leer(
+            "SELECT nota FROM matriculas WHERE documento = ? AND codigo_curso = ?", clave).fetchone()
+        return fila[0] if fila else defecto
+
+    def __setitem__(self, clave, nota):
+        # Una nota actualizada conserva su posición (id) en el orden de matrícula
+        self._motor._escribir(
+            "INSERT INTO matriculas (documento, codigo_curso, nota) VALUES (?, ?, ?) "
+            "ON CONFLICT (documento, codigo_curso) DO UPDATE SET nota = excluded.nota", (*clave, nota))
+
+    def pop(self, clave):
+        nota = self[clave]
+        self._motor._escribir("DELETE FROM matriculas WHERE documento = ? AND codigo_curso = ?", clave)
+        return nota
+
+    def __iter__(self):
+        for clave, _ in self.items():
+            yield clave
+
+    def items(self):
+        for documento, codigo_curso, nota in self._motor._leer(
+                "SELECT documento, codigo_curso, nota FROM matriculas ORDER BY id"):
+            yield (documento, codigo_curso), nota
+
+    def values(self):
+        for nota, in self._motor._leer("SELECT nota FROM matriculas ORDER BY id"):
+            yield nota
+
+    def cursos_de(self, documento):
+        return [codigo for codigo, in self._motor._leer(
+            "SELECT codigo_curso FROM matriculas WHERE documento = ? ORDER BY id", (documento,))]
+
+    def notas_de(self, documento):
+        return dict(self._motor._leer(
+            "SELECT codigo_curso, nota FROM matriculas WHERE documento = ? ORDER BY id", (documento,)))
+
+    def estudiantes_de(self, codigo_curso):
+        return [documento for documento, in self._motor._leer(
+            "SELECT documento FROM matriculas WHERE codigo_curso = ? ORDER BY id", (codigo_curso,))]
+
+    def columnas(self):
+        """Mismo formato que AlmacenColumnar.columnas, construido en una pasada."""
+        import numpy as np
+        ids_estudiante = {}
+        ids_curso = {}
+        total = len(self)
+        estudiantes = np.empty(total, dtype=np.int32)
+        cursos = np.empty(total, dtype=np.int32)
+        notas = np.empty(total, dtype=np.float64)
+        for i, ((documento, codigo_curso), nota) in enumerate(self.items()):
+            estudiantes[i] = ids_estudiante.setdefault(documento, len(ids_estudiante))
+            cursos[i] = ids_curso.setdefault(codigo_curso, len(ids_curso))
+            notas[i] = nota
+        return estudiantes, cursos, notas, list(ids_estudiante), list(ids_curso)
+
+
+def _filtro_matriculas(codigo_curso, documento, nota_minima, nota_maxima):
+    # Condiciones WHERE (y sus parámetros) de los filtros que no son None
+    condiciones = []
+    parametros = []
+    for condicion, valor in (("codigo_curso = ?", codigo_curso), ("documento = ?", documento),
+                             ("nota >= ?", nota_minima), ("nota <= ?", nota_maxima)):
+        if valor is not None:
+            condiciones.append(condicion)
+            parametros.append(valor)
+    return condiciones, parametros
+
+
+def _prefijar(columnas, alias):
+    return ", ".join(f"{alias}.{columna.strip()}" for columna in columnas.split(","))
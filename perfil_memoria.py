@@ -0,0 +1,330 @@
+## ==================== perfil_memoria.py ====================
+"""
+Reporte de memoria de ModeloSIGA.
+
+Construye instituciones sintéticas de distintos tamaños y mide con
+tracemalloc cuántos bytes cuesta cada estudiante, curso y matrícula,
+incluyendo los índices que mantiene el modelo.
+
+Con --archivo perfila un conjunto de datos real (JSON, instantánea o
+directorio con los CSV de la carga masiva) por fases: la carga, las
+features del predictor, los reportes y, con --entrenar, el modelo Keras.
+De cada fase se reporta el pico y lo que queda retenido al terminar
+(estado estable). La memoria del modelo se desglosa además por estructura
+(índice de matrículas, registros, estadísticas, rankings, índice de
+búsqueda) recorriendo sus objetos: cada objeto se cuenta una sola vez, en
+la primera estructura que lo alcanza.
+
+tracemalloc solo ve lo que se reserva a través de Python (incluidos los
+arreglos NumPy); TensorFlow reserva por su cuenta, así que para Keras se
+reportan también el tamaño de los pesos y el pico de memoria del proceso.
+
+Uso:
+    python perfil_memoria.py
+    python perfil_memoria.py --escalas 10000 100000 1000000 --columnar
+    python perfil_memoria.py --archivo datos.siga --entrenar
+"""
+
+import argparse
+import gc
+import importlib
+import os
+import random
+import resource
+import sys
+import tempfile
+import tracemalloc
+from types import BuiltinFunctionType, FunctionType, ModuleType
+
+from modelo import ModeloSIGA, Estudiante
+
+
+NOMBRES = ["Juan", "María", "Carlos", "Ana", "Luis", "Sofía", "Diego", "Valentina",
+           "Andrés", "Camila", "José", "Isabella", "Miguel", "Daniela", "Jorge", "Laura"]
+APELLIDOS = ["Pérez", "González", "Martínez", "Rodríguez", "López", "García", "Gómez",
+             "Hernández", "Díaz", "Torres", "Ramírez", "Castro", "Vargas", "Rojas"]
+
+
+def medir_escala(num_estudiantes, num_cursos=200, cursos_por_estudiante=5,
+                 columnar=False, semilla=42):
+    """
+    Mide el costo en bytes de cada tipo de registro para una escala dada.
+
+    Returns:
+        dict: Bytes por estudiante, curso y matrícula, y el pico total
+    """
+    rnd = random.Random(semilla)
+    tracemalloc.start()
+    try:
+        modelo = ModeloSIGA(columnar=columnar)
+        base = tracemalloc.get_traced_memory()[0]
+
+        # Los registros ya validados se agregan sin repetir las validaciones
+        for i in range(num_estudiantes):
+            documento = str(10_000_000 + i)
+            nombre = rnd.choice(NOMBRES)
+            modelo._agregar_estudiante(
+                documento, nombre,
+                f"{rnd.choice(APELLIDOS)} {rnd.choice(APELLIDOS)}",
+                f"{nombre.lower()}.{i}@email.com", "2000-01-01"
+            )
+        tras_estudiantes = tracemalloc.get_traced_memory()[0]
+
+        for c in range(num_cursos):
+            modelo._agregar_curso(f"CUR{c:04d}", f"Curso {c}")
+        tras_cursos = tracemalloc.get_traced_memory()[0]
+
+        codigos = list(modelo.cursos)
+        por_estudiante = min(cursos_por_estudiante, num_cursos)
+        for documento in modelo.estudiantes:
+            for codigo in rnd.sample(codigos, por_estudiante):
+                modelo._vincular(documento, codigo, round(rnd.uniform(0, 5), 1))
+        tras_matriculas, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    num_matriculas = len(modelo.matriculas)
+    return {
+        'estudiantes': num_estudiantes,
+        'cursos': num_cursos,
+        'matriculas': num_matriculas,
+        'bytes_por_estudiante': (tras_estudiantes - base) / max(num_estudiantes, 1),
+        'bytes_por_curso': (tras_cursos - tras_estudiantes) / max(num_cursos, 1),
+        'bytes_por_matricula': (tras_matriculas - tras_cursos) / max(num_matriculas, 1),
+        'total_mb': (tras_matriculas - base) / 2**20,
+        'pico_mb': pico / 2**20,
+    }
+
+
+def imprimir_reporte(resultados, columnar):
+    registro = sys.getsizeof(Estudiante("1", "a", "b", "c", "d"))
+    print("=" * 86)
+    print(f"REPORTE DE MEMORIA - ModeloSIGA ({'columnar' if columnar else 'en memoria'})")
+    print(f"Registro Estudiante vacío: {registro} bytes (sin contar sus cadenas)")
+    print("=" * 86)
+    print(f"{'Estudiantes':>12} {'Matrículas':>12} {'B/estudiante':>14} {'B/curso':>10} "
+          f"{'B/matrícula':>12} {'Total MB':>10} {'Pico MB':>10}")
+    print("-" * 86)
+    for r in resultados:
+        print(f"{r['estudiantes']:>12,} {r['matriculas']:>12,} {r['bytes_por_estudiante']:>14.1f} "
+              f"{r['bytes_por_curso']:>10.1f} {r['bytes_por_matricula']:>12.1f} "
+              f"{r['total_mb']:>10.1f} {r['pico_mb']:>10.1f}")
+    print("-" * 86)
+    print("B/estudiante incluye el registro, sus cadenas y su entrada en el índice de búsqueda.")
+    print("B/matrícula incluye el índice de matrículas, los contenedores y el ranking por curso.")
+
+
+# ==================== PERFIL POR ESTRUCTURA ====================
+
+# Lo que no pertenece a los datos: el recorrido no entra en clases, módulos ni funciones
+_NO_RECORRER = (type, ModuleType, FunctionType, BuiltinFunctionType)
+
+
+def tamano_profundo(objeto, vistos):
+    """
+    Bytes de objeto y de todo lo que alcanza, sin contar lo que ya está en vistos.
+
+    Args:
+        vistos: Conjunto de ids ya contados; se actualiza con los que cuenta esta llamada
+    """
+    total = 0
+    pendientes = [objeto]
+    while pendientes:
+        actual = pendientes.pop()
+        if id(actual) in vistos or isinstance(actual, _NO_RECORRER):
+            continue
+        vistos.add(id(actual))
+        if hasattr(actual, 'select_dtypes'):
+            # DataFrame de pandas: sus arreglos, y las celdas de las columnas de objetos
+            # (el recorrido no entra en ellas, y muchas son cadenas que ya tiene el modelo)
+            total += int(actual.memory_usage(deep=False).sum())
+            for columna in actual.select_dtypes(include='object'):
+                pendientes.extend(actual[columna].tolist())
+            continue
+        # sys.getsizeof incluye el buffer de un arreglo NumPy que es dueño de sus datos
+        total += sys.getsizeof(actual)
+        pendientes.extend(gc.get_referents(actual))
+    return total
+
+
+def estructuras_modelo(modelo):
+    """(nombre, objeto) de cada estructura del modelo, en el orden en que se atribuye la memoria."""
+    estructuras = [
+        ('Índice de matrículas', modelo._matriculas),
+        ('Estudiantes (registros y notas)', modelo.estudiantes),
+        ('Cursos (registros y estudiantes)', modelo.cursos),
+        ('Estadísticas por curso', (modelo._estadisticas, modelo._estadisticas_globales)),
+        ('Rankings por curso', modelo._rankings),
+        ('Índice global de notas', modelo._notas),
+        ('Índice de búsqueda', modelo._indice_busqueda),
+    ]
+    return [(nombre, objeto) for nombre, objeto in estructuras if objeto is not None]
+
+
+def desglosar(estructuras):
+    """Bytes de cada estructura, sin contar dos veces lo compartido."""
+    vistos = set()
+    return [(nombre, tamano_profundo(objeto, vistos)) for nombre, objeto in estructuras]
+
+
+class _Fase:
+    """Mide con tracemalloc el pico y lo retenido por un bloque de código."""
+
+    def __init__(self, perfil, nombre):
+        self.perfil = perfil
+        self.nombre = nombre
+
+    def __enter__(self):
+        tracemalloc.reset_peak()
+        self.inicio = tracemalloc.get_traced_memory()[0]
+        return self
+
+    def __exit__(self, *exc):
+        actual, pico = tracemalloc.get_traced_memory()
+        self.perfil['fases'].append({'fase': self.nombre, 'pico_mb': (pico - self.inicio) / 2**20,
+                                     'estable_mb': (actual - self.inicio) / 2**20})
+
+
+def _importar(modulo):
+    """(módulo, None), o (None, dependencia que falta) si no se puede importar."""
+    try:
+        return importlib.import_module(modulo), None
+    except ImportError as e:
+        return None, e.name
+
+
+def cargar_conjunto(modelo, archivo):
+    """Carga un JSON, una instantánea o un directorio con estudiantes/cursos/matriculas.csv."""
+    if os.path.isdir(archivo):
+        rutas = {f"archivo_{tipo}": os.path.join(archivo, f"{tipo}.csv")
+                 for tipo in ('estudiantes', 'cursos', 'matriculas')}
+        modelo.cargar_datos_csv(**{clave: ruta for clave, ruta in rutas.items() if os.path.exists(ruta)})
+    elif archivo.endswith('.json'):
+        modelo.cargar_datos_json(archivo)
+    else:
+        modelo.cargar_instantanea(archivo)
+
+
+def perfilar_archivo(archivo, columnar=False, entrenar=False, epocas=3):
+    """
+    Perfila un conjunto de datos por fases y desglosa el modelo por estructura.
+
+    Returns:
+        dict: Fases (pico y estable en MB), estructuras del modelo y de los
+              resultados de cada fase (bytes), y el pico de memoria del proceso
+    """
+    perfil = {'archivo': archivo, 'fases': [], 'estructuras': []}
+    retenidos = []  # (nombre, objeto) que cada fase deja vivos, para desglosarlos al final
+
+    # Se importa antes de medir: el costo de importar no es de ninguna fase
+    modulo_predictor, falta_predictor = _importar('predictor')
+    modulo_controlador, falta_controlador = _importar('controlador')
+    modulo_utils, falta_utils = _importar('utils')
+
+    def omitir(fase, falta):
+        # Sin la dependencia la fase se omite y el perfil sigue
+        perfil['fases'].append({'fase': fase, 'omitida': f"falta {falta}"})
+
+    tracemalloc.start()
+    try:
+        with _Fase(perfil, 'Carga del modelo'):
+            modelo = ModeloSIGA(columnar=columnar)
+            cargar_conjunto(modelo, archivo)
+        perfil['estudiantes'] = len(modelo.estudiantes)
+        perfil['cursos'] = len(modelo.cursos)
+        perfil['matriculas'] = len(modelo.matriculas)
+
+        predictor = None
+        if modulo_predictor:
+            with _Fase(perfil, 'Features del predictor (preparar_datos)'):
+                predictor = modulo_predictor.PredictorAcademico()
+                retenidos.append(('Features del predictor (X, y)', predictor.preparar_datos(modelo)))
+        else:
+            omitir('Features del predictor (preparar_datos)', falta_predictor)
+
+        reporte = None
+        if modulo_controlador:
+            with _Fase(perfil, 'Reporte de estudiantes (DataFrame)'):
+                reporte = modulo_controlador.ControladorSIGA(modelo, None).generar_reporte_estudiantes()
+                retenidos.append(('Reporte de estudiantes (DataFrame)', reporte))
+        else:
+            omitir('Reporte de estudiantes (DataFrame)', falta_controlador)
+
+        if reporte is not None and modulo_utils:
+            with tempfile.TemporaryDirectory() as directorio, _Fase(perfil, 'Reporte PDF (exportar_pdf)'):
+                modulo_utils.exportar_pdf(os.path.join(directorio, 'reporte.pdf'), reporte)
+        else:
+            omitir('Reporte PDF (exportar_pdf)', falta_utils or falta_controlador)
+
+        if entrenar:
+            if predictor is not None:
+                with _Fase(perfil, 'Entrenamiento Keras (memoria de Python)'):
+                    predictor.entrenar(modelo, epochs=epocas)
+                perfil['pesos_keras_mb'] = predictor.modelo.count_params() * 4 / 2**20
+            else:
+                omitir('Entrenamiento Keras', falta_predictor)
+    finally:
+        tracemalloc.stop()
+
+    # El recorrido se hace sin tracemalloc: sus propias reservas no cuentan
+    desglose = desglosar(estructuras_modelo(modelo) + retenidos)
+    perfil['estructuras'] = [{'estructura': nombre, 'bytes': tamano} for nombre, tamano in desglose]
+    # ru_maxrss está en KB en Linux (en bytes en macOS)
+    escala = 1 if sys.platform == 'darwin' else 1024
+    perfil['pico_proceso_mb'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * escala / 2**20
+    return perfil
+
+
+def imprimir_perfil(perfil):
+    print("=" * 86)
+    print(f"PERFIL DE MEMORIA - {perfil['archivo']}")
+    print(f"{perfil.get('estudiantes', 0):,} estudiantes, {perfil.get('cursos', 0):,} cursos, "
+          f"{perfil.get('matriculas', 0):,} matrículas")
+    print("=" * 86)
+    print(f"{'Fase':<48} {'Pico MB':>12} {'Estable MB':>12}")
+    print("-" * 86)
+    for fase in perfil['fases']:
+        if 'omitida' in fase:
+            print(f"{fase['fase']:<48} {'omitida: ' + fase['omitida']:>25}")
+        else:
+            print(f"{fase['fase']:<48} {fase['pico_mb']:>12.1f} {fase['estable_mb']:>12.1f}")
+    print("-" * 86)
+    total = sum(e['bytes'] for e in perfil['estructuras']) or 1
+    print(f"{'Estructura':<48} {'MB':>12} {'%':>8} {'B/matrícula':>14}")
+    print("-" * 86)
+    matriculas = max(perfil.get('matriculas', 0), 1)
+    for e in perfil['estructuras']:
+        print(f"{e['estructura']:<48} {e['bytes'] / 2**20:>12.1f} {e['bytes'] / total:>8.1%} "
+              f"{e['bytes'] / matriculas:>14.1f}")
+    print("-" * 86)
+    if 'pesos_keras_mb' in perfil:
+        print(f"Pesos del modelo Keras: {perfil['pesos_keras_mb']:.2f} MB "
+              "(TensorFlow reserva fuera de tracemalloc)")
+    print(f"Pico de memoria del proceso (RSS): {perfil['pico_proceso_mb']:.1f} MB")
+    print("Cada objeto compartido se cuenta en la primera estructura que lo alcanza.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reporte de memoria por estudiante, curso y matrícula")
+    parser.add_argument('--escalas', type=int, nargs='+', default=[10_000, 100_000, 1_000_000],
+                        help="Números de estudiantes a medir")
+    parser.add_argument('--cursos', type=int, default=200)
+    parser.add_argument('--cursos-por-estudiante', type=int, default=5)
+    parser.add_argument('--columnar', action='store_true', help="Usar el almacén columnar")
+    parser.add_argument('--archivo', help="Perfilar este conjunto de datos (.json, .siga o directorio de CSV)")
+    parser.add_argument('--entrenar', action='store_true', help="Con --archivo, incluir el entrenamiento")
+    parser.add_argument('--epocas', type=int, default=3)
+    args = parser.parse_args()
+
+    if args.archivo:
+        imprimir_perfil(perfilar_archivo(args.archivo, args.columnar, args.entrenar, args.epocas))
+        return
+
+    resultados = []
+    for escala in args.escalas:
+        resultados.append(medir_escala(escala, args.cursos, args.cursos_por_estudiante, args.columnar))
+    imprimir_reporte(resultados, args.columnar)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+## ==================== periodos.py ====================
+"""
+Períodos académicos archivados.
+
+El modelo solo guarda las matrículas del período en curso. Al cerrarlo
+(ModeloSIGA.cerrar_periodo) el período se archiva como instantánea (ver
+instantanea.py), un archivo por período, y el modelo sigue con los mismos
+estudiantes y cursos y sin matrículas: las operaciones del día a día crecen
+con el período en curso y no con toda la historia.
+
+Un período archivado no se carga. Se abre con mmap la primera vez que una
+consulta lo necesita, y solo se leen las páginas que esa consulta toca (las
+matrículas de un estudiante, el ranking de un curso), así que los reportes
+históricos y el entrenamiento del predictor pagan solo por lo que leen.
+
+Uso:
+    periodos = ArchivoPeriodos("periodos")
+    modelo.cerrar_periodo(periodos, "2025-1")
+    periodos.historial_estudiante("12345678")   # [(periodo, codigo_curso, nota)]
+    periodos.abrir("2025-1").obtener_top_estudiantes("MAT201")
+"""
+
+import os
+
+from instantanea import InstantaneaSIGA
+
+
+EXTENSION = ".siga"
+
+
+class ArchivoPeriodos:
+    def __init__(self, directorio):
+        self.directorio = directorio
+        self._abiertos = {}  # periodo -> InstantaneaSIGA ya abierta
+
+    def periodos(self):
+        """Nombres de los períodos archivados, en orden."""
+        if not os.path.isdir(self.directorio):
+            return []
+        return sorted(nombre[:-len(EXTENSION)] for nombre in os.listdir(self.directorio)
+                      if nombre.endswith(EXTENSION))
+
+    def __contains__(self, periodo):
+        return os.path.exists(self._ruta(periodo))
+
+    def archivar(self, modelo, periodo):
+        """Guarda el estado actual del modelo como el período archivado periodo."""
+        if not periodo or os.sep in periodo or (os.altsep and os.altsep in periodo):
+            raise ValueError(f"Nombre de período inválido: {periodo!r}")
+        if periodo in self:
+            raise ValueError(f"El período {periodo} ya está archivado")
+        os.makedirs(self.directorio, exist_ok=True)
+        # La instantánea se escribe aparte y se renombra: nunca queda un período a medio archivar
+        modelo.guardar_instantanea(self._ruta(periodo))
+
+    def descartar(self, periodo):
+        """Borra el período archivado, p. ej. si el modelo no pudo cerrarlo después de archivarlo."""
+        instantanea = self._abiertos.pop(periodo, None)
+        if instantanea is not None:
+            instantanea.cerrar()
+        os.remove(self._ruta(periodo))
+
+    def abrir(self, periodo):
+        """
+        Retorna el período archivado como InstantaneaSIGA, con las consultas del
+        modelo. Se abre una sola vez y queda abierto hasta cerrar().
+        """
+        instantanea = self._abiertos.get(periodo)
+        if instantanea is None:
+            if periodo not in self:
+                raise KeyError(f"Período no archivado: {periodo}")
+            instantanea = self._abiertos[periodo] = InstantaneaSIGA(self._ruta(periodo))
+        return instantanea
+
+    def total_matriculas(self, periodos=None):
+        return sum(len(self.abrir(periodo).matriculas) for periodo in self._elegidos(periodos))
+
+    def historial_estudiante(self, documento, periodos=None):
+        """
+        Retorna [(periodo, codigo_curso, nota)] de las matrículas archivadas del
+        estudiante. De cada período solo se leen las páginas de ese estudiante.
+        """
+        historial = []
+        for periodo in self._elegidos(periodos):
+            estudiante = self.abrir(periodo).estudiantes.get(documento)
+            if estudiante is not None:
+                historial.extend((periodo, codigo, nota) for codigo, nota in estudiante.notas.items())
+        return historial
+
+    def cerrar(self):
+        for instantanea in self._abiertos.values():
+            instantanea.cerrar()
+        self._abiertos.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+    def _ruta(self, periodo):
+        return os.path.join(self.directorio, f"{periodo}{EXTENSION}")
+
+    def _elegidos(self, periodos):
+        return self.periodos() if periodos is None else periodos
@@ -25,10 +25,15 @@ class PredictorAcademico:
         self.ruta_modelo = "modelo_prediccion.h5"
         self.ruta_scaler = "scaler.pkl"
         
-    def preparar_datos(self, modelo_siga):
+    def preparar_datos(self, modelo_siga, historial=None):
         """
         Prepara los datos de entrenamiento desde el modelo SIGA.
         
+        Con historial (ArchivoPeriodos) se entrena además con las matrículas
+        de los períodos archivados, leídas del archivo sin cargarlas al modelo.
+        Las features de cada matrícula se calculan solo con las de su período,
+        igual que predecir() las calcula con las del período en curso.
+        
         Features:
         - Promedio histórico del estudiante
         - Número de cursos del estudiante
@@ -39,49 +44,60 @@ class PredictorAcademico:
         Target:
         - 1 si aprobó (nota >= 3.0), 0 si reprobó
         """
-        X = []  # Features
-        y = []  # Target (aprobado/reprobado)
-        
-        for documento, codigo_curso, nota in modelo_siga.matriculas:
-            estudiante = modelo_siga.estudiantes.get(documento)
-            if not estudiante:
-                continue
-            
-            # Feature 1: Promedio histórico del estudiante (excluyendo el curso actual)
-            notas_estudiante = [n for c, n in estudiante.notas.items() if c != codigo_curso]
-            promedio_estudiante = np.mean(notas_estudiante) if notas_estudiante else 2.5
-            
-            # Feature 2: Número de cursos del estudiante
-            num_cursos_estudiante = len(estudiante.cursos)
-            
-            # Feature 3: Promedio del curso
-            notas_curso = [n for d, c, n in modelo_siga.matriculas if c == codigo_curso]
-            promedio_curso = np.mean(notas_curso) if notas_curso else 3.0
-            
-            # Feature 4: Tasa de aprobación del curso
-            aprobados, reprobados = modelo_siga.obtener_estadisticas_aprobados(codigo_curso)
-            total_curso = aprobados + reprobados
-            tasa_aprobacion = aprobados / total_curso if total_curso > 0 else 0.5
-            
-            # Feature 5: Número de estudiantes en el curso
-            num_estudiantes_curso = total_curso
-            
-            # Crear vector de features
-            features = [
-                promedio_estudiante,
-                num_cursos_estudiante,
-                promedio_curso,
-                tasa_aprobacion,
-                num_estudiantes_curso
-            ]
-            
-            # Target: 1 si aprobó, 0 si reprobó
-            target = 1 if nota >= 3.0 else 0
-            
-            X.append(features)
-            y.append(target)
-        
-        return np.array(X), np.array(y)
+        fuentes = [modelo_siga]
+        if historial is not None:
+            fuentes[:0] = [historial.abrir(periodo) for periodo in historial.periodos()]
+        
+        partes = [self._datos_periodo(*fuente.columnas_matriculas()) for fuente in fuentes]
+        X = np.concatenate([X for X, _ in partes])
+        y = np.concatenate([y for _, y in partes])
+        return X, y
+    
+    def _datos_periodo(self, ids_estudiante, ids_curso, notas, documentos, codigos):
+        # (X, y) de las matrículas de un período, con agregados de ese período
+        if len(notas) == 0:
+            return np.empty((0, 5)), np.empty(0, dtype=int)
+        
+        # Agregados por estudiante y por curso en una sola pasada vectorizada
+        conteo_est = np.bincount(ids_estudiante, minlength=len(documentos))
+        suma_est = np.bincount(ids_estudiante, weights=notas, minlength=len(documentos))
+        conteo_cur = np.bincount(ids_curso, minlength=len(codigos))
+        suma_cur = np.bincount(ids_curso, weights=notas, minlength=len(codigos))
+        aprobados_cur = np.bincount(ids_curso, weights=(notas >= 3.0), minlength=len(codigos))
+        
+        # Feature 1: Promedio histórico del estudiante (excluyendo el curso actual)
+        otros_cursos = conteo_est[ids_estudiante] - 1
+        promedio_estudiante = np.where(
+            otros_cursos > 0,
+            (suma_est[ids_estudiante] - notas) / np.maximum(otros_cursos, 1),
+            2.5
+        )
+        
+        # Feature 2: Número de cursos del estudiante
+        num_cursos_estudiante = conteo_est[ids_estudiante]
+        
+        # Feature 3: Promedio del curso
+        total_curso = conteo_cur[ids_curso]
+        promedio_curso = suma_cur[ids_curso] / total_curso
+        
+        # Feature 4: Tasa de aprobación del curso
+        tasa_aprobacion = aprobados_cur[ids_curso] / total_curso
+        
+        # Feature 5: Número de estudiantes en el curso
+        num_estudiantes_curso = total_curso
+        
+        X = np.column_stack([
+            promedio_estudiante,
+            num_cursos_estudiante,
+            promedio_curso,
+            tasa_aprobacion,
+            num_estudiantes_curso
+        ])
+        
+        # Target: 1 si aprobó, 0 si reprobó
+        y = (notas >= 3.0).astype(int)
+        
+        return X, y
     
     def construir_modelo(self):
         """Construye la arquitectura de la red neuronal."""
@@ -102,15 +118,18 @@ class PredictorAcademico:
         
         return modelo
     
-    def entrenar(self, modelo_siga, epochs=100, verbose=0):
+    def entrenar(self, modelo_siga, epochs=100, verbose=0, historial=None):
         """
         Entrena el modelo con los datos del sistema SIGA.
         
+        Args:
+            historial: ArchivoPeriodos con los períodos archivados a incluir
+        
         Returns:
             dict: Historial de entrenamiento y métricas
         """
         # Preparar datos
-        X, y = self.preparar_datos(modelo_siga)
+        X, y = self.preparar_datos(modelo_siga, historial)
         
         if len(X) < 10:
             raise ValueError("No hay suficientes datos para entrenar (mínimo 10 matrículas)")
@@ -181,17 +200,16 @@ class PredictorAcademico:
         if codigo_curso not in modelo_siga.cursos:
             raise ValueError("Curso no encontrado")
         
-        # Calcular features para la predicción
-        notas_estudiante = list(estudiante.notas.values())
+        # Calcular features para la predicción, como en el entrenamiento: el
+        # promedio del estudiante excluye el curso y el conteo lo incluye
+        notas_estudiante = [nota for codigo, nota in estudiante.notas.items() if codigo != codigo_curso]
         promedio_estudiante = np.mean(notas_estudiante) if notas_estudiante else 2.5
-        num_cursos_estudiante = len(estudiante.cursos)
-        
-        notas_curso = [n for d, c, n in modelo_siga.matriculas if c == codigo_curso]
-        promedio_curso = np.mean(notas_curso) if notas_curso else 3.0
+        num_cursos_estudiante = len(notas_estudiante) + 1
         
-        aprobados, reprobados = modelo_siga.obtener_estadisticas_aprobados(codigo_curso)
-        total_curso = aprobados + reprobados
-        tasa_aprobacion = aprobados / total_curso if total_curso > 0 else 0.5
+        estadisticas_curso = modelo_siga.obtener_estadisticas_curso(codigo_curso)
+        total_curso = estadisticas_curso.total
+        promedio_curso = estadisticas_curso.promedio if total_curso > 0 else 3.0
+        tasa_aprobacion = estadisticas_curso.tasa_aprobacion if total_curso > 0 else 0.5
         num_estudiantes_curso = total_curso
         
         # Crear vector de features
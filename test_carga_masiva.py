@@ -0,0 +1,145 @@
+## ==================== test_carga_masiva.py ====================
+"""
+Pruebas de la carga masiva desde CSV: validación vectorizada por bloques,
+inserción con resolución de duplicados y reporte de filas rechazadas.
+
+Ejecutar: python test_carga_masiva.py   (o con pytest)
+"""
+
+import csv
+import io
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+from carga_masiva import (validar_bloque_cursos, validar_bloque_estudiantes,
+                          validar_bloque_matriculas, leer_bloques, COLUMNAS_ESTUDIANTES)
+from modelo import ModeloSIGA
+
+
+ESTUDIANTES = (
+    'documento,nombre,apellidos,correo,fecha_nac\n'
+    '1001,Ana,"Pérez, Gómez",ana@correo.com,2000-01-01\n'
+    '\n'
+    '1002,"Luis ""Lucho""",Díaz,no-es-correo,2000-02-02\n'
+    '1003,"Marta\nSofía",Ruiz,marta@correo.com,2000-13-01\n'
+    'abc,Pedro,López,pedro@correo.com,2000-03-03\n'
+    '1001,Ana,Repetida,ana2@correo.com,2000-01-01\n'
+    '1004,Eva,Mora,eva@correo.com,2001-04-04\n'
+)
+CURSOS = 'codigo,nombre\nMAT,Matemáticas\nFIS,\n,Sin código\nMAT,Otra vez\n'
+MATRICULAS = (
+    'documento,codigo_curso,nota\n'
+    '1001,MAT,4.5\n'
+    '1001,MAT,3.0\n'
+    '1004,MAT,cinco\n'
+    '1004,MAT,7\n'
+    '9999,MAT,3.0\n'
+    '1004,QUI,3.0\n'
+    '1004,MAT,2.5\n'
+)
+
+
+def _escribir(directorio, nombre, contenido):
+    ruta = os.path.join(directorio, nombre)
+    with open(ruta, 'w', encoding='utf-8', newline='') as f:
+        f.write(contenido)
+    return ruta
+
+
+def _cargar(directorio, tamano_bloque=2):
+    modelo = ModeloSIGA()
+    rechazos = os.path.join(directorio, 'rechazos.csv')
+    resumen = modelo.cargar_datos_csv(
+        _escribir(directorio, 'estudiantes.csv', ESTUDIANTES),
+        _escribir(directorio, 'cursos.csv', CURSOS),
+        _escribir(directorio, 'matriculas.csv', MATRICULAS),
+        rechazos, tamano_bloque=tamano_bloque)
+    with open(rechazos, newline='', encoding='utf-8') as f:
+        filas = list(csv.reader(f))
+    return modelo, resumen, filas
+
+
+def test_validar_bloques():
+    """Cada validador separa las filas válidas y da el motivo de cada rechazo."""
+    estudiantes = pd.DataFrame([
+        ['1', 'Ana', 'Pérez', 'ana@correo.com', '2000-01-01'],
+        ['2', 'Luis', 'Díaz', 'sin-arroba', '2000-01-01'],
+        ['3', 'Eva', 'Mora', 'eva@correo.com', '2000-02-30'],
+        ['x1', 'Pedro', 'López', 'mal', 'nunca'],
+    ], columns=COLUMNAS_ESTUDIANTES)
+    validas, motivos = validar_bloque_estudiantes(estudiantes)
+    assert validas['documento'].tolist() == ['1']
+    # Si hay varios errores, se informa el del campo más a la izquierda
+    assert motivos.to_dict() == {1: "Email inválido", 2: "Fecha inválida", 3: "Documento inválido"}
+
+    validas, motivos = validar_bloque_cursos(pd.DataFrame(
+        [['MAT', 'Matemáticas'], ['FIS', '  '], ['', 'Sin código']], columns=['codigo', 'nombre']))
+    assert validas['codigo'].tolist() == ['MAT']
+    assert motivos.to_dict() == {1: "Nombre de curso vacío", 2: "Código de curso vacío"}
+
+    validas, motivos = validar_bloque_matriculas(pd.DataFrame(
+        [['1', 'MAT', '4.5'], ['1', 'FIS', '5.1'], ['1', 'QUI', ''], ['1', 'BIO', '0']],
+        columns=['documento', 'codigo_curso', 'nota']))
+    assert validas['nota'].tolist() == [4.5, 0.0]
+    assert motivos.to_dict() == {1: "La nota debe estar entre 0 y 5", 2: "Nota inválida"}
+
+
+def test_numero_de_registro():
+    """El índice de los bloques cuenta registros, no líneas (blancos y campos multilínea)."""
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = _escribir(directorio, 'estudiantes.csv', ESTUDIANTES)
+        bloques = list(leer_bloques(ruta, COLUMNAS_ESTUDIANTES, tamano_bloque=4))
+    assert [bloque.index.tolist() for bloque in bloques] == [[1, 2, 3, 4], [5, 6]]
+    assert bloques[0].loc[3, 'nombre'] == "Marta\nSofía"
+
+
+def test_reporte_de_rechazos():
+    """Los rechazos conservan sus datos aunque tengan comas, comillas o saltos de línea."""
+    with tempfile.TemporaryDirectory() as directorio:
+        modelo, resumen, filas = _cargar(directorio)
+
+    assert resumen == {'estudiantes': 2, 'cursos': 1, 'matriculas': 2, 'rechazadas': 12}
+    assert sorted(modelo.estudiantes) == ['1001', '1004']
+    assert modelo.estudiantes['1001'].apellidos == "Pérez, Gómez"
+    assert modelo.obtener_nota('1001', 'MAT') == 4.5    # Gana la primera aparición
+    assert modelo.obtener_nota('1004', 'MAT') == 2.5
+
+    assert filas[0] == ['archivo', 'registro', 'motivo', 'datos']
+    assert all(len(f) == 4 for f in filas)
+    rechazos = {(os.path.basename(f[0]), int(f[1])): (f[2], next(csv.reader(io.StringIO(f[3]))))
+                for f in filas[1:]}
+    assert len(rechazos) == resumen['rechazadas']
+    assert rechazos[('estudiantes.csv', 2)] == (
+        "Email inválido", ['1002', 'Luis "Lucho"', 'Díaz', 'no-es-correo', '2000-02-02'])
+    assert rechazos[('estudiantes.csv', 3)] == (
+        "Fecha inválida", ['1003', "Marta\nSofía", 'Ruiz', 'marta@correo.com', '2000-13-01'])
+    assert rechazos[('estudiantes.csv', 5)][0] == "El estudiante ya existe"
+    assert rechazos[('cursos.csv', 4)] == ("El curso ya existe", ['MAT', 'Otra vez'])
+    assert [rechazos[('matriculas.csv', r)][0] for r in range(2, 7)] == [
+        "El estudiante ya está matriculado en este curso", "Nota inválida",
+        "La nota debe estar entre 0 y 5", "Estudiante no encontrado", "Curso no encontrado"]
+
+
+def main():
+    print("=" * 70)
+    print("📥 PRUEBA DE CARGA MASIVA - carga_masiva")
+    print("=" * 70)
+    pruebas = [test_validar_bloques, test_numero_de_registro, test_reporte_de_rechazos]
+    exito = True
+    for prueba in pruebas:
+        inicio = time.perf_counter()
+        try:
+            prueba()
+            print(f"   ✅ {prueba.__name__} ({time.perf_counter() - inicio:.2f} s)")
+        except AssertionError as e:
+            print(f"   ❌ {prueba.__name__}: {e}")
+            exito = False
+    return exito
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,240 @@
+## ==================== test_concurrencia.py ====================
+"""
+Prueba de estrés del acceso concurrente a ModeloSIGA.
+
+Varios hilos escriben (altas, matrículas, notas, bajas, lotes) mientras otros
+leen y verifican que el modelo nunca se observa a medias: el índice de
+matrículas, las notas de cada estudiante, los estudiantes de cada curso y las
+estadísticas deben coincidir siempre.
+
+Ejecutar: python test_concurrencia.py   (o con pytest)
+"""
+
+import itertools
+import random
+import sys
+import threading
+import time
+
+from concurrencia import CerrojoLecturaEscritura
+from modelo import ModeloSIGA
+
+
+HILOS_ESCRITORES = 4
+HILOS_LECTORES = 6
+OPERACIONES_POR_ESCRITOR = 1500
+CURSOS = 12
+ESTUDIANTES_INICIALES = 200
+
+
+def _crear_modelo():
+    modelo = ModeloSIGA()
+    for i in range(CURSOS):
+        modelo.crear_curso(f"C{i:02d}", f"Curso {i}")
+    for i in range(ESTUDIANTES_INICIALES):
+        modelo.crear_estudiante(str(1000 + i), f"Nombre{i}", f"Apellido{i}",
+                                f"e{i}@correo.com", "2000-01-01")
+    return modelo
+
+
+def verificar_invariantes(modelo):
+    """Retorna la lista de inconsistencias del modelo (vacía si es coherente)."""
+    errores = []
+    matriculas = dict(modelo._matriculas)
+
+    notas_estudiantes = 0
+    for documento, estudiante in modelo.estudiantes.items():
+        for codigo, nota in estudiante.notas.items():
+            notas_estudiantes += 1
+            if matriculas.get((documento, codigo)) != nota:
+                errores.append(f"Nota de {documento} en {codigo} no coincide con el índice")
+    if notas_estudiantes != len(matriculas):
+        errores.append(f"{notas_estudiantes} notas en estudiantes y {len(matriculas)} matrículas")
+
+    total_cursos = 0
+    for codigo, curso in modelo.cursos.items():
+        estudiantes = set(curso.estudiantes)
+        esperados = {documento for documento, cod in matriculas if cod == codigo}
+        if estudiantes != esperados:
+            errores.append(f"Estudiantes del curso {codigo} no coinciden con el índice")
+        estadisticas = modelo.obtener_estadisticas_curso(codigo)
+        if estadisticas.total != len(esperados):
+            errores.append(f"Estadísticas de {codigo}: {estadisticas.total} != {len(esperados)}")
+        total_cursos += estadisticas.total
+    for documento, codigo in matriculas:
+        if documento not in modelo.estudiantes or codigo not in modelo.cursos:
+            errores.append(f"Matrícula huérfana {documento}/{codigo}")
+
+    if modelo.obtener_estadisticas_generales().total != len(matriculas):
+        errores.append("Estadísticas generales no coinciden con el índice")
+    if total_cursos != len(matriculas):
+        errores.append("La suma de los cursos no coincide con el índice")
+    return errores
+
+
+def _escritor(modelo, semilla, siguiente_documento, fallos):
+    azar = random.Random(semilla)
+    codigos = [f"C{i:02d}" for i in range(CURSOS)]
+    try:
+        for _ in range(OPERACIONES_POR_ESCRITOR):
+            operacion = azar.random()
+            with modelo.leyendo():
+                documentos = list(modelo.estudiantes)
+                claves = list(modelo._matriculas)
+            try:
+                if operacion < 0.15:
+                    documento = str(next(siguiente_documento))
+                    modelo.crear_estudiante(documento, "N", "A", f"{documento}@correo.com", "2001-02-03")
+                elif operacion < 0.45 and documentos:
+                    modelo.matricular_estudiante(azar.choice(documentos), azar.choice(codigos),
+                                                 round(azar.uniform(0, 5), 1))
+                elif operacion < 0.65 and claves:
+                    documento, codigo = azar.choice(claves)
+                    modelo.actualizar_nota(documento, codigo, round(azar.uniform(0, 5), 1))
+                elif operacion < 0.75 and documentos:
+                    modelo.eliminar_estudiante(azar.choice(documentos))
+                elif operacion < 0.85 and claves:
+                    modelo.actualizar_notas([(documento, codigo, round(azar.uniform(0, 5), 1))
+                                             for documento, codigo in azar.sample(claves, min(5, len(claves)))])
+                elif documentos:
+                    modelo.matricular_estudiantes([(azar.choice(documentos), azar.choice(codigos), 3.0)
+                                                   for _ in range(3)])
+            except ValueError:
+                pass  # Otro hilo se adelantó (ya matriculado, eliminado, ...): esperado
+    except Exception as e:
+        fallos.append(f"Escritor {semilla}: {type(e).__name__}: {e}")
+
+
+def _lector(modelo, detener, fallos, verificaciones):
+    try:
+        while not detener.is_set():
+            with modelo.leyendo():
+                errores = verificar_invariantes(modelo)
+            if errores:
+                fallos.extend(errores[:5])
+                return
+            # Consultas sueltas: cada una toma su propio cerrojo
+            modelo.obtener_top_estudiantes("C00", 5)
+            modelo.buscar_estudiantes("Apellido1")
+            verificaciones.append(1)
+    except Exception as e:
+        fallos.append(f"Lector: {type(e).__name__}: {e}")
+
+
+def test_modelo_concurrente():
+    """Escritores y lectores simultáneos: los lectores nunca ven el modelo a medias."""
+    modelo = _crear_modelo()
+    documentos = itertools.count(10_000_000)  # next() es atómico: documentos nuevos sin repetir
+    fallos = []
+    verificaciones = []
+    detener = threading.Event()
+    intervalo = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)  # Cambios de hilo frecuentes: intercala las operaciones a medias
+    escritores = [threading.Thread(target=_escritor, args=(modelo, semilla, documentos, fallos))
+                  for semilla in range(HILOS_ESCRITORES)]
+    lectores = [threading.Thread(target=_lector, args=(modelo, detener, fallos, verificaciones))
+                for _ in range(HILOS_LECTORES)]
+    try:
+        for hilo in lectores + escritores:
+            hilo.start()
+        for hilo in escritores:
+            hilo.join()
+    finally:
+        detener.set()
+        for hilo in lectores:
+            hilo.join()
+        sys.setswitchinterval(intervalo)
+
+    assert not fallos, "\n".join(fallos[:10])
+    assert verificaciones, "Los lectores no alcanzaron a verificar"
+    assert not verificar_invariantes(modelo)
+
+
+def test_lecturas_en_paralelo():
+    """Dos lectores comparten el cerrojo; un escritor espera a que terminen."""
+    cerrojo = CerrojoLecturaEscritura()
+    dentro = threading.Barrier(2, timeout=5)
+    eventos = []
+
+    def lector():
+        with cerrojo.lectura:
+            dentro.wait()  # Solo pasa si los dos lectores están dentro a la vez
+            time.sleep(0.05)
+            eventos.append('lectura')
+
+    def escritor():
+        time.sleep(0.01)
+        with cerrojo.escritura:
+            eventos.append('escritura')
+
+    hilos = [threading.Thread(target=lector) for _ in range(2)] + [threading.Thread(target=escritor)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    assert eventos == ['lectura', 'lectura', 'escritura']
+
+
+def test_reentrada():
+    """Lecturas anidadas, lectura dentro de escritura y escritura anidada no se bloquean."""
+    cerrojo = CerrojoLecturaEscritura()
+    with cerrojo.lectura:
+        with cerrojo.lectura:
+            pass
+    with cerrojo.escritura:
+        with cerrojo.escritura:
+            with cerrojo.lectura:
+                pass
+
+    # Sin lecturas ni escrituras pendientes: otro hilo puede escribir enseguida
+    libre = threading.Event()
+
+    def escribir():
+        with cerrojo.escritura:
+            libre.set()
+    hilo = threading.Thread(target=escribir)
+    hilo.start()
+    hilo.join(timeout=5)
+    assert libre.is_set()
+
+    # Un método de escritura del modelo que llama a otros públicos
+    modelo = _crear_modelo()
+    with modelo.escribiendo():
+        modelo.matricular_estudiante("1000", "C00", 4.0)
+        assert modelo.obtener_nota("1000", "C00") == 4.0
+
+
+def test_escritura_dentro_de_lectura():
+    """Pasar de lector a escritor en el mismo hilo se rechaza en vez de bloquearse."""
+    modelo = _crear_modelo()
+    with modelo.leyendo():
+        try:
+            modelo.crear_curso("C99", "Otro")
+        except RuntimeError:
+            pass
+        else:
+            raise AssertionError("Se esperaba RuntimeError")
+    modelo.crear_curso("C99", "Otro")  # Fuera de la lectura sí se puede
+    assert "C99" in modelo.cursos
+
+
+def main():
+    print("=" * 70)
+    print("🧵 PRUEBA DE CONCURRENCIA - ModeloSIGA")
+    print("=" * 70)
+    pruebas = [test_reentrada, test_escritura_dentro_de_lectura,
+               test_lecturas_en_paralelo, test_modelo_concurrente]
+    exito = True
+    for prueba in pruebas:
+        inicio = time.perf_counter()
+        try:
+            prueba()
+            print(f"   ✅ {prueba.__name__} ({time.perf_counter() - inicio:.2f} s)")
+        except AssertionError as e:
+            print(f"   ❌ {prueba.__name__}: {e}")
+            exito = False
+    return exito
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,134 @@
+## ==================== test_consultas.py ====================
+"""
+Pruebas de consultar_matriculas con muchas notas iguales: recorrida página a
+página con el cursor (PaginaMatriculas.siguiente), la consulta no salta ni
+repite filas, sin y con almacén columnar y sobre MotorSQLite, aunque el
+modelo cambie entre una página y otra.
+
+Ejecutar: python test_consultas.py   (o con pytest)
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+from modelo import ModeloSIGA, CLAVES_MATRICULAS
+from motor_sqlite import MotorSQLite
+
+
+ESTUDIANTES = 400
+CURSOS = 5
+NOTAS = [3.0, 4.5]  # Dos notas: casi todas las claves empatan en nota
+
+
+def _modelos(directorio):
+    yield ModeloSIGA()
+    yield ModeloSIGA(columnar=True)
+    yield ModeloSIGA(motor=MotorSQLite(os.path.join(directorio, "siga.db")))
+
+
+def _poblar(modelo):
+    azar = random.Random(19)
+    for i in range(CURSOS):
+        modelo.crear_curso(f"C{i}", f"Curso {i}")
+    for i in range(ESTUDIANTES):
+        documento = str(20000 + i)
+        modelo.crear_estudiante(documento, f"Nombre{i}", "Apellido", f"e{i}@correo.com", "2000-01-01")
+        for curso in azar.sample(range(CURSOS), azar.randint(1, 3)):
+            modelo.matricular_estudiante(documento, f"C{curso}", azar.choice(NOTAS))
+
+
+def _paginas(modelo, limite, cambiar=None, **filtro):
+    filas = []
+    cursor = None
+    while True:
+        pagina = modelo.consultar_matriculas(despues_de=cursor, limite=limite, **filtro)
+        assert len(pagina.filas) <= limite
+        filas.extend(pagina.filas)
+        if pagina.siguiente is None:
+            return filas
+        cursor = pagina.siguiente
+        if cambiar is not None:
+            cambiar(modelo)
+
+
+def _ordenadas(modelo, orden, codigo_curso=None):
+    filas = [fila for fila in modelo.matriculas if codigo_curso is None or fila[1] == codigo_curso]
+    return sorted(filas, key=CLAVES_MATRICULAS[orden])
+
+
+def test_empates_sin_saltos_ni_repetidos():
+    """Con notas repetidas, las páginas juntas dan cada fila una vez y en orden."""
+    with tempfile.TemporaryDirectory() as directorio:
+        for modelo in _modelos(directorio):
+            _poblar(modelo)
+            for orden in CLAVES_MATRICULAS:
+                for filtro in ({}, {'codigo_curso': "C3"}, {'aprobado': True}, {'nota_minima': 4.5}):
+                    esperado = [fila for fila in _ordenadas(modelo, orden, filtro.get('codigo_curso'))
+                                if fila[2] >= filtro.get('nota_minima', 0.0)
+                                and (filtro.get('aprobado') is None or fila[2] >= 3.0)]
+                    for limite in (1, 3, 50, 10_000):
+                        filas = _paginas(modelo, limite, orden=orden, **filtro)
+                        assert filas == esperado, (modelo.columnar, modelo.motor, orden, filtro, limite)
+            if modelo.motor is not None:
+                modelo.motor.cerrar()
+
+
+def test_cambios_entre_paginas():
+    """Las filas que no cambian mientras se pagina salen exactamente una vez."""
+    with tempfile.TemporaryDirectory() as directorio:
+        for modelo in _modelos(directorio):
+            _poblar(modelo)
+            azar = random.Random(23)
+            documentos = list(modelo.estudiantes)
+            tocados = set()
+
+            def cambiar(modelo):
+                # Cambia notas, borra y crea estudiantes entre página y página
+                documento = azar.choice(documentos)
+                tocados.add(documento)
+                if documento not in modelo.estudiantes:
+                    return
+                if azar.random() < .5:
+                    codigo = next(iter(modelo.estudiantes[documento].cursos))
+                    modelo.actualizar_nota(documento, codigo, azar.choice(NOTAS))
+                else:
+                    modelo.eliminar_estudiante(documento)
+                    nuevo = str(30000 + len(tocados))
+                    tocados.add(nuevo)
+                    modelo.crear_estudiante(nuevo, "Nuevo", "Apellido", "n@correo.com", "2000-01-01")
+                    modelo.matricular_estudiante(nuevo, "C0", azar.choice(NOTAS))
+
+            for orden in CLAVES_MATRICULAS:
+                antes = [fila for fila in _ordenadas(modelo, orden) if fila[0] not in tocados]
+                filas = _paginas(modelo, 25, cambiar, orden=orden)
+                claves = [CLAVES_MATRICULAS[orden](fila) for fila in filas]
+                assert claves == sorted(set(claves)), (modelo.columnar, modelo.motor, orden)
+                intactas = [fila for fila in filas if fila[0] not in tocados]
+                assert intactas == [fila for fila in antes if fila[0] not in tocados], \
+                    (modelo.columnar, modelo.motor, orden)
+            if modelo.motor is not None:
+                modelo.motor.cerrar()
+
+
+def main():
+    print("=" * 70)
+    print("📄 PRUEBA DE PAGINACIÓN POR CURSOR - consultar_matriculas")
+    print("=" * 70)
+    pruebas = [test_empates_sin_saltos_ni_repetidos, test_cambios_entre_paginas]
+    exito = True
+    for prueba in pruebas:
+        inicio = time.perf_counter()
+        try:
+            prueba()
+            print(f"   ✅ {prueba.__name__} ({time.perf_counter() - inicio:.2f} s)")
+        except AssertionError as e:
+            print(f"   ❌ {prueba.__name__}: {e}")
+            exito = False
+    return exito
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,146 @@
+## ==================== test_delta.py ====================
+"""
+Pruebas de los guardados incrementales: después de varios guardados que solo
+agregan líneas al archivo .delta, cargar el JSON con sus deltas reproduce el
+modelo (en diccionarios, incluido el orden de las matrículas).
+
+Ejecutar: python test_delta.py   (o con pytest)
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+from modelo import ModeloSIGA
+from motor_sqlite import MotorSQLite
+
+
+ESTUDIANTES = 80
+CURSOS = 8
+GUARDADOS = 6
+
+
+def _operar(modelo, azar, pasos):
+    documentos = [str(1000 + i) for i in range(ESTUDIANTES)]
+    codigos = [f"C{i}" for i in range(CURSOS)]
+    for _ in range(pasos):
+        op = azar.random()
+        try:
+            if op < .15:
+                modelo.crear_estudiante(azar.choice(documentos), "Nombre", "Apellido",
+                                        "a@correo.com", "2000-01-01")
+            elif op < .2:
+                modelo.crear_curso(azar.choice(codigos), f"Curso {azar.randrange(100)}")
+            elif op < .6:
+                modelo.matricular_estudiante(azar.choice(documentos), azar.choice(codigos),
+                                             round(azar.uniform(0, 5), 1))
+            elif op < .85:
+                modelo.actualizar_nota(azar.choice(documentos), azar.choice(codigos),
+                                       round(azar.uniform(0, 5), 1))
+            elif op < .9:
+                modelo.eliminar_estudiante(azar.choice(documentos))
+            elif op < .92:
+                modelo.eliminar_curso(azar.choice(codigos))
+        except ValueError:
+            pass
+
+
+def _foto(modelo, orden_matriculas=True):
+    # El almacén columnar y el motor reutilizan filas, así que solo el modelo
+    # en diccionarios conserva el orden de las matrículas
+    estudiantes = [est.to_dict() for est in modelo.estudiantes.values()]
+    cursos = [curso.to_dict() for curso in modelo.cursos.values()]
+    matriculas = list(modelo.matriculas)
+    if not orden_matriculas:
+        for est in estudiantes:
+            est['cursos'].sort()
+        for curso in cursos:
+            curso['estudiantes'].sort()
+        matriculas.sort()
+    return dict(estudiantes=estudiantes, cursos=cursos, matriculas=matriculas,
+                generales=modelo.obtener_estadisticas_generales().total)
+
+
+def _comparar(cargado, modelo):
+    orden = all(not m.columnar and m.motor is None for m in (cargado, modelo))
+    assert _foto(cargado, orden) == _foto(modelo, orden), (cargado.columnar, cargado.motor)
+
+
+def _cargar(archivo, directorio):
+    for modelo in (ModeloSIGA(), ModeloSIGA(columnar=True),
+                   ModeloSIGA(motor=MotorSQLite(os.path.join(directorio, f"siga-{time.perf_counter_ns()}.db")))):
+        modelo.cargar_datos_json(archivo)
+        yield modelo
+        if modelo.motor is not None:
+            modelo.motor.cerrar()
+
+
+def test_reaplicar_deltas():
+    """Cargar el JSON base con varios deltas da el mismo modelo que se guardó."""
+    with tempfile.TemporaryDirectory() as directorio:
+        archivo = os.path.join(directorio, "siga.json")
+        azar = random.Random(13)
+        modelo = ModeloSIGA()
+        _operar(modelo, azar, 400)
+        assert modelo.guardar_datos_json(archivo, incremental=True) is False
+
+        for _ in range(GUARDADOS):
+            _operar(modelo, azar, 150)
+            assert modelo.guardar_datos_json(archivo, incremental=True) is True
+            assert not modelo.hay_cambios()
+        with open(f"{archivo}.delta", encoding='utf-8') as f:
+            assert len(f.readlines()) == GUARDADOS
+
+        for cargado in _cargar(archivo, directorio):
+            _comparar(cargado, modelo)
+
+        # Guardar todo de nuevo incorpora los deltas y borra el archivo .delta
+        modelo.compactar_datos_json()
+        assert not os.path.exists(f"{archivo}.delta")
+        for cargado in _cargar(archivo, directorio):
+            _comparar(cargado, modelo)
+
+
+def test_delta_interrumpido():
+    """Un último delta escrito a medias se ignora; los anteriores se aplican."""
+    with tempfile.TemporaryDirectory() as directorio:
+        archivo = os.path.join(directorio, "siga.json")
+        azar = random.Random(17)
+        modelo = ModeloSIGA()
+        _operar(modelo, azar, 300)
+        modelo.guardar_datos_json(archivo, incremental=True)
+        _operar(modelo, azar, 100)
+        modelo.guardar_datos_json(archivo, incremental=True)
+        esperado = _foto(modelo)
+
+        _operar(modelo, azar, 100)
+        modelo.guardar_datos_json(archivo, incremental=True)
+        with open(f"{archivo}.delta", 'rb+') as f:
+            f.truncate(os.path.getsize(f"{archivo}.delta") - 10)
+
+        cargado = ModeloSIGA()
+        cargado.cargar_datos_json(archivo)
+        assert _foto(cargado) == esperado
+
+
+def main():
+    print("=" * 70)
+    print("🧾 PRUEBA DE GUARDADOS INCREMENTALES - guardar_datos_json(incremental=True)")
+    print("=" * 70)
+    pruebas = [test_reaplicar_deltas, test_delta_interrumpido]
+    exito = True
+    for prueba in pruebas:
+        inicio = time.perf_counter()
+        try:
+            prueba()
+            print(f"   ✅ {prueba.__name__} ({time.perf_counter() - inicio:.2f} s)")
+        except AssertionError as e:
+            print(f"   ❌ {prueba.__name__}: {e}")
+            exito = False
+    return exito
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
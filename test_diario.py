@@ -0,0 +1,160 @@
+## ==================== test_diario.py ====================
+"""
+Pruebas del diario de cambios: recuperación tras un cierre abrupto, descarte
+de la última línea a medio escribir y generaciones de los puntos de control.
+
+Ejecutar: python test_diario.py   (o con pytest)
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+from diario import Diario
+from modelo import ModeloSIGA
+
+
+def _estado(modelo):
+    return (sorted((e.documento, e.nombre) for e in modelo.estudiantes.values()),
+            sorted(modelo.cursos), sorted(modelo.matriculas))
+
+
+def _operar(modelo):
+    modelo.crear_curso("MAT", "Matemáticas")
+    modelo.crear_curso("FIS", "Física")
+    for i in range(5):
+        modelo.crear_estudiante(str(1000 + i), f"Nombre{i}", "Pérez", f"e{i}@correo.com", "2000-01-01")
+    modelo.matricular_estudiantes([(str(1000 + i), "MAT", 3.0 + i / 2) for i in range(5)])
+    modelo.matricular_estudiante("1000", "FIS", 2.0)
+    modelo.actualizar_nota("1000", "MAT", 4.9)
+    modelo.eliminar_estudiante("1004")
+
+
+def _abandonar(diario):
+    # Como si el proceso muriera: sin cerrar, solo lo que ya llegó al archivo
+    diario.modelo.desuscribir(diario._registrar)
+    diario.sincronizar()
+    diario._f.close()
+
+
+def test_recuperacion():
+    """Al abrir, se carga la instantánea y se reproducen los cambios del diario."""
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, "siga")
+        modelo = ModeloSIGA()
+        diario = Diario(modelo, ruta, intervalo=0)
+        _operar(modelo)
+        _abandonar(diario)
+
+        recuperado = ModeloSIGA()
+        with Diario(recuperado, ruta, intervalo=0) as otro:
+            assert otro.recuperados == 11
+            assert _estado(recuperado) == _estado(modelo)
+            assert recuperado.obtener_estadisticas_curso("MAT").total == 4
+
+            # Lo recuperado no se registra otra vez; lo nuevo sí
+            recuperado.crear_curso("QUI", "Química")
+        with Diario(ModeloSIGA(), ruta, intervalo=0) as tercero:
+            assert tercero.recuperados == 12
+            assert "QUI" in tercero.modelo.cursos
+
+
+def test_linea_incompleta():
+    """Una última línea cortada o con crc inválido se descarta y se trunca del archivo."""
+    for basura in (b'1f2e3d4c ["crear_curso","X"', b'00000000 ["crear_curso","X","Otro"]\n'):
+        with tempfile.TemporaryDirectory() as directorio:
+            ruta = os.path.join(directorio, "siga")
+            modelo = ModeloSIGA()
+            diario = Diario(modelo, ruta, intervalo=0)
+            _operar(modelo)
+            _abandonar(diario)
+            tamano = os.path.getsize(f"{ruta}.diario")
+            with open(f"{ruta}.diario", 'ab') as f:
+                f.write(basura)
+
+            recuperado = ModeloSIGA()
+            with Diario(recuperado, ruta, intervalo=0) as otro:
+                assert otro.recuperados == 11
+                assert "X" not in recuperado.cursos
+                assert os.path.getsize(f"{ruta}.diario") == tamano
+                recuperado.crear_curso("X", "Bien escrito")
+            with Diario(ModeloSIGA(), ruta, intervalo=0) as tercero:
+                assert tercero.modelo.cursos["X"].nombre == "Bien escrito"
+
+
+def test_generaciones():
+    """Cada punto de control sube la generación; un diario de otra generación se descarta."""
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, "siga")
+        modelo = ModeloSIGA()
+        diario = Diario(modelo, ruta, intervalo=0, registros_por_punto_control=4)
+        assert diario._generacion == 1  # Sin instantánea previa se guarda una al abrir
+        _operar(modelo)                  # 11 cambios: dos puntos de control
+        assert diario._generacion == 3
+        assert ModeloSIGA.abrir_instantanea(f"{ruta}.siga").generacion == 3
+        _abandonar(diario)
+
+        # El proceso muere entre guardar la instantánea y vaciar el diario: la
+        # instantánea ya incluye esos cambios y no se deben reproducir dos veces
+        with open(f"{ruta}.diario", 'rb') as f:
+            assert len(f.readlines()) == 4  # Cabecera y los tres cambios posteriores al último punto
+        modelo.actualizar_nota("1000", "FIS", 2.5)
+        modelo.guardar_instantanea(f"{ruta}.siga", 4)
+        with open(f"{ruta}.diario", 'ab') as f:
+            f.write(b'00000000 incompleta')
+
+        recuperado = ModeloSIGA()
+        with Diario(recuperado, ruta, intervalo=0) as otro:
+            assert otro.recuperados == 0 and otro._generacion == 4
+            assert _estado(recuperado) == _estado(modelo)
+            assert recuperado.obtener_nota("1000", "FIS") == 2.5
+        with open(f"{ruta}.diario", 'rb') as f:
+            assert len(f.readlines()) == 1  # El diario descartado quedó vacío (solo la cabecera)
+
+
+def test_carga_fallida_sin_punto_de_control():
+    """Una carga que falla no se notifica: no hay punto de control ni cambio de generación."""
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, "siga")
+        modelo = ModeloSIGA()
+        with Diario(modelo, ruta, intervalo=0) as diario:
+            _operar(modelo)
+            generacion = diario._generacion
+            dañado = os.path.join(directorio, "dañado.json")
+            with open(dañado, 'w', encoding='utf-8') as f:
+                f.write('{"estudiantes": [{"documento": "1"')
+            try:
+                modelo.cargar_datos_json(dañado)
+                fallo = False
+            except Exception:
+                fallo = True
+            assert fallo, "La carga debía fallar"
+            assert diario._generacion == generacion
+
+            valido = os.path.join(directorio, "valido.json")
+            modelo.guardar_datos_json(valido)
+            modelo.cargar_datos_json(valido)
+            assert diario._generacion == generacion + 1
+
+
+def main():
+    print("=" * 70)
+    print("📓 PRUEBA DEL DIARIO DE CAMBIOS - diario")
+    print("=" * 70)
+    pruebas = [test_recuperacion, test_linea_incompleta, test_generaciones,
+               test_carga_fallida_sin_punto_de_control]
+    exito = True
+    for prueba in pruebas:
+        inicio = time.perf_counter()
+        try:
+            prueba()
+            print(f"   ✅ {prueba.__name__} ({time.perf_counter() - inicio:.2f} s)")
+        except AssertionError as e:
+            print(f"   ❌ {prueba.__name__}: {e}")
+            exito = False
+    return exito
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
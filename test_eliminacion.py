@@ -0,0 +1,102 @@
+## ==================== test_eliminacion.py ====================
+"""
+Pruebas de la eliminación en lote: al eliminar una cohorte grande, sus
+matrículas, los agregados por curso y el índice de búsqueda quedan como si
+los estudiantes nunca hubieran existido.
+
+Ejecutar: python test_eliminacion.py   (o con pytest)
+"""
+
+import random
+import sys
+import time
+
+from modelo import ModeloSIGA
+
+
+ESTUDIANTES = 30000
+CURSOS = 20
+MATRICULAS_POR_ESTUDIANTE = 3
+
+
+def _poblar(modelo, estudiantes=ESTUDIANTES):
+    azar = random.Random(11)
+    for i in range(CURSOS):
+        modelo.crear_curso(f"C{i:02d}", f"Curso {i}")
+    for i in range(estudiantes):
+        documento = str(10_000_000 + i)
+        modelo._agregar_estudiante(documento, f"Nombre{i % 97}", f"Apellido{i % 89}",
+                                   f"e{i}@correo.com", "2000-01-01")
+        for curso in azar.sample(range(CURSOS), MATRICULAS_POR_ESTUDIANTE):
+            modelo._vincular(documento, f"C{curso:02d}", round(azar.uniform(0, 5), 1))
+
+
+def test_eliminar_cohorte():
+    """Eliminar un 10% de los estudiantes deja matrículas, agregados y búsqueda coherentes."""
+    for columnar in (False, True):
+        modelo = ModeloSIGA(columnar=columnar)
+        _poblar(modelo)
+        cohorte = [str(10_000_000 + i) for i in range(0, ESTUDIANTES, 10)]
+        quedan = set(modelo.estudiantes) - set(cohorte)
+
+        inicio = time.perf_counter()
+        modelo.eliminar_estudiantes(cohorte)
+        duracion = time.perf_counter() - inicio
+        assert duracion < 10, f"Eliminar {len(cohorte)} estudiantes tomó {duracion:.1f} s"
+
+        assert set(modelo.estudiantes) == quedan, columnar
+        assert all(documento in quedan for documento, _, _ in modelo.matriculas), columnar
+        assert len(modelo.matriculas) == len(quedan) * MATRICULAS_POR_ESTUDIANTE, columnar
+
+        total = 0
+        for codigo, curso in modelo.cursos.items():
+            notas = [modelo._matriculas[(documento, codigo)] for documento in curso.estudiantes]
+            assert set(curso.estudiantes) <= quedan, (columnar, codigo)
+            estadisticas = modelo.obtener_estadisticas_curso(codigo)
+            assert estadisticas.total == len(notas), (columnar, codigo)
+            assert abs(estadisticas.suma - sum(notas)) < 1e-6, (columnar, codigo)
+            top = [e.documento for e, _ in modelo.obtener_top_estudiantes(codigo, None)]
+            assert sorted(top) == sorted(curso.estudiantes), (columnar, codigo)
+            total += len(notas)
+        assert modelo.obtener_estadisticas_generales().total == total, columnar
+        assert modelo.contar_matriculas_por_nota(0.0) == total, columnar
+
+        # Ni los documentos ni los correos de la cohorte se encuentran ya
+        assert not modelo.buscar_estudiantes(cohorte[5]), columnar
+        assert not modelo.buscar_estudiantes(f"e{int(cohorte[7]) - 10_000_000}@"), columnar
+        encontrados = {e.documento for e in modelo.buscar_estudiantes("Apellido1")}
+        esperados = {d for d in quedan if "apellido1" in modelo.estudiantes[d].apellidos.lower()}
+        assert encontrados == esperados, columnar
+        assert len(modelo.buscar_estudiantes("")) == len(quedan), columnar
+
+
+def test_eliminar_y_volver_a_crear():
+    """Un estudiante eliminado en lote puede volver a crearse y encontrarse."""
+    modelo = ModeloSIGA()
+    _poblar(modelo, 500)
+    documento = str(10_000_000 + 123)
+    modelo.eliminar_estudiantes([documento, str(10_000_000 + 124), documento])
+    assert not modelo.buscar_estudiantes(documento)
+    modelo.crear_estudiante(documento, "Regresa", "Zúñiga", "r@correo.com", "2000-01-01")
+    assert [e.documento for e in modelo.buscar_estudiantes("zuniga")] == [documento]
+
+
+def main():
+    print("=" * 70)
+    print("🧹 PRUEBA DE ELIMINACIÓN EN LOTE - eliminar_estudiantes")
+    print("=" * 70)
+    pruebas = [test_eliminar_cohorte, test_eliminar_y_volver_a_crear]
+    exito = True
+    for prueba in pruebas:
+        inicio = time.perf_counter()
+        try:
+            prueba()
+            print(f"   ✅ {prueba.__name__} ({time.perf_counter() - inicio:.2f} s)")
+        except AssertionError as e:
+            print(f"   ❌ {prueba.__name__}: {e}")
+            exito = False
+    return exito
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,147 @@
+## ==================== test_estructuras.py ====================
+"""
+Pruebas de ListaOrdenada: posicion() y contar() coinciden con contar a mano
+mientras la lista cambia, y copia() da listas independientes aunque compartan
+los bloques.
+
+Ejecutar: python test_estructuras.py   (o con pytest)
+"""
+
+import random
+import sys
+import time
+from bisect import bisect_left
+
+from estructuras import ListaOrdenada
+
+
+PASOS = 10000
+VALORES = 300
+
+
+class _CargaPequena:
+    """Bloques diminutos para que las pruebas dividan y vacíen bloques a menudo."""
+
+    def __enter__(self):
+        self._carga = ListaOrdenada.CARGA
+        ListaOrdenada.CARGA = 4
+
+    def __exit__(self, *error):
+        ListaOrdenada.CARGA = self._carga
+
+
+def _revisar(lista, esperado, azar):
+    assert list(lista) == esperado
+    assert list(reversed(lista)) == esperado[::-1]
+    assert len(lista) == len(esperado)
+    for _ in range(5):
+        valor = azar.randrange(-1, VALORES + 1)
+        assert lista.posicion(valor) == bisect_left(esperado, valor), valor
+        assert (valor in lista) == (valor in esperado), valor
+        hasta = azar.randrange(-1, VALORES + 1)
+        assert lista.contar(valor, hasta) == sum(valor <= v < hasta for v in esperado), (valor, hasta)
+        assert list(lista.desde(valor)) == esperado[bisect_left(esperado, valor):], valor
+
+
+def test_posicion_y_contar():
+    """posicion() y contar() siguen la lista bajo agregar, agregar_lote y quitar."""
+    azar = random.Random(1)
+    with _CargaPequena():
+        lista, esperado = ListaOrdenada(), []
+        for paso in range(PASOS):
+            op = azar.random()
+            if op < .5:
+                valor = azar.randrange(VALORES)
+                lista.agregar(valor)
+                esperado.append(valor)
+            elif op < .55:
+                # Lotes pequeños se insertan uno a uno y los grandes rehacen la lista
+                lote = [azar.randrange(VALORES) for _ in range(azar.choice((1, 3, 40)))]
+                lista.agregar_lote(lote)
+                esperado.extend(lote)
+            elif esperado:
+                valor = azar.choice(esperado)
+                lista.quitar(valor)
+                esperado.remove(valor)
+            esperado.sort()
+            if paso % 50 == 0:
+                _revisar(lista, esperado, azar)
+        _revisar(lista, esperado, azar)
+
+
+def test_quitar_ausente():
+    """Quitar un valor que no está lanza ValueError y no cambia la lista."""
+    lista = ListaOrdenada([3, 1, 2])
+    for valor in (0, 4, 2.5):
+        try:
+            lista.quitar(valor)
+            assert False, f"quitar({valor}) debía fallar"
+        except ValueError:
+            pass
+    assert list(lista) == [1, 2, 3] and lista.posicion(3) == 2
+
+
+def test_copia_independiente():
+    """Las copias comparten bloques pero los cambios de una no se ven en las otras."""
+    azar = random.Random(2)
+    with _CargaPequena():
+        iniciales = [azar.randrange(VALORES) for _ in range(200)]
+        listas = [(ListaOrdenada(iniciales), sorted(iniciales))]
+        for paso in range(PASOS):
+            lista, esperado = azar.choice(listas)
+            op = azar.random()
+            if op < .45:
+                valor = azar.randrange(VALORES)
+                lista.agregar(valor)
+                esperado.append(valor)
+                esperado.sort()
+            elif op < .9 and esperado:
+                valor = azar.choice(esperado)
+                lista.quitar(valor)
+                esperado.remove(valor)
+            elif len(listas) < 30:
+                listas.append((lista.copia(), esperado[:]))
+            if paso % 100 == 0:
+                for lista, esperado in listas:
+                    _revisar(lista, esperado, azar)
+        for lista, esperado in listas:
+            _revisar(lista, esperado, azar)
+
+
+def test_copia_comparte_bloques():
+    """Copiar no duplica los bloques; escribir copia solo el bloque tocado."""
+    lista = ListaOrdenada(range(10 * ListaOrdenada.CARGA))
+    copia = lista.copia()
+    assert all(a is b for a, b in zip(lista._bloques, copia._bloques))
+
+    copia.agregar(0)
+    compartidos = sum(a is b for a, b in zip(lista._bloques, copia._bloques))
+    assert compartidos == len(lista._bloques) - 1
+    assert lista.contar(0, 1) == 1 and copia.contar(0, 1) == 2
+
+    # El bloque ya es propio de la copia: la siguiente escritura no lo vuelve a copiar
+    propio = copia._bloques[0]
+    copia.agregar(0)
+    assert copia._bloques[0] is propio
+
+
+def main():
+    print("=" * 70)
+    print("🧱 PRUEBA DE ESTRUCTURAS - ListaOrdenada")
+    print("=" * 70)
+    pruebas = [test_posicion_y_contar, test_quitar_ausente, test_copia_independiente,
+               test_copia_comparte_bloques]
+    exito = True
+    for prueba in pruebas:
+        inicio = time.perf_counter()
+        try:
+            prueba()
+            print(f"   ✅ {prueba.__name__} ({time.perf_counter() - inicio:.2f} s)")
+        except AssertionError as e:
+            print(f"   ❌ {prueba.__name__}: {e}")
+            exito = False
+    return exito
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
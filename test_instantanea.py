@@ -0,0 +1,108 @@
+## ==================== test_instantanea.py ====================
+"""
+Pruebas de ida y vuelta entre JSON e instantánea: una institución del
+generador (o un modelo con cadenas difíciles) pasa de JSON a instantánea y
+de vuelta a JSON sin cambiar un solo byte, por cualquiera de los caminos.
+
+Ejecutar: python test_instantanea.py   (o con pytest)
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+from generador import InstitucionSintetica
+from instantanea import instantanea_a_json, json_a_instantanea
+from modelo import ModeloSIGA
+
+
+def _leer(archivo):
+    with open(archivo, 'rb') as f:
+        return f.read()
+
+
+def _ida_y_vuelta(directorio, archivo_json, compacto):
+    # Cada camino de instantánea a JSON debe dar exactamente archivo_json
+    instantanea = os.path.join(directorio, "ida.siga")
+    json_a_instantanea(archivo_json, instantanea)
+    caminos = []
+
+    convertido = os.path.join(directorio, "convertido.json")
+    instantanea_a_json(instantanea, convertido, compacto=compacto)
+    caminos.append(("instantanea_a_json", convertido))
+
+    for columnar in (False, True):
+        modelo = ModeloSIGA(columnar=columnar)
+        modelo.cargar_instantanea(instantanea)
+        guardado = os.path.join(directorio, f"cargado-{columnar}.json")
+        modelo.guardar_datos_json(guardado, compacto=compacto)
+        caminos.append((f"cargar_instantanea columnar={columnar}", guardado))
+
+    esperado = _leer(archivo_json)
+    for camino, archivo in caminos:
+        assert _leer(archivo) == esperado, (camino, compacto)
+
+
+def test_institucion_generada():
+    """El JSON del generador, guardado por el modelo, sobrevive a la instantánea."""
+    with tempfile.TemporaryDirectory() as directorio:
+        institucion = InstitucionSintetica(1000, num_cursos=30, semilla=5)
+        generado = os.path.join(directorio, "generado.json")
+        institucion.escribir_json(generado)
+
+        modelo = ModeloSIGA()
+        modelo.cargar_datos_json(generado)
+        assert len(modelo.matriculas) == institucion.num_matriculas
+        for compacto in (True, False):
+            archivo = os.path.join(directorio, f"modelo-{compacto}.json")
+            modelo.guardar_datos_json(archivo, compacto=compacto)
+            _ida_y_vuelta(directorio, archivo, compacto)
+
+        # La instantánea que escribe el generador da el mismo JSON que la del modelo
+        instantanea = os.path.join(directorio, "generado.siga")
+        institucion.escribir_instantanea(instantanea)
+        convertido = os.path.join(directorio, "generado-convertido.json")
+        instantanea_a_json(instantanea, convertido, compacto=True)
+        assert _leer(convertido) == _leer(os.path.join(directorio, "modelo-True.json"))
+
+
+def test_cadenas_y_huecos():
+    """Comillas, acentos, estudiantes sin cursos y cursos sin estudiantes se conservan."""
+    with tempfile.TemporaryDirectory() as directorio:
+        modelo = ModeloSIGA()
+        modelo.crear_curso("MAT", 'Matemáticas "básicas"')
+        modelo.crear_curso("VAC", "Curso sin estudiantes \\ ni notas")
+        modelo.crear_curso("FIS", "Física ∑ 😀")
+        modelo.crear_estudiante("300", "Ñandú", "Peña O'Neil", "n@correo.com", "1999-12-31")
+        modelo.crear_estudiante("100", "Ana\tMaría", 'Díaz "la profe"', "a@correo.com", "2000-02-29")
+        modelo.crear_estudiante("200", "Sin", "Cursos", "s@correo.com", "2001-01-01")
+        modelo.matricular_estudiante("300", "FIS", 5.0)
+        modelo.matricular_estudiante("100", "FIS", 0.0)
+        modelo.matricular_estudiante("100", "MAT", 2.95)
+        modelo.matricular_estudiante("300", "MAT", 3.0)
+        for compacto in (True, False):
+            archivo = os.path.join(directorio, f"modelo-{compacto}.json")
+            modelo.guardar_datos_json(archivo, compacto=compacto)
+            _ida_y_vuelta(directorio, archivo, compacto)
+
+
+def main():
+    print("=" * 70)
+    print("💾 PRUEBA DE IDA Y VUELTA JSON ↔ INSTANTÁNEA - instantanea")
+    print("=" * 70)
+    pruebas = [test_institucion_generada, test_cadenas_y_huecos]
+    exito = True
+    for prueba in pruebas:
+        inicio = time.perf_counter()
+        try:
+            prueba()
+            print(f"   ✅ {prueba.__name__} ({time.perf_counter() - inicio:.2f} s)")
+        except AssertionError as e:
+            print(f"   ❌ {prueba.__name__}: {e}")
+            exito = False
+    return exito
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,135 @@
+## ==================== test_lectura.py ====================
+"""
+Pruebas de las lecturas consistentes (ModeloSIGA.lectura): la lectura ve el
+estado del modelo al crearla aunque el modelo siga cambiando, crearla no
+copia nada y el modelo copia solo los registros que modifica.
+
+Ejecutar: python test_lectura.py   (o con pytest)
+"""
+
+import random
+import sys
+import time
+
+from modelo import ModeloSIGA
+
+
+ESTUDIANTES = 60
+CURSOS = 6
+
+
+def _foto(modelo):
+    # Lo que se compara de una lectura y del modelo: el orden de las
+    # matrículas modificadas después de crear la lectura puede cambiar
+    return dict(
+        estudiantes={d: (e.nombre, dict(e.notas)) for d, e in modelo.estudiantes.items()},
+        cursos={c: (x.nombre, sorted(x.estudiantes)) for c, x in modelo.cursos.items()},
+        matriculas=sorted(modelo.matriculas),
+        top={c: [(e.documento, n) for e, n in modelo.obtener_top_estudiantes(c, None)] for c in modelo.cursos},
+        estadisticas={c: modelo.obtener_estadisticas_curso(c).total for c in modelo.cursos},
+        generales=modelo.obtener_estadisticas_generales().total,
+        aprobadas=modelo.contar_matriculas_por_nota(3.0),
+    )
+
+
+def _operar(modelo, azar, pasos):
+    documentos = [str(1000 + i) for i in range(ESTUDIANTES)]
+    codigos = [f"C{i}" for i in range(CURSOS)]
+    for _ in range(pasos):
+        op = azar.random()
+        try:
+            if op < .15:
+                modelo.crear_estudiante(azar.choice(documentos), "Nombre", "Apellido",
+                                        "a@correo.com", "2000-01-01")
+            elif op < .2:
+                modelo.crear_curso(azar.choice(codigos), "Curso")
+            elif op < .6:
+                modelo.matricular_estudiante(azar.choice(documentos), azar.choice(codigos),
+                                             round(azar.uniform(0, 5), 1))
+            elif op < .85:
+                modelo.actualizar_nota(azar.choice(documentos), azar.choice(codigos),
+                                       round(azar.uniform(0, 5), 1))
+            elif op < .97:
+                modelo.eliminar_estudiante(azar.choice(documentos))
+            else:
+                modelo.eliminar_curso(azar.choice(codigos))
+        except ValueError:
+            pass
+
+
+def test_lectura_fija():
+    """Cada lectura sigue viendo el estado al crearla, sin y con almacén columnar."""
+    for columnar in (False, True):
+        azar = random.Random(3)
+        modelo = ModeloSIGA(columnar=columnar)
+        lecturas = []
+        for _ in range(8):
+            _operar(modelo, azar, 150)
+            lectura = modelo.lectura()
+            lecturas.append((lectura, _foto(lectura)))
+            assert lecturas[-1][1] == _foto(modelo), columnar
+        _operar(modelo, azar, 300)
+        for lectura, foto in lecturas:
+            assert _foto(lectura) == foto, (columnar, lectura)
+            lectura.cerrar()
+
+
+def test_copia_solo_lo_modificado():
+    """Crear la lectura no copia; el modelo copia cada registro al modificarlo por primera vez."""
+    modelo = ModeloSIGA()
+    _operar(modelo, random.Random(5), 400)
+    documentos = [d for d, e in modelo.estudiantes.items() if e.cursos]
+    cambiado, intacto = documentos[:2]
+    codigo = next(iter(modelo.estudiantes[cambiado].cursos))
+
+    with modelo.lectura() as lectura:
+        assert lectura.estudiantes[cambiado] is modelo.estudiantes[cambiado]
+        modelo.actualizar_nota(cambiado, codigo, 0.0)
+        assert lectura.estudiantes[cambiado] is not modelo.estudiantes[cambiado]
+        assert lectura.estudiantes[intacto] is modelo.estudiantes[intacto]
+        assert lectura._rankings[codigo] is not modelo._rankings[codigo]
+
+        # Ya es propio del modelo: la siguiente escritura no lo vuelve a copiar
+        propio = modelo.estudiantes[cambiado]
+        modelo.actualizar_nota(cambiado, codigo, 1.0)
+        assert modelo.estudiantes[cambiado] is propio
+
+
+def test_cerrar_libera():
+    """Al cerrar la lectura el modelo la olvida y deja de guardar valores anteriores."""
+    modelo = ModeloSIGA()
+    _operar(modelo, random.Random(7), 200)
+    documento = next(d for d, e in modelo.estudiantes.items() if e.cursos)
+    codigo = next(iter(modelo.estudiantes[documento].cursos))
+
+    lectura = modelo.lectura()
+    otra = modelo.lectura()  # Sin cambios de por medio: ven lo mismo
+    assert len(modelo._lecturas) == 2
+    lectura.cerrar()
+    otra.cerrar()
+    assert not modelo._lecturas
+
+    estudiante = modelo.estudiantes[documento]
+    modelo.actualizar_nota(documento, codigo, 2.5)
+    assert modelo.estudiantes[documento] is estudiante
+
+
+def main():
+    print("=" * 70)
+    print("📸 PRUEBA DE LECTURAS CONSISTENTES - lectura")
+    print("=" * 70)
+    pruebas = [test_lectura_fija, test_copia_solo_lo_modificado, test_cerrar_libera]
+    exito = True
+    for prueba in pruebas:
+        inicio = time.perf_counter()
+        try:
+            prueba()
+            print(f"   ✅ {prueba.__name__} ({time.perf_counter() - inicio:.2f} s)")
+        except AssertionError as e:
+            print(f"   ❌ {prueba.__name__}: {e}")
+            exito = False
+    return exito
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
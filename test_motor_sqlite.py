@@ -0,0 +1,245 @@
+## ==================== test_motor_sqlite.py ====================
+"""
+Pruebas de ModeloSIGA sobre MotorSQLite.
+
+Las consultas (rankings, conteos, páginas de matrículas y búsqueda) se
+resuelven en SQL con los índices de la base y deben dar lo mismo que el
+modelo en memoria; cada operación pública queda confirmada al terminar y,
+si falla, no deja nada en la base.
+
+Ejecutar: python test_motor_sqlite.py   (o con pytest)
+"""
+
+import os
+import random
+import re
+import sqlite3
+import sys
+import tempfile
+import time
+
+from modelo import ModeloSIGA, CLAVES_MATRICULAS
+from motor_sqlite import MotorSQLite
+
+
+ESTUDIANTES = 300
+CURSOS = 8
+NOTAS = [0.0, 1.5, 2.9, 3.0, 3.5, 4.2, 5.0]  # Pocas notas distintas: muchos empates
+
+
+def _poblar(*modelos):
+    azar = random.Random(7)
+    apellidos = ["Pérez", "Gómez", "Núñez", "Díaz", "Ruiz"]
+    for modelo in modelos:
+        for i in range(CURSOS):
+            modelo.crear_curso(f"C{i}", f"Curso {i}")
+    for i in range(ESTUDIANTES):
+        documento = str(10000 + i)
+        datos = (documento, f"Nombre{i}", f"{apellidos[i % 5]} {i}", f"e{i}@correo.com", "2000-01-01")
+        cursos = azar.sample(range(CURSOS), azar.randint(0, 4))
+        notas = [azar.choice(NOTAS) for _ in cursos]
+        for modelo in modelos:
+            modelo.crear_estudiante(*datos)
+            for curso, nota in zip(cursos, notas):
+                modelo.matricular_estudiante(documento, f"C{curso}", nota)
+
+
+def _abrir(directorio):
+    return ModeloSIGA(motor=MotorSQLite(os.path.join(directorio, "siga.db")))
+
+
+def _paginas(modelo, limite, **filtro):
+    filas = []
+    cursor = None
+    while True:
+        pagina = modelo.consultar_matriculas(despues_de=cursor, limite=limite, **filtro)
+        filas.extend(pagina.filas)
+        if pagina.siguiente is None:
+            return filas
+        cursor = pagina.siguiente
+
+
+def _todas(modelo, codigo_curso=None, documento=None, nota_minima=None, nota_maxima=None,
+           aprobado=None, orden='curso'):
+    # Fuerza bruta: filtra y ordena todas las matrículas
+    filas = [fila for fila in modelo.matriculas
+             if (codigo_curso is None or fila[1] == codigo_curso)
+             and (documento is None or fila[0] == documento)
+             and (nota_minima is None or fila[2] >= nota_minima)
+             and (nota_maxima is None or fila[2] <= nota_maxima)
+             and (aprobado is None or (fila[2] >= 3.0) == aprobado)]
+    return sorted(filas, key=CLAVES_MATRICULAS[orden])
+
+
+def _agregados(modelo):
+    # Releídos de la base, las sumas pueden diferir en el último decimal
+    return {codigo: (e.total, e.aprobados, round(e.promedio, 9))
+            for codigo, e in ((codigo, modelo.obtener_estadisticas_curso(codigo)) for codigo in modelo.cursos)}
+
+
+def test_consultas_como_en_memoria():
+    """Rankings, conteos, matrículas por curso y búsqueda coinciden con el modelo en memoria."""
+    with tempfile.TemporaryDirectory() as directorio:
+        memoria, sqlite = ModeloSIGA(), _abrir(directorio)
+        _poblar(memoria, sqlite)
+
+        def filas(ranking):
+            return [(estudiante.documento, nota) for estudiante, nota in ranking]
+
+        for i in range(CURSOS):
+            codigo = f"C{i}"
+            for n in (1, 5, None):
+                assert filas(sqlite.obtener_top_estudiantes(codigo, n)) == \
+                    filas(memoria.obtener_top_estudiantes(codigo, n)), (codigo, n)
+                assert filas(sqlite.obtener_bottom_estudiantes(codigo, n)) == \
+                    filas(memoria.obtener_bottom_estudiantes(codigo, n)), (codigo, n)
+            assert sqlite.obtener_matriculas_por_curso(codigo) == memoria.obtener_matriculas_por_curso(codigo)
+            assert sqlite.obtener_promedio_curso(codigo) == memoria.obtener_promedio_curso(codigo)
+        for minima, maxima, codigo in [(None, None, None), (3.0, None, None), (None, 2.9, "C1"),
+                                       (1.5, 4.2, "C2"), (4.3, 4.9, None), (0.0, 0.0, "C3")]:
+            assert sqlite.contar_matriculas_por_nota(minima, maxima, codigo) == \
+                memoria.contar_matriculas_por_nota(minima, maxima, codigo), (minima, maxima, codigo)
+        for termino in ["perez", "NÚÑEZ", "e12@", "1001", "ez 1", "no-existe"]:
+            assert [e.documento for e in sqlite.buscar_estudiantes(termino)] == \
+                [e.documento for e in memoria.buscar_estudiantes(termino)], termino
+        sqlite.motor.cerrar()
+
+
+def test_paginacion_por_cursor():
+    """Cada filtro y orden, recorrido página a página, da las filas de la fuerza bruta."""
+    with tempfile.TemporaryDirectory() as directorio:
+        modelo = _abrir(directorio)
+        _poblar(modelo)
+        filtros = [{}, {'codigo_curso': "C2"}, {'documento': "10007"}, {'aprobado': True},
+                   {'aprobado': False, 'codigo_curso': "C5"}, {'nota_minima': 2.9, 'nota_maxima': 4.2},
+                   {'codigo_curso': "no-existe"}]
+        for orden in CLAVES_MATRICULAS:
+            for filtro in filtros:
+                esperado = _todas(modelo, orden=orden, **filtro)
+                for limite in (1, 7, 1000):
+                    assert _paginas(modelo, limite, orden=orden, **filtro) == esperado, (orden, filtro, limite)
+
+        # Los cambios entre páginas no hacen saltar ni repetir las filas que no cambiaron
+        pagina = modelo.consultar_matriculas(orden='nota', limite=50)
+        modelo.actualizar_nota(*pagina.filas[0][:2], 0.0)
+        resto = []
+        cursor = pagina.siguiente
+        while cursor is not None:
+            siguiente = modelo.consultar_matriculas(orden='nota', despues_de=cursor, limite=50)
+            resto.extend(siguiente.filas)
+            cursor = siguiente.siguiente
+        esperado = [fila for fila in _todas(modelo, orden='nota')
+                    if CLAVES_MATRICULAS['nota'](fila) > CLAVES_MATRICULAS['nota'](pagina.filas[-1])]
+        assert resto == esperado
+        modelo.motor.cerrar()
+
+
+def test_consultas_en_sql():
+    """Cada página es una sola consulta con LIMIT que recorre un índice, sin ordenar aparte."""
+    with tempfile.TemporaryDirectory() as directorio:
+        modelo = _abrir(directorio)
+        _poblar(modelo)
+        conexion = modelo.motor._conexion
+        sentencias = []
+
+        def registrar(sql):
+            if not sql.startswith("--"):  # Sentencias internas de FTS5
+                sentencias.append(sql)
+
+        conexion.set_trace_callback(registrar)
+        for orden, filtro in [('curso', {}), ('curso', {'codigo_curso': "C1"}), ('nota', {}),
+                              ('nota', {'aprobado': True})]:
+            sentencias.clear()
+            pagina = modelo.consultar_matriculas(orden=orden, limite=10, **filtro)
+            modelo.consultar_matriculas(orden=orden, despues_de=pagina.siguiente, limite=10, **filtro)
+            assert len(sentencias) == 2 and all("LIMIT" in sql for sql in sentencias), sentencias
+            plan = " ".join(fila[-1] for fila in conexion.execute(f"EXPLAIN QUERY PLAN {sentencias[-1]}"))
+            assert re.search("USING (COVERING )?INDEX", plan) and "TEMP B-TREE" not in plan, (orden, filtro, plan)
+
+        # La búsqueda lee los estudiantes en la misma consulta que los encuentra
+        sentencias.clear()
+        assert len(modelo.buscar_estudiantes("perez")) == ESTUDIANTES // 5
+        assert len(sentencias) == 1, sentencias
+        conexion.set_trace_callback(None)
+        modelo.motor.cerrar()
+
+
+def test_confirmada_al_terminar():
+    """Cada operación queda en la base al terminar, sin confirmar_cambios ni cerrar."""
+    with tempfile.TemporaryDirectory() as directorio:
+        modelo = _abrir(directorio)
+        modelo.crear_curso("MAT", "Matemáticas")
+        modelo.crear_estudiante("1001", "Ana", "Pérez", "ana@correo.com", "2000-01-01")
+        modelo.matricular_estudiante("1001", "MAT", 4.5)
+        modelo.matricular_estudiantes([])
+        assert not modelo.motor._conexion.in_transaction
+
+        # Otra conexión (otro proceso) ya las ve
+        with sqlite3.connect(os.path.join(directorio, "siga.db")) as otra:
+            assert otra.execute("SELECT documento, codigo_curso, nota FROM matriculas").fetchall() == \
+                [("1001", "MAT", 4.5)]
+        modelo.motor._conexion.close()  # Sin confirmar: como si el proceso terminara aquí
+
+        reabierto = _abrir(directorio)
+        assert reabierto.obtener_nota("1001", "MAT") == 4.5
+        assert reabierto.obtener_estadisticas_curso("MAT").total == 1
+        reabierto.motor.cerrar()
+
+
+def test_operacion_fallida_no_deja_nada():
+    """Si una operación falla a mitad, la base y los agregados quedan como antes."""
+    with tempfile.TemporaryDirectory() as directorio:
+        modelo = _abrir(directorio)
+        _poblar(modelo)
+        antes = sorted(modelo.matriculas)
+        agregados = _agregados(modelo)
+
+        original = modelo._vincular
+        llamadas = []
+
+        def vincular_y_fallar(documento, codigo_curso, nota):
+            llamadas.append(documento)
+            if len(llamadas) == 3:
+                raise OSError("disco lleno")
+            original(documento, codigo_curso, nota)
+
+        modelo._vincular = vincular_y_fallar
+        nuevos = [(str(10000 + i), "C0", 5.0) for i in range(ESTUDIANTES)
+                  if not modelo.esta_matriculado(str(10000 + i), "C0")][:5]
+        try:
+            modelo.matricular_estudiantes(nuevos)
+            assert False, "El lote debía fallar"
+        except OSError:
+            pass
+        del modelo._vincular
+
+        assert not modelo.motor._conexion.in_transaction
+        assert sorted(modelo.matriculas) == antes
+        assert _agregados(modelo) == agregados
+        modelo.motor.cerrar()
+
+        reabierto = _abrir(directorio)
+        assert sorted(reabierto.matriculas) == antes
+        reabierto.motor.cerrar()
+
+
+def main():
+    print("=" * 70)
+    print("🗄️  PRUEBA DEL MOTOR SQLITE - motor_sqlite")
+    print("=" * 70)
+    pruebas = [test_consultas_como_en_memoria, test_paginacion_por_cursor, test_consultas_en_sql,
+               test_confirmada_al_terminar, test_operacion_fallida_no_deja_nada]
+    exito = True
+    for prueba in pruebas:
+        inicio = time.perf_counter()
+        try:
+            prueba()
+            print(f"   ✅ {prueba.__name__} ({time.perf_counter() - inicio:.2f} s)")
+        except AssertionError as e:
+            print(f"   ❌ {prueba.__name__}: {e}")
+            exito = False
+    return exito
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,102 @@
+## ==================== test_periodos.py ====================
+"""
+Pruebas del cierre de períodos: el período se archiva y el modelo sigue con
+los mismos estudiantes y cursos sin matrículas; si el cierre falla, el modelo
+conserva el período y no queda archivado.
+
+Ejecutar: python test_periodos.py   (o con pytest)
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+from modelo import ModeloSIGA
+from motor_sqlite import MotorSQLite
+from periodos import ArchivoPeriodos
+
+
+def _modelos(directorio):
+    yield ModeloSIGA()
+    yield ModeloSIGA(columnar=True)
+    yield ModeloSIGA(motor=MotorSQLite(os.path.join(directorio, "siga.db")))
+
+
+def _poblar(modelo):
+    modelo.crear_curso("MAT", "Matemáticas")
+    modelo.crear_curso("FIS", "Física")
+    for i in range(6):
+        modelo.crear_estudiante(str(1000 + i), f"Nombre{i}", "Pérez", f"e{i}@correo.com", "2000-01-01")
+        modelo.matricular_estudiante(str(1000 + i), "MAT", 2.0 + i / 2)
+    modelo.matricular_estudiante("1000", "FIS", 4.0)
+
+
+def _cerrar(modelo):
+    if modelo.motor is not None:
+        modelo.motor.cerrar()
+
+
+def test_cerrar_periodo():
+    """Las matrículas pasan al archivo; estudiantes y cursos siguen en el modelo."""
+    with tempfile.TemporaryDirectory() as directorio:
+        for modelo in _modelos(directorio):
+            with ArchivoPeriodos(os.path.join(directorio, f"periodos-{id(modelo)}")) as periodos:
+                _poblar(modelo)
+                modelo.cerrar_periodo(periodos, "2025-1")
+                assert periodos.periodos() == ["2025-1"]
+                assert len(modelo.matriculas) == 0 and len(modelo.estudiantes) == 6
+                assert sorted(modelo.cursos) == ["FIS", "MAT"]
+                assert modelo.obtener_estadisticas_curso("MAT").total == 0
+                assert sorted(periodos.historial_estudiante("1000")) == [("2025-1", "FIS", 4.0),
+                                                                         ("2025-1", "MAT", 2.0)]
+            _cerrar(modelo)
+
+
+def test_cierre_fallido_no_archiva():
+    """Si el modelo no se puede rehacer, el período sigue en curso y el archivo se descarta."""
+    with tempfile.TemporaryDirectory() as directorio:
+        for modelo in _modelos(directorio):
+            with ArchivoPeriodos(os.path.join(directorio, f"periodos-{id(modelo)}")) as periodos:
+                _poblar(modelo)
+                antes = sorted(modelo.matriculas)
+
+                def adoptar_y_fallar(otro):
+                    raise OSError("disco lleno")
+
+                modelo._adoptar = adoptar_y_fallar
+                try:
+                    modelo.cerrar_periodo(periodos, "2025-1")
+                    fallo = False
+                except OSError:
+                    fallo = True
+                del modelo._adoptar
+                assert fallo, "El cierre debía fallar"
+                assert "2025-1" not in periodos
+                assert sorted(modelo.matriculas) == antes
+
+                # Se puede volver a cerrar con el mismo nombre
+                modelo.cerrar_periodo(periodos, "2025-1")
+                assert periodos.periodos() == ["2025-1"] and len(modelo.matriculas) == 0
+            _cerrar(modelo)
+
+
+def main():
+    print("=" * 70)
+    print("🗂️  PRUEBA DE PERÍODOS ARCHIVADOS - periodos")
+    print("=" * 70)
+    pruebas = [test_cerrar_periodo, test_cierre_fallido_no_archiva]
+    exito = True
+    for prueba in pruebas:
+        inicio = time.perf_counter()
+        try:
+            prueba()
+            print(f"   ✅ {prueba.__name__} ({time.perf_counter() - inicio:.2f} s)")
+        except AssertionError as e:
+            print(f"   ❌ {prueba.__name__}: {e}")
+            exito = False
+    return exito
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
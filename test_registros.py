@@ -0,0 +1,94 @@
+## ==================== test_registros.py ====================
+"""
+Pruebas de los registros compactos Estudiante y Curso: no tienen __dict__,
+crean sus colecciones con la primera matrícula, las sueltan con la última y
+_copia() da un registro que se puede modificar sin tocar el original.
+
+Ejecutar: python test_registros.py   (o con pytest)
+"""
+
+import sys
+import time
+
+from modelo import Curso, Estudiante, ModeloSIGA
+
+
+def test_sin_dict():
+    """Los registros no tienen __dict__ ni aceptan atributos nuevos."""
+    for registro in (Estudiante("1", "Ana", "Pérez", "a@correo.com", "2000-01-01"),
+                     Curso("MAT", "Matemáticas")):
+        assert not hasattr(registro, "__dict__"), type(registro).__name__
+        try:
+            registro.otro = 1
+            assert False, f"{type(registro).__name__} aceptó un atributo nuevo"
+        except AttributeError:
+            pass
+
+
+def test_matriculas_perezosas():
+    """Las colecciones se crean con la primera matrícula y se sueltan con la última."""
+    modelo = ModeloSIGA()
+    modelo.crear_curso("MAT", "Matemáticas")
+    modelo.crear_curso("FIS", "Física")
+    modelo.crear_estudiante("1", "Ana", "Pérez", "a@correo.com", "2000-01-01")
+    estudiante, curso = modelo.estudiantes["1"], modelo.cursos["MAT"]
+    assert estudiante._notas is None and curso._estudiantes is None
+    assert list(estudiante.cursos) == [] and dict(estudiante.notas) == {}
+    assert list(curso.estudiantes) == []
+
+    modelo.matricular_estudiante("1", "MAT", 4.0)
+    modelo.matricular_estudiante("1", "FIS", 3.5)
+    assert list(estudiante.cursos) == ["MAT", "FIS"]
+    assert estudiante.to_dict()["notas"] == {"MAT": 4.0, "FIS": 3.5}
+    assert curso.to_dict()["estudiantes"] == ["1"]
+
+    modelo.eliminar_curso("MAT")
+    modelo.eliminar_curso("FIS")
+    assert estudiante._notas is None
+    assert estudiante.to_dict()["cursos"] == [] and estudiante.to_dict()["notas"] == {}
+
+
+def test_copia_independiente():
+    """Modificar la copia de un registro no cambia el original."""
+    estudiante = Estudiante("1", "Ana", "Pérez", "a@correo.com", "2000-01-01")
+    estudiante._registrar_matricula("MAT", 4.0)
+    copia = estudiante._copia()
+    copia._registrar_nota("MAT", 1.0)
+    copia._registrar_matricula("FIS", 2.0)
+    assert dict(estudiante.notas) == {"MAT": 4.0}
+    assert dict(copia.notas) == {"MAT": 1.0, "FIS": 2.0}
+    copia._retirar_matricula("MAT")
+    copia._retirar_matricula("FIS")
+    assert copia._notas is None and dict(estudiante.notas) == {"MAT": 4.0}
+
+    curso = Curso("MAT", "Matemáticas")
+    curso._registrar_estudiante("1")
+    copia = curso._copia()
+    copia._registrar_estudiante("2")
+    copia._retirar_estudiante("1")
+    assert list(curso.estudiantes) == ["1"] and list(copia.estudiantes) == ["2"]
+
+    # Un registro sin matrículas se copia sin crear colecciones
+    assert Estudiante("2", "Luis", "Gómez", "l@correo.com", "2000-01-01")._copia()._notas is None
+    assert Curso("FIS", "Física")._copia()._estudiantes is None
+
+
+def main():
+    print("=" * 70)
+    print("🪪 PRUEBA DE REGISTROS COMPACTOS - Estudiante y Curso")
+    print("=" * 70)
+    pruebas = [test_sin_dict, test_matriculas_perezosas, test_copia_independiente]
+    exito = True
+    for prueba in pruebas:
+        inicio = time.perf_counter()
+        try:
+            prueba()
+            print(f"   ✅ {prueba.__name__} ({time.perf_counter() - inicio:.2f} s)")
+        except AssertionError as e:
+            print(f"   ❌ {prueba.__name__}: {e}")
+            exito = False
+    return exito
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -21,6 +21,12 @@ def exportar_pdf_completo(nombre_archivo, controlador):
     - Top 3 estudiantes por cada curso
     - Gráficas estadísticas de cada curso
     """
+    # Todo el reporte sale de una misma lectura, aunque el modelo cambie mientras se arma
+    with controlador.modelo.lectura() as modelo:
+        _exportar_pdf_completo(nombre_archivo, controlador, modelo)
+
+
+def _exportar_pdf_completo(nombre_archivo, controlador, modelo):
     doc = SimpleDocTemplate(nombre_archivo, pagesize=letter,
                            topMargin=0.5*inch, bottomMargin=0.5*inch,
                            leftMargin=0.5*inch, rightMargin=0.5*inch)
@@ -69,7 +75,6 @@ def exportar_pdf_completo(nombre_archivo, controlador):
     elementos.append(Spacer(1, 0.5*inch))
     
     # Estadísticas generales
-    modelo = controlador.modelo
     stats_data = [
         ['ESTADÍSTICAS GENERALES', ''],
         ['Total de Estudiantes:', str(len(modelo.estudiantes))],
@@ -77,11 +82,10 @@ def exportar_pdf_completo(nombre_archivo, controlador):
         ['Total de Matrículas:', str(len(modelo.matriculas))],
     ]
     
-    if modelo.matriculas:
-        notas = [nota for _, _, nota in modelo.matriculas]
-        promedio_general = sum(notas) / len(notas)
-        aprobados_total = sum(1 for nota in notas if nota >= 3.0)
-        tasa_aprobacion = (aprobados_total / len(notas)) * 100
+    generales = modelo.obtener_estadisticas_generales()
+    if generales.total:
+        promedio_general = generales.promedio
+        tasa_aprobacion = generales.tasa_aprobacion * 100
         
         stats_data.extend([
             ['Promedio General:', f'{promedio_general:.2f}'],
@@ -109,7 +113,7 @@ def exportar_pdf_completo(nombre_archivo, controlador):
     elementos.append(subtitulo)
     elementos.append(Spacer(1, 0.2*inch))
     
-    df = controlador.generar_reporte_estudiantes()
+    df = controlador.generar_reporte_estudiantes(modelo)
     
     if not df.empty:
         # Preparar datos para la tabla
@@ -232,15 +236,16 @@ def exportar_pdf_completo(nombre_archivo, controlador):
     graficas_generadas = 0
     
     for codigo_curso, curso in sorted(modelo.cursos.items()):
-        aprobados, reprobados = modelo.obtener_estadisticas_aprobados(codigo_curso)
+        estadisticas = modelo.obtener_estadisticas_curso(codigo_curso)
+        aprobados, reprobados = estadisticas.aprobados, estadisticas.reprobados
         
         if aprobados == 0 and reprobados == 0:
             continue
         
         graficas_generadas += 1
         
-        # Crear figura con dos subgráficas
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(10, 4))
+        # Crear figura con tres subgráficas
+        fig, (ax1, ax2, ax3) = plt.subplots(1, 3, figsize=(14, 4))
         
         # Gráfico de barras
         categorias = ['Aprobados\n(≥ 3.0)', 'Reprobados\n(< 3.0)']
@@ -279,6 +284,17 @@ def exportar_pdf_completo(nombre_archivo, controlador):
                 autotext.set_fontweight('bold')
                 autotext.set_fontsize(10)
         
+        # Histograma por décima, mantenido por el modelo: no se recorren las matrículas
+        notas = [estadisticas.nota_cubeta(c) for c in range(estadisticas.CUBETAS)]
+        colores_hist = ['#2ecc71' if nota >= estadisticas.NOTA_APROBATORIA else '#e74c3c' for nota in notas]
+        ax3.bar(notas, estadisticas.histograma, width=0.08, color=colores_hist, alpha=0.8)
+        ax3.axvline(estadisticas.mediana, color='#34495e', linestyle='--',
+                    label=f'Mediana: {estadisticas.mediana:.2f}')
+        ax3.set_title(f'Distribución de Notas\n{codigo_curso}', fontsize=12, fontweight='bold', pad=10)
+        ax3.set_xlabel('Nota', fontsize=10, fontweight='bold')
+        ax3.legend(fontsize=9)
+        ax3.grid(axis='y', alpha=0.3, linestyle='--')
+        
         plt.tight_layout()
         
         # Guardar gráfica
@@ -290,17 +306,18 @@ def exportar_pdf_completo(nombre_archivo, controlador):
         titulo_grafica = Paragraph(f"<b>{codigo_curso} - {curso.nombre}</b>", estilos['Heading4'])
         elementos.append(titulo_grafica)
         
-        img = Image(nombre_grafica, width=6.5*inch, height=2.6*inch)
+        img = Image(nombre_grafica, width=7*inch, height=2.1*inch)
         elementos.append(img)
         
         # Información adicional
         total = aprobados + reprobados
         tasa = (aprobados / total * 100) if total > 0 else 0
-        notas_curso = [nota for _, cod, nota in modelo.matriculas if cod == codigo_curso]
-        promedio_curso = sum(notas_curso) / len(notas_curso) if notas_curso else 0
+        promedio_curso = estadisticas.promedio
         
         info = Paragraph(
-            f"<i>Total: {total} estudiantes | Promedio: {promedio_curso:.2f} | Tasa de Aprobación: {tasa:.1f}%</i>",
+            f"<i>Total: {total} estudiantes | Promedio: {promedio_curso:.2f} | Tasa de Aprobación: {tasa:.1f}% | "
+            f"Mediana: {estadisticas.mediana:.2f} | P25-P75: {estadisticas.percentil(25):.2f}-"
+            f"{estadisticas.percentil(75):.2f}</i>",
             estilos['Normal']
         )
         elementos.append(Spacer(1, 0.05*inch))
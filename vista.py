@@ -1,11 +1,39 @@
 ## ==================== vista.py ====================
 import tkinter as tk
-from tkinter import ttk, messagebox, filedialog
+from tkinter import ttk, messagebox, filedialog, simpledialog
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import os
+import queue
+from bisect import bisect_left
 from datetime import datetime
 
+from eventos import (EstudianteAgregado, EstudianteEliminado, CursoAgregado, CursoEliminado,
+                     MatriculaAgregada, MatriculaEliminada, NotaCambiada, DatosRecargados)
+from modelo import CLAVES_MATRICULAS
+
+# Con más eventos que estos en una entrega es más rápido redibujar las tablas completas
+MAX_EVENTOS_INCREMENTALES = 2000
+
+# Cada cuánto el hilo de Tk aplica los eventos que el modelo entregó desde cualquier hilo
+INTERVALO_EVENTOS_MS = 50
+
+# Matrículas que se piden al modelo por cada "Cargar más"
+FILAS_POR_PAGINA = 500
+
+# Orden de la tabla de matrículas: por curso, y en cada uno de mayor a menor nota
+_clave_matricula = CLAVES_MATRICULAS['curso']
+
+
+def _iid_matricula(documento, codigo_curso):
+    # Identificador de la fila de una matrícula en su Treeview
+    return f"{documento}\x1f{codigo_curso}"
+
+
+def _borrar_fila(tree, iid):
+    if tree.exists(iid):
+        tree.delete(iid)
+
 
 # ==================== VISTA ====================
 class VistaSIGA:
@@ -17,6 +45,11 @@ class VistaSIGA:
         
         # Controlador se asignará después
         self.controlador = None
+        self._refrescos_pendientes = set()  # Tablas a refrescar cuando Tk quede libre
+        self._eventos_recibidos = queue.SimpleQueue()  # Entregas del modelo aún sin aplicar
+        self._filtro_matriculas = ""        # Curso mostrado en la tabla de matrículas
+        self._claves_matriculas = []        # Claves de orden de las filas cargadas, ordenadas
+        self._hay_mas_matriculas = False    # Quedan páginas por cargar
         
         self.crear_interfaz()
         
@@ -73,6 +106,14 @@ class VistaSIGA:
         ttk.Button(dashboard_frame, text="Guardar JSON", 
                   command=self.guardar_json).pack(fill=tk.X, pady=5)
         
+        ttk.Button(dashboard_frame, text="Compactar JSON", 
+                  command=self.compactar_json).pack(fill=tk.X, pady=5)
+        
+        ttk.Separator(dashboard_frame, orient='horizontal').pack(fill=tk.X, pady=10)
+        
+        ttk.Button(dashboard_frame, text="Cerrar Período", 
+                  command=self.cerrar_periodo).pack(fill=tk.X, pady=5)
+        
     def crear_panel_principal(self, parent):
             
         # Notebook para pestañas
@@ -778,6 +819,12 @@ def _mostrar_recomendaciones_cursos(self, documento, recomendaciones):
         ttk.Button(filter_frame, text="Mostrar Todas", 
                   command=self.mostrar_todas_matriculas).pack(side=tk.LEFT, padx=10)
         
+        self.btn_cargar_mas = ttk.Button(filter_frame, text="Cargar más", state=tk.DISABLED,
+                                         command=self.cargar_mas_matriculas)
+        self.btn_cargar_mas.pack(side=tk.LEFT, padx=10)
+        self.lbl_matriculas_mostradas = ttk.Label(filter_frame, text="")
+        self.lbl_matriculas_mostradas.pack(side=tk.LEFT, padx=10)
+        
         # Tabla de matrículas
         self.crear_tabla_matriculas(frame)
     
@@ -1049,9 +1096,14 @@ def _mostrar_recomendaciones_cursos(self, documento, recomendaciones):
     
     def btn_eliminar_estudiante(self):
         selected = self.tree_estudiantes.selection()
-        if selected and self.controlador:
-            item = self.tree_estudiantes.item(selected[0])
-            documento = item['values'][0]
+        if len(selected) > 1 and self.controlador:
+            # El iid de cada fila es el documento. Los valores de la fila no sirven:
+            # Treeview los retorna como número y "0123" llegaría como 123
+            documentos = list(selected)
+            if messagebox.askyesno("Confirmar", f"¿Eliminar los {len(documentos)} estudiantes seleccionados?"):
+                self.controlador.eliminar_estudiantes(documentos)
+        elif selected and self.controlador:
+            documento = selected[0]
             
             if messagebox.askyesno("Confirmar", f"¿Eliminar estudiante con documento {documento}?"):
                 self.controlador.eliminar_estudiante(documento)
@@ -1059,9 +1111,12 @@ def _mostrar_recomendaciones_cursos(self, documento, recomendaciones):
     
     def btn_eliminar_curso(self):
         selected = self.tree_cursos.selection()
-        if selected and self.controlador:
-            item = self.tree_cursos.item(selected[0])
-            codigo_curso = item['values'][0]
+        if len(selected) > 1 and self.controlador:
+            codigos = list(selected)  # El iid de cada fila es el código
+            if messagebox.askyesno("Confirmar", f"¿Eliminar los {len(codigos)} cursos seleccionados?"):
+                self.controlador.eliminar_cursos(codigos)
+        elif selected and self.controlador:
+            codigo_curso = selected[0]
             
             if messagebox.askyesno("Confirmar", f"¿Eliminar curso {codigo_curso}?"):
                 self.controlador.eliminar_curso(codigo_curso)
@@ -1092,6 +1147,14 @@ def _mostrar_recomendaciones_cursos(self, documento, recomendaciones):
                             estado = "APROBADO" if nota >= 3.0 else "REPROBADO"
                             self.text_resultados.insert(tk.END, f"  - {curso_cod} ({curso_nombre}): {nota} - {estado}\n")
                     
+                    # Períodos anteriores: se leen del archivo solo para este estudiante
+                    historial = self.controlador.historial_estudiante(est.documento)
+                    if historial:
+                        self.text_resultados.insert(tk.END, "Historial de períodos anteriores:\n")
+                        for periodo, curso_cod, nota in historial:
+                            estado = "APROBADO" if nota >= 3.0 else "REPROBADO"
+                            self.text_resultados.insert(tk.END, f"  [{periodo}] {curso_cod}: {nota} - {estado}\n")
+                    
                     self.text_resultados.insert(tk.END, "-"*40 + "\n\n")
             else:
                 self.text_resultados.insert(tk.END, "No se encontraron estudiantes con ese criterio.\n")
@@ -1129,7 +1192,8 @@ def _mostrar_recomendaciones_cursos(self, documento, recomendaciones):
                 self.mostrar_error("Error", "Por favor ingrese un código de curso")
                 return
                 
-            aprobados, reprobados = self.controlador.modelo.obtener_estadisticas_aprobados(curso)
+            estadisticas = self.controlador.modelo.obtener_estadisticas_curso(curso)
+            aprobados, reprobados = estadisticas.aprobados, estadisticas.reprobados
             
             if aprobados == 0 and reprobados == 0:
                 self.mostrar_error("Error", f"No hay estudiantes matriculados en el curso {curso}")
@@ -1138,9 +1202,9 @@ def _mostrar_recomendaciones_cursos(self, documento, recomendaciones):
             # Crear ventana para gráfico
             ventana_grafico = tk.Toplevel(self.root)
             ventana_grafico.title(f"Estadísticas del curso: {curso}")
-            ventana_grafico.geometry("700x500")
+            ventana_grafico.geometry("1000x500")
             
-            fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(12, 5))
+            fig, (ax1, ax2, ax3) = plt.subplots(1, 3, figsize=(17, 5))
             
             # Gráfico de barras
             categorias = ['Aprobados\n(≥ 3.0)', 'Reprobados\n(< 3.0)']
@@ -1174,6 +1238,19 @@ def _mostrar_recomendaciones_cursos(self, documento, recomendaciones):
                     autotext.set_color('white')
                     autotext.set_fontweight('bold')
             
+            # Histograma por décima, mantenido por el modelo: no se recorren las matrículas
+            notas = [estadisticas.nota_cubeta(c) for c in range(estadisticas.CUBETAS)]
+            colores_hist = ['#2ecc71' if nota >= estadisticas.NOTA_APROBATORIA else '#e74c3c' for nota in notas]
+            ax3.bar(notas, estadisticas.histograma, width=0.08, color=colores_hist, alpha=0.8)
+            for p, estilo in ((25, ':'), (50, '--'), (75, ':')):
+                valor = estadisticas.percentil(p)
+                ax3.axvline(valor, color='#34495e', linestyle=estilo, label=f'P{p}: {valor:.2f}')
+            ax3.set_title(f'Distribución de Notas\nCurso: {curso}', fontsize=14, fontweight='bold')
+            ax3.set_xlabel('Nota', fontsize=12)
+            ax3.set_ylabel('Cantidad de Estudiantes', fontsize=12)
+            ax3.legend()
+            ax3.grid(axis='y', alpha=0.3)
+            
             plt.tight_layout()
             
             canvas = FigureCanvasTkAgg(fig, ventana_grafico)
@@ -1187,7 +1264,9 @@ def _mostrar_recomendaciones_cursos(self, documento, recomendaciones):
             total = aprobados + reprobados
             porcentaje_aprobacion = (aprobados / total * 100) if total > 0 else 0
             
-            info_text = f"Total estudiantes: {total} | Tasa de aprobación: {porcentaje_aprobacion:.1f}%"
+            info_text = (f"Total estudiantes: {total} | Tasa de aprobación: {porcentaje_aprobacion:.1f}% | "
+                         f"Mediana: {estadisticas.mediana:.2f} | "
+                         f"P25-P75: {estadisticas.percentil(25):.2f}-{estadisticas.percentil(75):.2f}")
             ttk.Label(info_frame, text=info_text, font=('Arial', 10, 'bold')).pack()
     
     def btn_estadisticas_generales(self):
@@ -1209,14 +1288,14 @@ def _mostrar_recomendaciones_cursos(self, documento, recomendaciones):
             
             if total_matriculas > 0:
                 # Promedio general
-                notas = [nota for _, _, nota in modelo.matriculas]
-                promedio_general = sum(notas) / len(notas)
+                generales = modelo.obtener_estadisticas_generales()
+                promedio_general = generales.promedio
                 self.text_resultados.insert(tk.END, f"Promedio general: {promedio_general:.2f}\n")
                 
                 # Distribución de notas
-                aprobados_total = sum(1 for nota in notas if nota >= 3.0)
-                reprobados_total = len(notas) - aprobados_total
-                tasa_aprobacion = (aprobados_total / len(notas)) * 100
+                aprobados_total = generales.aprobados
+                reprobados_total = generales.reprobados
+                tasa_aprobacion = generales.tasa_aprobacion * 100
                 
                 self.text_resultados.insert(tk.END, f"Estudiantes aprobados (≥3.0): {aprobados_total}\n")
                 self.text_resultados.insert(tk.END, f"Estudiantes reprobados (<3.0): {reprobados_total}\n")
@@ -1227,17 +1306,13 @@ def _mostrar_recomendaciones_cursos(self, documento, recomendaciones):
                 self.text_resultados.insert(tk.END, "-" * 40 + "\n")
                 
                 for codigo_curso, curso in modelo.cursos.items():
-                    matriculas_curso = [m for m in modelo.matriculas if m[1] == codigo_curso]
-                    if matriculas_curso:
-                        notas_curso = [nota for _, _, nota in matriculas_curso]
-                        promedio_curso = sum(notas_curso) / len(notas_curso)
-                        aprobados_curso = sum(1 for nota in notas_curso if nota >= 3.0)
-                        
+                    estadisticas_curso = modelo.obtener_estadisticas_curso(codigo_curso)
+                    if estadisticas_curso.total:
                         self.text_resultados.insert(tk.END, f"\n{codigo_curso} - {curso.nombre}:\n")
-                        self.text_resultados.insert(tk.END, f"  Estudiantes matriculados: {len(matriculas_curso)}\n")
-                        self.text_resultados.insert(tk.END, f"  Promedio del curso: {promedio_curso:.2f}\n")
-                        self.text_resultados.insert(tk.END, f"  Aprobados: {aprobados_curso}/{len(matriculas_curso)}\n")
-                        self.text_resultados.insert(tk.END, f"  Tasa de aprobación: {(aprobados_curso/len(matriculas_curso)*100):.1f}%\n")
+                        self.text_resultados.insert(tk.END, f"  Estudiantes matriculados: {estadisticas_curso.total}\n")
+                        self.text_resultados.insert(tk.END, f"  Promedio del curso: {estadisticas_curso.promedio:.2f}\n")
+                        self.text_resultados.insert(tk.END, f"  Aprobados: {estadisticas_curso.aprobados}/{estadisticas_curso.total}\n")
+                        self.text_resultados.insert(tk.END, f"  Tasa de aprobación: {estadisticas_curso.tasa_aprobacion*100:.1f}%\n")
             else:
                 self.text_resultados.insert(tk.END, "No hay matrículas registradas en el sistema.\n")
     
@@ -1285,6 +1360,28 @@ def _mostrar_recomendaciones_cursos(self, documento, recomendaciones):
         if archivo and self.controlador:
             self.controlador.guardar_json(archivo)
     
+    def compactar_json(self):
+        if self.controlador:
+            self.controlador.compactar_json()
+    
+    def cerrar_periodo(self):
+        if not self.controlador:
+            return
+        periodo = simpledialog.askstring(
+            "Cerrar Período",
+            "Nombre del período que se cierra (ej. 2025-1).\n"
+            "Sus matrículas se archivan y el modelo queda listo para el siguiente."
+        )
+        if not periodo or not periodo.strip():
+            return
+        periodo = periodo.strip()
+        if messagebox.askyesno(
+            "Confirmar",
+            f"¿Cerrar el período {periodo}?\n"
+            "Todas las matrículas se archivan y se quitan del modelo; esto no se puede deshacer."
+        ):
+            self.controlador.cerrar_periodo(periodo)
+    
     def mostrar_gestion_estudiantes(self):
         self.notebook.select(self.frame_estudiantes)
     
@@ -1317,6 +1414,27 @@ def _mostrar_recomendaciones_cursos(self, documento, recomendaciones):
         self.refrescar_tabla_matriculas()
         self.actualizar_kpis()
     
+    def programar_refresco(self, *tablas):
+        """
+        Pide refrescar las tablas indicadas ('estudiantes', 'cursos', 'matriculas')
+        y los KPIs. Los pedidos hechos antes de que Tk quede libre se atienden
+        juntos, redibujando cada tabla una sola vez.
+        """
+        if not self._refrescos_pendientes:
+            self.root.after_idle(self._ejecutar_refrescos)
+        self._refrescos_pendientes.update(tablas)
+        self._refrescos_pendientes.add('kpis')
+    
+    def _ejecutar_refrescos(self):
+        tablas, self._refrescos_pendientes = self._refrescos_pendientes, set()
+        if 'estudiantes' in tablas:
+            self.refrescar_tabla_estudiantes()
+        if 'cursos' in tablas:
+            self.refrescar_tabla_cursos()
+        if 'matriculas' in tablas:
+            self.refrescar_tabla_matriculas()
+        self.actualizar_kpis()
+    
     def actualizar_tabla_estudiantes(self, estudiantes=None):
         # Limpiar tabla
         for item in self.tree_estudiantes.get_children():
@@ -1328,13 +1446,8 @@ def _mostrar_recomendaciones_cursos(self, documento, recomendaciones):
         
         if estudiantes:
             for estudiante in estudiantes:
-                self.tree_estudiantes.insert('', 'end', values=(
-                    estudiante.documento,
-                    estudiante.nombre,
-                    estudiante.apellidos,
-                    estudiante.correo,
-                    estudiante.fecha_nac
-                ))
+                self.tree_estudiantes.insert('', 'end', iid=estudiante.documento,
+                                             values=self._fila_estudiante(estudiante))
     
     def actualizar_tabla_cursos(self, cursos=None):
         # Limpiar tabla
@@ -1347,40 +1460,143 @@ def _mostrar_recomendaciones_cursos(self, documento, recomendaciones):
         
         if cursos and self.controlador:
             for curso in cursos:
-                # Calcular estadísticas del curso
-                estudiantes_inscritos = len(curso.estudiantes)
-                
-                # Calcular promedio
-                notas = [nota for doc, cod_curso, nota in self.controlador.modelo.matriculas if cod_curso == curso.codigo]
-                promedio = sum(notas) / len(notas) if notas else 0.0
-                
-                self.tree_cursos.insert('', 'end', values=(
-                    curso.codigo,
-                    curso.nombre,
-                    estudiantes_inscritos,
-                    f"{promedio:.2f}"
-                ))
+                self.tree_cursos.insert('', 'end', iid=curso.codigo, values=self._fila_curso(curso))
     
     def actualizar_tabla_matriculas(self, filtro_curso=""):
         # Limpiar tabla
         for item in self.tree_matriculas.get_children():
             self.tree_matriculas.delete(item)
         
+        self._filtro_matriculas = filtro_curso
+        self._claves_matriculas = []
+        self._hay_mas_matriculas = False
         if self.controlador:
-            matriculas = self.controlador.modelo.obtener_matriculas_por_curso(filtro_curso)
-            
-            for documento, codigo_curso, nota in matriculas:
-                estudiante = self.controlador.modelo.estudiantes.get(documento)
-                curso = self.controlador.modelo.cursos.get(codigo_curso)
-                
-                if estudiante and curso:
-                    self.tree_matriculas.insert('', 'end', values=(
-                        documento,
-                        f"{estudiante.nombre} {estudiante.apellidos}",
-                        codigo_curso,
-                        curso.nombre,
-                        f"{nota:.2f}"
-                    ))
+            self.cargar_mas_matriculas()
+    
+    def cargar_mas_matriculas(self):
+        """Agrega a la tabla la siguiente página de matrículas del filtro actual."""
+        claves = self._claves_matriculas
+        # La última fila cargada es el cursor: las filas que llegaron por eventos ya están en orden
+        pagina = self.controlador.modelo.consultar_matriculas(
+            codigo_curso=self._filtro_matriculas or None,
+            despues_de=claves[-1] if claves else None,
+            limite=FILAS_POR_PAGINA)
+        self._hay_mas_matriculas = False
+        for documento, codigo_curso, nota in pagina.filas:
+            self._insertar_fila_matricula(documento, codigo_curso, nota)
+        self._hay_mas_matriculas = pagina.siguiente is not None
+        self._actualizar_paginacion()
+    
+    def _actualizar_paginacion(self):
+        modelo = self.controlador.modelo
+        if self._filtro_matriculas:
+            total = modelo.obtener_estadisticas_curso(self._filtro_matriculas).total
+        else:
+            total = modelo.obtener_estadisticas_generales().total
+        self.lbl_matriculas_mostradas.config(
+            text=f"Mostrando {len(self._claves_matriculas)} de {total}")
+        self.btn_cargar_mas.config(state=tk.NORMAL if self._hay_mas_matriculas else tk.DISABLED)
+    
+    def _fila_estudiante(self, estudiante):
+        return (estudiante.documento, estudiante.nombre, estudiante.apellidos,
+                estudiante.correo, estudiante.fecha_nac)
+    
+    def _fila_curso(self, curso):
+        # Inscritos y promedio mantenidos incrementalmente por el modelo
+        promedio = self.controlador.modelo.obtener_promedio_curso(curso.codigo)
+        return (curso.codigo, curso.nombre, len(curso.estudiantes), f"{promedio:.2f}")
+    
+    def _insertar_fila_matricula(self, documento, codigo_curso, nota):
+        # La fila va en su posición del orden de la tabla. Si cae después de lo ya
+        # cargado no se muestra: llegará con "Cargar más"
+        clave = _clave_matricula((documento, codigo_curso, nota))
+        claves = self._claves_matriculas
+        if self._hay_mas_matriculas and (not claves or clave > claves[-1]):
+            return
+        
+        estudiante = self.controlador.modelo.estudiantes.get(documento)
+        curso = self.controlador.modelo.cursos.get(codigo_curso)
+        
+        if estudiante and curso:
+            posicion = bisect_left(claves, clave)
+            self.tree_matriculas.insert('', posicion, iid=_iid_matricula(documento, codigo_curso), values=(
+                documento,
+                f"{estudiante.nombre} {estudiante.apellidos}",
+                codigo_curso,
+                curso.nombre,
+                f"{nota:.2f}"
+            ))
+            claves.insert(posicion, clave)
+    
+    def _quitar_fila_matricula(self, documento, codigo_curso, nota):
+        claves = self._claves_matriculas
+        clave = _clave_matricula((documento, codigo_curso, nota))
+        posicion = bisect_left(claves, clave)
+        if posicion < len(claves) and claves[posicion] == clave:
+            del claves[posicion]
+        _borrar_fila(self.tree_matriculas, _iid_matricula(documento, codigo_curso))
+    
+    def _atender_eventos(self):
+        # Aplica juntas todas las entregas recibidas desde la vuelta anterior
+        eventos = []
+        while True:
+            try:
+                eventos.extend(self._eventos_recibidos.get_nowait())
+            except queue.Empty:
+                break
+        if eventos:
+            self.aplicar_eventos(eventos)
+        self.root.after(INTERVALO_EVENTOS_MS, self._atender_eventos)
+
+    def aplicar_eventos(self, eventos):
+        """
+        Actualiza solo las filas afectadas por una entrega de eventos del modelo
+        (ver eventos.py). Una recarga o una entrega muy grande redibujan las tablas.
+        """
+        if len(eventos) > MAX_EVENTOS_INCREMENTALES or any(type(e) is DatosRecargados for e in eventos):
+            self.programar_refresco('estudiantes', 'cursos', 'matriculas')
+            return
+        
+        modelo = self.controlador.modelo
+        cursos_afectados = set()
+        for evento in eventos:
+            tipo = type(evento)
+            if tipo is MatriculaAgregada:
+                cursos_afectados.add(evento.codigo_curso)
+                if self._filtro_matriculas in ("", evento.codigo_curso):
+                    self._insertar_fila_matricula(*evento)
+            elif tipo is MatriculaEliminada:
+                cursos_afectados.add(evento.codigo_curso)
+                self._quitar_fila_matricula(*evento)
+            elif tipo is NotaCambiada:
+                cursos_afectados.add(evento.codigo_curso)
+                if self._filtro_matriculas in ("", evento.codigo_curso):
+                    # La nota es parte del orden: la fila se reubica
+                    self._quitar_fila_matricula(evento.documento, evento.codigo_curso, evento.nota_anterior)
+                    self._insertar_fila_matricula(evento.documento, evento.codigo_curso, evento.nota_nueva)
+            elif tipo is EstudianteAgregado:
+                estudiante = modelo.estudiantes.get(evento.documento)
+                if estudiante and not self.tree_estudiantes.exists(evento.documento):
+                    self.tree_estudiantes.insert('', 'end', iid=evento.documento,
+                                                 values=self._fila_estudiante(estudiante))
+            elif tipo is EstudianteEliminado:
+                _borrar_fila(self.tree_estudiantes, evento.documento)
+            elif tipo is CursoAgregado:
+                cursos_afectados.add(evento.codigo)
+            elif tipo is CursoEliminado:
+                cursos_afectados.discard(evento.codigo)
+                _borrar_fila(self.tree_cursos, evento.codigo)
+        
+        for codigo in cursos_afectados:
+            curso = modelo.cursos.get(codigo)
+            if curso is None:
+                continue
+            if self.tree_cursos.exists(codigo):
+                self.tree_cursos.item(codigo, values=self._fila_curso(curso))
+            else:
+                self.tree_cursos.insert('', 'end', iid=codigo, values=self._fila_curso(curso))
+        self._actualizar_paginacion()
+        self.programar_refresco()  # Solo los KPIs, una vez por entrega
     
     def actualizar_kpis(self):
         if self.controlador:
@@ -1390,9 +1606,9 @@ def _mostrar_recomendaciones_cursos(self, documento, recomendaciones):
             self.lbl_total_matriculas.config(text=f"Total Matrículas: {len(modelo.matriculas)}")
             
             # Calcular promedio general
-            if modelo.matriculas:
-                notas = [nota for _, _, nota in modelo.matriculas]
-                promedio_general = sum(notas) / len(notas)
+            estadisticas = modelo.obtener_estadisticas_generales()
+            if estadisticas.total:
+                promedio_general = estadisticas.promedio
                 self.lbl_promedio_general.config(text=f"Promedio General: {promedio_general:.2f}")
             else:
                 self.lbl_promedio_general.config(text="Promedio General: 0.00")
@@ -1405,14 +1621,45 @@ def _mostrar_recomendaciones_cursos(self, documento, recomendaciones):
     
     def establecer_controlador(self, controlador):
         self.controlador = controlador
+        # El modelo entrega los eventos en el hilo que lo modificó; Tk solo se toca desde el suyo
+        controlador.modelo.eventos.suscribir(self._eventos_recibidos.put)
+        self.root.after(INTERVALO_EVENTOS_MS, self._atender_eventos)
 ## ==================== vista.py ====================
 import tkinter as tk
-from tkinter import ttk, messagebox, filedialog
+from tkinter import ttk, messagebox, filedialog, simpledialog
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import os
+import queue
+from bisect import bisect_left
 from datetime import datetime
 
+from eventos import (EstudianteAgregado, EstudianteEliminado, CursoAgregado, CursoEliminado,
+                     MatriculaAgregada, MatriculaEliminada, NotaCambiada, DatosRecargados)
+from modelo import CLAVES_MATRICULAS
+
+# Con más eventos que estos en una entrega es más rápido redibujar las tablas completas
+MAX_EVENTOS_INCREMENTALES = 2000
+
+# Cada cuánto el hilo de Tk aplica los eventos que el modelo entregó desde cualquier hilo
+INTERVALO_EVENTOS_MS = 50
+
+# Matrículas que se piden al modelo por cada "Cargar más"
+FILAS_POR_PAGINA = 500
+
+# Orden de la tabla de matrículas: por curso, y en cada uno de mayor a menor nota
+_clave_matricula = CLAVES_MATRICULAS['curso']
+
+
+def _iid_matricula(documento, codigo_curso):
+    # Identificador de la fila de una matrícula en su Treeview
+    return f"{documento}\x1f{codigo_curso}"
+
+
+def _borrar_fila(tree, iid):
+    if tree.exists(iid):
+        tree.delete(iid)
+
 
 # ==================== VISTA ====================
 class VistaSIGA:
@@ -1424,6 +1671,11 @@ class VistaSIGA:
         
         # Controlador se asignará después
         self.controlador = None
+        self._refrescos_pendientes = set()  # Tablas a refrescar cuando Tk quede libre
+        self._eventos_recibidos = queue.SimpleQueue()  # Entregas del modelo aún sin aplicar
+        self._filtro_matriculas = ""        # Curso mostrado en la tabla de matrículas
+        self._claves_matriculas = []        # Claves de orden de las filas cargadas, ordenadas
+        self._hay_mas_matriculas = False    # Quedan páginas por cargar
         
         self.crear_interfaz()
         
@@ -1483,6 +1735,14 @@ class VistaSIGA:
         ttk.Button(dashboard_frame, text="Guardar JSON", 
                   command=self.guardar_json).pack(fill=tk.X, pady=5)
         
+        ttk.Button(dashboard_frame, text="Compactar JSON", 
+                  command=self.compactar_json).pack(fill=tk.X, pady=5)
+        
+        ttk.Separator(dashboard_frame, orient='horizontal').pack(fill=tk.X, pady=10)
+        
+        ttk.Button(dashboard_frame, text="Cerrar Período", 
+                  command=self.cerrar_periodo).pack(fill=tk.X, pady=5)
+        
     def crear_panel_principal(self, parent):
         # Notebook para pestañas
         self.notebook = ttk.Notebook(parent)
@@ -1712,6 +1972,12 @@ class VistaSIGA:
         ttk.Button(filter_frame, text="Mostrar Todas", 
                   command=self.mostrar_todas_matriculas).pack(side=tk.LEFT, padx=10)
         
+        self.btn_cargar_mas = ttk.Button(filter_frame, text="Cargar más", state=tk.DISABLED,
+                                         command=self.cargar_mas_matriculas)
+        self.btn_cargar_mas.pack(side=tk.LEFT, padx=10)
+        self.lbl_matriculas_mostradas = ttk.Label(filter_frame, text="")
+        self.lbl_matriculas_mostradas.pack(side=tk.LEFT, padx=10)
+        
         # Tabla de matrículas
         self.crear_tabla_matriculas(frame)
     
@@ -2101,9 +2367,14 @@ class VistaSIGA:
     
     def btn_eliminar_estudiante(self):
         selected = self.tree_estudiantes.selection()
-        if selected and self.controlador:
-            item = self.tree_estudiantes.item(selected[0])
-            documento = item['values'][0]
+        if len(selected) > 1 and self.controlador:
+            # El iid de cada fila es el documento. Los valores de la fila no sirven:
+            # Treeview los retorna como número y "0123" llegaría como 123
+            documentos = list(selected)
+            if messagebox.askyesno("Confirmar", f"¿Eliminar los {len(documentos)} estudiantes seleccionados?"):
+                self.controlador.eliminar_estudiantes(documentos)
+        elif selected and self.controlador:
+            documento = selected[0]
             
             if messagebox.askyesno("Confirmar", f"¿Eliminar estudiante con documento {documento}?"):
                 self.controlador.eliminar_estudiante(documento)
@@ -2111,9 +2382,12 @@ class VistaSIGA:
     
     def btn_eliminar_curso(self):
         selected = self.tree_cursos.selection()
-        if selected and self.controlador:
-            item = self.tree_cursos.item(selected[0])
-            codigo_curso = item['values'][0]
+        if len(selected) > 1 and self.controlador:
+            codigos = list(selected)  # El iid de cada fila es el código
+            if messagebox.askyesno("Confirmar", f"¿Eliminar los {len(codigos)} cursos seleccionados?"):
+                self.controlador.eliminar_cursos(codigos)
+        elif selected and self.controlador:
+            codigo_curso = selected[0]
             
             if messagebox.askyesno("Confirmar", f"¿Eliminar curso {codigo_curso}?"):
                 self.controlador.eliminar_curso(codigo_curso)
@@ -2144,6 +2418,14 @@ class VistaSIGA:
                             estado = "APROBADO" if nota >= 3.0 else "REPROBADO"
                             self.text_resultados.insert(tk.END, f"  - {curso_cod} ({curso_nombre}): {nota} - {estado}\n")
                     
+                    # Períodos anteriores: se leen del archivo solo para este estudiante
+                    historial = self.controlador.historial_estudiante(est.documento)
+                    if historial:
+                        self.text_resultados.insert(tk.END, "Historial de períodos anteriores:\n")
+                        for periodo, curso_cod, nota in historial:
+                            estado = "APROBADO" if nota >= 3.0 else "REPROBADO"
+                            self.text_resultados.insert(tk.END, f"  [{periodo}] {curso_cod}: {nota} - {estado}\n")
+                    
                     self.text_resultados.insert(tk.END, "-"*40 + "\n\n")
             else:
                 self.text_resultados.insert(tk.END, "No se encontraron estudiantes con ese criterio.\n")
@@ -2181,7 +2463,8 @@ class VistaSIGA:
                 self.mostrar_error("Error", "Por favor ingrese un código de curso")
                 return
                 
-            aprobados, reprobados = self.controlador.modelo.obtener_estadisticas_aprobados(curso)
+            estadisticas = self.controlador.modelo.obtener_estadisticas_curso(curso)
+            aprobados, reprobados = estadisticas.aprobados, estadisticas.reprobados
             
             if aprobados == 0 and reprobados == 0:
                 self.mostrar_error("Error", f"No hay estudiantes matriculados en el curso {curso}")
@@ -2190,9 +2473,9 @@ class VistaSIGA:
             # Crear ventana para gráfico
             ventana_grafico = tk.Toplevel(self.root)
             ventana_grafico.title(f"Estadísticas del curso: {curso}")
-            ventana_grafico.geometry("700x500")
+            ventana_grafico.geometry("1000x500")
             
-            fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(12, 5))
+            fig, (ax1, ax2, ax3) = plt.subplots(1, 3, figsize=(17, 5))
             
             # Gráfico de barras
             categorias = ['Aprobados\n(≥ 3.0)', 'Reprobados\n(< 3.0)']
@@ -2226,6 +2509,19 @@ class VistaSIGA:
                     autotext.set_color('white')
                     autotext.set_fontweight('bold')
             
+            # Histograma por décima, mantenido por el modelo: no se recorren las matrículas
+            notas = [estadisticas.nota_cubeta(c) for c in range(estadisticas.CUBETAS)]
+            colores_hist = ['#2ecc71' if nota >= estadisticas.NOTA_APROBATORIA else '#e74c3c' for nota in notas]
+            ax3.bar(notas, estadisticas.histograma, width=0.08, color=colores_hist, alpha=0.8)
+            for p, estilo in ((25, ':'), (50, '--'), (75, ':')):
+                valor = estadisticas.percentil(p)
+                ax3.axvline(valor, color='#34495e', linestyle=estilo, label=f'P{p}: {valor:.2f}')
+            ax3.set_title(f'Distribución de Notas\nCurso: {curso}', fontsize=14, fontweight='bold')
+            ax3.set_xlabel('Nota', fontsize=12)
+            ax3.set_ylabel('Cantidad de Estudiantes', fontsize=12)
+            ax3.legend()
+            ax3.grid(axis='y', alpha=0.3)
+            
             plt.tight_layout()
             
             canvas = FigureCanvasTkAgg(fig, ventana_grafico)
@@ -2239,7 +2535,9 @@ class VistaSIGA:
             total = aprobados + reprobados
             porcentaje_aprobacion = (aprobados / total * 100) if total > 0 else 0
             
-            info_text = f"Total estudiantes: {total} | Tasa de aprobación: {porcentaje_aprobacion:.1f}%"
+            info_text = (f"Total estudiantes: {total} | Tasa de aprobación: {porcentaje_aprobacion:.1f}% | "
+                         f"Mediana: {estadisticas.mediana:.2f} | "
+                         f"P25-P75: {estadisticas.percentil(25):.2f}-{estadisticas.percentil(75):.2f}")
             ttk.Label(info_frame, text=info_text, font=('Arial', 10, 'bold')).pack()
     
     def btn_estadisticas_generales(self):
@@ -2261,14 +2559,14 @@ class VistaSIGA:
             
             if total_matriculas > 0:
                 # Promedio general
-                notas = [nota for _, _, nota in modelo.matriculas]
-                promedio_general = sum(notas) / len(notas)
+                generales = modelo.obtener_estadisticas_generales()
+                promedio_general = generales.promedio
                 self.text_resultados.insert(tk.END, f"Promedio general: {promedio_general:.2f}\n")
                 
                 # Distribución de notas
-                aprobados_total = sum(1 for nota in notas if nota >= 3.0)
-                reprobados_total = len(notas) - aprobados_total
-                tasa_aprobacion = (aprobados_total / len(notas)) * 100
+                aprobados_total = generales.aprobados
+                reprobados_total = generales.reprobados
+                tasa_aprobacion = generales.tasa_aprobacion * 100
                 
                 self.text_resultados.insert(tk.END, f"Estudiantes aprobados (≥3.0): {aprobados_total}\n")
                 self.text_resultados.insert(tk.END, f"Estudiantes reprobados (<3.0): {reprobados_total}\n")
@@ -2279,17 +2577,13 @@ class VistaSIGA:
                 self.text_resultados.insert(tk.END, "-" * 40 + "\n")
                 
                 for codigo_curso, curso in modelo.cursos.items():
-                    matriculas_curso = [m for m in modelo.matriculas if m[1] == codigo_curso]
-                    if matriculas_curso:
-                        notas_curso = [nota for _, _, nota in matriculas_curso]
-                        promedio_curso = sum(notas_curso) / len(notas_curso)
-                        aprobados_curso = sum(1 for nota in notas_curso if nota >= 3.0)
-                        
+                    estadisticas_curso = modelo.obtener_estadisticas_curso(codigo_curso)
+                    if estadisticas_curso.total:
                         self.text_resultados.insert(tk.END, f"\n{codigo_curso} - {curso.nombre}:\n")
-                        self.text_resultados.insert(tk.END, f"  Estudiantes matriculados: {len(matriculas_curso)}\n")
-                        self.text_resultados.insert(tk.END, f"  Promedio del curso: {promedio_curso:.2f}\n")
-                        self.text_resultados.insert(tk.END, f"  Aprobados: {aprobados_curso}/{len(matriculas_curso)}\n")
-                        self.text_resultados.insert(tk.END, f"  Tasa de aprobación: {(aprobados_curso/len(matriculas_curso)*100):.1f}%\n")
+                        self.text_resultados.insert(tk.END, f"  Estudiantes matriculados: {estadisticas_curso.total}\n")
+                        self.text_resultados.insert(tk.END, f"  Promedio del curso: {estadisticas_curso.promedio:.2f}\n")
+                        self.text_resultados.insert(tk.END, f"  Aprobados: {estadisticas_curso.aprobados}/{estadisticas_curso.total}\n")
+                        self.text_resultados.insert(tk.END, f"  Tasa de aprobación: {estadisticas_curso.tasa_aprobacion*100:.1f}%\n")
             else:
                 self.text_resultados.insert(tk.END, "No hay matrículas registradas en el sistema.\n")
     
@@ -2336,6 +2630,28 @@ class VistaSIGA:
         )
         if archivo and self.controlador:
             self.controlador.guardar_json(archivo)
+    
+    def compactar_json(self):
+        if self.controlador:
+            self.controlador.compactar_json()
+    
+    def cerrar_periodo(self):
+        if not self.controlador:
+            return
+        periodo = simpledialog.askstring(
+            "Cerrar Período",
+            "Nombre del período que se cierra (ej. 2025-1).\n"
+            "Sus matrículas se archivan y el modelo queda listo para el siguiente."
+        )
+        if not periodo or not periodo.strip():
+            return
+        periodo = periodo.strip()
+        if messagebox.askyesno(
+            "Confirmar",
+            f"¿Cerrar el período {periodo}?\n"
+            "Todas las matrículas se archivan y se quitan del modelo; esto no se puede deshacer."
+        ):
+            self.controlador.cerrar_periodo(periodo)
 
     # ==================== MÉTODOS DE NAVEGACIÓN ====================
     def mostrar_gestion_estudiantes(self):
@@ -2379,6 +2695,27 @@ class VistaSIGA:
         self.refrescar_tabla_matriculas()
         self.actualizar_kpis()
     
+    def programar_refresco(self, *tablas):
+        """
+        Pide refrescar las tablas indicadas ('estudiantes', 'cursos', 'matriculas')
+        y los KPIs. Los pedidos hechos antes de que Tk quede libre se atienden
+        juntos, redibujando cada tabla una sola vez.
+        """
+        if not self._refrescos_pendientes:
+            self.root.after_idle(self._ejecutar_refrescos)
+        self._refrescos_pendientes.update(tablas)
+        self._refrescos_pendientes.add('kpis')
+    
+    def _ejecutar_refrescos(self):
+        tablas, self._refrescos_pendientes = self._refrescos_pendientes, set()
+        if 'estudiantes' in tablas:
+            self.refrescar_tabla_estudiantes()
+        if 'cursos' in tablas:
+            self.refrescar_tabla_cursos()
+        if 'matriculas' in tablas:
+            self.refrescar_tabla_matriculas()
+        self.actualizar_kpis()
+    
     def actualizar_tabla_estudiantes(self, estudiantes=None):
         # Limpiar tabla
         for item in self.tree_estudiantes.get_children():
@@ -2390,13 +2727,8 @@ class VistaSIGA:
         
         if estudiantes:
             for estudiante in estudiantes:
-                self.tree_estudiantes.insert('', 'end', values=(
-                    estudiante.documento,
-                    estudiante.nombre,
-                    estudiante.apellidos,
-                    estudiante.correo,
-                    estudiante.fecha_nac
-                ))
+                self.tree_estudiantes.insert('', 'end', iid=estudiante.documento,
+                                             values=self._fila_estudiante(estudiante))
     
     def actualizar_tabla_cursos(self, cursos=None):
         # Limpiar tabla
@@ -2409,40 +2741,143 @@ class VistaSIGA:
         
         if cursos and self.controlador:
             for curso in cursos:
-                # Calcular estadísticas del curso
-                estudiantes_inscritos = len(curso.estudiantes)
-                
-                # Calcular promedio
-                notas = [nota for doc, cod_curso, nota in self.controlador.modelo.matriculas if cod_curso == curso.codigo]
-                promedio = sum(notas) / len(notas) if notas else 0.0
-                
-                self.tree_cursos.insert('', 'end', values=(
-                    curso.codigo,
-                    curso.nombre,
-                    estudiantes_inscritos,
-                    f"{promedio:.2f}"
-                ))
+                self.tree_cursos.insert('', 'end', iid=curso.codigo, values=self._fila_curso(curso))
     
     def actualizar_tabla_matriculas(self, filtro_curso=""):
         # Limpiar tabla
         for item in self.tree_matriculas.get_children():
             self.tree_matriculas.delete(item)
         
+        self._filtro_matriculas = filtro_curso
+        self._claves_matriculas = []
+        self._hay_mas_matriculas = False
         if self.controlador:
-            matriculas = self.controlador.modelo.obtener_matriculas_por_curso(filtro_curso)
-            
-            for documento, codigo_curso, nota in matriculas:
-                estudiante = self.controlador.modelo.estudiantes.get(documento)
-                curso = self.controlador.modelo.cursos.get(codigo_curso)
-                
-                if estudiante and curso:
-                    self.tree_matriculas.insert('', 'end', values=(
-                        documento,
-                        f"{estudiante.nombre} {estudiante.apellidos}",
-                        codigo_curso,
-                        curso.nombre,
-                        f"{nota:.2f}"
-                    ))
+            self.cargar_mas_matriculas()
+    
+    def cargar_mas_matriculas(self):
+        """Agrega a la tabla la siguiente página de matrículas del filtro actual."""
+        claves = self._claves_matriculas
+        # La última fila cargada es el cursor: las filas que llegaron por eventos ya están en orden
+        pagina = self.controlador.modelo.consultar_matriculas(
+            codigo_curso=self._filtro_matriculas or None,
+            despues_de=claves[-1] if claves else None,
+            limite=FILAS_POR_PAGINA)
+        self._hay_mas_matriculas = False
+        for documento, codigo_curso, nota in pagina.filas:
+            self._insertar_fila_matricula(documento, codigo_curso, nota)
+        self._hay_mas_matriculas = pagina.siguiente is not None
+        self._actualizar_paginacion()
+    
+    def _actualizar_paginacion(self):
+        modelo = self.controlador.modelo
+        if self._filtro_matriculas:
+            total = modelo.obtener_estadisticas_curso(self._filtro_matriculas).total
+        else:
+            total = modelo.obtener_estadisticas_generales().total
+        self.lbl_matriculas_mostradas.config(
+            text=f"Mostrando {len(self._claves_matriculas)} de {total}")
+        self.btn_cargar_mas.config(state=tk.NORMAL if self._hay_mas_matriculas else tk.DISABLED)
+    
+    def _fila_estudiante(self, estudiante):
+        return (estudiante.documento, estudiante.nombre, estudiante.apellidos,
+                estudiante.correo, estudiante.fecha_nac)
+    
+    def _fila_curso(self, curso):
+        # Inscritos y promedio mantenidos incrementalmente por el modelo
+        promedio = self.controlador.modelo.obtener_promedio_curso(curso.codigo)
+        return (curso.codigo, curso.nombre, len(curso.estudiantes), f"{promedio:.2f}")
+    
+    def _insertar_fila_matricula(self, documento, codigo_curso, nota):
+        # La fila va en su posición del orden de la tabla. Si cae después de lo ya
+        # cargado no se muestra: llegará con "Cargar más"
+        clave = _clave_matricula((documento, codigo_curso, nota))
+        claves = self._claves_matriculas
+        if self._hay_mas_matriculas and (not claves or clave > claves[-1]):
+            return
+        
+        estudiante = self.controlador.modelo.estudiantes.get(documento)
+        curso = self.controlador.modelo.cursos.get(codigo_curso)
+        
+        if estudiante and curso:
+            posicion = bisect_left(claves, clave)
+            self.tree_matriculas.insert('', posicion, iid=_iid_matricula(documento, codigo_curso), values=(
+                documento,
+                f"{estudiante.nombre} {estudiante.apellidos}",
+                codigo_curso,
+                curso.nombre,
+                f"{nota:.2f}"
+            ))
+            claves.insert(posicion, clave)
+    
+    def _quitar_fila_matricula(self, documento, codigo_curso, nota):
+        claves = self._claves_matriculas
+        clave = _clave_matricula((documento, codigo_curso, nota))
+        posicion = bisect_left(claves, clave)
+        if posicion < len(claves) and claves[posicion] == clave:
+            del claves[posicion]
+        _borrar_fila(self.tree_matriculas, _iid_matricula(documento, codigo_curso))
+    
+    def _atender_eventos(self):
+        # Aplica juntas todas las entregas recibidas desde la vuelta anterior
+        eventos = []
+        while True:
+            try:
+                eventos.extend(self._eventos_recibidos.get_nowait())
+            except queue.Empty:
+                break
+        if eventos:
+            self.aplicar_eventos(eventos)
+        self.root.after(INTERVALO_EVENTOS_MS, self._atender_eventos)
+
+    def aplicar_eventos(self, eventos):
+        """
+        Actualiza solo las filas afectadas por una entrega de eventos del modelo
+        (ver eventos.py). Una recarga o una entrega muy grande redibujan las tablas.
+        """
+        if len(eventos) > MAX_EVENTOS_INCREMENTALES or any(type(e) is DatosRecargados for e in eventos):
+            self.programar_refresco('estudiantes', 'cursos', 'matriculas')
+            return
+        
+        modelo = self.controlador.modelo
+        cursos_afectados = set()
+        for evento in eventos:
+            tipo = type(evento)
+            if tipo is MatriculaAgregada:
+                cursos_afectados.add(evento.codigo_curso)
+                if self._filtro_matriculas in ("", evento.codigo_curso):
+                    self._insertar_fila_matricula(*evento)
+            elif tipo is MatriculaEliminada:
+                cursos_afectados.add(evento.codigo_curso)
+                self._quitar_fila_matricula(*evento)
+            elif tipo is NotaCambiada:
+                cursos_afectados.add(evento.codigo_curso)
+                if self._filtro_matriculas in ("", evento.codigo_curso):
+                    # La nota es parte del orden: la fila se reubica
+                    self._quitar_fila_matricula(evento.documento, evento.codigo_curso, evento.nota_anterior)
+                    self._insertar_fila_matricula(evento.documento, evento.codigo_curso, evento.nota_nueva)
+            elif tipo is EstudianteAgregado:
+                estudiante = modelo.estudiantes.get(evento.documento)
+                if estudiante and not self.tree_estudiantes.exists(evento.documento):
+                    self.tree_estudiantes.insert('', 'end', iid=evento.documento,
+                                                 values=self._fila_estudiante(estudiante))
+            elif tipo is EstudianteEliminado:
+                _borrar_fila(self.tree_estudiantes, evento.documento)
+            elif tipo is CursoAgregado:
+                cursos_afectados.add(evento.codigo)
+            elif tipo is CursoEliminado:
+                cursos_afectados.discard(evento.codigo)
+                _borrar_fila(self.tree_cursos, evento.codigo)
+        
+        for codigo in cursos_afectados:
+            curso = modelo.cursos.get(codigo)
+            if curso is None:
+                continue
+            if self.tree_cursos.exists(codigo):
+                self.tree_cursos.item(codigo, values=self._fila_curso(curso))
+            else:
+                self.tree_cursos.insert('', 'end', iid=codigo, values=self._fila_curso(curso))
+        self._actualizar_paginacion()
+        self.programar_refresco()  # Solo los KPIs, una vez por entrega
     
     def actualizar_kpis(self):
         if self.controlador:
@@ -2452,9 +2887,9 @@ class VistaSIGA:
             self.lbl_total_matriculas.config(text=f"Total Matrículas: {len(modelo.matriculas)}")
             
             # Calcular promedio general
-            if modelo.matriculas:
-                notas = [nota for _, _, nota in modelo.matriculas]
-                promedio_general = sum(notas) / len(notas)
+            estadisticas = modelo.obtener_estadisticas_generales()
+            if estadisticas.total:
+                promedio_general = estadisticas.promedio
                 self.lbl_promedio_general.config(text=f"Promedio General: {promedio_general:.2f}")
             else:
                 self.lbl_promedio_general.config(text="Promedio General: 0.00")
@@ -2467,6 +2902,9 @@ class VistaSIGA:
     
     def establecer_controlador(self, controlador):
         self.controlador = controlador
+        # El modelo entrega los eventos en el hilo que lo modificó; Tk solo se toca desde el suyo
+        controlador.modelo.eventos.suscribir(self._eventos_recibidos.put)
+        self.root.after(INTERVALO_EVENTOS_MS, self._atender_eventos)
         self.actualizar_kpis()
 
     # ==================== MÉTODOS DE EVENTOS PARA PREDICCIÓN ====================